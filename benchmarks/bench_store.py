@@ -0,0 +1,192 @@
+"""
+bench_store.py
+
+Benchmark of nmis_dpp.store.PassportStore at large passport counts.
+
+Fills a store with a synthetic fleet of N passports in batched
+transactions: every passport has a unique serial and belongs to one of a
+few product lines (sharing GTIN, parts and most layers with its line, with
+lifecycle data shared per manufacturing lot). It then times:
+
+    insert           passports/s for add_many()
+    get_by_id        point lookup by primary key (load + rebuild the passport)
+    find_serial      point lookup through the serial index (ids only)
+    find_gtin        lookup through the GTIN index (~N/groups matches)
+    find_part_type   first 100 passports containing a part type (raw dicts)
+    scan_serial      streaming range scan by serial (raw dicts), passports/s
+
+    python benchmarks/bench_store.py --passports 1000000 --dir /tmp/stores -o store.json
+
+Each mode (--modes plain,dedup) fills its own database: "dedup" uses the
+content-addressed encoding, and the summary reports its size relative to
+"plain". Lookup times should stay roughly flat as --passports grows (B-tree
+indexes); insert and scan throughput should stay constant.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import sys
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from run_benchmarks import RESULTS_VERSION, measure, result  # also puts the repo root on sys.path
+
+from nmis_dpp.model import DigitalProductPassport  # noqa: E402
+from nmis_dpp.store import PassportStore  # noqa: E402
+from nmis_dpp.synthetic import generate_passport  # noqa: E402
+
+DEFAULT_PASSPORTS = 100_000
+DEFAULT_PARTS = 5
+DEFAULT_LINES = 1_000
+LOT_SIZE = 500
+MODES = ("plain", "dedup")
+
+
+def iter_passports(
+    n_passports: int, n_parts: int, lines: int = DEFAULT_LINES, seed: int = 0
+) -> Iterator[DigitalProductPassport]:
+    """Yield a fleet: product line templates with unique identities and per-lot lifecycle data."""
+    templates: Dict[int, DigitalProductPassport] = {}
+    for index in range(n_passports):
+        line = index % lines
+        template = templates.get(line)
+        if template is None:
+            template = templates[line] = generate_passport(n_parts, seed=seed * lines + line)
+        dpp = copy.copy(template)
+        identity = copy.copy(template.identity)
+        identity.global_ids = dict(template.identity.global_ids, serial=f"SN-{index:09d}", gtin=f"{line:014d}")
+        dpp.identity = identity
+        lifecycle = copy.copy(template.lifecycle)
+        lifecycle.manufacture = dict(template.lifecycle.manufacture, lot=f"LOT-{index // lines // LOT_SIZE:06d}")
+        dpp.lifecycle = lifecycle
+        yield dpp
+
+
+def run(
+    n_passports: int,
+    n_parts: int,
+    db_path: Path,
+    mode: str = "plain",
+    lines: int = DEFAULT_LINES,
+    lookups: int = 1_000,
+    min_time: float = 0.5,
+    max_repeat: int = 20,
+) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    rng = random.Random(0)
+    lines = min(lines, n_passports)
+
+    def report(entry: Dict[str, Any]) -> None:
+        entry["mode"] = mode
+        results.append(entry)
+        print(f"  {entry['name']:<16} {entry['min_s'] * 1e3:>12.3f} ms", file=sys.stderr)
+
+    print(f"{mode}: {n_passports} passports, {lines} product lines", file=sys.stderr)
+    with PassportStore(db_path, deduplicate=mode == "dedup") as store:
+        start = time.perf_counter()
+        batch_start, done = start, 0
+        passports = iter_passports(n_passports, n_parts, lines)
+        while done < n_passports:
+            added = store.add_many(islice(passports, 100_000))
+            done += added
+            now = time.perf_counter()
+            print(f"  inserted {done:>10} ({added / (now - batch_start):,.0f}/s)", file=sys.stderr)
+            batch_start = now
+        insert = result("insert", n_passports, [time.perf_counter() - start])
+        insert["passports_per_s"] = insert.pop("parts_per_s", None)
+        report(insert)
+
+        serials = [f"SN-{rng.randrange(n_passports):09d}" for _ in range(lookups)]
+        ids = [rng.randrange(1, n_passports + 1) for _ in range(lookups)]
+        gtins = [f"{rng.randrange(lines):014d}" for _ in range(max(1, lookups // 10))]
+
+        def per_lookup(name: str, fn: Callable[[], Any], calls: int) -> None:
+            timings = measure(fn, min_time, max_repeat)
+            report(result(name, None, [t / calls for t in timings]))
+
+        per_lookup("get_by_id", lambda: [store.get(i) for i in ids], len(ids))
+        per_lookup("find_serial", lambda: [store.find_ids(serial=s) for s in serials], len(serials))
+        per_lookup("find_gtin", lambda: [store.find_ids(gtin=g) for g in gtins], len(gtins))
+        per_lookup("find_part_type", lambda: list(islice(store.find(raw=True, batch_size=100, part_type="Sensor"), 100)), 1)
+
+        span = min(n_passports, 100_000)
+        low = rng.randrange(max(1, n_passports - span + 1))
+        scan = measure(
+            lambda: sum(1 for _ in store.scan("serial", f"SN-{low:09d}", f"SN-{low + span:09d}", raw=True)),
+            min_time, 3,
+        )
+        entry = result("scan_serial", span, scan)
+        entry["passports_per_s"] = entry.pop("parts_per_s", None)
+        report(entry)
+
+        stats = store.stats()
+        stats.pop("part_types")
+        results.append(dict(stats, name="size", mode=mode))
+        print(f"  database size    {stats['size_bytes'] / 2 ** 20:>12.1f} MiB "
+              f"({stats['blobs']} blobs)", file=sys.stderr)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite passport store.")
+    parser.add_argument("--passports", type=int, default=DEFAULT_PASSPORTS,
+                        help="Passports to insert (default: %(default)s).")
+    parser.add_argument("--parts", type=int, default=DEFAULT_PARTS, help="Parts per passport.")
+    parser.add_argument("--lines", type=int, default=DEFAULT_LINES,
+                        help="Product lines in the fleet (default: %(default)s).")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help="Store encodings to benchmark (default: %(default)s).")
+    parser.add_argument("--dir", type=Path,
+                        help="Directory for the databases (default: a temporary one, removed afterwards).")
+    parser.add_argument("--lookups", type=int, default=1_000, help="Point lookups per timing run.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds per lookup benchmark.")
+    parser.add_argument("-o", "--output", type=Path, help="Write results JSON to this file.")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes {sorted(unknown)}; expected {list(MODES)}")
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir or Path(tmp)
+        directory.mkdir(parents=True, exist_ok=True)
+        for mode in modes:
+            db_path = directory / f"passports-{mode}.db"
+            if db_path.exists():
+                parser.error(f"{db_path} already exists")
+            results.extend(run(
+                args.passports, args.parts, db_path, mode=mode, lines=args.lines,
+                lookups=args.lookups, min_time=args.min_time,
+            ))
+
+    document = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "passports": args.passports,
+        "parts": args.parts,
+        "lines": args.lines,
+        "results": results,
+    }
+    sizes = {r["mode"]: r["size_bytes"] for r in results if r["name"] == "size"}
+    if len(sizes) == 2:
+        document["dedup_size_ratio"] = sizes["dedup"] / sizes["plain"]
+        print(f"dedup database is {document['dedup_size_ratio']:.1%} of plain", file=sys.stderr)
+    text = json.dumps(document, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
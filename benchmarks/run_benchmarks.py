@@ -0,0 +1,268 @@
+"""
+run_benchmarks.py
+
+Standalone benchmark suite for nmis_dpp at production-like sizes.
+
+For each passport size (synthetic, seeded; see nmis_dpp.synthetic) it times:
+
+    map_dpp[<schema>]     full mapping with the repository's mapping configs
+    remap[<schema>]       incremental re-mapping after one part changed
+    map_parts[<schema>]   grouped part mapping (each part type resolved once)
+    map_part_class[...]   the same parts mapped one by one, for comparison
+    serialize             to_dict() + json.dumps()
+    deserialize           json.loads() + utils.passport_from_dict()
+    validate_raw          json_schema.passport_validator() on the raw dict
+    validate_mapped[...]  the mapper's compiled validation rules (check_rules();
+                          map_dpp() runs only the schema check by default)
+
+plus, once per schema, loading its mapping config through SchemaRegistry
+(config_load[<schema>]). Results are written as JSON that can be compared
+against a previous run:
+
+    python benchmarks/run_benchmarks.py --sizes 10,1000,100000 -o new.json
+    python benchmarks/run_benchmarks.py --compare old.json --threshold 1.2
+
+Sizes up to 1,000,000 parts are supported; expect a few GB of memory and
+minutes of runtime at that size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    # Run from a checkout without installing the package
+    sys.path.insert(0, str(REPO_ROOT))
+
+from nmis_dpp.json_schema import passport_validator  # noqa: E402
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper  # noqa: E402
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper  # noqa: E402
+from nmis_dpp.schema_registry import SchemaRegistry  # noqa: E402
+from nmis_dpp.synthetic import generate_passport  # noqa: E402
+from nmis_dpp.utils import passport_from_dict, to_dict  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_SIZES = (10, 100, 1_000, 10_000)
+DEFAULT_MIN_TIME = 0.5
+DEFAULT_MAX_REPEAT = 50
+DEFAULT_THRESHOLD = 1.25
+
+#: Schema name -> (mapper class, mapping config file in the repository root)
+SCHEMAS = {
+    "ECLASS": (ECLASSMapper, "eclass_part_class_mapping.yaml"),
+    "ISA-95": (ISA95Mapper, "isa95_part_class_mapping.yaml"),
+}
+
+
+def measure(fn: Callable[[], Any], min_time: float, max_repeat: int) -> List[float]:
+    """Run fn until min_time has elapsed (at least once, at most max_repeat times)."""
+    timings: List[float] = []
+    gc.collect()
+    deadline = time.perf_counter() + min_time
+    while len(timings) < max_repeat:
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() >= deadline:
+            break
+    return timings
+
+
+def result(name: str, parts: Optional[int], timings: List[float]) -> Dict[str, Any]:
+    best = min(timings)
+    entry = {
+        "name": name,
+        "parts": parts,
+        "repeat": len(timings),
+        "min_s": best,
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.mean(timings),
+    }
+    if parts:
+        entry["parts_per_s"] = parts / best if best else None
+    return entry
+
+
+def load_configs(config_dir: Path) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Load every schema config through a fresh registry, timing each load."""
+    registry = SchemaRegistry(config_dir=config_dir, plugin_group=None)
+    configs, results = {}, []
+    for schema, (mapper_class, _) in SCHEMAS.items():
+        registry.register(mapper_class)
+        start = time.perf_counter()
+        configs[schema] = registry.get_mapper(schema).config
+        results.append(result(f"config_load[{schema}]", None, [time.perf_counter() - start]))
+    return configs, results
+
+
+def prepare_config_dir(target: Path) -> Path:
+    """Copy the repository mapping configs under the names SchemaRegistry expects."""
+    registry = SchemaRegistry(config_dir=target, plugin_group=None)
+    for schema, (_, filename) in SCHEMAS.items():
+        source = REPO_ROOT / filename
+        if source.exists():
+            shutil.copyfile(source, registry._config_path(schema))
+    return target
+
+
+def bench_size(
+    n_parts: int,
+    configs: Dict[str, Any],
+    seed: int,
+    min_time: float,
+    max_repeat: int,
+) -> List[Dict[str, Any]]:
+    results = []
+
+    def run(name: str, fn: Callable[[], Any]) -> None:
+        results.append(result(name, n_parts, measure(fn, min_time, max_repeat)))
+        print(f"  {name:<28} {results[-1]['min_s'] * 1e3:>12.3f} ms", file=sys.stderr)
+
+    dpp = generate_passport(n_parts, seed=seed)
+
+    for schema, (mapper_class, _) in SCHEMAS.items():
+        mapper = mapper_class(config=configs.get(schema) or {})
+        mapped = mapper.map_dpp(dpp)
+        run(f"map_dpp[{schema}]", lambda: mapper.map_dpp(dpp))
+
+        part = dpp.structure.parts[-1] if dpp.structure.parts else None
+
+        def remap_one() -> None:
+            if part is not None:
+                part.name = part.name  # any assignment records a change
+            mapper.remap(dpp, mapped)
+
+        run(f"remap[{schema}]", remap_one)
+        parts = dpp.structure.parts
+        run(f"map_parts[{schema}]", lambda: mapper.map_parts(parts))
+        run(f"map_part_class[{schema}]", lambda: [mapper.map_part_class(p) for p in parts])
+        run(f"validate_mapped[{schema}]", lambda: mapper.check_rules(mapped))
+        del mapped
+
+    text = json.dumps(to_dict(dpp))
+    run("serialize", lambda: json.dumps(to_dict(dpp)))
+    run("deserialize", lambda: passport_from_dict(json.loads(text)))
+
+    raw = json.loads(text)
+    validator = passport_validator()
+    run("validate_raw", lambda: validator.validate(raw))
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print a comparison table and return the names of regressed benchmarks."""
+    previous = {(r["name"], r["parts"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"{'benchmark':<28} {'parts':>9} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for entry in current["results"]:
+        key = (entry["name"], entry["parts"])
+        old = previous.get(key)
+        if old is None or not old["min_s"]:
+            continue
+        ratio = entry["min_s"] / old["min_s"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(
+            f"{entry['name']:<28} {entry['parts'] or '-':>9} {old['min_s'] * 1e3:>12.3f} "
+            f"{entry['min_s'] * 1e3:>12.3f} {ratio:>7.2f}{flag}"
+        )
+        if flag:
+            regressions.append(f"{entry['name']}@{entry['parts']}" if entry["parts"] else entry["name"])
+    return regressions
+
+
+def run_suite(
+    sizes: List[int],
+    seed: int = 0,
+    min_time: float = DEFAULT_MIN_TIME,
+    max_repeat: int = DEFAULT_MAX_REPEAT,
+    mapping_configs: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run all benchmarks and return the results document.
+
+    Args:
+        sizes: Passport sizes (part counts) to benchmark.
+        seed: Synthetic data seed.
+        min_time / max_repeat: Per-benchmark run budget (see measure()).
+        mapping_configs: Load the repository mapping configs; False maps
+                         with empty configs and skips config_load.
+    """
+    configs: Dict[str, Any] = {}
+    results: List[Dict[str, Any]] = []
+    if mapping_configs:
+        with tempfile.TemporaryDirectory() as tmp:
+            configs, results = load_configs(prepare_config_dir(Path(tmp)))
+
+    for n_parts in sizes:
+        print(f"{n_parts} parts", file=sys.stderr)
+        results.extend(bench_size(n_parts, configs, seed, min_time, max_repeat))
+
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "seed": seed,
+        "mapping_configs": mapping_configs,
+        "sizes": sizes,
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the nmis_dpp benchmark suite.")
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated part counts (default: %(default)s).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic data seed.")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="Minimum seconds spent per benchmark (default: %(default)s).")
+    parser.add_argument("--max-repeat", type=int, default=DEFAULT_MAX_REPEAT,
+                        help="Maximum runs per benchmark (default: %(default)s).")
+    parser.add_argument("--no-configs", action="store_true",
+                        help="Map with empty configs instead of loading the mapping YAML files.")
+    parser.add_argument("-o", "--output", type=Path, help="Write results JSON to this file.")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown ratio reported as a regression (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size.replace("_", "")) for size in args.sizes.split(",") if size.strip()]
+    document = run_suite(
+        sizes, seed=args.seed, min_time=args.min_time, max_repeat=args.max_repeat,
+        mapping_configs=not args.no_configs,
+    )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(document, indent=2))
+
+    if args.compare:
+        regressions = compare(document, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
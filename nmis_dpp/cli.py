@@ -3,14 +3,42 @@ cli.py
 
 Command-line interface for the nmis_dpp package.
 Allows users to generate sample Digital Product Passports mapped to available schemas.
+
+Without arguments the CLI runs interactively. Subcommands:
+
+    profile   Map a passport file or synthetic workload N times with one
+              schema and report per-layer timings, peak memory and
+              (optionally) cProfile / tracemalloc summaries:
+
+                  python -m nmis_dpp.cli profile --schema ECLASS --synthetic 10000 -n 5 --cprofile
+
+    batch     Map directories, files or globs of passport JSON/JSONL files to
+              one or more schemas in parallel worker processes, writing
+              <output>/<schema>/<file> and a summary of failures (exit code 1
+              if any record failed):
+
+                  nmis-dpp batch passports/ --schema ECLASS,ISA-95 -o mapped/ --workers 8
 """
 
+import argparse
+import contextlib
+import cProfile
+import glob
+import io
 import json
 import logging
+import os
+import pstats
+import statistics
 import sys
-from typing import Dict, Any
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
 
 from nmis_dpp import get_global_registry
+from nmis_dpp.instrumentation import MetricsRecorder
 from nmis_dpp.model import (
     IdentityLayer, StructureLayer, LifecycleLayer, RiskLayer,
     SustainabilityLayer, ProvenanceLayer, DigitalProductPassport
@@ -18,7 +46,8 @@ from nmis_dpp.model import (
 from nmis_dpp.part_class import (
     Actuator, Sensor, PowerConversion
 )
-from nmis_dpp.utils import to_dict
+from nmis_dpp.schema_base import LAYER_MAPPERS, SchemaMapper
+from nmis_dpp.utils import passport_from_dict, to_dict
 
 # Configure basic logging to avoid noise but show important info
 logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
@@ -113,7 +142,7 @@ def create_sample_dpp() -> DigitalProductPassport:
         provenance=provenance
     )
 
-def main():
+def interactive():
     print("--- NMIS DPP Generator CLI ---")
     
     registry = get_global_registry()
@@ -155,5 +184,626 @@ def main():
         print(f"Error during mapping: {e}")
         sys.exit(1)
 
+# ---------------------------------------------------------------------------
+# Shared helpers for the non-interactive subcommands
+# ---------------------------------------------------------------------------
+
+def _registry(config_dir: Optional[Path]):
+    """The global registry, or a fresh one reading configs from config_dir."""
+    if config_dir is None:
+        return get_global_registry()
+    from nmis_dpp.schema_registry import SchemaRegistry, register_default_mappers
+
+    registry = SchemaRegistry(config_dir=config_dir)
+    register_default_mappers(registry)
+    return registry
+
+
+def _peak_rss_mib() -> Optional[float]:
+    """Peak resident set size of this process, where the platform reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+# ---------------------------------------------------------------------------
+# profile
+# ---------------------------------------------------------------------------
+
+def _load_workload(args: argparse.Namespace) -> Tuple[DigitalProductPassport, str]:
+    if args.input is not None:
+        with args.input.open("r", encoding="utf-8") as f:
+            return passport_from_dict(json.load(f)), str(args.input)
+
+    from nmis_dpp.synthetic import generate_passport
+
+    return generate_passport(args.synthetic, seed=args.seed), f"synthetic (seed {args.seed})"
+
+
+def profile_mapping(
+    mapper: SchemaMapper,
+    dpp: DigitalProductPassport,
+    iterations: int,
+    cprofile: bool = False,
+    trace_memory: bool = False,
+    top: int = 20,
+    sort: str = "cumulative",
+    pstats_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Profile mapper.map_dpp(dpp) and return a JSON-serializable report.
+
+    Timings come from a clean pass (after one warm-up call); cProfile and
+    tracemalloc each run in a separate pass, so their overhead does not
+    distort the timings. "schema_check_s" is the validation map_dpp() ran
+    itself (only the schema check unless the mapper has full_validation);
+    "validation_s" times the full rules (check_rules()) separately.
+
+    Args:
+        mapper: Mapper to profile (its instrumentation is restored afterwards).
+        dpp: Passport to map.
+        iterations: Timed map_dpp() calls (also used for the cProfile pass).
+        cprofile: Add the top functions from cProfile.
+        trace_memory: Add tracemalloc peak and top allocation sites of one call.
+        top: Number of functions/allocation sites to report.
+        sort: pstats sort key for the cProfile listing.
+        pstats_path: Also dump raw cProfile stats here (e.g. for snakeviz).
+
+    Returns:
+        Dict[str, Any]: Report (see format_profile_report()).
+    """
+    previous_instrumentation = mapper.__dict__.get("instrumentation")
+    recorder = MetricsRecorder()
+    try:
+        mapper.map_dpp(dpp)  # warm-up: lazy validators, caches, imports
+
+        mapper.instrumentation = recorder
+        timings: List[float] = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            mapped = mapper.map_dpp(dpp)
+            timings.append(time.perf_counter() - start)
+        mapper.instrumentation = None
+
+        # The full rules, which map_dpp() only runs with full_validation
+        rule_timings: List[float] = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            mapper.check_rules(mapped)
+            rule_timings.append(time.perf_counter() - start)
+    finally:
+        if previous_instrumentation is None:
+            mapper.__dict__.pop("instrumentation", None)
+        else:
+            mapper.instrumentation = previous_instrumentation
+
+    snapshot = recorder.snapshot()
+    layers = {
+        sample["labels"]["layer"]: sample["sum"] / sample["count"]
+        for sample in snapshot.get("layer_seconds", [])
+    }
+    validation = snapshot.get("validation_seconds", [])
+
+    report: Dict[str, Any] = {
+        "schema": mapper.get_schema_name(),
+        "parts": len(dpp.structure.parts),
+        "iterations": iterations,
+        "map_dpp_s": {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "max": max(timings),
+        },
+        "layers_s": {key: layers[key] for key, _ in LAYER_MAPPERS if key in layers},
+        "schema_check_s": validation[0]["sum"] / validation[0]["count"] if validation else None,
+        "validation_s": statistics.mean(rule_timings),
+        "full_validation": mapper.full_validation,
+    }
+
+    if cprofile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        for _ in range(iterations):
+            mapper.map_dpp(dpp)
+        profiler.disable()
+        if pstats_path is not None:
+            profiler.dump_stats(str(pstats_path))
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(top)
+        report["cprofile"] = stream.getvalue()
+
+    if trace_memory:
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            before = tracemalloc.take_snapshot()
+            mapped = mapper.map_dpp(dpp)
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            del mapped
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+        report["tracemalloc"] = {
+            "peak_mib": (peak - baseline) / (1024 * 1024),
+            "top": [
+                {"site": str(stat.traceback[0]), "size_kib": stat.size_diff / 1024, "count": stat.count_diff}
+                for stat in after.compare_to(before, "lineno")[:top]
+            ],
+        }
+
+    report["peak_rss_mib"] = _peak_rss_mib()
+    return report
+
+
+def format_profile_report(report: Dict[str, Any], workload: str) -> str:
+    """Render a profile_mapping() report for the terminal."""
+    wall = report["map_dpp_s"]
+    lines = [
+        f"Profile: {report['schema']} on {workload}, {report['parts']} parts, "
+        f"{report['iterations']} iterations",
+        f"map_dpp: min {wall['min'] * 1e3:.2f} ms, median {wall['median'] * 1e3:.2f} ms, "
+        f"mean {wall['mean'] * 1e3:.2f} ms, max {wall['max'] * 1e3:.2f} ms",
+        "",
+        "Mean time per call:",
+    ]
+    timed = dict(report["layers_s"])
+    if report["schema_check_s"] is not None:
+        timed["(validation)" if report["full_validation"] else "(schema check)"] = report["schema_check_s"]
+    for name, seconds in sorted(timed.items(), key=lambda item: -item[1]):
+        share = seconds / wall["mean"] * 100 if wall["mean"] else 0.0
+        lines.append(f"  {name:<16} {seconds * 1e3:>10.3f} ms {share:>6.1f}%")
+    if not report["full_validation"]:
+        lines.append(f"check_rules() (not run by map_dpp): {report['validation_s'] * 1e3:.3f} ms")
+
+    if report.get("peak_rss_mib") is not None:
+        lines.append(f"\nPeak RSS: {report['peak_rss_mib']:.1f} MiB")
+
+    memory = report.get("tracemalloc")
+    if memory:
+        lines.append(f"\ntracemalloc: peak {memory['peak_mib']:.2f} MiB during one map_dpp; top allocation sites:")
+        for stat in memory["top"]:
+            lines.append(f"  {stat['size_kib']:>10.1f} KiB {stat['count']:>8}  {stat['site']}")
+
+    if report.get("cprofile"):
+        lines.append("\ncProfile:")
+        lines.append(report["cprofile"].rstrip())
+    return "\n".join(lines)
+
+
+def profile_command(args: argparse.Namespace) -> int:
+    registry = _registry(args.config_dir)
+    try:
+        mapper = registry.get_mapper(args.schema)
+    except KeyError:
+        print(f"Error: Schema '{args.schema}' not found. Available: {', '.join(registry.list_schemas())}",
+              file=sys.stderr)
+        return 2
+
+    try:
+        dpp, workload = _load_workload(args)
+    except (OSError, ValueError, TypeError) as exc:
+        print(f"Error loading {args.input}: {exc}", file=sys.stderr)
+        return 2
+
+    report = profile_mapping(
+        mapper, dpp, args.iterations,
+        cprofile=args.cprofile, trace_memory=args.tracemalloc,
+        top=args.top, sort=args.sort, pstats_path=args.pstats,
+    )
+    report["workload"] = workload
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_profile_report(report, workload))
+    return 0
+
+# ---------------------------------------------------------------------------
+# batch
+# ---------------------------------------------------------------------------
+
+BATCH_SUFFIXES = (".json", ".jsonl")
+
+# Registry used by batch workers (set per process by _init_batch_worker)
+_batch_registry = None
+
+
+def collect_inputs(sources: List[str]) -> List[Tuple[Path, Path]]:
+    """
+    Expand input directories, files and glob patterns into passport files.
+
+    Directories are searched recursively for *.json and *.jsonl files.
+
+    Returns:
+        List[Tuple[Path, Path]]: (input file, output path relative to the
+        output directory), in a stable order without duplicates.
+
+    Raises:
+        ValueError: If a source matches nothing or two inputs would write
+                    the same output file.
+    """
+    found: List[Tuple[Path, Path]] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = [(f, f.relative_to(path)) for f in sorted(path.rglob("*"))
+                       if f.suffix in BATCH_SUFFIXES and f.is_file()]
+        elif path.is_file():
+            matches = [(path, Path(path.name))]
+        else:
+            files = [Path(f) for f in sorted(glob.glob(source, recursive=True))]
+            matches = [(f, Path(f.name)) for f in files if f.suffix in BATCH_SUFFIXES and f.is_file()]
+        if not matches:
+            raise ValueError(f"No .json/.jsonl files found for {source!r}")
+        found.extend(matches)
+
+    inputs, seen_inputs, seen_outputs = [], set(), {}
+    for path, relative in found:
+        resolved = path.resolve()
+        if resolved in seen_inputs:
+            continue
+        if relative in seen_outputs:
+            raise ValueError(f"{path} and {seen_outputs[relative]} would both be written to {relative}")
+        seen_inputs.add(resolved)
+        seen_outputs[relative] = path
+        inputs.append((path, relative))
+    return inputs
+
+
+def _schema_dir(canonical_name: str) -> str:
+    return canonical_name.lower().replace("-", "")
+
+
+def _init_batch_worker(config_dir: Optional[Path], shared_dir: Optional[str]) -> None:
+    global _batch_registry
+    logging.getLogger().setLevel(logging.ERROR)
+    _batch_registry = _registry(config_dir)
+    if shared_dir is not None:
+        _batch_registry.attach_shared_configs(shared_dir)
+
+
+def _iter_records(path: Path) -> Iterator[Tuple[Optional[str], Any]]:
+    """Yield (record label, passport dict) pairs; labels are None for single-passport files."""
+    if path.suffix == ".jsonl":
+        with path.open("r", encoding="utf-8") as f:
+            for lineno, line in enumerate(f, 1):
+                if line.strip():
+                    yield f"line {lineno}", line
+        return
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        for index, item in enumerate(data):
+            yield f"[{index}]", item
+    else:
+        yield None, data
+
+
+@contextlib.contextmanager
+def _output_file(path: Path) -> Iterator[Any]:
+    # Write to a temporary file first so a crashed run never leaves partial
+    # output; it replaces `path` only if the block completes
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _write_output(path: Path, write: Callable[[Any], None]) -> None:
+    with _output_file(path) as f:
+        write(f)
+
+
+def map_file(
+    path: Path,
+    relative: Path,
+    schemas: List[str],
+    output_dir: Path,
+    max_failures: int = 20,
+) -> Dict[str, Any]:
+    """
+    Map every passport in one JSON/JSONL file to each schema.
+
+    Output goes to output_dir/<schema>/<relative>: one mapped document per
+    line for JSONL input, the mapped document (or list of documents) for
+    JSON input. Records that fail to parse or map are counted and reported,
+    not raised. If the file itself cannot be read or parsed to the end,
+    nothing is written and no records count as mapped.
+
+    Args:
+        path: Input file.
+        relative: Output path relative to each schema's output directory.
+        schemas: Canonical schema names.
+        output_dir: Root output directory.
+        max_failures: Failures kept in the result (all are counted).
+
+    Returns:
+        Dict[str, Any]: File result with "path", "records", "mapped" (per
+        schema), "failed", "failures" and "seconds".
+    """
+    registry = _batch_registry if _batch_registry is not None else get_global_registry()
+    start = time.perf_counter()
+    result: Dict[str, Any] = {
+        "path": str(path), "records": 0, "mapped": {schema: 0 for schema in schemas},
+        "failed": 0, "failures": [],
+    }
+
+    def fail(record: Optional[str], schema: Optional[str], exc: BaseException) -> None:
+        result["failed"] += 1
+        if len(result["failures"]) < max_failures:
+            result["failures"].append({
+                "path": str(path), "record": record, "schema": schema,
+                "error": f"{type(exc).__name__}: {exc}",
+            })
+
+    # JSONL output is written record by record; JSON output is one document
+    # (or list), so it is collected and written at the end
+    jsonl = path.suffix == ".jsonl"
+    outputs: Dict[str, List[Any]] = {} if jsonl else {schema: [] for schema in schemas}
+    single = False
+    try:
+        with contextlib.ExitStack() as stack:
+            files = {
+                schema: stack.enter_context(_output_file(output_dir / _schema_dir(schema) / relative))
+                for schema in (schemas if jsonl else ())
+            }
+            for record, data in _iter_records(path):
+                result["records"] += 1
+                single = record is None
+                try:
+                    if isinstance(data, str):
+                        data = json.loads(data)
+                    dpp = passport_from_dict(data)
+                except Exception as exc:  # any malformed record is reported, not fatal
+                    fail(record, None, exc)
+                    continue
+                for schema in schemas:
+                    try:
+                        mapped = registry.map_dpp(schema, dpp)
+                    except Exception as exc:
+                        fail(record, schema, exc)
+                        continue
+                    if jsonl:
+                        files[schema].write(json.dumps(mapped) + "\n")
+                    else:
+                        outputs[schema].append(mapped)
+                    result["mapped"][schema] += 1
+    except (OSError, ValueError) as exc:
+        # Nothing is written for a file that cannot be read to the end
+        fail(None, None, exc)
+        result["mapped"] = {schema: 0 for schema in schemas}
+        outputs = {}
+
+    for schema, documents in outputs.items():
+        target = output_dir / _schema_dir(schema) / relative
+        if single and documents:
+            _write_output(target, lambda f: json.dump(documents[0], f, indent=2))
+        elif not single:
+            _write_output(target, lambda f: json.dump(documents, f, indent=2))
+
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(
+    inputs: List[Tuple[Path, Path]],
+    schemas: List[str],
+    output_dir: Path,
+    workers: int = 1,
+    config_dir: Optional[Path] = None,
+    progress: Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]] = None,
+    max_failures: int = 20,
+) -> Dict[str, Any]:
+    """
+    Map many passport files to one or more schemas, in parallel processes.
+
+    With workers > 1 the schema configs are exported once as shared
+    (memory-mapped) configs that all worker processes attach to.
+
+    Args:
+        inputs: (file, relative output path) pairs from collect_inputs().
+        schemas: Schema names or aliases.
+        output_dir: Root output directory (one subdirectory per schema).
+        workers: Worker processes; 1 maps in this process.
+        config_dir: Directory with mapping configs (default: global registry).
+        progress: Called as progress(file_result, totals) after each file.
+        max_failures: Failures kept per file and in the summary.
+
+    Returns:
+        Dict[str, Any]: Summary with file/record/failure totals, elapsed
+        time, throughput and the first failures.
+
+    Raises:
+        KeyError: If a schema is not registered.
+    """
+    registry = _registry(config_dir)
+    canonical = []
+    for schema in schemas:
+        info = registry.info(schema)
+        if "error" in info:
+            raise KeyError(info["error"])
+        if info["canonical_name"] not in canonical:
+            canonical.append(info["canonical_name"])
+
+    totals: Dict[str, Any] = {
+        "files": len(inputs), "files_done": 0, "records": 0, "failed": 0,
+        "mapped": {schema: 0 for schema in canonical}, "failures": [],
+    }
+    start = time.perf_counter()
+
+    def collect(file_result: Dict[str, Any]) -> None:
+        totals["files_done"] += 1
+        totals["records"] += file_result["records"]
+        totals["failed"] += file_result["failed"]
+        for schema, count in file_result["mapped"].items():
+            totals["mapped"][schema] += count
+        room = max_failures - len(totals["failures"])
+        totals["failures"].extend(file_result["failures"][:max(room, 0)])
+        totals["elapsed"] = time.perf_counter() - start
+        if progress is not None:
+            progress(file_result, totals)
+
+    workers = max(1, min(workers, len(inputs)))
+    if workers == 1:
+        global _batch_registry
+        previous, _batch_registry = _batch_registry, registry
+        try:
+            for path, relative in inputs:
+                collect(map_file(path, relative, canonical, output_dir, max_failures))
+        finally:
+            _batch_registry = previous
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with tempfile.TemporaryDirectory(prefix="nmis_dpp_batch_") as shared_dir:
+            registry.export_shared_configs(shared_dir, canonical)
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_batch_worker, initargs=(config_dir, shared_dir)
+            ) as pool:
+                futures = [
+                    pool.submit(map_file, path, relative, canonical, output_dir, max_failures)
+                    for path, relative in inputs
+                ]
+                for future in as_completed(futures):
+                    collect(future.result())
+
+    elapsed = time.perf_counter() - start
+    totals.pop("files_done")
+    totals.update({
+        "schemas": canonical,
+        "workers": workers,
+        "elapsed": elapsed,
+        "records_per_second": totals["records"] / elapsed if elapsed else None,
+    })
+    return totals
+
+
+def _print_progress(file_result: Dict[str, Any], totals: Dict[str, Any]) -> None:
+    rate = totals["records"] / totals["elapsed"] if totals["elapsed"] else 0.0
+    width = len(str(totals["files"]))
+    print(
+        f"[{totals['files_done']:>{width}}/{totals['files']}] {file_result['path']}: "
+        f"{file_result['records']} records, {file_result['failed']} failed "
+        f"({file_result['seconds']:.2f} s; {rate:.0f} records/s overall)",
+        file=sys.stderr,
+    )
+
+
+def format_batch_summary(summary: Dict[str, Any]) -> str:
+    """Render a run_batch() summary for the terminal."""
+    mapped = ", ".join(f"{schema} {count}" for schema, count in summary["mapped"].items())
+    lines = [
+        f"Mapped {summary['records']} records from {summary['files']} files with "
+        f"{summary['workers']} worker(s) in {summary['elapsed']:.2f} s "
+        f"({summary['records_per_second'] or 0:.0f} records/s)",
+        f"Mapped documents: {mapped}",
+        f"Failures: {summary['failed']}",
+    ]
+    for failure in summary["failures"]:
+        where = failure["path"] + (f" {failure['record']}" if failure["record"] else "")
+        schema = f" [{failure['schema']}]" if failure["schema"] else ""
+        lines.append(f"  {where}{schema}: {failure['error']}")
+    if summary["failed"] > len(summary["failures"]):
+        lines.append(f"  ... {summary['failed'] - len(summary['failures'])} more")
+    return "\n".join(lines)
+
+
+def batch_command(args: argparse.Namespace) -> int:
+    try:
+        inputs = collect_inputs(args.inputs)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    schemas = [name.strip() for value in args.schema for name in value.split(",") if name.strip()]
+
+    try:
+        summary = run_batch(
+            inputs, schemas, args.output_dir,
+            workers=args.workers, config_dir=args.config_dir,
+            progress=None if args.quiet else _print_progress,
+            max_failures=args.max_failures,
+        )
+    except KeyError as exc:
+        print(f"Error: {exc.args[0]}", file=sys.stderr)
+        return 2
+
+    if args.report is not None:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(format_batch_summary(summary))
+    return 1 if summary["failed"] else 0
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="nmis-dpp",
+        description="Digital Product Passport tools. Run without a command for the interactive generator.",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    profile = commands.add_parser("profile", help="Profile mapping of a passport with one schema.")
+    profile.add_argument("--schema", required=True, help="Target schema name or alias (e.g. ECLASS, ISA-95).")
+    source = profile.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=Path, help="Passport JSON file (utils.to_dict() format).")
+    source.add_argument("--synthetic", type=int, metavar="PARTS", help="Generate a synthetic passport with PARTS parts.")
+    profile.add_argument("--seed", type=int, default=0, help="Seed for --synthetic (default: %(default)s).")
+    profile.add_argument("-n", "--iterations", type=int, default=10, help="Timed map_dpp() calls (default: %(default)s).")
+    profile.add_argument("--config-dir", type=Path, help="Directory with <schema>_mapping.yml configs.")
+    profile.add_argument("--cprofile", action="store_true", help="Include a cProfile function listing.")
+    profile.add_argument("--sort", default="cumulative", help="cProfile sort key (default: %(default)s).")
+    profile.add_argument("--pstats", type=Path, help="Write raw cProfile stats to this file.")
+    profile.add_argument("--tracemalloc", action="store_true", help="Include tracemalloc allocation sites.")
+    profile.add_argument("--top", type=int, default=20, help="Entries in the cProfile/tracemalloc listings.")
+    profile.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    profile.add_argument("-o", "--output", type=Path, help="Also write the JSON report to this file.")
+    profile.set_defaults(handler=profile_command)
+
+    batch = commands.add_parser("batch", help="Map passport JSON/JSONL files to one or more schemas.")
+    batch.add_argument("inputs", nargs="+", metavar="INPUT",
+                       help="Input directories (searched recursively), files or glob patterns.")
+    batch.add_argument("-s", "--schema", action="append", required=True,
+                       help="Target schema name or alias; repeat or comma-separate for several.")
+    batch.add_argument("-o", "--output-dir", type=Path, required=True,
+                       help="Output directory (one subdirectory per schema).")
+    batch.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                       help="Worker processes (default: %(default)s).")
+    batch.add_argument("--config-dir", type=Path, help="Directory with <schema>_mapping.yml configs.")
+    batch.add_argument("--report", type=Path, help="Write the JSON summary to this file.")
+    batch.add_argument("--max-failures", type=int, default=20, help="Failures listed in the summary.")
+    batch.add_argument("-q", "--quiet", action="store_true", help="No per-file progress output.")
+    batch.set_defaults(handler=batch_command)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        interactive()
+        return 0
+    if getattr(args, "iterations", 1) < 1:
+        print("Error: --iterations must be at least 1", file=sys.stderr)
+        return 2
+    if getattr(args, "workers", 1) < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        return 2
+    return args.handler(args)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,515 @@
+"""
+diff.py
+
+Structural diff and patch for DigitalProductPassport.
+
+diff_passports() compares two passports layer by layer and returns a
+compact, JSON-serializable patch; apply_patch() applies it to a passport
+(or to its utils.to_dict() form). Sending patches instead of whole
+documents keeps replication traffic proportional to what changed:
+
+    patch = diff_passports(last_sent, dpp)
+    ...                                        # ship json.dumps(patch)
+    replica = apply_patch(replica, patch)
+
+A patch is a list of JSON Patch-like operations (RFC 6902 op names and
+JSON Pointer paths), with one difference: parts are addressed by part_id
+instead of list position, so inserting or removing a part does not shift
+the paths of all the others:
+
+    {"op": "replace", "path": "/sustainability/mass", "value": 12.5}
+    {"op": "add", "path": "/lifecycle/events/-", "value": {...}}
+    {"op": "remove", "path": "/identity/ownership/operator"}
+    {"op": "add", "path": "/structure/parts/P-7", "value": {...}}
+    {"op": "replace", "path": "/structure/parts/P-2/properties/rpm", "value": 900}
+    {"op": "reorder", "path": "/structure/parts", "value": ["P-7", "P-1", ...]}
+
+New parts are appended; a "reorder" op (the full list of part ids)
+follows the part operations only when the resulting order would differ
+from the new passport's.
+
+Layers and parts that are the same object are skipped; everything else
+is compared by content. With trust_versions=True, layers and parts that
+carry the same versioning.Versioned signature (e.g. a copy.deepcopy()
+snapshot that has not been modified since) are skipped as well, so
+diffing a passport against an earlier snapshot of itself costs time
+proportional to the change. That is only safe if every in-place edit of
+nested values is signalled with touch(), as for SchemaMapper.remap(); an
+unsignalled edit would be left out of the patch.
+
+JSON Pointer tokens are strings, so dicts with non-string keys are
+replaced as a whole rather than diffed key by key.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .model import (
+    DigitalProductPassport,
+    IdentityLayer,
+    LifecycleLayer,
+    ProvenanceLayer,
+    RiskLayer,
+    StructureLayer,
+    SustainabilityLayer,
+)
+from .part_class import PartClass
+from .utils import part_from_dict, to_dict
+
+Patch = List[Dict[str, Any]]
+
+#: Layer name -> layer class, in passport field order
+LAYER_TYPES = {
+    "identity": IdentityLayer,
+    "structure": StructureLayer,
+    "lifecycle": LifecycleLayer,
+    "risk": RiskLayer,
+    "sustainability": SustainabilityLayer,
+    "provenance": ProvenanceLayer,
+}
+
+PARTS_PATH = "/structure/parts"
+
+
+class PatchError(ValueError):
+    """Raised when a patch operation is malformed or does not fit its target."""
+
+
+# ---------------------------------------------------------------------------
+# JSON Pointer helpers
+# ---------------------------------------------------------------------------
+
+def escape_token(token: Any) -> str:
+    """Escape one JSON Pointer reference token (RFC 6901)."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def split_path(path: str) -> List[str]:
+    """
+    Split a JSON Pointer into unescaped reference tokens.
+
+    Raises:
+        PatchError: If the path is not a non-empty pointer ("/...").
+    """
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise PatchError(f"Invalid patch path {path!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+
+
+# ---------------------------------------------------------------------------
+# Diff
+# ---------------------------------------------------------------------------
+
+_FIELD_ORDER: Dict[type, Tuple[str, ...]] = {}
+
+
+def _field_order(cls: type) -> Tuple[str, ...]:
+    names = _FIELD_ORDER.get(cls)
+    if names is None:
+        names = _FIELD_ORDER[cls] = tuple(f.name for f in fields(cls))
+    return names
+
+
+def _unchanged(old: Any, new: Any, trust_versions: bool) -> bool:
+    if old is new:
+        return True
+    return trust_versions and type(old) is type(new) and old.signature() == new.signature()
+
+
+def diff_passports(
+    old: DigitalProductPassport,
+    new: DigitalProductPassport,
+    trust_versions: bool = False,
+) -> Patch:
+    """
+    Compute the patch that turns `old` into `new`.
+
+    Args:
+        old:
+            Passport the receiver already has (e.g. the last replicated state).
+        new:
+            Updated passport.
+        trust_versions:
+            Also skip layers and parts whose Versioned signature is
+            unchanged, without comparing their content (see module
+            docstring). Only for callers that touch() after every in-place
+            edit: an unsignalled edit is otherwise missing from the patch.
+
+    Returns:
+        Patch: List of operations; empty if the passports are equal.
+        Values are plain JSON data that do not share state with `new`.
+
+    Raises:
+        PatchError: If parts have to be matched by part_id (parts were
+                    added, removed or moved) but their ids are not unique.
+    """
+    patch: Patch = []
+    for name in LAYER_TYPES:
+        old_layer, new_layer = getattr(old, name), getattr(new, name)
+        if old_layer is new_layer:
+            continue
+        if name == "structure" and old_layer.parts is not new_layer.parts:
+            # Part edits do not change the layer's version; parts are
+            # skipped one by one on their own signatures instead
+            _diff_parts(old_layer.parts, new_layer.parts, patch, trust_versions)
+        if _unchanged(old_layer, new_layer, trust_versions):
+            continue
+        prefix = "/" + name + "/"
+        for field_name in _field_order(type(new_layer)):
+            if name != "structure" or field_name != "parts":
+                diff_values(getattr(old_layer, field_name), getattr(new_layer, field_name), prefix + field_name, patch)
+    return patch
+
+
+def diff_values(old: Any, new: Any, path: str = "", patch: Optional[Patch] = None) -> Patch:
+    """
+    Append the operations turning plain JSON-like value `old` into `new`.
+
+    Dicts with string keys are compared key by key; a list that only grew
+    at the end yields one "add" per appended item ("<path>/-"); any other
+    difference (including in a dict with non-string keys, which a JSON
+    Pointer cannot address) replaces the value at `path`.
+
+    Args:
+        old / new: Values to compare (dicts, lists, scalars, dataclasses).
+        path: JSON Pointer of the values.
+        patch: List to append to (a new one by default).
+
+    Returns:
+        Patch: `patch` with the operations appended.
+    """
+    if patch is None:
+        patch = []
+    if old is new or old == new:
+        return patch
+    if isinstance(old, dict) and isinstance(new, dict) and _str_keys(old) and _str_keys(new):
+        for key, value in old.items():
+            key_path = path + "/" + escape_token(key)
+            if key not in new:
+                patch.append({"op": "remove", "path": key_path})
+            else:
+                diff_values(value, new[key], key_path, patch)
+        for key, value in new.items():
+            if key not in old:
+                patch.append({"op": "add", "path": path + "/" + escape_token(key), "value": to_dict(value)})
+    elif isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[:len(old)] == old:
+        for item in new[len(old):]:
+            patch.append({"op": "add", "path": path + "/-", "value": to_dict(item)})
+    else:
+        patch.append({"op": "replace", "path": path, "value": to_dict(new)})
+    return patch
+
+
+def _str_keys(value: Dict[Any, Any]) -> bool:
+    return all(key.__class__ is str for key in value)
+
+
+def _index_parts(parts: Sequence[PartClass]) -> Dict[str, PartClass]:
+    by_id = {part.part_id: part for part in parts}
+    if len(by_id) != len(parts):
+        raise PatchError("Part ids are not unique; parts cannot be matched by part_id")
+    return by_id
+
+
+def _diff_parts(
+    old_parts: Sequence[PartClass],
+    new_parts: Sequence[PartClass],
+    patch: Patch,
+    trust_versions: bool,
+) -> None:
+    # With trust_versions, an equal Versioned signature means one part is an
+    # unmodified copy of the other (so also the part_id is the same).
+    if len(old_parts) == len(new_parts):
+        # Common case: no parts added, removed or moved. Walk both lists in
+        # step and only build id indexes if the ids stop lining up.
+        changed = []
+        for previous, part in zip(old_parts, new_parts):
+            if _unchanged(previous, part, trust_versions):
+                continue
+            if previous.part_id != part.part_id:
+                break
+            changed.append((previous, part))
+        else:
+            for previous, part in changed:
+                _diff_part(previous, part, patch)
+            return
+
+    old_by_id = _index_parts(old_parts)
+    new_by_id = _index_parts(new_parts)
+
+    for part_id in old_by_id:
+        if part_id not in new_by_id:
+            patch.append({"op": "remove", "path": PARTS_PATH + "/" + escape_token(part_id)})
+
+    added = []
+    for part in new_parts:
+        previous = old_by_id.get(part.part_id)
+        if previous is None:
+            patch.append({"op": "add", "path": PARTS_PATH + "/" + escape_token(part.part_id), "value": to_dict(part)})
+            added.append(part.part_id)
+        elif not _unchanged(previous, part, trust_versions):
+            _diff_part(previous, part, patch)
+
+    expected = [part_id for part_id in old_by_id if part_id in new_by_id] + added
+    order = list(new_by_id)
+    if order != expected:
+        patch.append({"op": "reorder", "path": PARTS_PATH, "value": order})
+
+
+def _diff_part(previous: PartClass, part: PartClass, patch: Patch) -> None:
+    if previous == part:  # dataclass equality, False for different part types
+        return
+    path = PARTS_PATH + "/" + escape_token(part.part_id)
+    if type(previous) is not type(part):
+        patch.append({"op": "replace", "path": path, "value": to_dict(part)})
+        return
+    for field_name in _field_order(type(part)):
+        diff_values(getattr(previous, field_name), getattr(part, field_name), path + "/" + field_name, patch)
+
+
+# ---------------------------------------------------------------------------
+# Patch
+# ---------------------------------------------------------------------------
+
+def apply_patch(
+    target: Union[DigitalProductPassport, Mapping],
+    patch: Sequence[Mapping[str, Any]],
+) -> Union[DigitalProductPassport, Dict[str, Any]]:
+    """
+    Apply a patch from diff_passports() and return the patched copy.
+
+    Works on DigitalProductPassport objects and on their to_dict() form.
+    The target is not modified: only the layers, parts and nested values
+    on the patched paths are copied, everything else is shared with it.
+    Patched layers and parts are new objects (with new versions), so
+    SchemaMapper.remap() re-maps exactly what the patch touched.
+
+    Args:
+        target: Passport, or passport dict (e.g. loaded JSON).
+        patch: Operations to apply, in order.
+
+    Returns:
+        The patched passport, of the same kind as `target`.
+
+    Raises:
+        PatchError: If an operation is malformed or its path does not exist.
+        TypeError: If target is neither a passport nor a mapping.
+    """
+    if isinstance(target, DigitalProductPassport):
+        patcher = _Patcher(copy.copy(target), objects=True)
+    elif isinstance(target, Mapping):
+        patcher = _Patcher(dict(target), objects=False)
+    else:
+        raise TypeError(f"Cannot apply a patch to {type(target).__name__}")
+
+    for operation in patch:
+        try:
+            op, path = operation["op"], operation["path"]
+        except (KeyError, TypeError):
+            raise PatchError(f"Malformed patch operation {operation!r}") from None
+        if op not in ("add", "remove", "replace", "reorder"):
+            raise PatchError(f"Unknown patch op {op!r} at {path}")
+        if op != "remove" and "value" not in operation:
+            raise PatchError(f"Patch op {op!r} at {path} has no value")
+        patcher.apply(op, split_path(path), operation.get("value"), path)
+    return patcher.root
+
+
+class _Patcher:
+    """Copy-on-write application of patch operations to one passport."""
+
+    def __init__(self, root: Any, objects: bool) -> None:
+        self.root = root
+        self.objects = objects
+        self._layers: Dict[str, Any] = {}  # layers already copied by this patch
+        self._parts: Optional[List[Any]] = None
+        self._positions: Optional[Dict[str, int]] = None
+
+    # -- access that works for dataclasses and dicts alike ------------------
+
+    def _get(self, container: Any, key: str, path: str) -> Any:
+        try:
+            return getattr(container, key) if self.objects else container[key]
+        except (AttributeError, KeyError, TypeError):
+            raise PatchError(f"Patch path {path} does not exist") from None
+
+    def _set(self, container: Any, key: str, value: Any) -> None:
+        if self.objects:
+            setattr(container, key, value)
+        else:
+            container[key] = value
+
+    def _layer(self, name: str, path: str) -> Any:
+        layer = self._layers.get(name)
+        if layer is None:
+            if name not in LAYER_TYPES:
+                raise PatchError(f"Patch path {path} does not name a passport layer")
+            layer = copy.copy(self._get(self.root, name, path))
+            self._set(self.root, name, layer)
+            self._layers[name] = layer
+        return layer
+
+    def _part_list(self, path: str) -> List[Any]:
+        if self._parts is None:
+            layer = self._layer("structure", path)
+            self._parts = list(self._get(layer, "parts", path))
+            self._set(layer, "parts", self._parts)
+        return self._parts
+
+    def _id_of(self, part: Any) -> Any:
+        return part.part_id if self.objects else part.get("part_id")
+
+    def _index(self, path: str) -> Dict[str, int]:
+        """part_id -> position in the (writable) parts list."""
+        if self._positions is None:
+            parts = self._part_list(path)
+            self._positions = {self._id_of(part): index for index, part in enumerate(parts)}
+        return self._positions
+
+    def _part_position(self, part_id: str, path: str) -> int:
+        try:
+            return self._index(path)[part_id]
+        except KeyError:
+            raise PatchError(f"Patch path {path} names an unknown part") from None
+
+    # -- operations ----------------------------------------------------------
+
+    def apply(self, op: str, tokens: List[str], value: Any, path: str) -> None:
+        if op == "reorder":
+            if tokens != ["structure", "parts"]:
+                raise PatchError(f"'reorder' only applies to {PARTS_PATH}, not {path}")
+            self._reorder(value, path)
+        elif len(tokens) == 1:
+            if op != "replace":
+                raise PatchError(f"Passport layers can only be replaced ({op!r} at {path})")
+            self._replace_layer(tokens[0], value, path)
+        elif tokens[:2] == ["structure", "parts"]:
+            if len(tokens) == 2:
+                raise PatchError(f"Parts are patched by part_id, not as a whole ({path})")
+            self._patch_part(op, tokens[2], tokens[3:], value, path)
+        else:
+            layer = self._layer(tokens[0], path)
+            field_name = tokens[1]
+            if len(tokens) == 2:
+                if op == "remove" or (self.objects and not hasattr(layer, field_name)):
+                    raise PatchError(f"Cannot {op} layer field at {path}")
+                self._set(layer, field_name, copy.deepcopy(value))
+            else:
+                current = self._get(layer, field_name, path)
+                self._set(layer, field_name, _patched(current, tokens[2:], op, value, path))
+
+    def _replace_layer(self, name: str, value: Any, path: str) -> None:
+        if name not in LAYER_TYPES:
+            raise PatchError(f"Patch path {path} does not name a passport layer")
+        if not isinstance(value, Mapping):
+            raise PatchError(f"Layer at {path} must be a dict")
+        value = copy.deepcopy(dict(value))
+        if self.objects:
+            if name == "structure":
+                value["parts"] = [part_from_dict(part) for part in value.get("parts", [])]
+            try:
+                value = LAYER_TYPES[name](**value)
+            except TypeError as exc:
+                raise PatchError(f"Invalid layer at {path}: {exc}") from None
+        self._set(self.root, name, value)
+        self._layers[name] = value
+        if name == "structure":
+            self._parts = self._positions = None
+
+    def _patch_part(self, op: str, part_id: str, tokens: List[str], value: Any, path: str) -> None:
+        parts = self._part_list(path)
+        if not tokens and op == "add":
+            positions = self._index(path)
+            if part_id in positions:
+                raise PatchError(f"Part {part_id!r} already exists ({path})")
+            positions[part_id] = len(parts)
+            parts.append(self._new_part(value, part_id, path))
+            return
+
+        index = self._part_position(part_id, path)
+        if not tokens:
+            if op == "remove":
+                del parts[index]
+                self._positions = None
+            else:
+                parts[index] = self._new_part(value, part_id, path)
+            return
+
+        part = parts[index]
+        data = to_dict(part) if self.objects else part
+        data = _patched(data, tokens, op, value, path)
+        parts[index] = self._new_part(data, part_id, path, copied=True) if self.objects else data
+
+    def _new_part(self, value: Any, part_id: str, path: str, copied: bool = False) -> Any:
+        if not isinstance(value, Mapping) or value.get("part_id") != part_id:
+            raise PatchError(f"Part at {path} must be a dict with part_id {part_id!r}")
+        if not copied:
+            value = copy.deepcopy(value)
+        if not self.objects:
+            return value
+        try:
+            return part_from_dict(value)
+        except TypeError as exc:
+            raise PatchError(f"Invalid part at {path}: {exc}") from None
+
+    def _reorder(self, order: Any, path: str) -> None:
+        parts = self._part_list(path)
+        by_id = {self._id_of(part): part for part in parts}
+        if not isinstance(order, list) or len(order) != len(parts) or set(order) != set(by_id):
+            raise PatchError(f"'reorder' at {path} must list every part id exactly once")
+        parts[:] = [by_id[part_id] for part_id in order]
+        self._positions = {part_id: index for index, part_id in enumerate(order)}
+
+
+def _patched(target: Any, tokens: List[str], op: str, value: Any, path: str) -> Any:
+    """Return a copy of plain JSON-like `target` with one operation applied at `tokens`.
+
+    Only the containers along the path are copied.
+    """
+    key = tokens[0]
+    if is_dataclass(target) and not isinstance(target, type):
+        target = to_dict(target)
+    if isinstance(target, dict):
+        target = dict(target)
+        if len(tokens) > 1:
+            if key not in target:
+                raise PatchError(f"Patch path {path} does not exist")
+            target[key] = _patched(target[key], tokens[1:], op, value, path)
+        elif op == "remove":
+            if target.pop(key, _MISSING) is _MISSING:
+                raise PatchError(f"Patch path {path} does not exist")
+        elif op == "replace" and key not in target:
+            raise PatchError(f"Patch path {path} does not exist")
+        else:
+            target[key] = copy.deepcopy(value)
+        return target
+
+    if isinstance(target, list):
+        target = list(target)
+        if key == "-" and len(tokens) == 1 and op == "add":
+            target.append(copy.deepcopy(value))
+            return target
+        try:
+            index = int(key)
+        except ValueError:
+            raise PatchError(f"Patch path {path} does not exist") from None
+        if not 0 <= index < len(target) + (op == "add" and len(tokens) == 1):
+            raise PatchError(f"Patch path {path} does not exist")
+        if len(tokens) > 1:
+            target[index] = _patched(target[index], tokens[1:], op, value, path)
+        elif op == "add":
+            target.insert(index, copy.deepcopy(value))
+        elif op == "remove":
+            del target[index]
+        else:
+            target[index] = copy.deepcopy(value)
+        return target
+
+    raise PatchError(f"Patch path {path} does not exist")
+
+
+_MISSING = object()
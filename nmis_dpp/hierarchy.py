@@ -0,0 +1,282 @@
+"""
+hierarchy.py
+
+Compiled product hierarchy of a StructureLayer.
+
+StructureLayer.hierarchy is a free-form dict. HierarchyIndex reads the
+product tree from it in either (or both) of two forms:
+
+    {"product": "UnitX",
+     "components": ["A001",                              # top-level part
+                    {"id": "ASM-1", "components": [      # nested assembly
+                        "S003", {"id": "P001", "components": [...]}]}]}
+
+    {"product": "UnitX",
+     "children": {"ASM-1": ["S003", "P001"], "P001": [...]}}   # flat edge map
+
+Nodes are part ids; a node does not need a matching part (e.g. a pure
+grouping assembly). Nodes without a parent, and parts the hierarchy does not
+mention, are children of the product (the implicit root): first the nested
+"components", then parentless "children" keys, then unmentioned parts in
+StructureLayer.parts order.
+
+The index is compiled once into flat arrays over the preorder (depth-first)
+numbering of the nodes: parent, depth and subtree end per node, plus child
+offsets (CSR). A subtree is then a contiguous index range, path-to-root
+follows parent pointers, and depth-limited walks skip whole subtrees, so
+queries stay fast on 100k-node trees and building never recurses:
+
+    index = layer.hierarchy_index()          # cached until the layer changes
+    index.parent("S003")                     # "ASM-1"
+    index.path_to_root("S003")               # ["S003", "ASM-1"]
+    list(index.subtree("ASM-1", max_depth=1))
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import accumulate
+from operator import add
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .part_class import PartClass
+from .part_index import PartIndex
+
+#: Index of the product (implicit root) node
+ROOT = 0
+
+
+class HierarchyIndex:
+    """
+    Immutable, compiled hierarchy of one StructureLayer (see module docstring).
+
+    Args:
+        hierarchy: StructureLayer.hierarchy.
+        parts: StructureLayer.parts, or a PartIndex over them.
+
+    Raises:
+        ValueError: If a node has two parents, a node is its own ancestor,
+                    or part ids are not unique.
+    """
+
+    def __init__(self, hierarchy: Mapping[str, Any], parts: Union[Sequence[PartClass], PartIndex]) -> None:
+        self.product = hierarchy.get("product")
+        if not isinstance(parts, PartIndex):
+            parts = PartIndex(parts)
+        self.parts: Dict[str, PartClass] = parts.by_id
+
+        children, count = _edges(hierarchy, self.parts.values())
+
+        # Preorder numbering with an explicit stack (trees may be very deep)
+        ids: List[Optional[str]] = []
+        parents: List[int] = []
+        depths: List[int] = []
+        stack: List[Any] = [(None, -1, 0)]
+        pop, push, get = stack.pop, stack.extend, children.get
+        while stack:
+            node, parent_index, node_depth = pop()
+            index = len(ids)
+            ids.append(node)
+            parents.append(parent_index)
+            depths.append(node_depth)
+            kids = get(node)
+            if kids:
+                node_depth += 1
+                push([(kid, index, node_depth) for kid in reversed(kids)])
+        if len(ids) != count:
+            raise ValueError("Hierarchy contains a cycle")
+
+        sizes = [1] * count
+        for index in range(count - 1, 0, -1):
+            sizes[parents[index]] += sizes[index]
+        # Child offsets (CSR): children of node i are children[offsets[i]:offsets[i + 1]].
+        # A stable sort by parent keeps each node's children in preorder.
+        counts = [0] * (count + 1)
+        for parent_index in parents[1:]:
+            counts[parent_index + 1] += 1
+
+        self._ids = ids
+        self._position: Dict[str, int] = {node: index for index, node in enumerate(ids) if index}
+        self._parent = array("l", parents)
+        self._depth = array("l", depths)
+        self._end = array("l", map(add, range(count), sizes))
+        self._offsets = array("l", accumulate(counts))
+        self._children = array("l", sorted(range(1, count), key=parents.__getitem__))
+
+    def __len__(self) -> int:
+        """Number of nodes, excluding the product."""
+        return len(self._ids) - 1
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._position
+
+    def __repr__(self) -> str:
+        return f"HierarchyIndex(product={self.product!r}, nodes={len(self)})"
+
+    def _index(self, node: Optional[str]) -> int:
+        if node is None:
+            return ROOT
+        try:
+            return self._position[node]
+        except KeyError:
+            raise KeyError(f"Unknown hierarchy node {node!r}") from None
+
+    # -------------------------------------------------------------------------
+    # Node queries
+    # -------------------------------------------------------------------------
+
+    def part(self, node: str) -> Optional[PartClass]:
+        """The part with this id (None for nodes without a part)."""
+        self._index(node)
+        return self.parts.get(node)
+
+    def parent(self, node: str) -> Optional[str]:
+        """Parent node id; None for children of the product."""
+        return self._ids[self._parent[self._index(node)]]
+
+    def depth(self, node: str) -> int:
+        """Depth below the product (top-level nodes have depth 1)."""
+        return self._depth[self._index(node)]
+
+    def children(self, node: Optional[str] = None) -> List[str]:
+        """Direct children, in hierarchy order (None: top-level nodes)."""
+        index = self._index(node)
+        ids = self._ids
+        return [ids[child] for child in self._children[self._offsets[index]:self._offsets[index + 1]]]
+
+    def path_to_root(self, node: str) -> List[str]:
+        """The node, its parent, ... up to its top-level ancestor."""
+        ids, parent = self._ids, self._parent
+        index = self._index(node)
+        path = []
+        while index != ROOT:
+            path.append(ids[index])
+            index = parent[index]
+        return path
+
+    def is_ancestor(self, ancestor: Optional[str], node: str) -> bool:
+        """True if `node` lies in the subtree of `ancestor` (or is it)."""
+        start, index = self._index(ancestor), self._index(node)
+        return start <= index < self._end[start]
+
+    def subtree_size(self, node: Optional[str] = None) -> int:
+        """Number of nodes in the subtree, including the node itself."""
+        index = self._index(node)
+        return self._end[index] - index
+
+    # -------------------------------------------------------------------------
+    # Traversal
+    # -------------------------------------------------------------------------
+
+    def subtree(
+        self,
+        node: Optional[str] = None,
+        max_depth: Optional[int] = None,
+        include_self: bool = True,
+    ) -> Iterator[str]:
+        """
+        Iterate a subtree in preorder (depth first, hierarchy order).
+
+        Args:
+            node: Subtree root; None walks the whole product.
+            max_depth: Only nodes at most this many levels below `node`.
+            include_self: Yield `node` itself first (never the product).
+        """
+        start = self._index(node)
+        stop = self._end[start]
+        ids = self._ids
+        first = start if include_self and start != ROOT else start + 1
+        if max_depth is None:
+            return iter(ids[first:stop])
+        return self._limited(first, stop, self._depth[start] + max_depth)
+
+    def _limited(self, index: int, stop: int, limit: int) -> Iterator[str]:
+        ids, depth, end = self._ids, self._depth, self._end
+        while index < stop:
+            if depth[index] > limit:
+                index = end[index]  # skip the whole too-deep subtree
+                continue
+            yield ids[index]
+            index += 1
+
+    def subtree_parts(self, node: Optional[str] = None, max_depth: Optional[int] = None) -> Iterator[PartClass]:
+        """Parts in a subtree (preorder), skipping nodes without a part."""
+        parts = self.parts
+        for node_id in self.subtree(node, max_depth):
+            part = parts.get(node_id)
+            if part is not None:
+                yield part
+
+    def level(self, depth: int) -> List[str]:
+        """All nodes at one depth below the product, in preorder."""
+        return list(self._limited_level(depth))
+
+    def _limited_level(self, target: int) -> Iterator[str]:
+        ids, depth, end = self._ids, self._depth, self._end
+        index, stop = 1, len(ids)
+        while index < stop:
+            node_depth = depth[index]
+            if node_depth == target:
+                yield ids[index]
+                index = end[index]
+            elif node_depth > target:
+                index = end[index]
+            else:
+                index += 1
+
+
+def _entry_id(entry: Any) -> Any:
+    if isinstance(entry, Mapping):
+        return entry.get("id", entry.get("part_id"))
+    return entry
+
+
+def _edges(hierarchy: Mapping[str, Any], parts: Iterable[PartClass]) -> Tuple[Dict[Optional[str], List[str]], int]:
+    """Children lists keyed by node id (None: the product), and the node count (with the product)."""
+    children: Dict[Optional[str], List[str]] = {None: []}
+    parent_of: Dict[str, Optional[str]] = {}
+
+    def link(parent: Optional[str], node: Any) -> None:
+        if node is None or node == "":
+            raise ValueError(f"Hierarchy entry under {parent!r} has no id")
+        node = str(node)
+        if node in parent_of:
+            if parent_of[node] == parent:
+                return  # listed in both forms
+            raise ValueError(f"Hierarchy node {node!r} has two parents ({parent_of[node]!r}, {parent!r})")
+        parent_of[node] = parent
+        children.setdefault(parent, []).append(node)
+
+    # Nested form (iteratively: entries may nest deeply)
+    pending = [(None, hierarchy.get("components") or [])]
+    while pending:
+        parent, entries = pending.pop()
+        for entry in entries:
+            node = _entry_id(entry)
+            link(parent, node)
+            if isinstance(entry, Mapping):
+                nested = entry.get("components") or entry.get("children")
+                if nested:
+                    pending.append((str(node), nested))
+
+    # Flat edge map; the common case (string ids, each listed once) is
+    # handled in bulk, anything else through link()
+    flat = hierarchy.get("children") or {}
+    for parent, kids in flat.items():
+        parent = str(parent)
+        if parent not in children and kids and all(kid.__class__ is str and kid for kid in kids):
+            linked = dict.fromkeys(kids, parent)
+            if len(linked) == len(kids) and parent_of.keys().isdisjoint(linked):
+                parent_of.update(linked)
+                children[parent] = list(kids)
+                continue
+        for kid in kids:
+            link(parent, kid)
+    for parent in flat:
+        if str(parent) not in parent_of:
+            link(None, parent)
+
+    for part in parts:
+        if part.part_id not in parent_of:
+            link(None, part.part_id)
+    return children, len(parent_of) + 1
@@ -0,0 +1,248 @@
+"""
+instrumentation.py
+
+Pluggable timing and counter hooks for SchemaMapper.
+
+A mapper calls its `instrumentation` object (None by default, which costs a
+single attribute check per call) at these points:
+
+    layer_mapped(schema, layer, seconds)   after each layer mapping method
+    parts_mapped(schema, count)            parts mapped for a structure layer
+    part_cache_lookup(schema, hit)         per map_part_class() with a part cache
+    validated(schema, seconds, valid)      after validate_mapping()
+    dpp_mapped(schema, seconds, error)     after map_dpp()/remap()
+
+Instrumentation is a no-op base class to subclass; MetricsRecorder
+aggregates the events in memory and exports them as JSON or in the
+Prometheus text exposition format (e.g. for the node_exporter textfile
+collector):
+
+    recorder = MetricsRecorder()
+    registry = SchemaRegistry(instrumentation=recorder)
+    ...
+    print(recorder.summary())
+    recorder.write_prometheus("/var/lib/node_exporter/nmis_dpp.prom")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+class Instrumentation:
+    """
+    No-op instrumentation hooks; override the ones you need.
+
+    Hooks may be called concurrently from several threads and should be
+    cheap, as they run inside the mapping hot path.
+    """
+
+    def layer_mapped(self, schema: str, layer: str, seconds: float) -> None:
+        """A layer mapping method (e.g. map_structure_layer) returned."""
+
+    def parts_mapped(self, schema: str, count: int) -> None:
+        """`count` parts were mapped with map_part_class() for a structure layer."""
+
+    def part_cache_lookup(self, schema: str, hit: bool) -> None:
+        """map_part_class() consulted the part cache."""
+
+    def validated(self, schema: str, seconds: float, valid: bool) -> None:
+        """validate_mapping() ran on a mapped document."""
+
+    def dpp_mapped(self, schema: str, seconds: float, error: Optional[BaseException]) -> None:
+        """map_dpp() or remap() finished (error is the exception raised, if any)."""
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+#: Metric name -> (Prometheus type, help text)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "layer_seconds": ("summary", "Wall time spent mapping a DPP layer."),
+    "parts_mapped_total": ("counter", "Parts mapped with map_part_class()."),
+    "part_cache_lookups_total": ("counter", "Part cache lookups by result."),
+    "validation_seconds": ("summary", "Wall time spent validating mapped documents."),
+    "validation_failures_total": ("counter", "Mapped documents that failed validation."),
+    "map_dpp_seconds": ("summary", "Wall time of map_dpp()/remap() calls."),
+    "map_dpp_errors_total": ("counter", "map_dpp()/remap() calls that raised."),
+}
+
+
+class MetricsRecorder(Instrumentation):
+    """
+    Thread-safe in-memory aggregation of instrumentation events.
+
+    Timings are kept as summaries (count, sum, max); counters as totals.
+    Every metric is labelled with the schema name (and layer or cache
+    result where applicable).
+
+    Args:
+        namespace: Prefix of exported metric names.
+    """
+
+    def __init__(self, namespace: str = "nmis_dpp") -> None:
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        # (metric, labels) -> total, or [count, sum, max] for summaries
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._timings: Dict[Tuple[str, Labels], List[float]] = {}
+
+    # -------------------------------------------------------------------------
+    # Hooks
+    # -------------------------------------------------------------------------
+
+    def _count(self, metric: str, labels: Labels, amount: float = 1) -> None:
+        key = (metric, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _time(self, metric: str, labels: Labels, seconds: float) -> None:
+        key = (metric, labels)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                self._timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+
+    def layer_mapped(self, schema: str, layer: str, seconds: float) -> None:
+        self._time("layer_seconds", (("schema", schema), ("layer", layer)), seconds)
+
+    def parts_mapped(self, schema: str, count: int) -> None:
+        self._count("parts_mapped_total", (("schema", schema),), count)
+
+    def part_cache_lookup(self, schema: str, hit: bool) -> None:
+        self._count("part_cache_lookups_total", (("schema", schema), ("result", "hit" if hit else "miss")))
+
+    def validated(self, schema: str, seconds: float, valid: bool) -> None:
+        self._time("validation_seconds", (("schema", schema),), seconds)
+        if not valid:
+            self._count("validation_failures_total", (("schema", schema),))
+
+    def dpp_mapped(self, schema: str, seconds: float, error: Optional[BaseException]) -> None:
+        self._time("map_dpp_seconds", (("schema", schema),), seconds)
+        if error is not None:
+            self._count("map_dpp_errors_total", (("schema", schema),))
+
+    # -------------------------------------------------------------------------
+    # Inspection and export
+    # -------------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Return the recorded values as plain data.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Metric name -> samples, each with
+            "labels" and either "value" (counters) or "count", "sum" and
+            "max" (timings, in seconds).
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {key: list(values) for key, values in self._timings.items()}
+
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        for (metric, labels), value in sorted(counters.items()):
+            result.setdefault(metric, []).append({"labels": dict(labels), "value": value})
+        for (metric, labels), (count, total, peak) in sorted(timings.items()):
+            result.setdefault(metric, []).append(
+                {"labels": dict(labels), "count": int(count), "sum": total, "max": peak}
+            )
+        return result
+
+    def summary(self) -> str:
+        """Human-readable table of timings, slowest total first."""
+        with self._lock:
+            timings = sorted(
+                ((key, list(values)) for key, values in self._timings.items()),
+                key=lambda item: -item[1][1],
+            )
+        lines = [f"{'metric':<20} {'labels':<32} {'count':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}"]
+        for (metric, labels), (count, total, peak) in timings:
+            label_text = ",".join(value for _, value in labels)
+            lines.append(
+                f"{metric:<20} {label_text:<32} {int(count):>8} {total * 1e3:>10.2f} "
+                f"{total / count * 1e3:>9.3f} {peak * 1e3:>9.3f}"
+            )
+        return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for metric, (kind, help_text) in METRICS.items():
+            samples = snapshot.get(metric)
+            if not samples:
+                continue
+            name = f"{self.namespace}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels = _format_labels(sample["labels"])
+                if kind == "summary":
+                    lines.append(f"{name}_count{labels} {sample['count']}")
+                    lines.append(f"{name}_sum{labels} {sample['sum']!r}")
+                else:
+                    lines.append(f"{name}{labels} {_format_value(sample['value'])}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: Union[str, Path]) -> Path:
+        """
+        Atomically write to_prometheus() output to a file.
+
+        Returns:
+            Path: The written file.
+        """
+        return _write_atomic(Path(path), self.to_prometheus())
+
+    def write_json(self, path: Union[str, Path]) -> Path:
+        """
+        Atomically write snapshot() as JSON to a file.
+
+        Returns:
+            Path: The written file.
+        """
+        return _write_atomic(Path(path), json.dumps(self.snapshot(), indent=2))
+
+    def __repr__(self) -> str:
+        return f"MetricsRecorder(series={len(self._counters) + len(self._timings)})"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _write_atomic(path: Path, text: str) -> Path:
+    # Readers (e.g. a metrics scraper) never see a partially written file.
+    # The temporary name is per thread, so concurrent exports do not share it.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
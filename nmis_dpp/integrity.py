@@ -0,0 +1,423 @@
+"""
+integrity.py
+
+Merkle-tree integrity digests for DigitalProductPassport.
+
+Every passport layer and every part is serialized canonically
+(utils.canonical_json) and hashed into a leaf; the part leaves form a
+subtree, and the layer leaves plus the parts subtree root are combined
+into one root digest per passport:
+
+                              root
+                 /                          \\
+            ...                                ...
+      identity  structure  parts-root  lifecycle  risk  sustainability  provenance
+                           /        \\
+                        ...          ...
+                      part 0 ... part n-1
+
+The root ("sha256:<hex>") is what a signature in ProvenanceLayer.signatures
+covers; record it under the entry's "digest" key and verify_passport()
+checks it. The signatures themselves are excluded from the provenance leaf
+(they sign the root), as are the parts from the structure leaf (they have
+their own subtree).
+
+Leaves and inner nodes are hashed with distinct prefixes (0x00 / 0x01, as
+in RFC 6962) so a leaf can never be passed off as an inner node; a node
+without a sibling is promoted to the next level unchanged.
+
+Recomputing after an update only rehashes what changed: pass the previous
+MerkleTree and layers/parts whose versioning.Versioned signature (and, for
+parts, part_id) is unchanged reuse their leaves, so editing one part of a 100k-part passport
+rehashes one leaf and the ~17 nodes above it:
+
+    tree = passport_tree(dpp)
+    dpp.structure.parts[7].name = "Pump"
+    tree = passport_tree(dpp, previous=tree)
+
+Bulk verification of a PassportStore (verify_store()) can spread id ranges
+over worker processes, each reading the database through its own
+connection.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .model import DigitalProductPassport
+from .utils import canonical_json
+
+HASH_ALGORITHM = "sha256"
+
+#: Key of a ProvenanceLayer.signatures entry holding the signed root digest
+DIGEST_KEY = "digest"
+
+#: Leaves of the top-level tree, in order ("parts" is the parts subtree root)
+LEAVES = ("identity", "structure", "parts", "lifecycle", "risk", "sustainability", "provenance")
+
+#: Layer fields left out of the layer leaves
+EXCLUDED_FIELDS = {"structure": ("parts",), "provenance": ("signatures",)}
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+Passport = Union[DigitalProductPassport, Mapping]
+
+
+# ---------------------------------------------------------------------------
+# Hashing primitives
+# ---------------------------------------------------------------------------
+
+_HASHERS: Dict[str, Callable[[bytes], Any]] = {}
+
+
+def _hasher(algorithm: str) -> Callable[[bytes], Any]:
+    hasher = _HASHERS.get(algorithm)
+    if hasher is None:
+        # Named constructors (hashlib.sha256) are faster than hashlib.new()
+        hasher = getattr(hashlib, algorithm, None)
+        if hasher is None:
+            hashlib.new(algorithm)  # raises ValueError for unknown algorithms
+            hasher = lambda data: hashlib.new(algorithm, data)  # noqa: E731
+        _HASHERS[algorithm] = hasher
+    return hasher
+
+
+def _leaf(hasher: Callable[[bytes], Any], name: str, content: Any) -> bytes:
+    return hasher(_LEAF_PREFIX + name.encode("ascii") + b"\x00" + canonical_json(content).encode("utf-8")).digest()
+
+
+def _layer_content(name: str, layer: Any) -> Any:
+    excluded = EXCLUDED_FIELDS.get(name, ())
+    if isinstance(layer, Mapping):
+        return {key: value for key, value in layer.items() if key not in excluded}
+    return {f.name: getattr(layer, f.name) for f in fields(layer) if f.name not in excluded}
+
+
+def _levels(leaves: List[bytes], hasher: Callable[[bytes], Any]) -> List[List[bytes]]:
+    """All tree levels, from the leaves up to the single root."""
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        levels.append([
+            hasher(_NODE_PREFIX + below[i] + below[i + 1]).digest() if i + 1 < len(below) else below[i]
+            for i in range(0, len(below), 2)
+        ])
+    return levels
+
+
+def _update_levels(levels: List[List[bytes]], changed: Iterable[int], hasher: Callable[[bytes], Any]) -> None:
+    """Recompute the nodes above the changed leaves (in place)."""
+    indices = sorted(set(changed))
+    for level in range(1, len(levels)):
+        below, current = levels[level - 1], levels[level]
+        indices = sorted({index // 2 for index in indices})
+        for index in indices:
+            left = 2 * index
+            current[index] = (
+                hasher(_NODE_PREFIX + below[left] + below[left + 1]).digest() if left + 1 < len(below) else below[left]
+            )
+
+
+def _root(levels: List[List[bytes]], hasher: Callable[[bytes], Any]) -> bytes:
+    return levels[-1][0] if levels[0] else hasher(_NODE_PREFIX).digest()
+
+
+def _proof(levels: List[List[bytes]], index: int) -> List[Tuple[str, bytes]]:
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(("L" if sibling < index else "R", level[sibling]))
+        index //= 2
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Trees
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MerkleTree:
+    """
+    Merkle tree of one passport (see module docstring).
+
+    Attributes:
+        algorithm: hashlib algorithm name.
+        top: Levels of the top-level tree over LEAVES.
+        parts: Levels of the parts subtree (parts[0]: part leaves in order).
+        layer_signatures: Versioned signature of each layer when hashed
+                          (None for passports given as dicts).
+        part_keys: (part_id, Versioned signature) of each part when hashed
+                   (None for dicts).
+    """
+    algorithm: str
+    top: List[List[bytes]]
+    parts: List[List[bytes]]
+    layer_signatures: Optional[Dict[str, Tuple[int, ...]]] = field(default=None, repr=False)
+    part_keys: Optional[Tuple[Tuple[Any, Tuple[int, ...]], ...]] = field(default=None, repr=False)
+
+    @property
+    def root(self) -> bytes:
+        """Root digest."""
+        return self.top[-1][0]
+
+    @property
+    def hexdigest(self) -> str:
+        """Root digest as "<algorithm>:<hex>" (the form recorded in signatures)."""
+        return f"{self.algorithm}:{self.root.hex()}"
+
+    def leaf(self, name: str) -> bytes:
+        """Digest of one of LEAVES."""
+        return self.top[0][LEAVES.index(name)]
+
+    def part_proof(self, index: int) -> List[Tuple[str, str]]:
+        """
+        Inclusion proof of the part at `index`: the sibling digests from its
+        leaf up to the root, as ("L" | "R", hex) pairs. See verify_part().
+        """
+        if not 0 <= index < len(self.parts[0]):
+            raise IndexError(f"Part index {index} out of range")
+        path = _proof(self.parts, index) + _proof(self.top, LEAVES.index("parts"))
+        return [(side, digest.hex()) for side, digest in path]
+
+
+def passport_tree(
+    dpp: Passport,
+    previous: Optional[MerkleTree] = None,
+    algorithm: str = HASH_ALGORITHM,
+) -> MerkleTree:
+    """
+    Compute the Merkle tree of a passport.
+
+    Args:
+        dpp:
+            DigitalProductPassport, or its to_dict() form (same digests).
+        previous:
+            Earlier tree of the same passport object. Layers whose Versioned
+            signature, and parts whose part_id and signature, are unchanged
+            reuse its leaves, and
+            only nodes above changed part leaves are rehashed. As with
+            SchemaMapper.remap(), in-place edits of nested values must be
+            signalled with touch(). `previous` is not modified.
+        algorithm:
+            hashlib algorithm name.
+
+    Returns:
+        MerkleTree: The tree; its hexdigest is the passport digest.
+
+    Raises:
+        ValueError: If the algorithm is not available.
+    """
+    hasher = _hasher(algorithm)
+    tracked = not isinstance(dpp, Mapping)
+    get = getattr if tracked else (lambda data, name: data[name])
+    if previous is not None and (previous.algorithm != algorithm or previous.part_keys is None or not tracked):
+        previous = None
+
+    layer_signatures: Optional[Dict[str, Tuple[int, ...]]] = {} if tracked else None
+    top: List[bytes] = []
+    for name in LEAVES:
+        if name == "parts":
+            top.append(b"")  # filled in below
+            continue
+        layer = get(dpp, name)
+        if tracked:
+            signature = layer_signatures[name] = layer.signature()
+            if previous is not None and previous.layer_signatures.get(name) == signature:
+                top.append(previous.leaf(name))
+                continue
+        top.append(_leaf(hasher, name, _layer_content(name, layer)))
+
+    parts = get(get(dpp, "structure"), "parts")
+    part_keys = tuple((part.part_id, part.signature()) for part in parts) if tracked else None
+    if previous is None:
+        part_levels = _levels([_leaf(hasher, "part", part) for part in parts], hasher)
+    elif len(part_keys) == len(previous.part_keys):
+        changed = [i for i, (new, old) in enumerate(zip(part_keys, previous.part_keys)) if new != old]
+        part_levels = [list(level) for level in previous.parts] if changed else previous.parts
+        for index in changed:
+            part_levels[0][index] = _leaf(hasher, "part", parts[index])
+        _update_levels(part_levels, changed, hasher)
+    else:
+        # Parts added or removed: reuse the leaves of unchanged parts (same
+        # part_id and signature), rebuild the nodes
+        known = dict(zip(previous.part_keys, previous.parts[0]))
+        leaves = []
+        for part, key in zip(parts, part_keys):
+            digest = known.get(key)
+            leaves.append(digest if digest is not None else _leaf(hasher, "part", part))
+        part_levels = _levels(leaves, hasher)
+
+    top[LEAVES.index("parts")] = _root(part_levels, hasher)
+    return MerkleTree(
+        algorithm=algorithm,
+        top=_levels(top, hasher),
+        parts=part_levels,
+        layer_signatures=layer_signatures,
+        part_keys=part_keys,
+    )
+
+
+def passport_digest(dpp: Passport, algorithm: str = HASH_ALGORITHM) -> str:
+    """Root digest of a passport as "<algorithm>:<hex>"."""
+    return passport_tree(dpp, algorithm=algorithm).hexdigest
+
+
+# ---------------------------------------------------------------------------
+# Verification
+# ---------------------------------------------------------------------------
+
+def _split_digest(digest: str) -> Tuple[str, bytes]:
+    try:
+        algorithm, hex_digest = digest.split(":", 1)
+        return algorithm, bytes.fromhex(hex_digest)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid digest {digest!r}; expected '<algorithm>:<hex>'") from None
+
+
+def recorded_digests(dpp: Passport) -> List[str]:
+    """Digests recorded in the passport's provenance signatures (DIGEST_KEY)."""
+    provenance = dpp["provenance"] if isinstance(dpp, Mapping) else dpp.provenance
+    signatures = provenance["signatures"] if isinstance(provenance, Mapping) else provenance.signatures
+    return [entry[DIGEST_KEY] for entry in signatures if isinstance(entry, Mapping) and entry.get(DIGEST_KEY)]
+
+
+def verify_passport(
+    dpp: Passport,
+    expected: Optional[str] = None,
+    previous: Optional[MerkleTree] = None,
+) -> bool:
+    """
+    Check a passport against a root digest.
+
+    Args:
+        dpp: DigitalProductPassport or its to_dict() form.
+        expected: Digest ("<algorithm>:<hex>"). None checks every digest
+                  recorded in the provenance signatures instead.
+        previous: Earlier tree of the passport, to rehash only changes.
+
+    Returns:
+        bool: True if there is at least one digest and all of them match.
+
+    Raises:
+        ValueError: If a digest is malformed or its algorithm unavailable.
+    """
+    digests = [expected] if expected is not None else recorded_digests(dpp)
+    trees: Dict[str, MerkleTree] = {}
+    for digest in digests:
+        algorithm, root = _split_digest(digest)
+        tree = trees.get(algorithm)
+        if tree is None:
+            tree = trees[algorithm] = passport_tree(dpp, previous=previous, algorithm=algorithm)
+        if not hmac.compare_digest(tree.root, root):
+            return False
+    return bool(digests)
+
+
+def verify_part(part: Any, proof: Sequence[Tuple[str, str]], digest: str) -> bool:
+    """
+    Check that a part (PartClass or its to_dict() form) belongs to the
+    passport with root `digest`, using MerkleTree.part_proof() of that
+    passport - without the rest of the passport.
+    """
+    algorithm, root = _split_digest(digest)
+    hasher = _hasher(algorithm)
+    node = _leaf(hasher, "part", part)
+    for side, sibling in proof:
+        sibling_bytes = bytes.fromhex(sibling)
+        pair = sibling_bytes + node if side == "L" else node + sibling_bytes
+        node = hasher(_NODE_PREFIX + pair).digest()
+    return hmac.compare_digest(node, root)
+
+
+@dataclass
+class StoreVerification:
+    """
+    Result of verify_store().
+
+    Attributes:
+        checked: Passports checked.
+        mismatched: Ids of passports whose content does not match a recorded digest.
+        unsigned: Ids of passports without a recorded digest.
+    """
+    checked: int = 0
+    mismatched: List[int] = field(default_factory=list)
+    unsigned: List[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True if every passport carries matching digests."""
+        return not self.mismatched and not self.unsigned
+
+    def merge(self, other: "StoreVerification") -> None:
+        self.checked += other.checked
+        self.mismatched.extend(other.mismatched)
+        self.unsigned.extend(other.unsigned)
+
+
+def _verify_rows(rows: Iterable[Tuple[int, Dict[str, Any]]]) -> StoreVerification:
+    result = StoreVerification()
+    for passport_id, data in rows:
+        result.checked += 1
+        if not recorded_digests(data):
+            result.unsigned.append(passport_id)
+        elif not verify_passport(data):
+            result.mismatched.append(passport_id)
+    return result
+
+
+_worker_store = None
+
+
+def _init_verify_worker(path: str) -> None:
+    global _worker_store
+    from .store import PassportStore
+
+    _worker_store = PassportStore(path)
+
+
+def _verify_range(start: int, stop: int, batch_size: int) -> StoreVerification:
+    return _verify_rows(_worker_store.scan("id", start, stop, raw=True, batch_size=batch_size))
+
+
+def verify_store(store: Any, workers: int = 1, batch_size: int = 500, chunk_size: int = 5_000) -> StoreVerification:
+    """
+    Verify every passport in a store.PassportStore against its recorded digests.
+
+    Passports are checked in their to_dict() form (not rebuilt as objects).
+    Canonical serialization, not hashing, dominates the cost, and it holds
+    the GIL, so parallel verification uses processes: with workers > 1,
+    ranges of chunk_size ids are verified by worker processes that read the
+    database through their own connections (WAL readers do not block).
+
+    Args:
+        store: The PassportStore (file-backed when workers > 1).
+        workers: Worker processes; 1 verifies in this process.
+        batch_size: Rows fetched per query.
+        chunk_size: Passports per work item when workers > 1.
+
+    Returns:
+        StoreVerification: Counts and ids of failing passports, in id order.
+
+    Raises:
+        ValueError: If workers > 1 and the store is in memory.
+    """
+    if workers <= 1:
+        return _verify_rows(store.scan("id", raw=True, batch_size=batch_size))
+    if store.path == ":memory:":
+        raise ValueError("An in-memory store cannot be verified by worker processes")
+
+    ids = store.find_ids()
+    ranges = [(ids[i], ids[min(i + chunk_size, len(ids)) - 1] + 1) for i in range(0, len(ids), chunk_size)]
+    result = StoreVerification()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_verify_worker, initargs=(store.path,)) as pool:
+        futures = [pool.submit(_verify_range, start, stop, batch_size) for start, stop in ranges]
+        for future in futures:
+            result.merge(future.result())
+    return result
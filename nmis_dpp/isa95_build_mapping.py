@@ -6,9 +6,13 @@ Parses all ISA-95 / B2MML XSD schemas from
 domain PartClass types to ISA-95 element/complexType definitions,
 using description-based scoring heuristics on XSD annotations.
 
+The same definitions can alternatively be ingested from the prebuilt
+B2MML-JSON schema (AllSchemas.json), which is streamed definition by
+definition instead of parsing ~40 XSD trees.
+
 Output YAML has the shape:
 
-isa95_source: "xsd"
+isa95_source: "xsd" | "json"
 total_definitions: N
 domain_mappings:
   PowerConversion:
@@ -21,9 +25,14 @@ Author: Anmol Kumar
 
 from __future__ import annotations
 
+import argparse
+import contextlib
+import io
+import json
 import re
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 
 import xml.etree.ElementTree as ET
 import yaml
@@ -42,6 +51,8 @@ ISA95_SCHEMA_DIR = (
     / "Schema"
 )
 
+ISA95_JSON_SCHEMA = ISA95_SCHEMA_DIR / "AllSchemas.json"
+
 OUTPUT_YAML = "isa95_part_class_mapping.yaml"
 
 MIN_SCORE = 1  # minimal keyword hits to accept a domain
@@ -358,6 +369,225 @@ def load_all_xsd_definitions(schema_dir: Path) -> Dict[str, Dict[str, Any]]:
     return all_defs
 
 
+# ---------------------------------------------------------------------------
+# B2MML-JSON (AllSchemas.json) parsing helpers
+# ---------------------------------------------------------------------------
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+_WS = re.compile(r"\s*")
+
+
+class _JsonStream:
+    """
+    Minimal pull reader over a JSON text file.
+
+    Only one value is decoded at a time (via json.JSONDecoder.raw_decode),
+    so large top-level objects such as "$defs" can be walked entry by entry
+    without materialising the whole document.
+    """
+
+    def __init__(self, fp, chunk_size: int = JSON_CHUNK_SIZE) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0  # characters dropped from the front of _buf
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._offset += self._pos
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of input)."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value ending exactly at the buffer edge may be truncated
+                # (e.g. a number split across chunks); read on to be sure.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def iter_object(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterate over the members of the object starting at the current
+        position. Values are yielded lazily: the caller either consumes the
+        value completely via value()/iter_object() or leaves it alone, in
+        which case it is decoded and discarded on resume.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            self.peek()
+            start = self._offset + self._pos
+            yield key, self
+            if self._offset + self._pos == start:
+                self.value()  # not consumed by the caller
+            sep = self.peek()
+            self._pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"Malformed JSON object: unexpected {sep!r}")
+
+
+def iter_json_schema_defs(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream (name, definition) pairs from the "$defs" object of a B2MML-JSON
+    schema file, decoding one definition at a time.
+    """
+    with path.open("r", encoding="utf-8") as fp:
+        stream = _JsonStream(fp)
+        for key, member in stream.iter_object():
+            if key != "$defs":
+                continue  # header members ($id, title, ...) are skipped
+            for name, defn in member.iter_object():
+                yield name, defn.value()
+            return
+
+
+def load_all_json_definitions(json_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the same defs_by_name structure as load_all_xsd_definitions(),
+    but from the prebuilt B2MML-JSON schema.
+
+    Mapping rules:
+        - "$defs" entries that are plain "$ref" aliases correspond to
+          global xs:element declarations  -> group "Element".
+        - all other named "$defs" entries correspond to xs:complexType
+          declarations                     -> group "ComplexType".
+        - property names of complex types correspond to local
+          xs:element declarations          -> group "Element" (no annotation).
+        - namespaced primitive aliases ("xsd:string", "Extended:CodeType")
+          have no XSD counterpart and are skipped.
+    """
+    defs: Dict[str, Dict[str, Any]] = {}
+    local_elements: List[str] = []
+
+    if not json_path.exists():
+        print(f"❌ JSON schema not found: {json_path}")
+        return defs
+
+    for name, defn in iter_json_schema_defs(json_path):
+        if ":" in name or not isinstance(defn, dict):
+            continue
+
+        defs[name] = {
+            "name": name,
+            "description": _strip_ws(defn.get("description")),
+            "group": "Element" if "$ref" in defn else "ComplexType",
+            "source": json_path.name,
+        }
+
+        for prop in defn.get("properties", {}):
+            if not prop.startswith(("@", "$")):
+                local_elements.append(prop)
+
+    for name in local_elements:
+        defs.setdefault(name, {
+            "name": name,
+            "description": "",
+            "group": "Element",
+            "source": json_path.name,
+        })
+
+    return defs
+
+
+def load_definitions(source: str = "xsd") -> Dict[str, Dict[str, Any]]:
+    """
+    Load ISA-95 definitions from the requested source ("xsd" or "json").
+    """
+    if source == "xsd":
+        return load_all_xsd_definitions(ISA95_SCHEMA_DIR)
+    if source == "json":
+        return load_all_json_definitions(ISA95_JSON_SCHEMA)
+    raise ValueError(f"Unknown ISA-95 definition source: {source!r}")
+
+
+def compare_definitions(
+    xsd_defs: Dict[str, Dict[str, Any]],
+    json_defs: Dict[str, Dict[str, Any]],
+) -> Dict[str, List[str]]:
+    """
+    Consistency check between the XSD and JSON ingestion paths.
+
+    Only the fields that drive domain classification (description) and
+    the declaration kind (group) are compared; "source" naturally differs.
+
+    Returns:
+        {
+          "only_in_xsd": [...],
+          "only_in_json": [...],
+          "description_mismatch": [...],
+          "group_mismatch": [...],
+        }
+    """
+    common = xsd_defs.keys() & json_defs.keys()
+    return {
+        "only_in_xsd": sorted(xsd_defs.keys() - json_defs.keys()),
+        "only_in_json": sorted(json_defs.keys() - xsd_defs.keys()),
+        "description_mismatch": sorted(
+            n for n in common
+            if xsd_defs[n]["description"] != json_defs[n]["description"]
+        ),
+        "group_mismatch": sorted(
+            n for n in common if xsd_defs[n]["group"] != json_defs[n]["group"]
+        ),
+    }
+
+
+def benchmark_sources(repeat: int = 5) -> Dict[str, float]:
+    """
+    Time both ingestion paths; returns the best wall time (seconds) per source.
+    """
+    timings: Dict[str, float] = {}
+    for source in ("xsd", "json"):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                load_definitions(source)
+            best = min(best, time.perf_counter() - start)
+        timings[source] = best
+    return timings
+
+
 # ---------------------------------------------------------------------------
 # Scoring and classification
 # ---------------------------------------------------------------------------
@@ -459,11 +689,54 @@ def generate_part_class_bindings(mapping: Dict[str, Any]) -> List[PartClass]:
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    print(f"🔍 Loading ISA-95 XSDs from: {ISA95_SCHEMA_DIR}")
-
-    defs_by_name = load_all_xsd_definitions(ISA95_SCHEMA_DIR)
-    print(f"   Total extracted XSD definitions: {len(defs_by_name)}")
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the ISA-95 part class mapping.")
+    parser.add_argument(
+        "--source", choices=["xsd", "json"], default="xsd",
+        help="Ingest definitions from the XSDs or from AllSchemas.json.",
+    )
+    parser.add_argument(
+        "--check", action="store_true",
+        help="Compare the XSD and JSON ingestion paths and exit.",
+    )
+    parser.add_argument(
+        "--benchmark", action="store_true",
+        help="Time both ingestion paths and exit.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        timings = benchmark_sources()
+        for source, seconds in timings.items():
+            print(f"⏱️  {source}: {seconds * 1000:.1f} ms")
+        return
+
+    if args.check:
+        with contextlib.redirect_stdout(io.StringIO()):
+            xsd_defs = load_definitions("xsd")
+            json_defs = load_definitions("json")
+        report = compare_definitions(xsd_defs, json_defs)
+        for key, names in report.items():
+            print(f"  {key}: {len(names)} {names[:10]}")
+        xsd_mapping = build_domain_mapping(xsd_defs)
+        json_mapping = build_domain_mapping(json_defs)
+        for domain in DOMAIN_KEYWORDS:
+            xsd_ids = set(xsd_mapping[domain]["isa95_type_ids"])
+            json_ids = set(json_mapping[domain]["isa95_type_ids"])
+            if xsd_ids != json_ids:
+                print(
+                    f"  {domain}: -{sorted(xsd_ids - json_ids)} "
+                    f"+{sorted(json_ids - xsd_ids)}"
+                )
+        return
+
+    if args.source == "json":
+        print(f"🔍 Streaming ISA-95 definitions from: {ISA95_JSON_SCHEMA}")
+    else:
+        print(f"🔍 Loading ISA-95 XSDs from: {ISA95_SCHEMA_DIR}")
+
+    defs_by_name = load_definitions(args.source)
+    print(f"   Total extracted {args.source.upper()} definitions: {len(defs_by_name)}")
 
     print("🏗️ Building domain mappings (description-based scoring)...")
     part_class_mapping = build_domain_mapping(defs_by_name)
@@ -472,7 +745,7 @@ def main() -> None:
     with open(OUTPUT_YAML, "w", encoding="utf-8") as f:
         yaml.dump(
             {
-                "isa95_source": "xsd",
+                "isa95_source": args.source,
                 "total_definitions": len(defs_by_name),
                 "domain_mappings": part_class_mapping,
             },
@@ -0,0 +1,448 @@
+"""
+json_schema.py
+
+JSON Schema (draft 2020-12) documents generated from the DPP dataclasses,
+and a precompiled validator for raw dicts.
+
+The schemas are derived from the dataclass fields and type hints of the
+passport layers (model.py) and part classes (part_class.py), so they never
+drift from the code. Fields without a default are required and unknown keys
+are rejected, mirroring what the dataclass constructors accept. Parts are
+polymorphic: the "type" key selects the PartClass subclass, falling back to
+PartClass for unknown types, like b2mml_import does.
+
+SchemaValidator compiles a schema once into nested closures and checks
+incoming records (e.g. parsed JSON) before any objects are constructed,
+collecting every issue with its JSON path:
+
+    validator = passport_validator()
+    issues = validator.validate(json.load(f))
+    report = validator.validate_batch(records)   # throughput, failures
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import typing
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .model import (
+    DigitalProductPassport,
+    IdentityLayer,
+    LifecycleLayer,
+    ProvenanceLayer,
+    RiskLayer,
+    StructureLayer,
+    SustainabilityLayer,
+)
+from .part_class import PART_CLASS_TYPES, OntologyBinding, PartClass
+from .utils import hint_origin_args
+from .validation import CompiledValidator, ValidationIssue, Visitor, format_path
+
+
+JSON_SCHEMA_DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+#: Name of the polymorphic part definition in $defs
+PART_DEF = "Part"
+
+LAYER_CLASSES = (
+    IdentityLayer, StructureLayer, LifecycleLayer,
+    RiskLayer, SustainabilityLayer, ProvenanceLayer,
+)
+
+_PRIMITIVES = {str: "string", int: "integer", float: "number", bool: "boolean"}
+
+
+# ---------------------------------------------------------------------------
+# Schema generation
+# ---------------------------------------------------------------------------
+
+def _type_schema(hint: Any, defs: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate a type hint into a JSON Schema fragment, filling defs."""
+    if hint in _PRIMITIVES:
+        return {"type": _PRIMITIVES[hint]}
+    if hint is type(None):
+        return {"type": "null"}
+
+    origin, args = hint_origin_args(hint)
+
+    if origin is typing.Union:
+        options = [a for a in args if a is not type(None)]
+        inner = _type_schema(options[0], defs) if len(options) == 1 else {
+            "anyOf": [_type_schema(a, defs) for a in options]
+        }
+        if len(options) == len(args):
+            return inner
+        if isinstance(inner.get("type"), str):
+            return {**inner, "type": [inner["type"], "null"]}
+        return {"anyOf": [inner, {"type": "null"}]}
+    if origin in (list, tuple):
+        schema: Dict[str, Any] = {"type": "array"}
+        if args and args[0] is not Ellipsis:
+            schema["items"] = _type_schema(args[0], defs)
+        return schema
+    if origin is dict:
+        schema = {"type": "object"}
+        if len(args) == 2:
+            values = _type_schema(args[1], defs)
+            if values:
+                schema["additionalProperties"] = values
+        return schema
+
+    if isinstance(hint, type) and issubclass(hint, PartClass):
+        _add_part_defs(defs)
+        return {"$ref": f"#/$defs/{PART_DEF}"}
+    if dataclasses.is_dataclass(hint):
+        _add_dataclass_def(hint, defs)
+        return {"$ref": f"#/$defs/{hint.__name__}"}
+
+    # typing.Any, the builtin any() used as a hint, object, ...
+    return {}
+
+
+def _dataclass_body(cls: type, defs: Dict[str, Any]) -> Dict[str, Any]:
+    hints = typing.get_type_hints(cls)
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+
+    for f in dataclasses.fields(cls):
+        properties[f.name] = _type_schema(hints.get(f.name, Any), defs)
+        if f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING:
+            required.append(f.name)
+
+    schema: Dict[str, Any] = {"title": cls.__name__}
+    doc = (cls.__doc__ or "").strip()
+    if doc:
+        schema["description"] = doc.splitlines()[0]
+    schema["type"] = "object"
+    schema["properties"] = properties
+    if required:
+        schema["required"] = required
+    schema["additionalProperties"] = False
+    return schema
+
+
+def _add_dataclass_def(cls: type, defs: Dict[str, Any]) -> None:
+    if cls.__name__ not in defs:
+        defs[cls.__name__] = {}  # placeholder, guards against recursion
+        defs[cls.__name__] = _dataclass_body(cls, defs)
+
+
+def _add_part_defs(defs: Dict[str, Any]) -> None:
+    """Add every part class plus the "type"-discriminated Part definition."""
+    if PART_DEF in defs:
+        return
+    defs[PART_DEF] = {}
+    for cls in PART_CLASS_TYPES.values():
+        _add_dataclass_def(cls, defs)
+
+    branches: List[Dict[str, Any]] = [
+        {
+            "if": {"properties": {"type": {"const": name}}, "required": ["type"]},
+            "then": {"$ref": f"#/$defs/{cls.__name__}"},
+        }
+        for name, cls in PART_CLASS_TYPES.items()
+        if cls is not PartClass
+    ]
+    known = [name for name, cls in PART_CLASS_TYPES.items() if cls is not PartClass]
+    branches.append({
+        "if": {"properties": {"type": {"enum": known}}, "required": ["type"]},
+        "else": {"$ref": f"#/$defs/{PartClass.__name__}"},
+    })
+    defs[PART_DEF] = {
+        "title": "Part",
+        "description": "A PartClass record; its \"type\" selects the subclass.",
+        "type": "object",
+        "allOf": branches,
+    }
+
+
+def dataclass_schema(cls: type) -> Dict[str, Any]:
+    """
+    Return a standalone JSON Schema for a DPP dataclass.
+
+    Args:
+        cls: A layer class, DigitalProductPassport, OntologyBinding or a
+             PartClass subclass.
+
+    Returns:
+        Dict[str, Any]: Schema with nested dataclasses under "$defs".
+
+    Raises:
+        TypeError: If cls is not a dataclass.
+    """
+    if not (isinstance(cls, type) and dataclasses.is_dataclass(cls)):
+        raise TypeError(f"{cls!r} is not a dataclass")
+    defs: Dict[str, Any] = {}
+    body = _dataclass_body(cls, defs)
+    defs.pop(cls.__name__, None)
+    schema = {"$schema": JSON_SCHEMA_DIALECT, "$id": f"urn:nmis-dpp:{cls.__name__}", **body}
+    if defs:
+        schema["$defs"] = dict(sorted(defs.items()))
+    return schema
+
+
+def passport_schema() -> Dict[str, Any]:
+    """Return the JSON Schema of a serialized DigitalProductPassport (see utils.to_dict)."""
+    return dataclass_schema(DigitalProductPassport)
+
+
+def part_schema() -> Dict[str, Any]:
+    """Return the JSON Schema of a single serialized part of any PartClass type."""
+    defs: Dict[str, Any] = {}
+    _add_part_defs(defs)
+    body = defs.pop(PART_DEF)
+    return {
+        "$schema": JSON_SCHEMA_DIALECT,
+        "$id": f"urn:nmis-dpp:{PART_DEF}",
+        **body,
+        "$defs": dict(sorted(defs.items())),
+    }
+
+
+def all_schemas() -> Dict[str, Dict[str, Any]]:
+    """Return standalone schemas keyed by name: the passport, each layer, parts and bindings."""
+    schemas = {cls.__name__: dataclass_schema(cls) for cls in (DigitalProductPassport, *LAYER_CLASSES)}
+    schemas[PART_DEF] = part_schema()
+    for cls in (*PART_CLASS_TYPES.values(), OntologyBinding):
+        schemas[cls.__name__] = dataclass_schema(cls)
+    return schemas
+
+
+# ---------------------------------------------------------------------------
+# Compiled validation
+# ---------------------------------------------------------------------------
+
+_JSON_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+    "object": lambda v: v.__class__ is dict or isinstance(v, Mapping),
+    "array": lambda v: isinstance(v, (list, tuple)),
+}
+
+
+def _json_type(value: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _JSON_TYPES[name](value):
+            return name
+    return type(value).__name__
+
+
+class _Compiler:
+    """Compiles the JSON Schema subset emitted above into visitor closures."""
+
+    def __init__(self, root: Dict[str, Any]) -> None:
+        self.defs = root.get("$defs", {})
+        self.compiled: Dict[str, Visitor] = {}
+
+    def ref(self, ref: str) -> Visitor:
+        name = ref.rsplit("/", 1)[-1]
+        visit = self.compiled.get(name)
+        if visit is None:
+            slot: List[Visitor] = []
+            # Indirection while compiling, for self-referencing definitions
+            self.compiled[name] = lambda value, path, issues: slot[0](value, path, issues)
+            slot.append(self.compile(self.defs[name]))
+            visit = self.compiled[name] = slot[0]
+        return visit
+
+    def compile(self, schema: Dict[str, Any]) -> Visitor:
+        if "$ref" in schema:
+            return self.ref(schema["$ref"])
+
+        steps: List[Visitor] = []
+
+        types = schema.get("type")
+        if types is not None:
+            names = (types,) if isinstance(types, str) else tuple(types)
+            checks = tuple(_JSON_TYPES[name] for name in names)
+            expected = " or ".join(names)
+            type_ok = checks[0] if len(checks) == 1 else (lambda v: any(c(v) for c in checks))
+        else:
+            type_ok = None
+
+        if "const" in schema:
+            const = schema["const"]
+            steps.append(self._simple("const", lambda v: v == const, f"must be {const!r}"))
+        if "enum" in schema:
+            allowed = tuple(schema["enum"])
+            steps.append(self._simple("enum", lambda v: v in allowed, f"must be one of {list(allowed)}"))
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            steps.append(self._object(schema))
+        if "items" in schema:
+            steps.append(self._items(schema["items"]))
+        if "anyOf" in schema:
+            steps.append(self._any_of(schema["anyOf"]))
+        if "allOf" in schema:
+            steps.append(self._all_of(schema["allOf"]))
+
+        steps_t = tuple(steps)
+
+        if type_ok is None:
+            def visit(value, path, issues):
+                for step in steps_t:
+                    step(value, path, issues)
+        else:
+            def visit(value, path, issues):
+                if not type_ok(value):
+                    issues.append(ValidationIssue(
+                        format_path(path), "type", f"expected {expected}, got {_json_type(value)}"
+                    ))
+                    return
+                for step in steps_t:
+                    step(value, path, issues)
+        return visit
+
+    @staticmethod
+    def _simple(rule: str, ok: Callable[[Any], bool], message: str) -> Visitor:
+        def visit(value, path, issues):
+            if not ok(value):
+                issues.append(ValidationIssue(format_path(path), rule, f"{message}, got {value!r}"))
+        return visit
+
+    def _object(self, schema: Dict[str, Any]) -> Visitor:
+        properties = {
+            key: self.compile(sub) for key, sub in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        extra = schema.get("additionalProperties", True)
+        visit_extra = self.compile(extra) if isinstance(extra, dict) and extra else None
+        reject_extra = extra is False
+
+        def visit(value, path, issues):
+            # Exact dict check first: ABC isinstance checks dominate otherwise
+            if value.__class__ is not dict and not isinstance(value, Mapping):
+                return
+            for key in required:
+                if key not in value:
+                    issues.append(ValidationIssue(format_path((path, key)), "required", "is required"))
+            for key, item in value.items():
+                visit_property = properties.get(key)
+                if visit_property is not None:
+                    visit_property(item, (path, key), issues)
+                elif reject_extra:
+                    issues.append(ValidationIssue(
+                        format_path((path, key)), "additionalProperties", "is not a known field"
+                    ))
+                elif visit_extra is not None:
+                    visit_extra(item, (path, key), issues)
+        return visit
+
+    def _items(self, schema: Dict[str, Any]) -> Visitor:
+        visit_item = self.compile(schema)
+
+        def visit(value, path, issues):
+            if isinstance(value, (list, tuple)):
+                for index, item in enumerate(value):
+                    visit_item(item, (path, index), issues)
+        return visit
+
+    def _any_of(self, options: List[Dict[str, Any]]) -> Visitor:
+        visitors = tuple(self.compile(option) for option in options)
+
+        def visit(value, path, issues):
+            for option in visitors:
+                scratch: List[ValidationIssue] = []
+                option(value, path, scratch)
+                if not scratch:
+                    return
+            issues.append(ValidationIssue(format_path(path), "anyOf", "matches none of the allowed schemas"))
+        return visit
+
+    def _all_of(self, branches: List[Dict[str, Any]]) -> Visitor:
+        dispatch = self._discriminator(branches)
+        if dispatch is not None:
+            return dispatch
+
+        compiled: List[Tuple[Optional[Visitor], Optional[Visitor], Optional[Visitor]]] = []
+        for branch in branches:
+            condition = self.compile(branch["if"]) if "if" in branch else None
+            then = self.compile(branch["then"]) if "then" in branch else None
+            otherwise = self.compile(branch["else"]) if "else" in branch else None
+            if condition is None:
+                then = self.compile(branch)
+            compiled.append((condition, then, otherwise))
+
+        def visit(value, path, issues):
+            for condition, then, otherwise in compiled:
+                if condition is None:
+                    then(value, path, issues)
+                    continue
+                scratch: List[ValidationIssue] = []
+                condition(value, path, scratch)
+                chosen = otherwise if scratch else then
+                if chosen is not None:
+                    chosen(value, path, issues)
+        return visit
+
+    def _discriminator(self, branches: List[Dict[str, Any]]) -> Optional[Visitor]:
+        """
+        Compile the generated "type"-discriminated if/then chain (see
+        _add_part_defs) into a single dict lookup instead of evaluating every
+        condition. Returns None for any other allOf shape.
+        """
+        *cases, fallback = branches
+        key = None
+        targets: Dict[Any, Visitor] = {}
+        for branch in cases:
+            condition = branch.get("if", {})
+            props = condition.get("properties", {})
+            if set(branch) != {"if", "then"} or len(props) != 1:
+                return None
+            (name, sub), = props.items()
+            if set(sub) != {"const"} or key not in (None, name):
+                return None
+            key = name
+            targets[sub["const"]] = self.compile(branch["then"])
+
+        condition = fallback.get("if", {})
+        known = condition.get("properties", {}).get(key, {}).get("enum")
+        if set(fallback) != {"if", "else"} or known is None or set(known) != set(targets):
+            return None
+        default = self.compile(fallback["else"])
+
+        def visit(value, path, issues):
+            discriminator = value.get(key) if value.__class__ is dict or isinstance(value, Mapping) else None
+            try:
+                target = targets.get(discriminator, default)
+            except TypeError:  # unhashable discriminator
+                target = default
+            target(value, path, issues)
+        return visit
+
+
+class SchemaValidator(CompiledValidator):
+    """
+    A JSON Schema (as generated by this module) compiled into closures.
+
+    Supports the keywords the generator emits: type, const, enum,
+    properties, required, additionalProperties, items, anyOf, allOf with
+    if/then/else, and local $ref into $defs.
+
+    Args:
+        schema: Schema document, e.g. passport_schema().
+    """
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema
+        self._visit = _Compiler(schema).compile(schema)
+
+    def __repr__(self) -> str:
+        return f"SchemaValidator({self.schema.get('$id', self.schema.get('title'))!r})"
+
+
+@functools.lru_cache(maxsize=None)
+def passport_validator() -> SchemaValidator:
+    """Shared validator for raw DigitalProductPassport dicts (compiled once)."""
+    return SchemaValidator(passport_schema())
+
+
+@functools.lru_cache(maxsize=None)
+def part_validator() -> SchemaValidator:
+    """Shared validator for raw part dicts of any PartClass type (compiled once)."""
+    return SchemaValidator(part_schema())
@@ -0,0 +1,276 @@
+"""
+jsonld.py
+
+Compact, canonical JSON-LD export of mapped passports.
+
+SchemaMapper.map_dpp() embeds the mapper's get_context() in every document
+and keeps the mapper's plain keys. JsonLdExporter turns mapped documents
+into publishable JSON-LD:
+
+- keys are IRI-compacted with the mapper's JSONLD_PREFIX
+  ("serialNumber" -> "eclass:serialNumber"; keys starting with "@" or
+  already containing ":" are kept), so they expand through the prefix
+  definitions of the context. JSON-LD 1.1 only uses a term as a prefix if
+  its IRI ends in a gen-delim ("/", "#", ...), so the exported context
+  appends "#" to a prefix IRI that does not (the ISA-95 namespace
+  "http://www.mesa.org/xml/B2MML-V0600" becomes ".../B2MML-V0600#");
+- "@context" is either the mapper's context, inlined, or a reference to a
+  shared context document (context_url), published once with
+  write_context();
+- output is canonical JSON: "@context" first, all other keys sorted, no
+  insignificant whitespace, UTF-8. Equal documents give identical bytes.
+
+The context text and the key -> compact IRI table are computed once per
+exporter/prefix rather than per document, and write() streams documents
+(and large lists within them, such as the parts) to a file in chunks
+without building the whole output in memory:
+
+    exporter = exporter_for(mapper, context_url="https://dpp.example/eclass.jsonld")
+    exporter.write_context("eclass.jsonld")
+    with open("passports.jsonl", "w", encoding="utf-8") as out:
+        exporter.write((mapper.map_dpp(dpp) for dpp in passports), out)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple, Union
+from urllib.parse import quote
+
+from .schema_base import SchemaMapper
+
+#: Items encoded per chunk when streaming large lists
+DEFAULT_CHUNK_ITEMS = 256
+
+#: Container nesting levels streamed key by key / chunk by chunk; deeper
+#: values are encoded in one piece
+STREAM_DEPTH = 3
+
+# Cap on each prefix's key table (keys of free-form dicts, e.g. part
+# properties, are compacted too and could otherwise grow it without bound)
+MAX_TERMS = 65_536
+
+_encode = json.JSONEncoder(
+    sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+).encode
+
+#: Characters a prefix IRI must end in to expand compact IRIs (RFC 3986 gen-delims)
+GEN_DELIMS = ":/?#[]@"
+
+_TERM_TABLES: Dict[str, Dict[str, str]] = {}
+_EXPORTERS: Dict[Tuple[type, Optional[str]], "JsonLdExporter"] = {}
+_lock = threading.Lock()
+
+
+def compact_iri(prefix: str, key: Any) -> str:
+    """
+    Compact IRI for a document key under a prefix.
+
+    Keys starting with "@" (JSON-LD keywords) or containing ":" (already
+    IRIs or compact IRIs) are returned unchanged; other characters that are
+    not IRI-safe are percent-encoded.
+    """
+    key = str(key)
+    if not key or key.startswith("@") or ":" in key:
+        return key
+    return f"{prefix}:{quote(key, safe='-._~')}"
+
+
+def prefix_context(context: Dict[str, Any], prefix: str) -> Dict[str, Any]:
+    """
+    Copy of a context whose `prefix` definition can expand compact IRIs.
+
+    A prefix IRI that does not end in a gen-delim is given a trailing "#";
+    otherwise "isa95:ID" would not expand under JSON-LD 1.1 and would
+    expand to a run-together IRI (".../B2MML-V0600ID") under 1.0.
+
+    Raises:
+        ValueError: If `prefix` is not defined in the context, or not as an IRI.
+    """
+    definition = context.get(prefix)
+    iri = definition.get("@id") if isinstance(definition, dict) else definition
+    if not isinstance(iri, str) or not iri:
+        raise ValueError(f"Prefix {prefix!r} is not defined as an IRI in the context")
+    if iri[-1] in GEN_DELIMS:
+        return context
+    iri += "#"
+    return {**context, prefix: {**definition, "@id": iri} if isinstance(definition, dict) else iri}
+
+
+class JsonLdExporter:
+    """
+    Exports one mapper's documents as compact, canonical JSON-LD.
+
+    Args:
+        mapper: Mapper (instance or class) whose documents are exported.
+        context_url: Reference this shared context document instead of
+                     inlining the mapper's context in every document.
+        chunk_items: Items encoded per chunk when streaming large lists.
+
+    Raises:
+        ValueError: If the mapper's JSONLD_PREFIX is not defined in its context.
+
+    The exported context is the mapper's, with the prefix IRI fixed up by
+    prefix_context() where needed.
+    """
+
+    def __init__(
+        self,
+        mapper: Union[SchemaMapper, type],
+        context_url: Optional[str] = None,
+        chunk_items: int = DEFAULT_CHUNK_ITEMS,
+    ) -> None:
+        if isinstance(mapper, type):
+            mapper = mapper()
+        self.schema = mapper.get_schema_name()
+        self.prefix = mapper.JSONLD_PREFIX
+        self.context: Dict[str, Any] = dict(mapper.get_context())
+        if self.prefix is not None:
+            if self.prefix not in self.context:
+                raise ValueError(f"JSONLD_PREFIX {self.prefix!r} is not defined in the {self.schema} context")
+            self.context = prefix_context(self.context, self.prefix)
+        self.context_url = context_url
+        self.chunk_items = chunk_items
+        self._context_text = _encode(context_url if context_url is not None else self.context)
+        if self.prefix is None:
+            self._terms: Dict[str, str] = {}
+        else:
+            with _lock:
+                self._terms = _TERM_TABLES.setdefault(self.prefix, {})
+
+    def __repr__(self) -> str:
+        return f"JsonLdExporter({self.schema!r}, context_url={self.context_url!r})"
+
+    # -------------------------------------------------------------------------
+    # Context
+    # -------------------------------------------------------------------------
+
+    def context_document(self) -> Dict[str, Any]:
+        """The context document to publish at context_url."""
+        return {"@context": self.context}
+
+    def write_context(self, path: Union[str, Path]) -> None:
+        """Write context_document() (canonical JSON) to a file."""
+        Path(path).write_text(_encode(self.context_document()), encoding="utf-8")
+
+    # -------------------------------------------------------------------------
+    # Compaction
+    # -------------------------------------------------------------------------
+
+    def _term(self, key: Any) -> str:
+        terms = self._terms
+        term = terms.get(key)
+        if term is None:
+            term = compact_iri(self.prefix, key) if self.prefix is not None else str(key)
+            if len(terms) < MAX_TERMS:
+                terms[key] = term
+        return term
+
+    def _compact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            terms, term, compact = self._terms, self._term, self._compact
+            return {terms.get(key) or term(key): compact(item) for key, item in value.items()}
+        if isinstance(value, list):
+            compact = self._compact
+            return [compact(item) for item in value]
+        return value
+
+    def compact(self, mapped: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compacted JSON-LD form of a mapped document (a new dict).
+
+        The document's own "@context" (as embedded by map_dpp()) is replaced
+        by the exporter's.
+        """
+        document = {"@context": self.context_url if self.context_url is not None else self.context}
+        for key, value in mapped.items():
+            if key != "@context":
+                document[self._term(key)] = self._compact(value)
+        return document
+
+    # -------------------------------------------------------------------------
+    # Serialization
+    # -------------------------------------------------------------------------
+
+    def iter_chunks(self, mapped: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield the canonical JSON-LD text of a mapped document in pieces.
+
+        Keys are compacted while encoding; lists longer than chunk_items
+        (within the first STREAM_DEPTH levels) are compacted and encoded
+        chunk_items at a time, so memory use does not grow with their size.
+        """
+        items = sorted((self._term(key), value) for key, value in mapped.items() if key != "@context")
+        yield '{"@context":' + self._context_text
+        for term, value in items:
+            yield "," + _encode(term) + ":"
+            yield from self._iter_value(value, STREAM_DEPTH - 1)
+        yield "}"
+
+    def _iter_value(self, value: Any, depth: int) -> Iterator[str]:
+        if depth and isinstance(value, dict) and value:
+            separator = "{"
+            for term, item in sorted((self._term(key), item) for key, item in value.items()):
+                yield separator + _encode(term) + ":"
+                separator = ","
+                yield from self._iter_value(item, depth - 1)
+            yield "}"
+        elif depth and isinstance(value, list) and len(value) > self.chunk_items:
+            separator = "["
+            for start in range(0, len(value), self.chunk_items):
+                yield separator + _encode(self._compact(value[start:start + self.chunk_items]))[1:-1]
+                separator = ","
+            yield "]"
+        else:
+            yield _encode(self._compact(value))
+
+    def dumps(self, mapped: Dict[str, Any]) -> str:
+        """Canonical JSON-LD text of a mapped document."""
+        return "".join(self.iter_chunks(mapped))
+
+    def write(self, documents: Iterable[Dict[str, Any]], out: TextIO, lines: bool = True) -> int:
+        """
+        Stream mapped documents to a text file.
+
+        Args:
+            documents: Mapped documents (e.g. a generator of map_dpp() results).
+            out: Text file opened for writing (UTF-8).
+            lines: One document per line (JSON Lines); False writes a JSON array.
+
+        Returns:
+            int: Number of documents written.
+        """
+        count = 0
+        write = out.write
+        if not lines:
+            write("[")
+        for mapped in documents:
+            if count and not lines:
+                write(",")
+            for chunk in self.iter_chunks(mapped):
+                write(chunk)
+            if lines:
+                write("\n")
+            count += 1
+        if not lines:
+            write("]")
+        return count
+
+
+def exporter_for(mapper: Union[SchemaMapper, type], context_url: Optional[str] = None) -> JsonLdExporter:
+    """
+    Shared JsonLdExporter for a mapper class (created on first use).
+
+    Exporters only depend on the mapper class (schema name, prefix and
+    context), so all instances of a mapper share one.
+    """
+    cls = mapper if isinstance(mapper, type) else type(mapper)
+    key = (cls, context_url)
+    exporter = _EXPORTERS.get(key)
+    if exporter is None:
+        exporter = JsonLdExporter(mapper, context_url=context_url)
+        with _lock:
+            exporter = _EXPORTERS.setdefault(key, exporter)
+    return exporter
@@ -4,7 +4,7 @@ eclass_mapper.py
 Implementation of SchemaMapper for ECLASS 16.
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Sequence, Tuple
 import logging
 
 from nmis_dpp.schema_base import SchemaMapper
@@ -25,11 +25,31 @@ class ECLASSMapper(SchemaMapper):
     Mapper for ECLASS 16.0.
     """
 
+    SCHEMA_NAME = "ECLASS"
+    SCHEMA_VERSION = "16.0"
+    PART_ID_KEY = "id"
+    STRUCTURE_PARTS_KEY = "components"
+    JSONLD_PREFIX = "eclass"
+
+    #: ECLASS IRDI of a classification class, e.g. "0173-1#01-AGZ376#020"
+    IRDI_PATTERN = r"\d{4}-\d+#\d{2}-[A-Z0-9]{6}#\d{3}"
+
+    VALIDATION_RULES = (
+        {"path": "schema", "equals": "ECLASS"},
+        {"path": "identity", "required_any": ["serialNumber", "gtin", "manufacturerPartId"]},
+        {"path": "identity.manufacturerId", "type": "string", "severity": "warning"},
+        {"path": "structure.components", "type": "array", "unique_by": "id"},
+        {"path": "structure.components[*].id", "required": True, "type": "string"},
+        {"path": "structure.components[*].eclassIrdi", "pattern": IRDI_PATTERN},
+        {"path": "structure.components[*].attributes.*", "finite": True},
+        {"path": "sustainability.mass", "type": "number", "min": 0},
+    )
+
     def get_schema_name(self) -> str:
-        return "ECLASS"
+        return self.SCHEMA_NAME
 
     def get_schema_version(self) -> str:
-        return "16.0"
+        return self.SCHEMA_VERSION
 
     def get_context(self) -> Dict[str, Any]:
         """
@@ -56,9 +76,9 @@ class ECLASSMapper(SchemaMapper):
     def map_structure_layer(self, layer: StructureLayer) -> Dict[str, Any]:
         """
         Map structure layer. The most important part is the 'parts' list,
-        which we map using map_part_class.
+        which we map using map_parts (grouped by part type).
         """
-        mapped_parts = [self.map_part_class(p) for p in layer.parts]
+        mapped_parts = self.map_parts(layer.parts)
         return {
             "hierarchy": layer.hierarchy, # Pass-through structure for now
             "components": mapped_parts,
@@ -89,35 +109,44 @@ class ECLASSMapper(SchemaMapper):
         Otherwise, look up the PartClass type in the loaded config
         (generated by eclass_build_mapping.py).
         """
-        binding = part.get_binding("ECLASS")
-        
-        eclass_classification = None
-        if binding and binding.class_ids:
-             eclass_classification = binding.class_ids[0] # Take the first one
-        
-        # If no explicit binding, check config mapping
-        if not eclass_classification:
-            domain_mappings = self.config.get("domain_mappings", {})
-            domain_map = domain_mappings.get(part.type)
-            if domain_map:
-                # Use the 'eclass_classes' from config if available (keys are IRDIs)
-                # This is a simplification; we might just want to list *possible* classes
-                classes = domain_map.get("eclass_classes", {})
-                if classes:
-                    eclass_classification = list(classes.keys())[0] # Pick the first available class for this domain
+        return self.map_resolved_parts([part], {part.type: self.resolve_part_type(part.type)})[0]
 
-        return {
-            "id": part.part_id,
-            "name": part.name,
-            "eclassIrdi": eclass_classification,
-            "attributes": part.properties,
-        }
+    def resolve_part_type(self, part_type: str) -> Any:
+        """
+        Config classification for a PartClass type: the first ECLASS class
+        listed under its "domain_mappings" entry, or None.
+        """
+        domain_map = self.config.get("domain_mappings", {}).get(part_type)
+        if domain_map:
+            # Use the 'eclass_classes' from config if available (keys are IRDIs)
+            # This is a simplification; we might just want to list *possible* classes
+            classes = domain_map.get("eclass_classes", {})
+            if classes:
+                return next(iter(classes))  # Pick the first available class for this domain
+        return None
+
+    def map_resolved_parts(self, parts: Sequence[PartClass], resolved: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Map parts with their types' classifications already resolved; an
+        explicit ECLASS binding still takes precedence.
+        """
+        # Most parts have no bindings; the config classification then applies
+        return [
+            {
+                "id": part.part_id,
+                "name": part.name,
+                "eclassIrdi": (part.ontology_bindings and part.primary_class_id("ECLASS")) or resolved[part.type],
+                "attributes": part.properties,
+            }
+            for part in parts
+        ]
 
     def validate_mapping(self, mapped_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
-        Basic validation.
+        Schema check; with full_validation, validate against
+        VALIDATION_RULES (plus config "validation_rules") instead.
         """
-        errors = []
-        if not mapped_data.get("schema") == "ECLASS":
-             errors.append("Schema mismatch")
-        return len(errors) == 0, errors
+        if self.full_validation:
+            return self.check_rules(mapped_data)
+        return self.check_schema(mapped_data)
+
@@ -4,7 +4,7 @@ isa95_mapper.py
 Implementation of SchemaMapper for ISA-95 / B2MML.
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Sequence, Tuple
 import logging
 
 from nmis_dpp.schema_base import SchemaMapper
@@ -25,12 +25,35 @@ class ISA95Mapper(SchemaMapper):
     Mapper for ISA-95 (IEC 62264).
     """
 
+    SCHEMA_NAME = "ISA-95"
+    SCHEMA_VERSION = "V0600"
+    PART_ID_KEY = "ID"
+    STRUCTURE_PARTS_KEY = "NestedEquipment"
+    JSONLD_PREFIX = "isa95"
+
+    #: Equipment hierarchy levels of the ISA-95 role-based equipment model
+    EQUIPMENT_LEVELS = (
+        "Enterprise", "Site", "Area", "ProcessCell", "Unit", "ProductionLine",
+        "WorkCell", "ProductionUnit", "StorageZone", "StorageUnit", "WorkCenter",
+        "WorkUnit", "EquipmentModule", "ControlModule", "Other",
+    )
+
+    VALIDATION_RULES = (
+        {"path": "schema", "equals": "ISA-95"},
+        {"path": "identity.ID", "required": True, "type": "string",
+         "message": "is required (gtin or serial)"},
+        {"path": "identity.EquipmentLevel", "one_of": EQUIPMENT_LEVELS},
+        {"path": "structure.NestedEquipment", "type": "array", "unique_by": "ID"},
+        {"path": "structure.NestedEquipment[*].ID", "required": True, "type": "string"},
+        {"path": "structure.NestedEquipment[*].Properties[*].ID", "required": True},
+    )
+
     def get_schema_name(self) -> str:
-        return "ISA-95"
+        return self.SCHEMA_NAME
 
     def get_schema_version(self) -> str:
         # Assuming B2MML V0600 or similar based on loose context
-        return "V0600"
+        return self.SCHEMA_VERSION
 
     def get_context(self) -> Dict[str, Any]:
         """
@@ -51,7 +74,7 @@ class ISA95Mapper(SchemaMapper):
         }
 
     def map_structure_layer(self, layer: StructureLayer) -> Dict[str, Any]:
-        mapped_parts = [self.map_part_class(p) for p in layer.parts]
+        mapped_parts = self.map_parts(layer.parts)
         return {
             "Hierarchy": layer.hierarchy,
             "NestedEquipment": mapped_parts,
@@ -76,33 +99,45 @@ class ISA95Mapper(SchemaMapper):
         """
         Map part to ISA-95 Equipment element.
         """
-        binding = part.get_binding("ISA-95")
-        
-        equipment_class = None
-        if binding and binding.class_ids:
-            equipment_class = binding.class_ids[0]
-        
-        if not equipment_class:
-            domain_mappings = self.config.get("domain_mappings", {})
-            domain_map = domain_mappings.get(part.type)
-            if domain_map:
-                isa_types = domain_map.get("isa95_type_ids", [])
-                if isa_types:
-                    equipment_class = isa_types[0]
+        return self.map_resolved_parts([part], {part.type: self.resolve_part_type(part.type)})[0]
 
-        return {
-            "ID": part.part_id,
-            "EquipmentClassID": equipment_class,
-            "Description": part.name,
-            # Map properties to EquipmentProperty
-            "Properties": [
-                {"ID": k, "Value": [str(v)]} 
-                for k, v in part.properties.items()
-            ]
-        }
+    def resolve_part_type(self, part_type: str) -> Any:
+        """
+        Config equipment class for a PartClass type: the first ISA-95 type
+        listed under its "domain_mappings" entry, or None.
+        """
+        domain_map = self.config.get("domain_mappings", {}).get(part_type)
+        if domain_map:
+            isa_types = domain_map.get("isa95_type_ids", [])
+            if isa_types:
+                return isa_types[0]
+        return None
+
+    def map_resolved_parts(self, parts: Sequence[PartClass], resolved: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Map parts with their types' equipment classes already resolved; an
+        explicit ISA-95 binding still takes precedence.
+        """
+        # Most parts have no bindings; the config classification then applies
+        return [
+            {
+                "ID": part.part_id,
+                "EquipmentClassID": (part.ontology_bindings and part.primary_class_id("ISA-95")) or resolved[part.type],
+                "Description": part.name,
+                # Map properties to EquipmentProperty
+                "Properties": [
+                    {"ID": k, "Value": [str(v)]}
+                    for k, v in part.properties.items()
+                ]
+            }
+            for part in parts
+        ]
 
     def validate_mapping(self, mapped_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
-        errors = []
-        if not mapped_data.get("schema") == "ISA-95":
-             errors.append("Schema mismatch")
-        return len(errors) == 0, errors
+        """
+        Schema check; with full_validation, validate against
+        VALIDATION_RULES (plus config "validation_rules") instead.
+        """
+        if self.full_validation:
+            return self.check_rules(mapped_data)
+        return self.check_schema(mapped_data)
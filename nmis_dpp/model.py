@@ -1,11 +1,12 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict
-from uuid import UUID
-from datetime import datetime
+from .hierarchy import HierarchyIndex
+from .part_index import PartIndex
 from .part_class import PartClass
+from .versioning import ChangeLog, Versioned, version_of
 
 @dataclass
-class IdentityLayer:
+class IdentityLayer(Versioned):
     """
     Represents product identity attributes for a digital product passport.
 
@@ -21,7 +22,7 @@ class IdentityLayer:
     conformity: List[str]
 
 @dataclass
-class StructureLayer:
+class StructureLayer(Versioned):
     """
     Describes how the product is structurally organized and built.
 
@@ -38,8 +39,112 @@ class StructureLayer:
     materials: List[Dict[str, any]]
     bom_refs: List[str]
 
+    def add_part(self, part: PartClass) -> None:
+        """Append a part and record the change (see versioning.py)."""
+        self.parts.append(part)
+        self.touch()
+
+    def replace_part(self, index: int, part: PartClass) -> None:
+        """
+        Replace parts[index] and record the change as a change of that part
+        only (see changed_parts()); the layer's signature stays the same.
+        """
+        previous, self.parts[index] = self.parts[index], part
+        state = self.__dict__
+        state.pop("_part_index", None)
+        state.pop("_hierarchy_index", None)
+        log = state.get("_parts_log")
+        if log is not None:
+            log.positions.pop(id(previous), None)
+            log.attach(part, index)
+        part.touch()
+
+    def changed_parts(self, since: int) -> List[int]:
+        """
+        Positions of the parts modified after version `since`, in order.
+
+        `since` is a version taken before the earlier state was read (e.g.
+        versioning.next_version()). Tracked parts report their own
+        assignments and touch() calls to the layer (versioning.ChangeLog),
+        so this costs O(changes). Otherwise (the first call, after the layer's signature
+        changed, or for a `since` older than the tracking) every part's
+        version is compared, and tracking of the current parts starts.
+
+        Only stamped changes are seen: in-place edits of a part's nested
+        values need part.touch(), and a list item replaced in place needs
+        replace_part() (or touch() on the layer).
+        """
+        signature = self.signature()
+        log = self.__dict__.get("_parts_log")
+        if log is not None and log.signature == signature and since >= log.start:
+            return log.modified(since)
+        parts = self.parts
+        changed = [index for index, part in enumerate(parts) if version_of(part) > since]
+        log = ChangeLog(parts, signature, since)
+        log.changed.update((id(parts[index]), parts[index]) for index in changed)
+        object.__setattr__(self, "_parts_log", log)  # not a modification
+        return changed
+
+    def hierarchy_index(self) -> HierarchyIndex:
+        """
+        Compiled hierarchy of this layer (see hierarchy.HierarchyIndex).
+
+        Built on first use and cached until the layer's version signature
+        changes. As for part_index(), changing a part's part_id or replacing
+        an item of parts in place must be followed by touch() on the layer.
+        """
+        signature = self.signature()
+        cached = self.__dict__.get("_hierarchy_index")
+        if cached is None or cached[0] != signature:
+            cached = (signature, HierarchyIndex(self.hierarchy, self.part_index()))
+            object.__setattr__(self, "_hierarchy_index", cached)  # not a modification
+        return cached[1]
+
+    def part_index(self) -> PartIndex:
+        """
+        part_id and type lookups over this layer's parts (see part_index.py).
+
+        Built on first use and cached until the layer's version signature
+        changes. The signature does not see edits that keep the list length:
+        changing a part's part_id or type in place, or replacing an item in
+        place (layer.parts[i] = part), must be followed by touch() on the
+        layer (add_part(), replace_part() and assigning layer.parts need not).
+
+        Raises:
+            ValueError: If part ids are not unique.
+        """
+        signature = self.signature()
+        cached = self.__dict__.get("_part_index")
+        if cached is None or cached[0] != signature:
+            cached = (signature, PartIndex(self.parts))
+            object.__setattr__(self, "_part_index", cached)  # not a modification
+        return cached[1]
+
+    def get_part(self, part_id: str) -> Optional[PartClass]:
+        """
+        The part with this part_id, or None (O(1), via part_index()).
+
+        A cached hit is checked against the current list (the same object
+        still at its position, with this part_id), so a part renamed or
+        replaced in place is never returned. A part put in place of another
+        (layer.parts[i] = part) is only found after touch().
+        """
+        index = self.part_index()
+        position = index.positions.get(part_id)
+        if position is not None:
+            parts, part = self.parts, index.by_id[part_id]
+            if position >= len(parts) or parts[position] is not part or part.part_id != part_id:
+                # Edited in place without touch(): record it and rebuild once
+                self.touch()
+                index = self.part_index()
+        return index.by_id.get(part_id)
+
+    def parts_of_type(self, part_type: str) -> List[PartClass]:
+        """Parts of one type, in parts order (via part_index(); see there for touch())."""
+        return self.part_index().of_type(part_type)
+
 @dataclass
-class LifecycleLayer:
+class LifecycleLayer(Versioned):
     """
     Tracks manufacturing, usage, and serviceability data across the product's life.
 
@@ -56,8 +161,13 @@ class LifecycleLayer:
     events: List[Dict[str, any]]
     end_of_life: Dict[str, any]
 
+    def add_event(self, event: Dict[str, any]) -> None:
+        """Append a lifecycle event and record the change (see versioning.py)."""
+        self.events.append(event)
+        self.touch()
+
 @dataclass
-class RiskLayer:
+class RiskLayer(Versioned):
     """
     Criticality, reliability, and security information relevant to product risk assessment.
 
@@ -71,7 +181,7 @@ class RiskLayer:
     security: Dict[str, any]
 
 @dataclass
-class SustainabilityLayer:
+class SustainabilityLayer(Versioned):
     """
     Sustainability and circularity attributes for product impact and end-of-life eligibility.
 
@@ -87,7 +197,7 @@ class SustainabilityLayer:
     remanufacture: Dict[str, any]
 
 @dataclass
-class ProvenanceLayer:
+class ProvenanceLayer(Versioned):
     """
     Provenance and trust metadata for the product.
 
@@ -16,6 +16,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
+from .versioning import Versioned
+
 
 # ---------------------------------------------------------------------------
 # Ontology binding model (ontology-agnostic)
@@ -64,7 +66,7 @@ class OntologyBinding:
 # ---------------------------------------------------------------------------
 
 @dataclass
-class PartClass:
+class PartClass(Versioned):
     """
     Base class for all part types.
 
@@ -160,6 +162,8 @@ class PartClass:
             if metadata:
                 existing.metadata.update(metadata)
 
+        self.touch()
+
     def get_binding(self, ontology_name: str) -> Optional[OntologyBinding]:
         """
         Retrieve the OntologyBinding for a given ontology, if present.
@@ -172,6 +176,20 @@ class PartClass:
         """
         return self.ontology_bindings.get(ontology_name)
 
+    def primary_class_id(self, ontology_name: str) -> Optional[str]:
+        """
+        First class id of the binding to an ontology, if any.
+
+        Args:
+            ontology_name: Name of the ontology.
+
+        Returns:
+            The first of the binding's class_ids, or None if the part is not
+            bound or the binding lists no classes.
+        """
+        binding = self.ontology_bindings.get(ontology_name)
+        return binding.class_ids[0] if binding is not None and binding.class_ids else None
+
     def allowed_item_types(self, ontology_name: str) -> List[str]:
         """
         Return a list of ontology item types (case classes) that this
@@ -563,3 +581,19 @@ class Fastener(PartClass):
     diameter: Optional[float] = None
     length: Optional[float] = None
     strength: Optional[float] = None
+
+
+# ---------------------------------------------------------------------------
+# Type registry
+# ---------------------------------------------------------------------------
+
+PART_CLASS_TYPES: Dict[str, type] = {
+    cls.__name__: cls
+    for cls in (
+        PartClass, PowerConversion, EnergyStorage, Actuator, Sensor,
+        ControlUnit, UserInterface, Thermal, Fluidics, Structural,
+        Transmission, Protection, Connectivity, SoftwareModule,
+        Consumable, Fastener,
+    )
+}
+"""Mapping from PartClass.type labels to the corresponding dataclass."""
@@ -0,0 +1,101 @@
+"""
+part_index.py
+
+Lookup tables for the parts of a StructureLayer.
+
+Joining anything against parts (BOM references, hierarchy nodes, lifecycle
+events) by scanning StructureLayer.parts is O(parts) per lookup, so O(n*m)
+per join. PartIndex maps part_id -> part (built in one pass, duplicate ids
+rejected) and, on first use, type -> parts:
+
+    index = layer.part_index()              # cached until the layer changes
+    index["S003"]                           # KeyError if unknown
+    layer.get_part("S003")                  # None if unknown
+    index.get_many(["S003", "P001"])        # one result per id, in order
+    layer.parts_of_type("Sensor")
+
+StructureLayer caches the index against its version signature (see
+versioning.py), so appending or removing parts, or assigning a new parts
+list, rebuilds it. Edits that keep the list length must be followed by
+touch() on the layer: changing a part's part_id or type in place, and
+replacing an item in place (layer.parts[i] = part).
+StructureLayer.get_part() also checks every hit against the current list
+and rebuilds when the part was renamed or replaced.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .part_class import PartClass
+
+
+class PartIndex:
+    """
+    part_id and type lookups over a sequence of parts (a snapshot).
+
+    Args:
+        parts: StructureLayer.parts.
+
+    Raises:
+        ValueError: If part ids are not unique (the duplicates are named).
+    """
+
+    def __init__(self, parts: Sequence[PartClass]) -> None:
+        self.by_id: Dict[str, PartClass] = {part.part_id: part for part in parts}
+        if len(self.by_id) != len(parts):
+            duplicates = sorted(
+                str(part_id) for part_id, count in Counter(part.part_id for part in parts).items() if count > 1
+            )
+            shown = ", ".join(repr(part_id) for part_id in duplicates[:5])
+            more = f" (+{len(duplicates) - 5} more)" if len(duplicates) > 5 else ""
+            raise ValueError(f"Duplicate part ids: {shown}{more}")
+        #: part_id -> index in the parts sequence
+        self.positions: Dict[str, int] = {part_id: index for index, part_id in enumerate(self.by_id)}
+        self._by_type: Optional[Dict[str, List[PartClass]]] = None
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, part_id: object) -> bool:
+        return part_id in self.by_id
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.by_id)
+
+    def __getitem__(self, part_id: str) -> PartClass:
+        try:
+            return self.by_id[part_id]
+        except KeyError:
+            raise KeyError(f"Unknown part id {part_id!r}") from None
+
+    def __repr__(self) -> str:
+        return f"PartIndex(parts={len(self)})"
+
+    def get(self, part_id: str, default: Optional[PartClass] = None) -> Optional[PartClass]:
+        """The part with this id, or `default`."""
+        return self.by_id.get(part_id, default)
+
+    def get_many(self, part_ids: Iterable[str]) -> List[Optional[PartClass]]:
+        """One part (or None if unknown) per id, in order, e.g. for BOM joins."""
+        get = self.by_id.get
+        return [get(part_id) for part_id in part_ids]
+
+    @property
+    def by_type(self) -> Dict[str, List[PartClass]]:
+        """type -> parts of that type, in StructureLayer.parts order (built on first use)."""
+        if self._by_type is None:
+            by_type: Dict[str, List[PartClass]] = {}
+            for part in self.by_id.values():
+                group = by_type.get(part.type)
+                if group is None:
+                    by_type[part.type] = [part]
+                else:
+                    group.append(part)
+            self._by_type = by_type
+        return self._by_type
+
+    def of_type(self, part_type: str) -> List[PartClass]:
+        """Parts of one type (a new list; empty if there are none)."""
+        return list(self.by_type.get(part_type, ()))
@@ -15,9 +15,12 @@ new mapper subclass and (optionally) a new YAML config are needed.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import asdict
-from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import asdict, dataclass, replace
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Sequence, TextIO, Tuple
+import copy
+import json
 import logging
+import time
 
 from nmis_dpp.model import (
     DigitalProductPassport,
@@ -29,11 +32,57 @@ from nmis_dpp.model import (
     ProvenanceLayer,
 )
 from nmis_dpp.part_class import PartClass
+from nmis_dpp.cache import PartMappingCache, part_fingerprint
+from nmis_dpp.instrumentation import Instrumentation
+from nmis_dpp.utils import config_fingerprint
+from nmis_dpp.validation import BatchReport, ListStreamValidator, MappingValidationError, ValidationIssue, Validator
+from nmis_dpp.versioning import next_version
 
 
 logger = logging.getLogger(__name__)
 
 
+#: (layer name, layer mapping method); the name is both the DigitalProductPassport
+#: attribute and the key in the mapped document.
+LAYER_MAPPERS: Tuple[Tuple[str, str], ...] = (
+    ("identity", "map_identity_layer"),
+    ("structure", "map_structure_layer"),
+    ("lifecycle", "map_lifecycle_layer"),
+    ("risk", "map_risk_layer"),
+    ("sustainability", "map_sustainability_layer"),
+    ("provenance", "map_provenance_layer"),
+)
+
+#: Parts mapped (and held in memory) at a time by SchemaMapper.iter_map_json().
+STREAM_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class MappingState:
+    """
+    Versions of the passport content a mapped document was computed from.
+
+    Attributes:
+        mapper_token: Identifies the mapper instance (and thus configuration).
+        layers: Layer name -> Versioned.signature() of that layer.
+        since: Version taken before mapping started; parts stamped after it
+               have changed (StructureLayer.changed_parts).
+    """
+    mapper_token: int
+    layers: Dict[str, Tuple[int, ...]]
+    since: int
+
+
+class MappedDPP(dict):
+    """
+    Result of SchemaMapper.map_dpp(): a plain dict that additionally carries
+    the MappingState it was computed from, so remap() can tell which layers
+    and parts changed since.
+    """
+
+    mapping_state: Optional[MappingState] = None
+
+
 class SchemaMapper(ABC):
     """
     Abstract base class for mapping Digital Product Passport (DPP) objects
@@ -75,7 +124,52 @@ class SchemaMapper(ABC):
               semantic/linked-data export.
     """
 
-    def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
+    #: Class-level schema metadata (what get_schema_name()/get_schema_version()
+    #: return). When set, SchemaRegistry.register() reads the name from the
+    #: class instead of instantiating the mapper.
+    SCHEMA_NAME: Optional[str] = None
+    SCHEMA_VERSION: Optional[str] = None
+
+    #: Whether one instance may be used by several threads at once. Mappers
+    #: that keep mutable per-call state set this to False; SchemaRegistry then
+    #: maps through pooled instances (see SchemaRegistry.lease).
+    THREAD_SAFE: bool = True
+
+    #: Key holding the part identifier in the output of map_part_class().
+    #: Used to re-stamp cached part mappings with the requesting part's id.
+    PART_ID_KEY: str = "part_id"
+
+    #: Key of the mapped parts list in map_structure_layer() output, in the
+    #: order of StructureLayer.parts. Lets remap() re-map only changed parts;
+    #: None re-maps the whole structure layer whenever a part changes.
+    STRUCTURE_PARTS_KEY: Optional[str] = None
+
+    #: Prefix of get_context() under which the keys of mapped documents are
+    #: defined for JSON-LD export (see jsonld.py): "serialNumber" is written
+    #: as "<prefix>:serialNumber". None leaves keys uncompacted.
+    JSONLD_PREFIX: Optional[str] = None
+
+    #: Declarative rules for mapped documents (see validation.Validator),
+    #: extended by the config's "validation_rules" list. Compiled once per
+    #: instance; check_rules() runs them.
+    VALIDATION_RULES: Tuple[Dict[str, Any], ...] = ()
+
+    #: Whether validate_mapping() (and so map_dpp()/remap()) runs the full
+    #: VALIDATION_RULES, or only the cheap check_schema(). A config
+    #: "full_validation" entry overrides it. check_rules() and
+    #: validate_batch() always run the full rules, e.g. at export time.
+    FULL_VALIDATION: bool = False
+
+    #: Hooks receiving per-layer timings and counters (see instrumentation.py).
+    #: None (the default) skips all timing; set it on an instance or through
+    #: SchemaRegistry(instrumentation=...).
+    instrumentation: Optional[Instrumentation] = None
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        part_cache: Optional[PartMappingCache] = None,
+    ) -> None:
         """
         Initialize the mapper with an optional configuration.
 
@@ -83,9 +177,22 @@ class SchemaMapper(ABC):
             config:
                 Configuration dictionary for the mapper, typically loaded from
                 a YAML or JSON file (e.g. mapping tables, IRDIs, required fields).
-                If None, an empty dict is used.
+                If None, an empty dict is used. A positive "part_cache_size"
+                entry enables part mapping memoization (see enable_part_cache).
+            part_cache:
+                Optional (possibly shared) PartMappingCache to memoize
+                map_part_class() results with.
         """
         self.config: Dict[str, Any] = config or {}
+        self._config_version: Optional[str] = None
+        self.part_cache: Optional[PartMappingCache] = None
+        self._mapper_token = next_version()
+        self._validator: Optional[Validator] = None
+
+        cache_size = self.config.get("part_cache_size")
+        if part_cache is not None or cache_size:
+            self.enable_part_cache(cache=part_cache, maxsize=cache_size or None)
+
         logger.info("Initialized %s mapper.", self.get_schema_name())
 
     # -------------------------------------------------------------------------
@@ -232,6 +339,65 @@ class SchemaMapper(ABC):
         """
         raise NotImplementedError
 
+    @property
+    def validator(self) -> Validator:
+        """VALIDATION_RULES plus config "validation_rules", compiled on first use."""
+        if self._validator is None:
+            rules = list(self.VALIDATION_RULES) + list(self.config.get("validation_rules") or ())
+            self._validator = Validator(rules)
+        return self._validator
+
+    @property
+    def full_validation(self) -> bool:
+        """FULL_VALIDATION, unless the config's "full_validation" entry says otherwise."""
+        return bool(self.config.get("full_validation", self.FULL_VALIDATION))
+
+    def check_schema(self, mapped_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Cheap structural check: the document is tagged with this schema's name.
+
+        Returns:
+            Tuple[bool, List[str]]: (is_valid, error messages).
+        """
+        if mapped_data.get("schema") != self.get_schema_name():
+            return False, ["Schema mismatch"]
+        return True, []
+
+    def check_rules(self, mapped_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Run the compiled validation rules; a ready-made validate_mapping() body.
+
+        All issues are collected in one pass. Warnings are logged and do not
+        make the document invalid.
+
+        Returns:
+            Tuple[bool, List[str]]: (is_valid, ["$.path: message", ...]).
+        """
+        errors = []
+        for issue in self.validator.validate(mapped_data):
+            if issue.severity == "error":
+                errors.append(str(issue))
+            else:
+                logger.warning("%s validation warning: %s", self.get_schema_name(), issue)
+        return not errors, errors
+
+    def validate_issues(self, mapped_data: Dict[str, Any]) -> List[ValidationIssue]:
+        """Return every rule violation (errors and warnings) with its JSON path."""
+        return self.validator.validate(mapped_data)
+
+    def validate_batch(self, documents: Iterable[Dict[str, Any]], max_failures: int = 100) -> BatchReport:
+        """
+        Validate many mapped documents against this mapper's rules.
+
+        Args:
+            documents: Mapped documents (e.g. map_dpp() results).
+            max_failures: Number of invalid documents whose issues are kept.
+
+        Returns:
+            BatchReport: Counts, issue statistics by rule/path and throughput.
+        """
+        return self.validator.validate_batch(documents, max_failures=max_failures)
+
     @abstractmethod
     def get_context(self) -> Dict[str, Any]:
         """
@@ -272,43 +438,316 @@ class SchemaMapper(ABC):
 
         Returns:
             Dict[str, Any]:
-                Complete schema-compliant representation.
+                Complete schema-compliant representation (a MappedDPP, which
+                remap() can later update incrementally).
 
         Raises:
-            ValueError:
-                If validation fails (validate_mapping() returns is_valid=False).
+            MappingValidationError:
+                A ValueError raised if validation fails (validate_mapping()
+                returns is_valid=False); its .errors lists every message.
             Exception:
                 Any error raised during mapping is logged and re-raised.
         """
+        instrumentation = self.instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
         try:
             logger.info("Starting mapping to %s ...", self.get_schema_name())
 
-            mapped: Dict[str, Any] = {
-                "schema": self.get_schema_name(),
-                "schema_version": self.get_schema_version(),
-                "@context": self.get_context(),
-                "identity": self.map_identity_layer(dpp.identity),
-                "structure": self.map_structure_layer(dpp.structure),
-                "lifecycle": self.map_lifecycle_layer(dpp.lifecycle),
-                "risk": self.map_risk_layer(dpp.risk),
-                "sustainability": self.map_sustainability_layer(dpp.sustainability),
-                "provenance": self.map_provenance_layer(dpp.provenance),
-            }
+            state = self._mapping_state(dpp)
+            mapped = MappedDPP(
+                {
+                    "schema": self.get_schema_name(),
+                    "schema_version": self.get_schema_version(),
+                    "@context": self.get_context(),
+                }
+            )
+            for key, method in LAYER_MAPPERS:
+                mapped[key] = self._map_layer(key, method, getattr(dpp, key), instrumentation)
 
             # Validate mapped data for the target schema
-            is_valid, errors = self.validate_mapping(mapped)
-            if not is_valid:
-                error_msg = f"Validation failed: {'; '.join(errors)}"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
+            self._check_mapping(mapped)
+            mapped.mapping_state = state
 
             logger.info("Successfully mapped DPP to %s.", self.get_schema_name())
+            if instrumentation is not None:
+                instrumentation.dpp_mapped(self.get_schema_name(), time.perf_counter() - started, None)
             return mapped
 
         except Exception as exc:
             logger.error("Error during mapping to %s: %s", self.get_schema_name(), exc)
+            if instrumentation is not None:
+                instrumentation.dpp_mapped(self.get_schema_name(), time.perf_counter() - started, exc)
+            raise
+
+    def remap(self, dpp: DigitalProductPassport, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Bring a previous map_dpp() result up to date with the passport.
+
+        Only layers whose version signature changed are re-mapped. If just
+        some parts changed (the StructureLayer itself did not), only those
+        parts are re-mapped and spliced into the previous parts list (see
+        STRUCTURE_PARTS_KEY). Unchanged layer dicts are shared with
+        `previous`, which is left untouched.
+
+        Changes are detected through versioning.Versioned: attribute
+        assignment, replaced layer objects, list/dict length changes of a
+        layer and explicit touch() calls. Parts are found through
+        StructureLayer.changed_parts(), so the cost is proportional to the
+        change: nested edits of a part need part.touch(), and a part
+        replaced in the list needs StructureLayer.replace_part() (or
+        touch() on the layer). map_dpp() records only a version and the
+        layer signatures, nothing per part.
+
+        Args:
+            dpp:
+                The (modified) DigitalProductPassport.
+            previous:
+                Earlier result of map_dpp()/remap() by this mapper instance
+                for the same passport. Anything else (e.g. a dict loaded from
+                JSON) falls back to a full map_dpp().
+
+        Returns:
+            Dict[str, Any]: Complete schema-compliant representation.
+
+        Raises:
+            ValueError:
+                If validation fails (validate_mapping() returns is_valid=False).
+        """
+        state = getattr(previous, "mapping_state", None)
+        if state is None or state.mapper_token != self._mapper_token:
+            return self.map_dpp(dpp)
+
+        instrumentation = self.instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        try:
+            current = self._mapping_state(dpp)
+            mapped = MappedDPP(previous)
+            changed = []
+
+            for key, method in LAYER_MAPPERS:
+                if current.layers[key] != state.layers[key]:
+                    mapped[key] = self._map_layer(key, method, getattr(dpp, key), instrumentation)
+                    changed.append(key)
+
+            if "structure" not in changed:
+                positions = dpp.structure.changed_parts(state.since)
+                if positions:
+                    mapped["structure"] = self._remap_parts(dpp.structure, previous["structure"], positions)
+                    changed.append("structure")
+
+            if changed:
+                logger.debug("Re-mapped %s to %s.", ", ".join(changed), self.get_schema_name())
+                self._check_mapping(mapped)
+            mapped.mapping_state = current
+        except Exception as exc:
+            if instrumentation is not None:
+                instrumentation.dpp_mapped(self.get_schema_name(), time.perf_counter() - started, exc)
+            raise
+
+        if instrumentation is not None:
+            instrumentation.dpp_mapped(self.get_schema_name(), time.perf_counter() - started, None)
+        return mapped
+
+    def iter_map_json(self, dpp: DigitalProductPassport, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[str]:
+        """
+        Map a passport and yield its JSON text in fragments.
+
+        The fragments join to json.dumps(self.map_dpp(dpp)), but the mapped
+        parts list (STRUCTURE_PARTS_KEY) is never built: all other layers
+        are mapped first (the structure layer without its parts), then the
+        parts are mapped, validated and encoded batch_size at a time. Peak
+        memory is the source passport plus one batch of mapped parts.
+
+        validate_mapping() runs once, on the document with an empty parts
+        list. With full_validation, the part rules of VALIDATION_RULES then
+        run on each batch (validation.ListStreamValidator): issue paths use
+        the part's index in the whole list, and unique_by checks span all
+        batches. Mappers without a STRUCTURE_PARTS_KEY are mapped with
+        map_dpp() and yield one fragment.
+
+        Args:
+            dpp: The DigitalProductPassport to map.
+            batch_size: Parts mapped per batch.
+
+        Yields:
+            str: JSON text fragments (header, batches of parts, footer).
+
+        Raises:
+            MappingValidationError:
+                If the document or a batch of parts fails validation; the
+                fragments yielded so far are then an incomplete document.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        parts_key = self.STRUCTURE_PARTS_KEY
+        if parts_key is None:
+            yield json.dumps(self.map_dpp(dpp))
+            return
+
+        instrumentation = self.instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        parts = dpp.structure.parts
+        dumps = json.dumps
+        try:
+            document: Dict[str, Any] = {
+                "schema": self.get_schema_name(),
+                "schema_version": self.get_schema_version(),
+                "@context": self.get_context(),
+            }
+            for key, method in LAYER_MAPPERS:
+                layer = getattr(dpp, key)
+                if key == "structure":
+                    layer = replace(layer, parts=[])
+                document[key] = self._map_layer(key, method, layer, instrumentation)
+            structure = document["structure"]
+            if parts_key not in structure:
+                raise ValueError(f"map_structure_layer() result has no {parts_key!r} key")
+            self._check_mapping(document)  # header once, with an empty parts list
+            items = ListStreamValidator(self.validator.rules, f"structure.{parts_key}") if self.full_validation else None
+
+            separator = "{"
+            for key, value in document.items():
+                if key != "structure":
+                    yield separator + dumps(key) + ": " + dumps(value)
+                    separator = ", "
+                    continue
+                yield separator + dumps(key) + ": "
+                separator = ", "
+                inner = "{"
+                for structure_key, structure_value in structure.items():
+                    if structure_key != parts_key:
+                        yield inner + dumps(structure_key) + ": " + dumps(structure_value)
+                        inner = ", "
+                        continue
+                    yield inner + dumps(structure_key) + ": ["
+                    inner = ", "
+                    for start in range(0, len(parts), batch_size):
+                        batch = self.map_parts(parts[start:start + batch_size])
+                        if items is not None:
+                            self._check_issues(items.validate(batch))
+                        yield (", " if start else "") + dumps(batch)[1:-1]
+                    yield "]"
+                yield "}"
+            yield "}"
+        except Exception as exc:
+            logger.error("Error during streaming mapping to %s: %s", self.get_schema_name(), exc)
+            if instrumentation is not None:
+                instrumentation.dpp_mapped(self.get_schema_name(), time.perf_counter() - started, exc)
             raise
 
+        if instrumentation is not None:
+            schema = self.get_schema_name()
+            instrumentation.parts_mapped(schema, len(parts))
+            instrumentation.dpp_mapped(schema, time.perf_counter() - started, None)
+
+    def write_dpp_json(
+        self,
+        dpp: DigitalProductPassport,
+        out: TextIO,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> int:
+        """
+        Stream the mapped passport as JSON to a text file (see iter_map_json()).
+
+        A validation error leaves a partial document in `out`; write to a
+        temporary file and rename it on success where that matters.
+
+        Args:
+            dpp: The DigitalProductPassport to map.
+            out: Text file opened for writing.
+            batch_size: Parts mapped per batch.
+
+        Returns:
+            int: Number of characters written.
+        """
+        written = 0
+        write = out.write
+        for fragment in self.iter_map_json(dpp, batch_size):
+            write(fragment)
+            written += len(fragment)
+        return written
+
+    def _map_layer(
+        self,
+        key: str,
+        method: str,
+        layer: Any,
+        instrumentation: Optional[Instrumentation],
+    ) -> Dict[str, Any]:
+        """Call one layer mapping method, reporting its timing if instrumented."""
+        if instrumentation is None:
+            return getattr(self, method)(layer)
+
+        started = time.perf_counter()
+        result = getattr(self, method)(layer)
+        schema = self.get_schema_name()
+        instrumentation.layer_mapped(schema, key, time.perf_counter() - started)
+        if key == "structure":
+            instrumentation.parts_mapped(schema, len(layer.parts))
+        return result
+
+    def _remap_parts(
+        self,
+        layer: StructureLayer,
+        previous: Dict[str, Any],
+        changed: List[int],
+    ) -> Dict[str, Any]:
+        """Re-map the parts at the `changed` positions, reusing all other mapped parts."""
+        parts_key = self.STRUCTURE_PARTS_KEY
+        mapped_parts = previous.get(parts_key) if parts_key else None
+        if mapped_parts is None or len(mapped_parts) != len(layer.parts):
+            return self.map_structure_layer(layer)
+
+        instrumentation = self.instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+
+        mapped_parts = list(mapped_parts)
+        parts = layer.parts
+        for index, mapped in zip(changed, self.map_parts([parts[index] for index in changed])):
+            mapped_parts[index] = mapped
+        remapped = len(changed)
+
+        if instrumentation is not None:
+            schema = self.get_schema_name()
+            instrumentation.layer_mapped(schema, "structure", time.perf_counter() - started)
+            instrumentation.parts_mapped(schema, remapped)
+        return {**previous, parts_key: mapped_parts}
+
+    def _mapping_state(self, dpp: DigitalProductPassport) -> MappingState:
+        # Taken before the passport is read, so concurrent edits count as changes
+        since = next_version()
+        return MappingState(
+            mapper_token=self._mapper_token,
+            layers={key: getattr(dpp, key).signature() for key, _ in LAYER_MAPPERS},
+            since=since,
+        )
+
+    def _check_issues(self, issues: List[ValidationIssue]) -> None:
+        """Log warnings and raise MappingValidationError for errors, like check_rules()/_check_mapping()."""
+        errors = []
+        for issue in issues:
+            if issue.severity == "error":
+                errors.append(str(issue))
+            else:
+                logger.warning("%s validation warning: %s", self.get_schema_name(), issue)
+        if errors:
+            error_msg = f"Validation failed: {'; '.join(errors)}"
+            logger.error(error_msg)
+            raise MappingValidationError(error_msg, errors)
+
+    def _check_mapping(self, mapped: Dict[str, Any]) -> None:
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            is_valid, errors = self.validate_mapping(mapped)
+        else:
+            started = time.perf_counter()
+            is_valid, errors = self.validate_mapping(mapped)
+            instrumentation.validated(self.get_schema_name(), time.perf_counter() - started, is_valid)
+        if not is_valid:
+            error_msg = f"Validation failed: {'; '.join(errors)}"
+            logger.error(error_msg)
+            raise MappingValidationError(error_msg, errors)
+
     def map_part_class(self, part: PartClass) -> Dict[str, Any]:
         """
         Map a single PartClass instance into the target schema representation.
@@ -327,6 +766,150 @@ class SchemaMapper(ABC):
         """
         return asdict(part)
 
+    # -------------------------------------------------------------------------
+    # Grouped part mapping
+    # -------------------------------------------------------------------------
+
+    def resolve_part_type(self, part_type: str) -> Any:
+        """
+        Per-type mapping data shared by all parts of one type.
+
+        Mappers whose part mapping looks up the part's `type` (e.g. in the
+        config's "domain_mappings") override this together with
+        map_resolved_parts(); map_parts() then resolves each type once per
+        call instead of once per part.
+
+        Args:
+            part_type: PartClass.type.
+
+        Returns:
+            Any: Whatever map_resolved_parts() expects (None by default).
+        """
+        return None
+
+    def map_resolved_parts(self, parts: Sequence[PartClass], resolved: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Map parts, in order, given resolve_part_type() of every part type.
+
+        Overrides should map in one tight loop (e.g. a comprehension), and
+        map_part_class() should be the single-part case of it.
+
+        Args:
+            parts: Parts to map.
+            resolved: resolve_part_type() result per PartClass.type.
+
+        Returns:
+            List[Dict[str, Any]]: One mapped part per part, in the same order.
+        """
+        map_part = self.map_part_class
+        return [map_part(part) for part in parts]
+
+    def map_parts(self, parts: Sequence[PartClass]) -> List[Dict[str, Any]]:
+        """
+        Map parts, in order (as map_part_class() would, one by one).
+
+        The parts' types are collected once and each is resolved once
+        (resolve_part_type()); all parts are then mapped in one pass by
+        map_resolved_parts(). Mappers without a resolve_part_type(),
+        subclasses that only override map_part_class(), and mappers with a
+        part cache (see enable_part_cache) map part by part.
+
+        Args:
+            parts: Parts to map, e.g. StructureLayer.parts.
+
+        Returns:
+            List[Dict[str, Any]]: One mapped part per part, in the same order.
+        """
+        if not self._maps_parts_grouped():
+            map_part = self.map_part_class
+            return [map_part(part) for part in parts]
+        resolve = self.resolve_part_type
+        resolved = {part_type: resolve(part_type) for part_type in {part.type for part in parts}}
+        return self.map_resolved_parts(parts, resolved)
+
+    def _maps_parts_grouped(self) -> bool:
+        cls = type(self)
+        if "map_part_class" in self.__dict__ or cls.resolve_part_type is SchemaMapper.resolve_part_type:
+            return False
+        # The most derived definition decides: a subclass overriding only
+        # map_part_class() must still have it called for every part.
+        for klass in cls.__mro__:
+            attributes = vars(klass)
+            if "map_resolved_parts" in attributes or "map_part_class" in attributes:
+                return "map_resolved_parts" in attributes and klass is not SchemaMapper
+        return False
+
+    # -------------------------------------------------------------------------
+    # Part mapping memoization
+    # -------------------------------------------------------------------------
+
+    @property
+    def config_version(self) -> str:
+        """
+        Stable fingerprint of this mapper's configuration.
+
+        Part cache keys include it, so a cache shared between mappers (or
+        kept across a config reload) never serves results computed from a
+        different configuration. Computed once, on first use.
+        """
+        if self._config_version is None:
+            self._config_version = config_fingerprint(self.config)
+        return self._config_version
+
+    def enable_part_cache(
+        self,
+        cache: Optional[PartMappingCache] = None,
+        maxsize: Optional[int] = None,
+    ) -> PartMappingCache:
+        """
+        Memoize map_part_class() by part content.
+
+        Parts with identical class, name, type, properties, typed fields and
+        ontology bindings are mapped once; later requests get a copy of the
+        cached result with PART_ID_KEY set to their own part_id. Cached
+        results must be treated as read-only below the top level.
+
+        Args:
+            cache: Existing cache to use (may be shared between mappers).
+            maxsize: Size of a newly created cache (ignored if cache is given).
+
+        Returns:
+            PartMappingCache: The active cache, for inspecting its counters.
+        """
+        if cache is None:
+            cache = PartMappingCache(maxsize) if maxsize else PartMappingCache()
+        self.part_cache = cache
+
+        uncached = type(self).map_part_class.__get__(self)
+        schema = self.get_schema_name()
+        id_key = self.PART_ID_KEY
+
+        def map_part_class(part: PartClass) -> Dict[str, Any]:
+            key = (schema, self.config_version, part_fingerprint(part))
+            mapped = cache.get(key)
+            instrumentation = self.instrumentation
+            if instrumentation is not None:
+                instrumentation.part_cache_lookup(schema, mapped is not None)
+            if mapped is None:
+                mapped = uncached(part)
+                cache.put(key, copy.deepcopy(mapped))
+                return mapped
+            mapped = dict(mapped)
+            if id_key in mapped:
+                mapped[id_key] = part.part_id
+            return mapped
+
+        map_part_class.__doc__ = uncached.__doc__
+        # The instance attribute shadows the class method, so every caller
+        # (map_structure_layer, SchemaRegistry.map_part, ...) goes through it.
+        self.map_part_class = map_part_class  # type: ignore[method-assign]
+        return cache
+
+    def disable_part_cache(self) -> None:
+        """Stop memoizing map_part_class(); the cache object itself is left intact."""
+        self.__dict__.pop("map_part_class", None)
+        self.part_cache = None
+
     # -------------------------------------------------------------------------
     # Config access helper
     # -------------------------------------------------------------------------
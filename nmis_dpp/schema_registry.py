@@ -14,17 +14,28 @@ Responsibilities:
 
 This file does NOT contain schema-specific logic; that lives in mapper classes
 (e.g., ECLASSMapper, ISA95Mapper) which inherit from SchemaMapper.
+
+Third-party mappers can be installed as plugins by declaring an entry point
+in the "nmis_dpp.mappers" group, named after the canonical schema name:
+
+    [project.entry-points."nmis_dpp.mappers"]
+    AAS = "acme_dpp.aas_mapper:AASMapper"
+
+Plugins are registered lazily: their module is imported the first time the
+schema is requested.
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from contextlib import contextmanager
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Type, Optional, List, Any, Union
-
-import yaml
+from typing import Callable, Dict, Iterator, Type, Optional, List, Any, Tuple, Union
 
+from .instrumentation import Instrumentation
 from .schema_base import SchemaMapper
 from .model import (
     DigitalProductPassport,
@@ -39,6 +50,55 @@ from .part_class import PartClass
 
 logger = logging.getLogger(__name__)
 
+#: Entry point group scanned for plugin mappers.
+PLUGIN_ENTRY_POINT_GROUP = "nmis_dpp.mappers"
+
+#: Default maximum number of idle instances kept per schema by lease().
+DEFAULT_POOL_SIZE = 8
+
+#: Default seconds between config file checks in watch mode.
+DEFAULT_WATCH_INTERVAL = 2.0
+
+# (mtime_ns, size) of a config file, or None if it does not exist
+FileStamp = Optional[Tuple[int, int]]
+
+# Called as listener(canonical_name, new_mapper_or_None) after a reload
+ReloadListener = Callable[[str, Optional[SchemaMapper]], None]
+
+
+def _declared_schema_name(mapper_class: Type[SchemaMapper]) -> Optional[str]:
+    """
+    SCHEMA_NAME of a mapper class, if get_schema_name() is known to agree.
+
+    An inherited SCHEMA_NAME is ignored when a subclass overrides
+    get_schema_name() without setting SCHEMA_NAME again: the closest class
+    in the MRO defining either attribute decides.
+    """
+    for cls in mapper_class.__mro__:
+        namespace = vars(cls)
+        if "SCHEMA_NAME" in namespace:
+            return namespace["SCHEMA_NAME"] or None
+        if "get_schema_name" in namespace:
+            return None
+    return None
+
+
+def _iter_entry_points(group: str) -> List[Any]:
+    """Return installed entry points of a group (empty if unsupported)."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python 3.7
+        try:
+            from importlib_metadata import entry_points  # type: ignore
+        except ImportError:
+            logger.debug("importlib.metadata unavailable; skipping plugin discovery")
+            return []
+
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=group))
+    return list(eps.get(group, []))
+
 
 class SchemaRegistry:
     """
@@ -53,15 +113,37 @@ class SchemaRegistry:
         - map a full DPP,
         - map individual parts,
         - list schemas and aliases.
+
+    The registry is safe for concurrent use. Config files, mapper classes and
+    shared mapper instances are loaded at most once per schema, even when
+    many threads request a schema at the same time. Mappers that keep
+    mutable state (THREAD_SAFE = False) are served from a pool of instances;
+    see lease().
+
+    Configs can be hot-reloaded: check_for_updates() (or the background
+    thread started by watch()) detects changed config files and swaps in
+    new mapper instances without blocking readers.
     """
 
-    def __init__(self, config_dir: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        config_dir: Optional[Path] = None,
+        plugin_group: Optional[str] = PLUGIN_ENTRY_POINT_GROUP,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> None:
         """
         Initialize the schema registry.
 
         Args:
             config_dir: Directory containing YAML config files for schema mappings.
                         Defaults to <this_file_dir>/config.
+            plugin_group: Entry point group to discover plugin mappers from
+                          (see discover_plugins). None disables discovery.
+            pool_size: Maximum number of idle mapper instances kept per
+                       schema for lease().
+            instrumentation: Hooks installed on every mapper instance this
+                             registry creates (see set_instrumentation).
         """
         if config_dir is None:
             config_dir = Path(__file__).parent / "config"
@@ -80,6 +162,29 @@ class SchemaRegistry:
         # Canonical schema name -> loaded config
         self._configs: Dict[str, Dict[str, Any]] = {}
 
+        # Canonical schema name -> resolved mapper class (lazy loaders run once)
+        self._classes: Dict[str, Type[SchemaMapper]] = {}
+
+        # Canonical schema name -> idle instances for lease()
+        self._pools: Dict[str, List[SchemaMapper]] = {}
+        self.pool_size = pool_size
+
+        # _lock guards the dicts above; the per-schema locks serialise
+        # (slow) loading so each config/class/instance is loaded only once.
+        self._lock = threading.RLock()
+        self._schema_locks: Dict[str, threading.RLock] = {}
+
+        # Canonical schema name -> (file stamp, content digest) of the loaded config
+        self._config_stamps: Dict[str, Tuple[FileStamp, Optional[str]]] = {}
+        self._reload_listeners: List[ReloadListener] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._watch_stop: Optional[threading.Event] = None
+
+        self.plugin_group = plugin_group
+        self._plugins_discovered = plugin_group is None
+
+        self.instrumentation = instrumentation
+
         logger.info(f"SchemaRegistry initialized with config_dir={self.config_dir}")
 
     # -------------------------------------------------------------------------
@@ -97,16 +202,21 @@ class SchemaRegistry:
         if not issubclass(mapper_class, SchemaMapper):
             raise TypeError(f"{mapper_class} must inherit from SchemaMapper")
 
-        tmp = mapper_class(config={})
-        name = tmp.get_schema_name()
+        name = _declared_schema_name(mapper_class)
+        if not name:
+            # Mappers without (trustworthy) class-level metadata only expose it on instances
+            logger.debug(f"{mapper_class.__name__} has no own SCHEMA_NAME; instantiating to read it")
+            name = mapper_class(config={}).get_schema_name()
 
-        self._mappers[name] = mapper_class
-        logger.info(f"Registered schema mapper: {name}")
+        with self._lock:
+            self._mappers[name] = mapper_class
+            self._classes.pop(name, None)
+            logger.info(f"Registered schema mapper: {name}")
 
-        if aliases:
-            for alias in aliases:
-                self._aliases[alias] = name
-                logger.debug(f"Alias registered: {alias} -> {name}")
+            if aliases:
+                for alias in aliases:
+                    self._aliases[alias] = name
+                    logger.debug(f"Alias registered: {alias} -> {name}")
 
     def register_lazy(
         self,
@@ -133,13 +243,52 @@ class SchemaRegistry:
                 raise TypeError(f"{class_name} in {module_path} is not a SchemaMapper")
             return cls
 
-        self._mappers[canonical_name] = lazy_loader
-        logger.info(f"Registered lazy mapper: {canonical_name}")
+        with self._lock:
+            self._mappers[canonical_name] = lazy_loader
+            self._classes.pop(canonical_name, None)
+            logger.info(f"Registered lazy mapper: {canonical_name}")
+
+            if aliases:
+                for alias in aliases:
+                    self._aliases[alias] = canonical_name
+                    logger.debug(f"Alias (lazy) registered: {alias} -> {canonical_name}")
 
-        if aliases:
-            for alias in aliases:
-                self._aliases[alias] = canonical_name
-                logger.debug(f"Alias (lazy) registered: {alias} -> {canonical_name}")
+    def discover_plugins(self) -> List[str]:
+        """
+        Register plugin mappers declared as entry points in plugin_group.
+
+        Each entry point name is taken as the canonical schema name and its
+        value ("module:ClassName") is registered with register_lazy(), so no
+        plugin module is imported here. Schemas that are already registered
+        keep their existing mapper.
+
+        Called automatically on the first list_schemas() or on the first
+        lookup of an unknown schema.
+
+        Returns:
+            List[str]: Canonical names of the newly registered plugins.
+        """
+        if self.plugin_group is None:
+            self._plugins_discovered = True
+            return []
+
+        added = []
+        with self._lock:
+            self._plugins_discovered = True
+            for ep in _iter_entry_points(self.plugin_group):
+                if ep.name in self._mappers:
+                    logger.debug(f"Plugin {ep.name} ignored: schema already registered")
+                    continue
+                module_path, _, class_name = ep.value.partition(":")
+                if not class_name:
+                    logger.warning(f"Plugin {ep.name} ignored: entry point {ep.value!r} is not 'module:Class'")
+                    continue
+                self.register_lazy(ep.name, module_path.strip(), class_name.strip())
+                added.append(ep.name)
+
+        if added:
+            logger.info(f"Discovered plugin mappers: {added}")
+        return added
 
     # -------------------------------------------------------------------------
     # Lookup helpers
@@ -151,6 +300,74 @@ class SchemaRegistry:
         """
         return self._aliases.get(name_or_alias, name_or_alias)
 
+    def _require(self, name_or_alias: str) -> str:
+        """
+        Resolve a schema name or alias, discovering plugins if it is unknown.
+
+        Raises:
+            KeyError if schema is not registered.
+        """
+        canonical = self._resolve_canonical_name(name_or_alias)
+
+        if canonical not in self._mappers and not self._plugins_discovered:
+            self.discover_plugins()
+            canonical = self._resolve_canonical_name(name_or_alias)
+
+        if canonical not in self._mappers:
+            raise KeyError(f"Schema '{name_or_alias}' not registered. Available: {list(self._mappers.keys())}")
+        return canonical
+
+    def _schema_lock(self, canonical_name: str) -> threading.RLock:
+        with self._lock:
+            lock = self._schema_locks.get(canonical_name)
+            if lock is None:
+                lock = self._schema_locks[canonical_name] = threading.RLock()
+            return lock
+
+    def _mapper_class(self, canonical_name: str) -> Type[SchemaMapper]:
+        """Return the mapper class, running a lazy loader at most once."""
+        mapper_class = self._classes.get(canonical_name)
+        if mapper_class is not None:
+            return mapper_class
+
+        with self._schema_lock(canonical_name):
+            mapper_class = self._classes.get(canonical_name)
+            if mapper_class is None:
+                mapper_class_or_loader = self._mappers[canonical_name]
+                if callable(mapper_class_or_loader) and not isinstance(mapper_class_or_loader, type):
+                    mapper_class = mapper_class_or_loader()
+                else:
+                    mapper_class = mapper_class_or_loader  # type: ignore
+                self._classes[canonical_name] = mapper_class
+            return mapper_class
+
+    def _new_instance(self, canonical_name: str) -> SchemaMapper:
+        mapper_class = self._mapper_class(canonical_name)
+        mapper = mapper_class(config=self._load_config(canonical_name))
+        if self.instrumentation is not None:
+            mapper.instrumentation = self.instrumentation
+        logger.info(f"Created new mapper instance for {canonical_name}: {mapper}")
+        return mapper
+
+    def set_instrumentation(self, instrumentation: Optional[Instrumentation]) -> None:
+        """
+        Install instrumentation hooks on all current and future mapper instances.
+
+        Args:
+            instrumentation: e.g. an instrumentation.MetricsRecorder; None
+                             restores the no-op default.
+        """
+        with self._lock:
+            self.instrumentation = instrumentation
+            mappers = list(self._instances.values())
+            for pool in self._pools.values():
+                mappers.extend(pool)
+        for mapper in mappers:
+            if instrumentation is None:
+                mapper.__dict__.pop("instrumentation", None)
+            else:
+                mapper.instrumentation = instrumentation
+
     def _load_config(self, canonical_name: str) -> Dict[str, Any]:
         """
         Load YAML config for a given canonical schema name.
@@ -158,27 +375,317 @@ class SchemaRegistry:
         Conventional filename pattern: <lowercase schema name with no dashes>_mapping.yml
         Example: "ECLASS" -> "eclass_mapping.yml", "ISA-95" -> "isa95_mapping.yml"
         """
-        if canonical_name in self._configs:
+        config = self._configs.get(canonical_name)
+        if config is not None:
+            return config
+
+        with self._schema_lock(canonical_name):
+            if canonical_name not in self._configs:
+                self._read_config(canonical_name)
             return self._configs[canonical_name]
 
+    def _config_path(self, canonical_name: str) -> Path:
         file_stub = canonical_name.lower().replace("-", "")
-        cfg_path = self.config_dir / f"{file_stub}_mapping.yml"
+        return self.config_dir / f"{file_stub}_mapping.yml"
+
+    @staticmethod
+    def _file_stamp(path: Path) -> FileStamp:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
 
-        if not cfg_path.exists():
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _read_config(self, canonical_name: str) -> None:
+        cfg_path = self._config_path(canonical_name)
+        stamp = self._file_stamp(cfg_path)
+
+        if stamp is None:
             logger.debug(f"No config found for {canonical_name} at {cfg_path}, using empty config.")
             self._configs[canonical_name] = {}
-            return self._configs[canonical_name]
+            self._config_stamps[canonical_name] = (None, None)
+            return
 
         try:
-            with cfg_path.open("r", encoding="utf-8") as f:
-                cfg = yaml.safe_load(f) or {}
-                self._configs[canonical_name] = cfg
-                logger.info(f"Loaded config for {canonical_name} from {cfg_path}")
-        except Exception as exc:
+            data = cfg_path.read_bytes()
+        except OSError as exc:
             logger.warning(f"Failed to load config for {canonical_name} from {cfg_path}: {exc}")
             self._configs[canonical_name] = {}
+            return
+
+        cfg = self._parse_config(canonical_name, cfg_path, data)
+        self._configs[canonical_name] = {} if cfg is None else cfg
+        self._config_stamps[canonical_name] = (stamp, self._digest(data))
 
-        return self._configs[canonical_name]
+    @staticmethod
+    def _parse_config(canonical_name: str, cfg_path: Path, data: bytes) -> Optional[Dict[str, Any]]:
+        """Parse YAML config content; None (with a warning) if it is invalid."""
+        # Deferred: yaml is only needed once a config file actually exists
+        import yaml
+
+        try:
+            cfg = yaml.safe_load(data) or {}
+            logger.info(f"Loaded config for {canonical_name} from {cfg_path}")
+            return cfg
+        except Exception as exc:
+            logger.warning(f"Failed to load config for {canonical_name} from {cfg_path}: {exc}")
+            return None
+
+    # -------------------------------------------------------------------------
+    # Config hot-reload
+    # -------------------------------------------------------------------------
+
+    def check_for_updates(self) -> List[str]:
+        """
+        Reload every loaded config whose file changed since it was read.
+
+        Each check costs one stat() per loaded config. Files with a new
+        mtime or size are hashed, and only files whose content actually
+        changed are re-parsed. For those, a new mapper instance is built and
+        warmed outside the lookup path and then swapped in atomically, so
+        get_mapper() keeps returning the previous instance until then.
+
+        Derived state is invalidated by the swap:
+        - idle pooled instances are dropped;
+        - results cached in a PartMappingCache are keyed by config_version,
+          so the new instance never sees them (it takes over the old
+          instance's cache);
+        - remap() falls back to a full map_dpp() for results of the old
+          instance;
+        - reload listeners (add_reload_listener) are notified.
+
+        A config that fails to parse keeps the previous one in service.
+
+        Returns:
+            List[str]: Canonical names of the reloaded schemas.
+        """
+        reloaded = []
+        with self._lock:
+            loaded = list(self._config_stamps.items())
+
+        for canonical, (stamp, digest) in loaded:
+            cfg_path = self._config_path(canonical)
+            new_stamp = self._file_stamp(cfg_path)
+            if new_stamp == stamp:
+                continue
+
+            if new_stamp is None:
+                new_digest, config = None, {}
+            else:
+                try:
+                    data = cfg_path.read_bytes()
+                except OSError as exc:
+                    logger.warning(f"Failed to re-read config for {canonical} from {cfg_path}: {exc}")
+                    continue
+                new_digest = self._digest(data)
+                if new_digest == digest:
+                    # Touched but unchanged
+                    self._restamp(canonical, (stamp, digest), (new_stamp, digest))
+                    continue
+                config = self._parse_config(canonical, cfg_path, data)
+                if config is None:
+                    # Keep serving the previous config until the file changes again
+                    self._restamp(canonical, (stamp, digest), (new_stamp, new_digest))
+                    continue
+
+            if self._swap_config(canonical, config, (stamp, digest), (new_stamp, new_digest)):
+                reloaded.append(canonical)
+
+        return reloaded
+
+    def _restamp(
+        self,
+        canonical_name: str,
+        previous: Tuple[FileStamp, Optional[str]],
+        stamp: Tuple[FileStamp, Optional[str]],
+    ) -> None:
+        """Record a new file stamp, unless the config was replaced or detached meanwhile."""
+        with self._lock:
+            if self._config_stamps.get(canonical_name) == previous:
+                self._config_stamps[canonical_name] = stamp
+
+    def _swap_config(
+        self,
+        canonical_name: str,
+        config: Dict[str, Any],
+        previous: Tuple[FileStamp, Optional[str]],
+        stamp: Tuple[FileStamp, Optional[str]],
+    ) -> bool:
+        """
+        Install a re-read config, unless the stamp is no longer `previous`
+        (a concurrent reload or attach_shared_configs() got there first).
+
+        Returns:
+            bool: Whether the config was installed.
+        """
+        with self._schema_lock(canonical_name):
+            old = self._instances.get(canonical_name)
+            new = None
+            if old is not None:
+                new = self._mapper_class(canonical_name)(config=config)
+                if self.instrumentation is not None:
+                    new.instrumentation = self.instrumentation
+                if new.part_cache is None and old.part_cache is not None:
+                    new.enable_part_cache(cache=old.part_cache)
+                new.config_version  # warm the config fingerprint before serving
+
+            with self._lock:
+                if self._config_stamps.get(canonical_name) != previous:
+                    logger.debug(f"Discarding stale reload of {canonical_name}")
+                    return False
+                self._configs[canonical_name] = config
+                self._config_stamps[canonical_name] = stamp
+                if new is not None:
+                    self._instances[canonical_name] = new
+                self._pools.pop(canonical_name, None)
+                listeners = list(self._reload_listeners)
+
+        logger.info(f"Reloaded config for {canonical_name}")
+        for listener in listeners:
+            try:
+                listener(canonical_name, new)
+            except Exception:
+                logger.exception(f"Reload listener failed for {canonical_name}")
+        return True
+
+    def add_reload_listener(self, listener: ReloadListener) -> None:
+        """
+        Register a callback invoked after a config reload, e.g. to rebuild
+        application-level lookup tables derived from a mapper.
+
+        Args:
+            listener: Called as listener(canonical_name, new_mapper); new_mapper
+                      is None if no shared instance existed yet.
+        """
+        with self._lock:
+            self._reload_listeners.append(listener)
+
+    def watch(self, interval: float = DEFAULT_WATCH_INTERVAL) -> threading.Thread:
+        """
+        Start a daemon thread that calls check_for_updates() periodically.
+
+        Calling watch() again while a watcher is running returns that watcher.
+
+        Args:
+            interval: Seconds between checks.
+
+        Returns:
+            threading.Thread: The watcher thread.
+        """
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return self._watcher
+            stop = threading.Event()
+            thread = threading.Thread(
+                target=self._watch_loop,
+                args=(interval, stop),
+                name="SchemaRegistryWatcher",
+                daemon=True,
+            )
+            self._watcher, self._watch_stop = thread, stop
+        thread.start()
+        logger.info(f"Watching {self.config_dir} for config changes every {interval}s")
+        return thread
+
+    def stop_watching(self, timeout: Optional[float] = None) -> None:
+        """Stop the watcher thread started by watch(), if any."""
+        with self._lock:
+            thread, stop = self._watcher, self._watch_stop
+            self._watcher = self._watch_stop = None
+        if thread is not None and stop is not None:
+            stop.set()
+            thread.join(timeout)
+
+    def _watch_loop(self, interval: float, stop: threading.Event) -> None:
+        while not stop.wait(interval):
+            try:
+                self.check_for_updates()
+            except Exception:
+                logger.exception("Config update check failed")
+
+    # -------------------------------------------------------------------------
+    # Shared (memory-mapped) configs for multi-process workers
+    # -------------------------------------------------------------------------
+
+    def export_shared_configs(
+        self,
+        directory: Union[str, Path],
+        schemas: Optional[List[str]] = None,
+    ) -> Dict[str, Path]:
+        """
+        Write the configs of registered schemas as shared config files.
+
+        Run this once in the parent process; workers then call
+        attach_shared_configs() on the same directory (see shared_config.py).
+        Schemas without a config file are skipped.
+
+        Args:
+            directory: Output directory (created if missing); a tmpfs such as
+                       /dev/shm avoids disk I/O.
+            schemas: Names or aliases to export. Defaults to all registered.
+
+        Returns:
+            Dict[str, Path]: Canonical schema name -> written file.
+        """
+        from .shared_config import export_config
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        written = {}
+        for name in schemas or self.list_schemas():
+            canonical = self._require(name)
+            config = self._load_config(canonical)
+            if not config:
+                continue
+            path = self._shared_config_path(directory, canonical)
+            written[canonical] = export_config(config, path)
+            logger.info(f"Exported shared config for {canonical} to {path}")
+        return written
+
+    def attach_shared_configs(self, directory: Union[str, Path]) -> List[str]:
+        """
+        Use memory-mapped configs written by export_shared_configs().
+
+        Replaces the configs (and any existing mapper instances) of every
+        registered schema that has a shared config file in `directory`.
+        Attached configs are read-only and are not hot-reloaded from YAML;
+        re-export in the parent and re-attach to pick up changes.
+
+        Args:
+            directory: Directory passed to export_shared_configs().
+
+        Returns:
+            List[str]: Canonical names of the schemas now using shared configs.
+        """
+        from .shared_config import SharedConfig
+
+        directory = Path(directory)
+        attached = []
+        for canonical in self.list_schemas():
+            path = self._shared_config_path(directory, canonical)
+            if not path.exists():
+                continue
+            config = SharedConfig.open(path)
+            with self._schema_lock(canonical), self._lock:
+                self._configs[canonical] = config
+                self._config_stamps.pop(canonical, None)
+                self._instances.pop(canonical, None)
+                self._pools.pop(canonical, None)
+            attached.append(canonical)
+            logger.info(f"Attached shared config for {canonical} from {path}")
+        return attached
+
+    @staticmethod
+    def _shared_config_path(directory: Path, canonical_name: str) -> Path:
+        from .shared_config import FILE_SUFFIX
+
+        file_stub = canonical_name.lower().replace("-", "")
+        return directory / f"{file_stub}_mapping{FILE_SUFFIX}"
 
     # -------------------------------------------------------------------------
     # Public API
@@ -188,37 +695,86 @@ class SchemaRegistry:
         """
         Get an instantiated mapper for a given schema name or alias.
 
+        The instance is shared by all callers. Mappers declaring
+        THREAD_SAFE = False should be used through lease() instead when
+        called from several threads.
+
         Args:
             name_or_alias: The schema name or alias.
             force_reload: If True, create a new instance even if one is cached.
+                          Idle pooled instances are discarded as well.
 
         Raises:
             KeyError if schema is not registered.
         """
-        canonical = self._resolve_canonical_name(name_or_alias)
+        canonical = self._require(name_or_alias)
+
+        if not force_reload:
+            mapper = self._instances.get(canonical)
+            if mapper is not None:
+                return mapper
+
+        with self._schema_lock(canonical):
+            if not force_reload:
+                # Another thread may have created it while we waited
+                mapper = self._instances.get(canonical)
+                if mapper is not None:
+                    return mapper
+
+            mapper = self._new_instance(canonical)
+            with self._lock:
+                self._instances[canonical] = mapper
+                if force_reload:
+                    self._pools.pop(canonical, None)
+            return mapper
+
+    @contextmanager
+    def lease(self, name_or_alias: str) -> Iterator[SchemaMapper]:
+        """
+        Check out a mapper instance for exclusive use by the calling thread.
 
-        if canonical not in self._mappers:
-            raise KeyError(f"Schema '{name_or_alias}' not registered. Available: {list(self._mappers.keys())}")
+        Instances come from a per-schema pool and are returned to it when the
+        block exits (up to pool_size idle instances are kept). Use this for
+        mappers that keep mutable state between calls:
 
-        if not force_reload and canonical in self._instances:
-            return self._instances[canonical]
+            with registry.lease("ECLASS") as mapper:
+                mapper.map_dpp(dpp)
 
-        mapper_class_or_loader = self._mappers[canonical]
-        if callable(mapper_class_or_loader) and not isinstance(mapper_class_or_loader, type):
-            mapper_class = mapper_class_or_loader()
-        else:
-            mapper_class = mapper_class_or_loader  # type: ignore
+        Raises:
+            KeyError if schema is not registered.
+        """
+        canonical = self._require(name_or_alias)
 
-        config = self._load_config(canonical)
-        mapper = mapper_class(config=config)
-        self._instances[canonical] = mapper
-        logger.info(f"Created new mapper instance for {canonical}: {mapper}")
-        return mapper
+        with self._lock:
+            pool = self._pools.setdefault(canonical, [])
+            mapper = pool.pop() if pool else None
+        if mapper is None:
+            mapper = self._new_instance(canonical)
+
+        try:
+            yield mapper
+        finally:
+            with self._lock:
+                # A force_reload in the meantime replaced the pool; drop stale instances
+                if self._pools.get(canonical) is pool and len(pool) < self.pool_size:
+                    pool.append(mapper)
+
+    @contextmanager
+    def _using(self, name_or_alias: str) -> Iterator[SchemaMapper]:
+        """Shared instance for thread-safe mappers, a leased one otherwise."""
+        canonical = self._require(name_or_alias)
+        if self._mapper_class(canonical).THREAD_SAFE:
+            yield self.get_mapper(canonical)
+        else:
+            with self.lease(canonical) as mapper:
+                yield mapper
 
     def list_schemas(self) -> List[str]:
         """
-        Return canonical names of all registered schemas.
+        Return canonical names of all registered schemas (including plugins).
         """
+        if not self._plugins_discovered:
+            self.discover_plugins()
         return list(self._mappers.keys())
 
     def list_aliases(self, canonical_name: str) -> List[str]:
@@ -263,9 +819,9 @@ class SchemaRegistry:
         Returns:
             A schema-specific dict as returned by SchemaMapper.map_dpp().
         """
-        mapper = self.get_mapper(name_or_alias)
-        logger.debug(f"Mapping DPP using schema {mapper.get_schema_name()}")
-        return mapper.map_dpp(dpp)
+        with self._using(name_or_alias) as mapper:
+            logger.debug(f"Mapping DPP using schema {mapper.get_schema_name()}")
+            return mapper.map_dpp(dpp)
 
     def map_part(self, name_or_alias: str, part: PartClass) -> Dict[str, Any]:
         """
@@ -274,12 +830,12 @@ class SchemaRegistry:
         Returns:
             Dict[str, Any]: Schema-specific representation of the part.
         """
-        mapper = self.get_mapper(name_or_alias)
-        logger.debug(
-            f"Mapping PartClass(id={part.part_id}, type={part.type}) "
-            f"using schema {mapper.get_schema_name()}"
-        )
-        return mapper.map_part_class(part)
+        with self._using(name_or_alias) as mapper:
+            logger.debug(
+                f"Mapping PartClass(id={part.part_id}, type={part.type}) "
+                f"using schema {mapper.get_schema_name()}"
+            )
+            return mapper.map_part_class(part)
 
     def map_layers(
         self,
@@ -300,7 +856,21 @@ class SchemaRegistry:
         Returns:
             Dict[str, Any]: Schema-compliant representation of all layers.
         """
-        mapper = self.get_mapper(name_or_alias)
+        with self._using(name_or_alias) as mapper:
+            return self._map_layers(
+                mapper, identity, structure, lifecycle, risk, sustainability, provenance
+            )
+
+    @staticmethod
+    def _map_layers(
+        mapper: SchemaMapper,
+        identity: IdentityLayer,
+        structure: StructureLayer,
+        lifecycle: LifecycleLayer,
+        risk: RiskLayer,
+        sustainability: SustainabilityLayer,
+        provenance: ProvenanceLayer,
+    ) -> Dict[str, Any]:
         logger.debug(f"Mapping individual layers using schema {mapper.get_schema_name()}")
 
         mapped = {
@@ -330,25 +900,39 @@ class SchemaRegistry:
 # -------------------------------------------------------------------------
 
 _global_registry: Optional[SchemaRegistry] = None
+_global_registry_lock = threading.Lock()
 
 
 def get_global_registry() -> SchemaRegistry:
     """
     Get (or create) a global SchemaRegistry instance.
+
+    The built-in mappers are registered (lazily) when the registry is created.
     """
     global _global_registry
-    if _global_registry is None:
-        _global_registry = SchemaRegistry()
-    return _global_registry
-
-
-def register_default_mappers() -> None:
+    registry = _global_registry
+    if registry is None:
+        with _global_registry_lock:
+            registry = _global_registry
+            if registry is None:
+                registry = SchemaRegistry()
+                register_default_mappers(registry)
+                _global_registry = registry
+    return registry
+
+
+def register_default_mappers(registry: Optional[SchemaRegistry] = None) -> None:
     """
-    Register built-in mappers (ECLASS, ISA-95, etc.) with the global registry.
+    Register built-in mappers (ECLASS, ISA-95, etc.) with a registry.
+
+    get_global_registry() calls this for the global registry; call it
+    explicitly to populate a separately created SchemaRegistry.
 
-    Call this once at package initialization (e.g. in nmis_dpp/__init__.py).
+    Args:
+        registry: Target registry. Defaults to the global registry.
     """
-    registry = get_global_registry()
+    if registry is None:
+        registry = get_global_registry()
 
     # Lazy registration of built-ins
     registry.register_lazy(
@@ -365,4 +949,4 @@ def register_default_mappers() -> None:
         aliases=["ISA95", "isa95", "IEC62264"],
     )
 
-    logger.info("Default mappers registered in global SchemaRegistry")
+    logger.info("Default mappers registered in SchemaRegistry")
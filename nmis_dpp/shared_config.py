@@ -0,0 +1,361 @@
+"""
+shared_config.py
+
+Read-only, memory-mapped mapping configs shared between worker processes.
+
+A parsed mapping config (e.g. the ECLASS domain mapping with all class
+definitions) is large, and every worker process that loads it from YAML
+holds its own copy. export_config() writes a config once into a compact
+binary file; SharedConfig.open() maps that file read-only and exposes it as
+a lazy, nested Mapping. Nothing is decoded up front: values are read from
+the mapping only when accessed, and the pages are shared through the OS
+page cache by every process that maps the same file, so per-worker memory
+for mapper configs stays close to zero.
+
+File layout (little-endian, all offsets absolute):
+
+    header:  magic "NDPPCFG1" | root offset (u64) | config fingerprint (8 bytes)
+    dict:    'D' | n (u32) | key offsets (n x u64) | value offsets (n x u64)
+             | key order (n x u32, indices sorted by UTF-8 key bytes)
+    list:    'L' | n (u32) | item offsets (n x u64)
+    str:     'S' | length (u32) | UTF-8 bytes        (deduplicated)
+    int:     'I' | i64          big int: 'J' | length (u32) | decimal digits
+    float:   'F' | f64          True 'T', False 'f', None 'N'
+
+Dicts keep their original key order for iteration (mappers pick "the first"
+class of a domain) and are looked up by binary search over the key order.
+
+Usage:
+    # parent process, before forking workers
+    paths = get_global_registry().export_shared_configs("/dev/shm/nmis_dpp")
+
+    # each worker (e.g. gunicorn post_fork)
+    get_global_registry().attach_shared_configs("/dev/shm/nmis_dpp")
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+from .utils import config_fingerprint
+
+
+MAGIC = b"NDPPCFG1"
+FILE_SUFFIX = ".mmcfg"
+
+_HEADER = struct.Struct("<8sQ8s")
+_TAG_COUNT = struct.Struct("<BI")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_DICT, _LIST, _STR, _INT, _BIGINT, _FLOAT, _TRUE, _FALSE, _NONE = b"DLSIJFTfN"
+
+_I64_MIN, _I64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+# Lookup memo markers: key not looked up yet / key known to be absent
+_UNSEEN = object()
+_ABSENT = object()
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+
+class _Writer:
+    """Post-order encoder: children are written before the node referring to them."""
+
+    def __init__(self, fp) -> None:
+        self.fp = fp
+        self.offset = _HEADER.size
+        self.strings: Dict[str, int] = {}
+        fp.write(b"\0" * _HEADER.size)
+
+    def _emit(self, data: bytes) -> int:
+        offset = self.offset
+        self.fp.write(data)
+        self.offset += len(data)
+        return offset
+
+    def write(self, value: Any) -> int:
+        if isinstance(value, str):
+            offset = self.strings.get(value)
+            if offset is None:
+                data = value.encode("utf-8")
+                offset = self._emit(_TAG_COUNT.pack(_STR, len(data)) + data)
+                self.strings[value] = offset
+            return offset
+        if value is None:
+            return self._emit(bytes((_NONE,)))
+        if isinstance(value, bool):
+            return self._emit(bytes((_TRUE if value else _FALSE,)))
+        if isinstance(value, int):
+            if _I64_MIN <= value <= _I64_MAX:
+                return self._emit(bytes((_INT,)) + _I64.pack(value))
+            digits = str(value).encode("ascii")
+            return self._emit(_TAG_COUNT.pack(_BIGINT, len(digits)) + digits)
+        if isinstance(value, float):
+            return self._emit(bytes((_FLOAT,)) + _F64.pack(value))
+        if isinstance(value, Mapping):
+            keys = list(value.keys())
+            for key in keys:
+                if not isinstance(key, str):
+                    raise TypeError(f"Shared configs require string keys, got {key!r}")
+            key_offsets = [self.write(key) for key in keys]
+            value_offsets = [self.write(value[key]) for key in keys]
+            encoded = [key.encode("utf-8") for key in keys]
+            order = sorted(range(len(keys)), key=encoded.__getitem__)
+            n = len(keys)
+            return self._emit(
+                _TAG_COUNT.pack(_DICT, n)
+                + struct.pack(f"<{n}Q", *key_offsets)
+                + struct.pack(f"<{n}Q", *value_offsets)
+                + struct.pack(f"<{n}I", *order)
+            )
+        if isinstance(value, (list, tuple)):
+            offsets = [self.write(item) for item in value]
+            n = len(offsets)
+            return self._emit(_TAG_COUNT.pack(_LIST, n) + struct.pack(f"<{n}Q", *offsets))
+        raise TypeError(f"Unsupported config value type: {type(value).__name__}")
+
+
+def export_config(config: Mapping, path: Union[str, Path]) -> Path:
+    """
+    Write a (parsed) mapping config to a shared config file.
+
+    The file is written to a temporary name and renamed into place, so
+    processes attaching concurrently never see a partial file.
+
+    Args:
+        config: Nested dict/list config with string keys and JSON-like values.
+        path: Target file.
+
+    Returns:
+        Path: The written file.
+
+    Raises:
+        TypeError: If the config contains non-string keys or unsupported values.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    fingerprint = bytes.fromhex(config_fingerprint(config))
+
+    try:
+        with tmp_path.open("wb") as fp:
+            writer = _Writer(fp)
+            root = writer.write(config)
+            fp.seek(0)
+            fp.write(_HEADER.pack(MAGIC, root, fingerprint))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+
+def _decode(buf: mmap.mmap, offset: int) -> Any:
+    tag = buf[offset]
+    if tag == _STR:
+        _, n = _TAG_COUNT.unpack_from(buf, offset)
+        start = offset + _TAG_COUNT.size
+        return str(buf[start:start + n], "utf-8")
+    if tag == _DICT:
+        return MappedDict(buf, offset)
+    if tag == _LIST:
+        return MappedList(buf, offset)
+    if tag == _INT:
+        return _I64.unpack_from(buf, offset + 1)[0]
+    if tag == _FLOAT:
+        return _F64.unpack_from(buf, offset + 1)[0]
+    if tag == _TRUE:
+        return True
+    if tag == _FALSE:
+        return False
+    if tag == _NONE:
+        return None
+    if tag == _BIGINT:
+        _, n = _TAG_COUNT.unpack_from(buf, offset)
+        start = offset + _TAG_COUNT.size
+        return int(buf[start:start + n])
+    raise ValueError(f"Corrupt shared config: unknown tag {tag!r} at offset {offset}")
+
+
+def _u64(buf: mmap.mmap, offset: int) -> int:
+    return int.from_bytes(buf[offset:offset + 8], "little")
+
+
+class MappedDict(Mapping):
+    """
+    Read-only dict view onto a dict node of a shared config.
+
+    Looked-up keys (including misses) are memoized per node, so repeated
+    lookups, which are the common case in mappers, cost a dict hit and
+    return the same child view objects. The memo only grows with the keys
+    a process actually queries.
+    """
+
+    __slots__ = ("_buf", "_n", "_keys", "_values", "_order", "_memo")
+
+    def __init__(self, buf: mmap.mmap, offset: int) -> None:
+        _, n = _TAG_COUNT.unpack_from(buf, offset)
+        self._buf = buf
+        self._n = n
+        self._keys = offset + _TAG_COUNT.size
+        self._values = self._keys + 8 * n
+        self._order = self._values + 8 * n
+        self._memo: Dict[str, Any] = {}
+
+    def _raw_key(self, index: int) -> bytes:
+        offset = _u64(self._buf, self._keys + 8 * index)
+        _, n = _TAG_COUNT.unpack_from(self._buf, offset)
+        start = offset + _TAG_COUNT.size
+        return self._buf[start:start + n]
+
+    def _sorted_index(self, position: int) -> int:
+        start = self._order + 4 * position
+        return int.from_bytes(self._buf[start:start + 4], "little")
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._memo.get(key, _UNSEEN)
+        if value is _UNSEEN:
+            value = self._memo[key] = self._lookup(key)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._memo.get(key, _UNSEEN)
+        if value is _UNSEEN:
+            value = self._memo[key] = self._lookup(key)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def _lookup(self, key: str) -> Any:
+        """Binary search over the sorted key order; _ABSENT if missing."""
+        if not isinstance(key, str):
+            return _ABSENT
+        target = key.encode("utf-8")
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._raw_key(self._sorted_index(mid)) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._n:
+            index = self._sorted_index(lo)
+            if self._raw_key(index) == target:
+                return _decode(self._buf, _u64(self._buf, self._values + 8 * index))
+        return _ABSENT
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._n):
+            yield str(self._raw_key(index), "utf-8")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} with {self._n} keys>"
+
+
+class MappedList(Sequence):
+    """Read-only list view onto a list node of a shared config."""
+
+    __slots__ = ("_buf", "_n", "_items")
+
+    def __init__(self, buf: mmap.mmap, offset: int) -> None:
+        _, n = _TAG_COUNT.unpack_from(buf, offset)
+        self._buf = buf
+        self._n = n
+        self._items = offset + _TAG_COUNT.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("list index out of range")
+        return _decode(self._buf, _u64(self._buf, self._items + 8 * index))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (list, tuple, MappedList)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} with {self._n} items>"
+
+
+class SharedConfig(MappedDict):
+    """
+    Root of an attached shared config file.
+
+    Behaves like the (read-only) config dict it was exported from. Pickling
+    re-attaches the same file in the receiving process instead of copying
+    the data.
+
+    Attributes:
+        path: The mapped file.
+        fingerprint: config_fingerprint() of the exported config, so mappers
+                     use it as config_version without walking the content.
+    """
+
+    __slots__ = ("path", "fingerprint", "_mmap")
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a shared config file")
+        magic, root, fingerprint = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a shared config file")
+        if self._mmap[root] != _DICT:
+            self._mmap.close()
+            raise ValueError(f"{self.path}: root of a shared config must be a mapping")
+
+        self.fingerprint = fingerprint.hex()
+        super().__init__(self._mmap, root)
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "SharedConfig":
+        """Attach a file written by export_config()."""
+        return cls(path)
+
+    def close(self) -> None:
+        """Unmap the file. Views obtained from this config become invalid."""
+        self._mmap.close()
+
+    def __reduce__(self):
+        return (type(self), (str(self.path),))
+
+    def __repr__(self) -> str:
+        return f"SharedConfig(path={str(self.path)!r}, keys={len(self)})"
+
+
+def to_plain(value: Any) -> Any:
+    """Recursively copy a shared config (or any part of it) into dicts/lists."""
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, (MappedList, list, tuple)):
+        return [to_plain(item) for item in value]
+    return value
@@ -0,0 +1,627 @@
+"""
+store.py
+
+Local persistent passport store backed by SQLite (standard library only).
+
+PassportStore keeps each DigitalProductPassport as a JSON document (the
+utils.to_dict() form) next to indexed lookup columns:
+
+    gtin, serial, manufacturer_pn    from IdentityLayer.global_ids
+    brand, model                     from IdentityLayer.make_model
+    part type                        one row per distinct part type
+
+Every column has a B-tree index, so lookups are O(log n) in the number of
+stored passports, and range scans stream in index order with keyset
+pagination (memory use does not grow with the result size):
+
+    with PassportStore("passports.db") as store:
+        store.add_many(passports)                     # one transaction per batch
+        dpp = store.get(store.find_ids(serial="SN-1")[0])
+        for id_, dpp in store.find(gtin="04012345678901"):
+            ...
+        for id_, data in store.scan("serial", "SN-1000", "SN-2000", raw=True):
+            ...
+
+The database runs in WAL mode, so readers (e.g. other processes opening the
+same file) are not blocked by a writer.
+
+Content-addressed deduplication (PassportStore(..., deduplicate=True)):
+fleets repeat the same part specs and identical layer blocks across many
+passports. A deduplicating store hashes the canonical JSON of each part
+(without its part_id) and of every layer except identity, stores each
+unique blob once with a reference count, and keeps only a small manifest of
+hashes per passport; reads reassemble passports from the blobs through an
+in-memory LRU cache. Both encodings can coexist in one database.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .model import DigitalProductPassport
+from .utils import passport_from_dict, to_json_compact
+
+SCHEMA_VERSION = 2
+
+# passports.encoding: full JSON document, or manifest of blob hashes
+ENCODING_DOCUMENT = 0
+ENCODING_MANIFEST = 1
+
+#: Layers stored as shared blobs by a deduplicating store (plus each part)
+DEDUP_LAYERS = ("structure", "lifecycle", "risk", "sustainability", "provenance")
+
+DEFAULT_BLOB_CACHE_SIZE = 16_384
+
+#: Lookup column -> (layer dict, key) it is extracted from
+IDENTITY_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "gtin": ("global_ids", "gtin"),
+    "serial": ("global_ids", "serial"),
+    "manufacturer_pn": ("global_ids", "manufacturer_pn"),
+    "brand": ("make_model", "brand"),
+    "model": ("make_model", "model"),
+}
+
+#: Columns accepted by find()/find_ids()/scan(); "part_type" matches any part
+LOOKUP_FIELDS = tuple(IDENTITY_COLUMNS) + ("part_type",)
+
+DEFAULT_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS passports (
+    id INTEGER PRIMARY KEY,
+    gtin TEXT,
+    serial TEXT,
+    manufacturer_pn TEXT,
+    brand TEXT,
+    model TEXT,
+    n_parts INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    encoding INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS passports_gtin ON passports (gtin);
+CREATE INDEX IF NOT EXISTS passports_serial ON passports (serial);
+CREATE INDEX IF NOT EXISTS passports_manufacturer_pn ON passports (manufacturer_pn);
+CREATE INDEX IF NOT EXISTS passports_brand_model ON passports (brand, model);
+CREATE INDEX IF NOT EXISTS passports_model ON passports (model);
+CREATE TABLE IF NOT EXISTS part_types (
+    type TEXT NOT NULL,
+    passport_id INTEGER NOT NULL REFERENCES passports (id) ON DELETE CASCADE,
+    PRIMARY KEY (type, passport_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS part_types_passport ON part_types (passport_id);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    refs INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+# Schema version -> statements upgrading it to the next version
+_MIGRATIONS = {
+    1: ["ALTER TABLE passports ADD COLUMN encoding INTEGER NOT NULL DEFAULT 0"],
+}
+
+_INSERT = (
+    "INSERT INTO passports (gtin, serial, manufacturer_pn, brand, model, n_parts, document, encoding) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_WITH_ID = (
+    "INSERT INTO passports (id, gtin, serial, manufacturer_pn, brand, model, n_parts, document, encoding) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_REPLACE = (
+    "UPDATE passports SET gtin = ?, serial = ?, manufacturer_pn = ?, brand = ?, model = ?, "
+    "n_parts = ?, document = ?, encoding = ? WHERE id = ?"
+)
+_INSERT_TYPE = "INSERT OR IGNORE INTO part_types (type, passport_id) VALUES (?, ?)"
+_INSERT_BLOB = "INSERT OR IGNORE INTO blobs (hash, refs, data) VALUES (?, 0, ?)"
+_ADD_REFS = "UPDATE blobs SET refs = refs + ? WHERE hash = ?"
+_DROP_UNREFERENCED = "DELETE FROM blobs WHERE hash = ? AND refs <= 0"
+
+# SQLite's default limit on host parameters per statement is 999
+_MAX_PARAMS = 900
+
+Row = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str], int, str, int]
+Blob = Tuple[str, str]  # (hash, canonical JSON)
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+_FIELD_NAMES: Dict[type, Tuple[str, ...]] = {}
+
+
+def _content(obj: Any, skip: str) -> Dict[str, Any]:
+    """Dataclass fields of obj except `skip`, for hashing."""
+    cls = type(obj)
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+    return {name: getattr(obj, name) for name in names if name != skip}
+
+
+def _manifest(dpp: DigitalProductPassport) -> Tuple[str, List[Blob]]:
+    """Manifest JSON of a passport and the (hash, data) blobs it references."""
+    blobs: List[Blob] = []
+
+    def ref(content: Any) -> str:
+        data = to_json_compact(content, sort_keys=True)
+        digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+        blobs.append((digest, data))
+        return digest
+
+    layers = {
+        name: ref(_content(dpp.structure, "parts") if name == "structure" else getattr(dpp, name))
+        for name in DEDUP_LAYERS
+    }
+    parts = [[part.part_id, ref(_content(part, "part_id"))] for part in dpp.structure.parts]
+    manifest = {"identity": dpp.identity, "layers": layers, "parts": parts}
+    return to_json_compact(manifest), blobs
+
+
+def _row(dpp: DigitalProductPassport, deduplicate: bool = False) -> Tuple[Row, List[str], List[Blob]]:
+    """Passport row (lookup columns, document, encoding), distinct part types and blobs."""
+    identity = dpp.identity
+    columns = tuple(
+        _text((getattr(identity, layer_field) or {}).get(key))
+        for layer_field, key in IDENTITY_COLUMNS.values()
+    )
+    parts = dpp.structure.parts
+    types = sorted({part.type for part in parts if part.type})
+    if deduplicate:
+        document, blobs = _manifest(dpp)
+        encoding = ENCODING_MANIFEST
+    else:
+        document, blobs, encoding = to_json_compact(dpp), [], ENCODING_DOCUMENT
+    return columns + (len(parts), document, encoding), types, blobs
+
+
+def _manifest_hashes(manifest: Dict[str, Any]) -> List[str]:
+    return list(manifest["layers"].values()) + [digest for _, digest in manifest["parts"]]
+
+
+def _with_key(blob: str, key: str, value_json: str, first: bool) -> str:
+    """Splice '"key":value' into the JSON object text `blob`, as first or last member."""
+    if blob == "{}":
+        return f'{{"{key}":{value_json}}}'
+    if first:
+        return f'{{"{key}":{value_json},{blob[1:]}'
+    return f'{blob[:-1]},"{key}":{value_json}}}'
+
+
+def _assemble(manifest: Dict[str, Any], blobs: Dict[str, str]) -> Dict[str, Any]:
+    """Rebuild the to_dict() form of a passport from its manifest."""
+    # Splice the blob texts into one JSON document and parse it once, which
+    # is much faster than parsing every blob and merging the dicts
+    dumps = json.dumps
+    parts = ",".join(
+        _with_key(blobs[digest], "part_id", dumps(part_id), first=True) for part_id, digest in manifest["parts"]
+    )
+    layers = [f'"identity":{to_json_compact(manifest["identity"])}']
+    for name, digest in manifest["layers"].items():
+        blob = blobs[digest]
+        if name == "structure":
+            blob = _with_key(blob, "parts", f"[{parts}]", first=False)
+        layers.append(f'"{name}":{blob}')
+    return json.loads("{" + ",".join(layers) + "}")
+
+
+class PassportStore:
+    """
+    SQLite-backed store of DigitalProductPassport objects.
+
+    Args:
+        path: Database file (created if missing), or ":memory:".
+        timeout: Seconds to wait for a lock held by another connection.
+        deduplicate: Store passports written by this instance as manifests
+                     of shared, content-addressed blobs (see module docstring).
+        blob_cache_size: Blobs (JSON strings) cached in memory for reads.
+
+    The store is safe to share between threads (calls are serialized on one
+    connection); use one store per process.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        timeout: float = 30.0,
+        deduplicate: bool = False,
+        blob_cache_size: int = DEFAULT_BLOB_CACHE_SIZE,
+    ) -> None:
+        self.path = str(path)
+        self.deduplicate = deduplicate
+        self.blob_cache_size = blob_cache_size
+        self._blob_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._transaction() as cursor:
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise ValueError(f"{self.path} uses store schema {version}; this version supports {SCHEMA_VERSION}")
+            while 0 < version < SCHEMA_VERSION:
+                for statement in _MIGRATIONS[version]:
+                    cursor.execute(statement)
+                version += 1
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    cursor.execute(statement)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # -------------------------------------------------------------------------
+    # Connection management
+    # -------------------------------------------------------------------------
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "PassportStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def add(self, dpp: DigitalProductPassport) -> int:
+        """
+        Store a passport.
+
+        Returns:
+            int: The new passport id.
+        """
+        row, types, blobs = _row(dpp, self.deduplicate)
+        with self._transaction() as cursor:
+            cursor.execute(_INSERT, row)
+            passport_id = cursor.lastrowid
+            cursor.executemany(_INSERT_TYPE, [(part_type, passport_id) for part_type in types])
+            self._add_refs(cursor, blobs)
+        return passport_id
+
+    def add_many(self, dpps: Iterable[DigitalProductPassport], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Store many passports, committing one transaction per batch.
+
+        Serialization of a batch happens before its transaction starts, so
+        the write lock is held only for the inserts themselves.
+
+        Args:
+            dpps: Passports to store (any iterable, consumed lazily).
+            batch_size: Passports per transaction.
+
+        Returns:
+            int: Number of passports stored.
+        """
+        total = 0
+        batch: List[Tuple[Row, List[str], List[Blob]]] = []
+        for dpp in dpps:
+            batch.append(_row(dpp, self.deduplicate))
+            if len(batch) >= batch_size:
+                total += self._insert_batch(batch)
+                batch = []
+        if batch:
+            total += self._insert_batch(batch)
+        return total
+
+    def _insert_batch(self, batch: List[Tuple[Row, List[str], List[Blob]]]) -> int:
+        with self._transaction() as cursor:
+            first = cursor.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM passports").fetchone()[0]
+            # Explicit ids keep the prepared INSERT in one executemany call and
+            # let the part type rows be built without a lastrowid round trip
+            ids = range(first, first + len(batch))
+            cursor.executemany(
+                _INSERT_WITH_ID,
+                [(passport_id,) + row for passport_id, (row, _, _) in zip(ids, batch)],
+            )
+            cursor.executemany(
+                _INSERT_TYPE,
+                [(part_type, passport_id) for passport_id, (_, types, _) in zip(ids, batch) for part_type in types],
+            )
+            self._add_refs(cursor, [blob for _, _, blobs in batch for blob in blobs])
+        return len(batch)
+
+    @staticmethod
+    def _add_refs(cursor: sqlite3.Cursor, blobs: List[Blob]) -> None:
+        if not blobs:
+            return
+        refs = Counter(digest for digest, _ in blobs)
+        cursor.executemany(_INSERT_BLOB, dict(blobs).items())
+        cursor.executemany(_ADD_REFS, [(count, digest) for digest, count in refs.items()])
+
+    @staticmethod
+    def _release_refs(cursor: sqlite3.Cursor, passport_id: int) -> None:
+        """Drop the blob references of a stored passport; KeyError if it does not exist."""
+        row = cursor.execute("SELECT document, encoding FROM passports WHERE id = ?", (passport_id,)).fetchone()
+        if row is None:
+            raise KeyError(passport_id)
+        if row[1] != ENCODING_MANIFEST:
+            return
+        refs = Counter(_manifest_hashes(json.loads(row[0])))
+        cursor.executemany(_ADD_REFS, [(-count, digest) for digest, count in refs.items()])
+        cursor.executemany(_DROP_UNREFERENCED, [(digest,) for digest in refs])
+
+    def replace(self, passport_id: int, dpp: DigitalProductPassport) -> None:
+        """
+        Overwrite a stored passport.
+
+        Raises:
+            KeyError: If no passport has this id.
+        """
+        row, types, blobs = _row(dpp, self.deduplicate)
+        with self._transaction() as cursor:
+            self._release_refs(cursor, passport_id)
+            cursor.execute(_REPLACE, row + (passport_id,))
+            cursor.execute("DELETE FROM part_types WHERE passport_id = ?", (passport_id,))
+            cursor.executemany(_INSERT_TYPE, [(part_type, passport_id) for part_type in types])
+            self._add_refs(cursor, blobs)
+
+    def delete(self, passport_id: int) -> None:
+        """
+        Remove a stored passport.
+
+        Raises:
+            KeyError: If no passport has this id.
+        """
+        with self._transaction() as cursor:
+            self._release_refs(cursor, passport_id)
+            cursor.execute("DELETE FROM passports WHERE id = ?", (passport_id,))
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def _blobs(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """Blob data by hash, from the LRU cache or (in one query per chunk) the database."""
+        cache = self._blob_cache
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            for digest in set(hashes):
+                data = cache.get(digest)
+                if data is None:
+                    missing.append(digest)
+                else:
+                    cache.move_to_end(digest)
+                    found[digest] = data
+            for start in range(0, len(missing), _MAX_PARAMS):
+                chunk = missing[start:start + _MAX_PARAMS]
+                rows = self._conn.execute(
+                    f"SELECT hash, data FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+                if self.blob_cache_size > 0:
+                    cache.update(rows)
+            while len(cache) > self.blob_cache_size:
+                cache.popitem(last=False)
+        return found
+
+    def _load_many(self, rows: Sequence[Tuple[str, int]], raw: bool) -> List[Any]:
+        """Decode (document, encoding) rows, fetching the blobs of a whole page at once."""
+        documents = [json.loads(document) for document, _ in rows]
+        manifests = [doc for doc, (_, encoding) in zip(documents, rows) if encoding == ENCODING_MANIFEST]
+        if manifests:
+            blobs = self._blobs(digest for manifest in manifests for digest in _manifest_hashes(manifest))
+            documents = [
+                _assemble(doc, blobs) if encoding == ENCODING_MANIFEST else doc
+                for doc, (_, encoding) in zip(documents, rows)
+            ]
+        return documents if raw else [passport_from_dict(doc) for doc in documents]
+
+    def get(self, passport_id: int, raw: bool = False) -> Any:
+        """
+        Load a passport by id.
+
+        Args:
+            passport_id: Id returned by add() or find_ids().
+            raw: Return the to_dict() form instead of a DigitalProductPassport.
+
+        Raises:
+            KeyError: If no passport has this id.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document, encoding FROM passports WHERE id = ?", (passport_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(passport_id)
+        return self._load_many([row], raw)[0]
+
+    def __contains__(self, passport_id: Any) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM passports WHERE id = ?", (passport_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM passports").fetchone()[0]
+
+    @staticmethod
+    def _where(criteria: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        unknown = set(criteria) - set(LOOKUP_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown lookup fields {sorted(unknown)}; expected {list(LOOKUP_FIELDS)}")
+        clauses, params = [], []
+        for name, value in criteria.items():
+            if name == "part_type":
+                clauses.append("id IN (SELECT passport_id FROM part_types WHERE type = ?)")
+            else:
+                clauses.append(f"{name} = ?")
+            params.append(_text(value))
+        return " AND ".join(clauses) or "1", params
+
+    def find_ids(self, **criteria: Any) -> List[int]:
+        """
+        Ids of passports matching all criteria, in ascending order.
+
+        Args:
+            **criteria: Equality conditions on LOOKUP_FIELDS, e.g.
+                        find_ids(brand="Acme", part_type="Sensor").
+
+        Raises:
+            ValueError: On unknown fields.
+        """
+        where, params = self._where(criteria)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT id FROM passports WHERE {where} ORDER BY id", params).fetchall()
+        return [row[0] for row in rows]
+
+    def find(self, raw: bool = False, batch_size: int = 500, **criteria: Any) -> Iterator[Tuple[int, Any]]:
+        """
+        Stream (id, passport) pairs matching all criteria, in id order.
+
+        Args:
+            raw: Yield to_dict() forms instead of DigitalProductPassport objects.
+            batch_size: Rows fetched per query.
+            **criteria: See find_ids().
+        """
+        criteria = dict(criteria)
+        part_type = criteria.pop("part_type", None)
+        where, params = self._where(criteria)
+        if part_type is None:
+            return self._paginate("id", where, params, raw, batch_size)
+        # Walk the (type, passport_id) primary key in order instead of
+        # re-collecting every matching id for each page
+        return self._paginate(
+            "id", f"part_types.type = ? AND {where}", [_text(part_type)] + params, raw, batch_size,
+            source="part_types CROSS JOIN passports ON passports.id = part_types.passport_id",
+            key="part_types.passport_id",
+        )
+
+    def scan(
+        self,
+        field: str = "id",
+        start: Any = None,
+        stop: Any = None,
+        raw: bool = False,
+        batch_size: int = 500,
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Stream (id, passport) pairs ordered by an indexed column.
+
+        Args:
+            field: "id" or one of IDENTITY_COLUMNS.
+            start: Inclusive lower bound (None: from the first row).
+            stop: Exclusive upper bound (None: to the last row).
+            raw: Yield to_dict() forms instead of DigitalProductPassport objects.
+            batch_size: Rows fetched per query.
+
+        Raises:
+            ValueError: If the field is not indexed.
+        """
+        if field != "id" and field not in IDENTITY_COLUMNS:
+            raise ValueError(f"Cannot scan by {field!r}; expected 'id' or one of {list(IDENTITY_COLUMNS)}")
+        clauses, params = [f"{field} IS NOT NULL"], []
+        if start is not None:
+            clauses.append(f"{field} >= ?")
+            params.append(start if field == "id" else _text(start))
+        if stop is not None:
+            clauses.append(f"{field} < ?")
+            params.append(stop if field == "id" else _text(stop))
+        return self._paginate(field, " AND ".join(clauses), params, raw, batch_size)
+
+    def _paginate(
+        self,
+        field: str,
+        where: str,
+        params: List[Any],
+        raw: bool,
+        batch_size: int,
+        source: str = "passports",
+        key: str = "id",
+    ) -> Iterator[Tuple[int, Any]]:
+        # Keyset pagination: each page resumes after the last (field, id) seen,
+        # so no cursor stays open between pages and writers are never blocked
+        field = key if field == "id" else field
+        order = key if field == key else f"{field}, {key}"
+        select = f"SELECT {key}, {field}, document, encoding FROM {source} WHERE {where}"
+        last: Optional[Tuple[Any, int]] = None
+        while True:
+            if last is None:
+                query, page_params = select, list(params)
+            elif field == key:
+                query, page_params = f"{select} AND {key} > ?", list(params) + [last[1]]
+            else:
+                query = f"{select} AND ({field} > ? OR ({field} = ? AND {key} > ?))"
+                page_params = list(params) + [last[0], last[0], last[1]]
+            with self._lock:
+                rows = self._conn.execute(f"{query} ORDER BY {order} LIMIT ?", page_params + [batch_size]).fetchall()
+            loaded = self._load_many([(document, encoding) for _, _, document, encoding in rows], raw)
+            for row, passport in zip(rows, loaded):
+                yield row[0], passport
+            if len(rows) < batch_size:
+                return
+            last = (rows[-1][1], rows[-1][0])
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Store statistics.
+
+        Returns:
+            Dict[str, Any]: Passport, part and part-type counts; blob count,
+            references and bytes; bytes of passport documents/manifests; and
+            the database size in bytes.
+        """
+        with self._lock:
+            execute = self._conn.execute
+            passports, parts, document_bytes = execute(
+                "SELECT COUNT(*), COALESCE(SUM(n_parts), 0), COALESCE(SUM(LENGTH(document)), 0) FROM passports"
+            ).fetchone()
+            blobs, blob_refs, blob_bytes = execute(
+                "SELECT COUNT(*), COALESCE(SUM(refs), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+            types = dict(execute("SELECT type, COUNT(*) FROM part_types GROUP BY type").fetchall())
+            page_count = execute("PRAGMA page_count").fetchone()[0]
+            page_size = execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "passports": passports,
+            "parts": parts,
+            "part_types": types,
+            "document_bytes": document_bytes,
+            "blobs": blobs,
+            "blob_refs": blob_refs,
+            "blob_bytes": blob_bytes,
+            "size_bytes": page_count * page_size,
+        }
+
+    def __repr__(self) -> str:
+        return f"PassportStore({self.path!r}, deduplicate={self.deduplicate})"
+
+
+class _Transaction:
+    """Holds the store lock for one BEGIN IMMEDIATE ... COMMIT/ROLLBACK block."""
+
+    def __init__(self, store: PassportStore) -> None:
+        self.store = store
+
+    def __enter__(self) -> sqlite3.Cursor:
+        self.store._lock.acquire()
+        try:
+            self.cursor = self.store._conn.cursor()
+            self.cursor.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.store._lock.release()
+            raise
+        return self.cursor
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        try:
+            self.cursor.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.cursor.close()
+            self.store._lock.release()
@@ -0,0 +1,230 @@
+"""
+synthetic.py
+
+Seeded generator of synthetic Digital Product Passports for benchmarks,
+profiling and load tests.
+
+Parts cycle through every PartClass subclass (or a chosen subset), so each
+class is equally represented at any size; their typed fields, properties
+and (for a fraction of parts) ECLASS bindings are filled with random but
+reproducible values. The same (n_parts, seed) always yields the same
+passport, so results from different runs and machines are comparable.
+
+    dpp = generate_passport(10_000, seed=42)
+    data = generate_passport_dict(100)      # to_dict() form, for JSON tests
+    hierarchy = tree_hierarchy(part_ids)    # deep product tree for the parts
+
+Parts are produced lazily by iter_parts(), so very large workloads can be
+streamed without holding a full passport in memory.
+"""
+
+from __future__ import annotations
+
+import random
+import typing
+from dataclasses import fields
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .model import (
+    DigitalProductPassport,
+    IdentityLayer,
+    LifecycleLayer,
+    ProvenanceLayer,
+    RiskLayer,
+    StructureLayer,
+    SustainabilityLayer,
+)
+from .part_class import PART_CLASS_TYPES, PartClass
+from .utils import hint_origin_args, to_dict
+
+#: Part classes generated by default: every concrete PartClass subclass.
+DEFAULT_PART_TYPES: Tuple[str, ...] = tuple(
+    name for name, cls in PART_CLASS_TYPES.items() if cls is not PartClass
+)
+
+#: Fraction of parts that get an explicit ECLASS ontology binding.
+DEFAULT_BINDING_RATIO = 0.1
+
+_WORDS = (
+    "alpha", "bravo", "delta", "flux", "nova", "orbit", "pulse", "quartz",
+    "sigma", "titan", "vector", "zephyr",
+)
+_MATERIALS = ("steel", "aluminium", "ABS", "PA66", "copper", "brass", "PEEK", "glass")
+_ALNUM = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+Generator = Callable[[random.Random], Any]
+
+
+def _value_generator(name: str, hint: Any) -> Optional[Generator]:
+    """Return a random value generator for a typed PartClass field."""
+    origin, args = hint_origin_args(hint)
+    options = [a for a in args if a is not type(None)]
+    base = options[0] if origin is typing.Union and len(options) == 1 else hint
+    origin, args = hint_origin_args(base)
+
+    if base is float:
+        return lambda rng: round(rng.uniform(0.1, 1000.0), 3)
+    if base is int:
+        return lambda rng: rng.randint(1, 5000)
+    if base is str:
+        if name in ("material",):
+            return lambda rng: rng.choice(_MATERIALS)
+        if name in ("version", "firmware_version"):
+            return lambda rng: f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 99)}"
+        return lambda rng: f"{name}-{rng.choice(_WORDS)}"
+    if origin is list:
+        return lambda rng: rng.sample(_WORDS, 2)
+    if origin is dict:
+        if args[1:] == (float,):
+            return lambda rng: {axis: round(rng.uniform(1, 500), 1) for axis in ("x", "y", "z")}
+        return lambda rng: {"sha256": "%064x" % rng.getrandbits(256)}
+    return None
+
+
+_FIELD_GENERATORS: Dict[type, List[Tuple[str, Generator]]] = {}
+
+
+def _typed_fields(cls: type) -> List[Tuple[str, Generator]]:
+    generators = _FIELD_GENERATORS.get(cls)
+    if generators is None:
+        base_fields = {f.name for f in fields(PartClass)}
+        hints = typing.get_type_hints(cls)
+        generators = []
+        for f in fields(cls):
+            if f.name in base_fields:
+                continue
+            generator = _value_generator(f.name, hints[f.name])
+            if generator is not None:
+                generators.append((f.name, generator))
+        _FIELD_GENERATORS[cls] = generators
+    return generators
+
+
+def _irdi(rng: random.Random) -> str:
+    code = "".join(rng.choice(_ALNUM) for _ in range(6))
+    return f"0173-1#01-{code}#{rng.randint(1, 30):03d}"
+
+
+def iter_parts(
+    n_parts: int,
+    seed: int = 0,
+    part_types: Optional[Sequence[str]] = None,
+    binding_ratio: float = DEFAULT_BINDING_RATIO,
+) -> Iterator[PartClass]:
+    """
+    Yield n_parts synthetic parts, round-robin over part_types.
+
+    Args:
+        n_parts: Number of parts to generate.
+        seed: Random seed; equal seeds give equal parts.
+        part_types: PartClass type names (default: all subclasses).
+        binding_ratio: Fraction of parts bound to an ECLASS class.
+
+    Raises:
+        KeyError: If a part type is unknown.
+    """
+    rng = random.Random(seed)
+    classes = [(name, PART_CLASS_TYPES[name]) for name in (part_types or DEFAULT_PART_TYPES)]
+    plans = [(name, cls, _typed_fields(cls)) for name, cls in classes]
+
+    for index in range(n_parts):
+        type_name, cls, generators = plans[index % len(plans)]
+        kwargs = {name: generate(rng) for name, generate in generators if rng.random() < 0.9}
+        part = cls(
+            part_id=f"P{index:07d}",
+            name=f"{type_name} {rng.choice(_WORDS)}-{index}",
+            type=type_name,
+            properties={
+                "weight_g": round(rng.uniform(1, 5000), 2),
+                "supplier": f"SUP-{rng.randint(1, 500):04d}",
+            },
+            **kwargs,
+        )
+        if rng.random() < binding_ratio:
+            part.bind_ontology("ECLASS", class_ids=[_irdi(rng)])
+        yield part
+
+
+def generate_passport(
+    n_parts: int,
+    seed: int = 0,
+    part_types: Optional[Sequence[str]] = None,
+    binding_ratio: float = DEFAULT_BINDING_RATIO,
+) -> DigitalProductPassport:
+    """
+    Build a complete synthetic passport with n_parts parts.
+
+    Args:
+        n_parts: Number of parts in the StructureLayer.
+        seed: Random seed; equal seeds give equal passports.
+        part_types: PartClass type names (default: all subclasses).
+        binding_ratio: Fraction of parts bound to an ECLASS class.
+
+    Returns:
+        DigitalProductPassport
+    """
+    rng = random.Random(f"passport-{seed}")
+    model = f"{rng.choice(_WORDS).title()} {rng.randint(100, 9999)}"
+    parts = list(iter_parts(n_parts, seed=seed, part_types=part_types, binding_ratio=binding_ratio))
+
+    return DigitalProductPassport(
+        identity=IdentityLayer(
+            global_ids={
+                "gtin": f"{rng.randrange(10 ** 13):014d}",
+                "serial": f"SYN-{seed}-{rng.randrange(10 ** 8):08d}",
+                "manufacturer_pn": f"PN-{rng.randint(1000, 9999)}",
+            },
+            make_model={"brand": "Synthetic Devices", "model": model, "hw_rev": "A", "fw_rev": "1.0"},
+            ownership={"manufacturer": "Synthetic Devices Ltd", "owner": "Benchmark Org"},
+            conformity=["CE", "RoHS"],
+        ),
+        structure=StructureLayer(
+            hierarchy={"product": model, "assemblies": max(1, n_parts // 100)},
+            parts=parts,
+            interfaces=[{"type": "electrical", "details": {"voltage": 230}}],
+            materials=[{"name": m, "%mass": round(rng.uniform(1, 40), 1)} for m in rng.sample(_MATERIALS, 3)],
+            bom_refs=[f"BOM-{seed}-{rng.randint(1, 999):03d}"],
+        ),
+        lifecycle=LifecycleLayer(
+            manufacture={"lot": f"LOT-{rng.randint(1, 9999):04d}", "date": "2025-01-15", "co2e": round(rng.uniform(1, 500), 1)},
+            use={"counters": {"hours": rng.randint(0, 20000)}},
+            serviceability={"repairability_score": rng.randint(1, 10)},
+            events=[{"event_type": "install", "timestamp": "2025-02-01"}],
+            end_of_life={"recovery_routes": ["Recycle"]},
+        ),
+        risk=RiskLayer(
+            criticality={"levels": "Safety", "mtbf": rng.randint(1000, 100000)},
+            fmea=[{"failure_mode": "overheat", "effect": "shutdown", "mitigation": "cooling"}],
+            security={"update_policy": "signed-only"},
+        ),
+        sustainability=SustainabilityLayer(
+            mass=round(rng.uniform(0.5, 500.0), 2),
+            energy={"standby": round(rng.uniform(0, 5), 2), "active": round(rng.uniform(5, 2000), 1)},
+            recycled_content={"pcr_percent": rng.randint(0, 80)},
+            remanufacture={"eligible": rng.random() < 0.5},
+        ),
+        provenance=ProvenanceLayer(
+            signatures=[{"type": "manufacturer", "certificate": f"cert-{seed}"}],
+            trace_links=[f"EPCIS:synthetic-{seed}"],
+        ),
+    )
+
+
+def generate_passport_dict(n_parts: int, seed: int = 0, **kwargs: Any) -> Dict[str, Any]:
+    """Return generate_passport(...) in to_dict() form (what JSON files contain)."""
+    return to_dict(generate_passport(n_parts, seed=seed, **kwargs))
+
+
+def tree_hierarchy(part_ids: Sequence[str], fanout: int = 8, product: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Arrange part ids as a complete fanout-ary product tree.
+
+    The first part is the only top-level node; part i is a child of part
+    (i - 1) // fanout. Returned in the flat "children" form understood by
+    hierarchy.HierarchyIndex, e.g. for
+    ``dpp.structure.hierarchy = tree_hierarchy([p.part_id for p in dpp.structure.parts])``.
+    """
+    children: Dict[str, List[str]] = {}
+    for index in range(1, len(part_ids)):
+        children.setdefault(part_ids[(index - 1) // fanout], []).append(part_ids[index])
+    return {"product": product, "children": children}
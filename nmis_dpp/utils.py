@@ -7,9 +7,21 @@ Includes serialization helpers and validation routines for parts and passport la
 Author: Anmol Kumar, NMIS
 """
 
+import hashlib
 import json
-from dataclasses import asdict, is_dataclass
-from typing import Any
+from dataclasses import asdict, fields, is_dataclass
+from typing import Any, Dict, Tuple
+
+from .model import (
+    DigitalProductPassport,
+    IdentityLayer,
+    LifecycleLayer,
+    ProvenanceLayer,
+    RiskLayer,
+    StructureLayer,
+    SustainabilityLayer,
+)
+from .part_class import PART_CLASS_TYPES, OntologyBinding, PartClass
 
 
 def to_dict(obj: Any) -> dict:
@@ -46,10 +58,156 @@ def to_json(obj: Any, indent: int = 2) -> str:
     return json.dumps(to_dict(obj), indent=indent, default=str)
 
 
+def part_from_dict(data: Dict[str, Any]) -> PartClass:
+    """
+    Rebuild a PartClass (subclass selected by its "type") from to_dict() output.
+
+    Unknown types fall back to PartClass; keys that are not fields of the
+    selected class are ignored. The input dict is not modified.
+
+    Args:
+        data (dict): Serialized part.
+
+    Returns:
+        PartClass: The reconstructed part.
+    """
+    cls = PART_CLASS_TYPES.get(data.get("type"), PartClass)
+    names = _field_names(cls)
+    kwargs = {key: value for key, value in data.items() if key in names}
+    bindings = kwargs.get("ontology_bindings")
+    if bindings:
+        kwargs["ontology_bindings"] = {
+            key: OntologyBinding(**binding) if isinstance(binding, dict) else binding
+            for key, binding in bindings.items()
+        }
+    return cls(**kwargs)
+
+
+def passport_from_dict(data: Dict[str, Any]) -> DigitalProductPassport:
+    """
+    Rebuild a DigitalProductPassport from to_dict() output (e.g. loaded JSON).
+
+    Args:
+        data (dict): Serialized passport with all six layers.
+
+    Returns:
+        DigitalProductPassport: The reconstructed passport.
+
+    Raises:
+        TypeError: If a layer is missing fields or has unknown ones
+                   (see json_schema.passport_validator to report every issue).
+    """
+    structure = dict(data.get("structure", {}))
+    structure["parts"] = [part_from_dict(part) for part in structure.get("parts", [])]
+    return DigitalProductPassport(
+        identity=IdentityLayer(**data.get("identity", {})),
+        structure=StructureLayer(**structure),
+        lifecycle=LifecycleLayer(**data.get("lifecycle", {})),
+        risk=RiskLayer(**data.get("risk", {})),
+        sustainability=SustainabilityLayer(**data.get("sustainability", {})),
+        provenance=ProvenanceLayer(**data.get("provenance", {})),
+    )
+
+
+_FIELD_NAMES: Dict[type, frozenset] = {}
+
+
+def _field_names(cls: type) -> frozenset:
+    names = _FIELD_NAMES.get(cls)
+    if names is None:
+        names = _FIELD_NAMES[cls] = frozenset(f.name for f in fields(cls))
+    return names
+
+
+_FIELD_ORDER: Dict[type, Tuple[str, ...]] = {}
+
+
+def hint_origin_args(hint: Any) -> Tuple[Any, Tuple[Any, ...]]:
+    """
+    Origin and arguments of a type hint, e.g. (list, (int,)) for List[int].
+
+    Equivalent to typing.get_origin()/get_args() (Python 3.8+) for the hints
+    used in the model; (None, ()) for plain classes.
+    """
+    return getattr(hint, "__origin__", None), tuple(getattr(hint, "__args__", None) or ())
+
+
+def _json_default(obj: Any) -> Any:
+    # json.dumps() hook: dataclasses become dicts of their fields (in field
+    # order, like asdict()) without asdict()'s recursive deep copy
+    if is_dataclass(obj) and not isinstance(obj, type):
+        cls = type(obj)
+        names = _FIELD_ORDER.get(cls)
+        if names is None:
+            names = _FIELD_ORDER[cls] = tuple(f.name for f in fields(cls))
+        return {name: getattr(obj, name) for name in names}
+    return str(obj)
+
+
+def to_json_compact(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Serialize a dataclass (or list/dict thereof) to JSON without whitespace.
+
+    Produces the same document as json.dumps(to_dict(obj)) but encodes the
+    dataclasses directly instead of building the to_dict() copy first,
+    which is several times faster for large passports. Non-JSON values are
+    rendered with str().
+
+    Args:
+        obj (Any): A serializable dataclass object (or list/dict).
+        sort_keys (bool): Sort object keys.
+
+    Returns:
+        str: Compact JSON string.
+    """
+    return json.dumps(
+        obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    )
+
+
+def canonical_json(obj: Any) -> str:
+    """
+    Serialize a dataclass (or list/dict thereof) to canonical JSON: sorted
+    keys, no insignificant whitespace, non-JSON values rendered with str().
+
+    Two objects with equal content always produce the same string, which
+    makes the output suitable for hashing and content addressing.
+
+    Args:
+        obj (Any): A serializable dataclass object (or list/dict).
+
+    Returns:
+        str: Canonical JSON string.
+    """
+    return to_json_compact(obj, sort_keys=True)
+
+
+def config_fingerprint(config: Any) -> str:
+    """
+    Return a short, stable fingerprint of a mapper configuration.
+
+    Objects exposing a precomputed `fingerprint` attribute (such as an
+    attached shared_config.SharedConfig) are not re-serialized.
+
+    Args:
+        config (Any): Configuration dict (or list/dataclass structure).
+
+    Returns:
+        str: Hex digest (BLAKE2b, 64 bit) of the canonical JSON form.
+    """
+    fingerprint = getattr(config, "fingerprint", None)
+    if fingerprint:
+        return fingerprint
+    return hashlib.blake2b(canonical_json(config).encode("utf-8"), digest_size=8).hexdigest()
+
+
 def validate_part_class(part) -> bool:
     """
     Basic validator for PartClass and its subclasses.
 
+    To check raw part dicts field by field before constructing objects,
+    use json_schema.part_validator().
+
     Args:
         part: An instance of PartClass or subclass.
 
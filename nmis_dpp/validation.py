@@ -0,0 +1,561 @@
+"""
+validation.py
+
+Declarative, compiled validation rules for mapped DPP documents.
+
+A rule set is a list of plain dicts (so it can live in a mapper class or in
+the mapper's YAML config under "validation_rules"). Each rule names a path
+in the mapped document and one or more checks:
+
+    {"path": "identity.ID", "required": True, "type": "string"}
+    {"path": "structure.components", "unique_by": "id"}
+    {"path": "structure.components[*].eclassIrdi", "pattern": IRDI_PATTERN}
+    {"path": "structure.components[*].attributes.*", "finite": True}
+    {"path": "sustainability.mass", "min": 0, "severity": "warning"}
+
+Paths are dot-separated keys; "key[*]" visits every item of a list and a
+"*" segment visits every value of an object. Checks other than "required"
+and "required_any" ignore absent/None values.
+
+Supported checks: required, required_any (list of keys, at least one
+non-empty), type (string|number|integer|boolean|object|array), equals,
+one_of, pattern (regex, full match), min / max, finite, max_length,
+unique_by (key that must be unique across a list of objects).
+Optional rule keys: severity ("error" | "warning"), message (overrides the
+default message).
+
+Validator compiles a rule set once into a tree of closures that walks the
+document a single time, visiting only the paths some rule refers to, and
+collects every issue with its JSON path (e.g. "$.structure.components[3].id").
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+SEVERITIES = ("error", "warning")
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: v.__class__ is dict or isinstance(v, Mapping),
+    "array": lambda v: isinstance(v, (list, tuple)),
+}
+
+_INDEX = re.compile(r"\[\d+\]")
+
+# Check keywords in evaluation order (also the recognised rule keys)
+CHECKS = (
+    "required", "required_any", "type", "equals", "one_of", "pattern",
+    "min", "max", "finite", "max_length", "unique_by",
+)
+_RULE_KEYS = frozenset(CHECKS) | {"path", "severity", "message"}
+
+# A JSON path under construction: "$" or a (parent path, key/index) tuple
+Path = Union[str, Tuple[Any, Union[str, int]]]
+Check = Callable[[Any], Optional[List[Tuple[str, str]]]]
+Visitor = Callable[[Any, Path, List["ValidationIssue"]], None]
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """
+    A single rule violation.
+
+    Attributes:
+        path: JSON path of the offending value (e.g. "$.identity.ID").
+        rule: Check keyword that failed (e.g. "required").
+        message: Human-readable description.
+        severity: "error" or "warning".
+    """
+    path: str
+    rule: str
+    message: str
+    severity: str = "error"
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+class MappingValidationError(ValueError):
+    """Raised by SchemaMapper.map_dpp() when a mapped document is invalid."""
+
+    def __init__(self, message: str, errors: List[str]) -> None:
+        super().__init__(message)
+        self.errors = errors
+
+
+@dataclass
+class BatchReport:
+    """
+    Aggregate result of Validator.validate_batch().
+
+    Attributes:
+        documents / valid / invalid: Document counts.
+        errors / warnings: Issue counts by severity.
+        by_rule: Issue count per check keyword.
+        by_path: Issue count per path, with list indices normalised to [*].
+        failures: Document index -> issues, for the first max_failures
+                  invalid documents.
+        elapsed: Wall time in seconds.
+    """
+    documents: int = 0
+    valid: int = 0
+    invalid: int = 0
+    errors: int = 0
+    warnings: int = 0
+    by_rule: Counter = field(default_factory=Counter)
+    by_path: Counter = field(default_factory=Counter)
+    failures: Dict[int, List[ValidationIssue]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.documents / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        lines = [
+            f"{self.documents} documents: {self.valid} valid, {self.invalid} invalid "
+            f"({self.errors} errors, {self.warnings} warnings) "
+            f"in {self.elapsed:.3f}s ({self.documents_per_second:,.0f} docs/s)"
+        ]
+        for path, count in self.by_path.most_common(10):
+            lines.append(f"  {count:>8}  {path}")
+        return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Rule compilation
+# ---------------------------------------------------------------------------
+
+class _Node:
+    """Rule tree node for one path position (compiled into a closure)."""
+
+    __slots__ = ("children", "items", "values", "checks", "required")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        self.items: Optional[_Node] = None
+        self.values: Optional[_Node] = None
+        self.checks: List[Tuple[Check, str, str]] = []  # (check, rule, severity)
+        # (rule, message, severity) reported when the value is absent
+        self.required: List[Tuple[str, str, str]] = []
+
+    def missing(self) -> List[Tuple[str, str, str, str]]:
+        """Issues for an absent value: own required checks and those of key-only descendants."""
+        issues = [("", rule, message, severity) for rule, message, severity in self.required]
+        for key, child in self.children.items():
+            issues.extend((f".{key}{suffix}", *rest) for suffix, *rest in child.missing())
+        return issues
+
+
+def _parse_path(path: str) -> List[str]:
+    segments = []
+    for part in path.split("."):
+        if not part:
+            raise ValueError(f"Invalid rule path {path!r}")
+        while part.endswith("[*]"):
+            part = part[:-3]
+            if part:
+                segments.append(part)
+            part = ""
+            segments.append("[*]")
+        if part:
+            segments.append(part)
+    return segments
+
+
+def _make_check(keyword: str, param: Any, message: Optional[str]) -> Check:
+    """
+    Compile one check keyword. The check returns None when the value passes,
+    else a list of (path suffix, message) failures.
+    """
+    def fail(default: str, suffix: str = "") -> List[Tuple[str, str]]:
+        return [(suffix, message or default)]
+
+    if keyword == "required":
+        def check(value):
+            if value is None or value == "" or value == [] or value == {}:
+                return fail("is required")
+            return None
+        return check
+
+    if keyword == "required_any":
+        keys = tuple(param)
+        default = f"requires one of {', '.join(keys)}"
+
+        def check(value):
+            if not isinstance(value, Mapping) or not any(value.get(k) not in (None, "") for k in keys):
+                return fail(default)
+            return None
+        return check
+
+    if keyword == "type":
+        if param not in _TYPES:
+            raise ValueError(f"Unknown type {param!r}; expected one of {sorted(_TYPES)}")
+        is_type = _TYPES[param]
+        default = f"expected {param}"
+
+        def check(value):
+            if value is not None and not is_type(value):
+                return fail(f"{default}, got {type(value).__name__}")
+            return None
+        return check
+
+    if keyword == "equals":
+        def check(value):
+            if value is not None and value != param:
+                return fail(f"expected {param!r}, got {value!r}")
+            return None
+        return check
+
+    if keyword == "one_of":
+        allowed = tuple(param)
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            allowed_set = None
+        default = f"must be one of {', '.join(map(str, allowed))}"
+
+        def check(value):
+            if value is None:
+                return None
+            try:
+                ok = value in allowed_set if allowed_set is not None else value in allowed
+            except TypeError:
+                ok = False
+            return None if ok else fail(f"{default}, got {value!r}")
+        return check
+
+    if keyword == "pattern":
+        match = re.compile(param).fullmatch
+        default = f"does not match {param}"
+
+        def check(value):
+            if value is None:
+                return None
+            if not isinstance(value, str) or match(value) is None:
+                return fail(f"{value!r} {default}")
+            return None
+        return check
+
+    if keyword in ("min", "max"):
+        bound = param
+        below = keyword == "min"
+        word = "at least" if below else "at most"
+
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+            if (value < bound) if below else (value > bound):
+                return fail(f"must be {word} {bound}, got {value!r}")
+            return None
+        return check
+
+    if keyword == "finite":
+        def check(value):
+            if isinstance(value, float) and not math.isfinite(value):
+                return fail(f"must be a finite number, got {value!r}")
+            return None
+        return check
+
+    if keyword == "max_length":
+        limit = int(param)
+
+        def check(value):
+            if isinstance(value, (str, list, tuple)) and len(value) > limit:
+                return fail(f"length {len(value)} exceeds {limit}")
+            return None
+        return check
+
+    if keyword == "unique_by":
+        key = param
+
+        def check(value):
+            if not isinstance(value, (list, tuple)):
+                return None
+            seen: Dict[Any, int] = {}
+            failures = []
+            for index, item in enumerate(value):
+                if not isinstance(item, Mapping):
+                    continue
+                item_key = item.get(key)
+                if item_key is None:
+                    continue
+                first = seen.setdefault(item_key, index)
+                if first != index:
+                    failures.extend(fail(
+                        f"duplicate {key} {item_key!r} (first at index {first})", f"[{index}].{key}"
+                    ))
+            return failures or None
+        return check
+
+    raise ValueError(f"Unknown validation check {keyword!r}")
+
+
+def format_path(path: Path) -> str:
+    """
+    Render a lazily built path as a JSON path string.
+
+    Visitors pass paths as nested (parent, key) tuples, with int keys for
+    list indices, so no string is built unless an issue is reported.
+    """
+    parts = []
+    while path.__class__ is tuple:
+        path, key = path
+        parts.append(f"[{key}]" if key.__class__ is int else f".{key}")
+    parts.append(path)
+    return "".join(reversed(parts))
+
+
+def _report(
+    failures: List[Tuple[str, str]], path: Path, rule: str, severity: str, issues: List[ValidationIssue]
+) -> None:
+    base = format_path(path)
+    for suffix, message in failures:
+        issues.append(ValidationIssue(base + suffix, rule, message, severity))
+
+
+def _compile_node(node: _Node) -> Visitor:
+    checks = tuple(node.checks)
+
+    def is_leaf(child: _Node) -> bool:
+        return not (child.children or child.items or child.values)
+
+    # Leaf children are checked inline, without a visitor call
+    children = tuple(
+        (
+            key,
+            None if is_leaf(child) else _compile_node(child),
+            tuple(child.checks) if is_leaf(child) else None,
+            tuple(child.missing()),
+        )
+        for key, child in node.children.items()
+    )
+    visit_item = _compile_node(node.items) if node.items is not None else None
+    item_checks = tuple(node.items.checks) if node.items is not None and is_leaf(node.items) else None
+    visit_value = _compile_node(node.values) if node.values is not None else None
+    value_checks = tuple(node.values.checks) if node.values is not None and is_leaf(node.values) else None
+
+    def visit(value: Any, path: Path, issues: List[ValidationIssue]) -> None:
+        for check, rule, severity in checks:
+            failures = check(value)
+            if failures:
+                _report(failures, path, rule, severity, issues)
+        if children:
+            is_mapping = value.__class__ is dict or isinstance(value, Mapping)
+            for key, visit_child, leaf_checks, missing in children:
+                if is_mapping and key in value:
+                    if leaf_checks is None:
+                        visit_child(value[key], (path, key), issues)
+                        continue
+                    child_value = value[key]
+                    for check, rule, severity in leaf_checks:
+                        failures = check(child_value)
+                        if failures:
+                            _report(failures, (path, key), rule, severity, issues)
+                elif missing:
+                    base = format_path((path, key))
+                    for suffix, rule, message, severity in missing:
+                        issues.append(ValidationIssue(base + suffix, rule, message, severity))
+        if visit_item is not None and (value.__class__ is list or isinstance(value, (list, tuple))):
+            if item_checks is None:
+                for index, item in enumerate(value):
+                    visit_item(item, (path, index), issues)
+            else:
+                for index, item in enumerate(value):
+                    for check, rule, severity in item_checks:
+                        failures = check(item)
+                        if failures:
+                            _report(failures, (path, index), rule, severity, issues)
+        if visit_value is not None and (value.__class__ is dict or isinstance(value, Mapping)):
+            if value_checks is None:
+                for key, item in value.items():
+                    visit_value(item, (path, key), issues)
+            else:
+                for key, item in value.items():
+                    for check, rule, severity in value_checks:
+                        failures = check(item)
+                        if failures:
+                            _report(failures, (path, key), rule, severity, issues)
+
+    return visit
+
+
+class CompiledValidator:
+    """
+    Base for validators compiled into a single visitor closure.
+
+    Subclasses set self._visit, a function (value, path, issues) that
+    appends a ValidationIssue for every violation below `path`.
+    """
+
+    _visit: Visitor
+
+    def validate(self, document: Any) -> List[ValidationIssue]:
+        """Return every issue found in the document (empty if it is valid)."""
+        issues: List[ValidationIssue] = []
+        self._visit(document, "$", issues)
+        return issues
+
+    def is_valid(self, document: Any) -> bool:
+        """True if the document has no error-severity issues."""
+        return not any(issue.severity == "error" for issue in self.validate(document))
+
+    def validate_batch(self, documents: Iterable[Any], max_failures: int = 100) -> BatchReport:
+        """
+        Validate many documents and aggregate statistics.
+
+        Args:
+            documents: Iterable of documents.
+            max_failures: Number of invalid documents whose issues are kept
+                          in BatchReport.failures.
+
+        Returns:
+            BatchReport
+        """
+        report = BatchReport()
+        visit = self._visit
+        start = time.perf_counter()
+
+        for index, document in enumerate(documents):
+            issues: List[ValidationIssue] = []
+            visit(document, "$", issues)
+            report.documents += 1
+
+            errors = 0
+            for issue in issues:
+                if issue.severity == "error":
+                    errors += 1
+                report.by_rule[issue.rule] += 1
+                report.by_path[_INDEX.sub("[*]", issue.path)] += 1
+            report.errors += errors
+            report.warnings += len(issues) - errors
+
+            if errors:
+                report.invalid += 1
+                if len(report.failures) < max_failures:
+                    report.failures[index] = issues
+            else:
+                report.valid += 1
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+class Validator(CompiledValidator):
+    """
+    A rule set compiled into a single-pass document validator.
+
+    Args:
+        rules: Rule dicts (see module docstring).
+
+    Raises:
+        ValueError: On unknown check keywords, severities or malformed paths.
+    """
+
+    def __init__(self, rules: Iterable[Mapping]) -> None:
+        self.rules = [dict(rule) for rule in rules]
+        root = _Node()
+
+        for rule in self.rules:
+            unknown = set(rule) - _RULE_KEYS
+            if unknown:
+                raise ValueError(f"Unknown keys {sorted(unknown)} in validation rule {rule}")
+            severity = rule.get("severity", "error")
+            if severity not in SEVERITIES:
+                raise ValueError(f"Unknown severity {severity!r} in validation rule {rule}")
+            message = rule.get("message")
+
+            node = root
+            for segment in _parse_path(rule["path"]):
+                if segment == "[*]":
+                    node.items = node.items or _Node()
+                    node = node.items
+                elif segment == "*":
+                    node.values = node.values or _Node()
+                    node = node.values
+                else:
+                    node = node.children.setdefault(segment, _Node())
+
+            for keyword in CHECKS:
+                if keyword not in rule or (keyword in ("required", "finite") and not rule[keyword]):
+                    continue
+                node.checks.append((_make_check(keyword, rule[keyword], message), keyword, severity))
+                if keyword in ("required", "required_any"):
+                    node.required.append((keyword, message or "is required", severity))
+
+        self._visit = _compile_node(root)
+
+    def __repr__(self) -> str:
+        return f"Validator(rules={len(self.rules)})"
+
+
+class ListStreamValidator:
+    """
+    Validates the items of one list of a document in batches, as a
+    Validator over the whole document would validate that list.
+
+    Used when the list is never materialised (SchemaMapper.iter_map_json()).
+    The item rules (paths below "<list_path>[*]") are compiled once; issue
+    paths carry the item's index in the whole list, and "unique_by" rules on
+    the list itself remember the keys of earlier batches. Other checks on
+    the list itself (type, max_length, ...) are not applied here; validate
+    them on the document with the list left empty.
+
+    Args:
+        rules: Rule dicts of the whole document (see module docstring).
+        list_path: Rule path of the list, e.g. "structure.components".
+    """
+
+    def __init__(self, rules: Iterable[Mapping], list_path: str) -> None:
+        prefix = list_path + "[*]"
+        item_rules = []
+        self._unique: List[Tuple[Any, str, Optional[str], Dict[Any, int]]] = []
+        for rule in rules:
+            path = rule["path"]
+            if path == list_path and "unique_by" in rule:
+                self._unique.append((rule["unique_by"], rule.get("severity", "error"), rule.get("message"), {}))
+            elif path == prefix or path.startswith(prefix + ".") or path.startswith(prefix + "["):
+                item_rules.append({**rule, "path": path[len(list_path):]})
+        self._items = Validator(item_rules) if item_rules else None
+        self._base = "$." + list_path
+        self.count = 0
+
+    def validate(self, items: List[Any]) -> List[ValidationIssue]:
+        """Validate the next batch of items (in list order)."""
+        start = self.count
+        self.count += len(items)
+        issues: List[ValidationIssue] = []
+
+        if self._items is not None:
+            for issue in self._items.validate(items):
+                # "$[3].id" -> "$.structure.components[<start + 3>].id"
+                index, _, rest = issue.path[2:].partition("]")
+                issues.append(ValidationIssue(
+                    f"{self._base}[{start + int(index)}]{rest}", issue.rule, issue.message, issue.severity
+                ))
+
+        for key, severity, message, seen in self._unique:
+            for index, item in enumerate(items, start):
+                if not isinstance(item, Mapping):
+                    continue
+                item_key = item.get(key)
+                if item_key is None:
+                    continue
+                first = seen.setdefault(item_key, index)
+                if first != index:
+                    issues.append(ValidationIssue(
+                        f"{self._base}[{index}].{key}", "unique_by",
+                        message or f"duplicate {key} {item_key!r} (first at index {first})", severity,
+                    ))
+        return issues
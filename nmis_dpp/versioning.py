@@ -0,0 +1,141 @@
+"""
+versioning.py
+
+Change tracking for passport layers and parts.
+
+Every tracked object carries a version number drawn from a single,
+process-wide monotonic clock. Assigning any attribute stamps the object
+with a fresh version, so "has this changed since X?" is a single integer
+comparison, and a replaced object is always distinguishable from the one
+it replaced.
+
+In-place mutation of nested containers (e.g. ``layer.events.append(...)``
+or ``part.properties["x"] = 1``) cannot be observed; call ``touch()``
+afterwards, or use the helpers that do so (LifecycleLayer.add_event,
+StructureLayer.add_part, PartClass.bind_ontology).
+
+Objects attached to a ChangeLog also record themselves in it whenever they
+are stamped, so a container can list its modified members without looking
+at the unmodified ones (StructureLayer.changed_parts).
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, Dict, Iterable, List, Tuple
+
+_clock = itertools.count(1)
+
+
+def next_version() -> int:
+    """Return a fresh, process-wide unique version number."""
+    return next(_clock)
+
+
+def version_of(obj: Any) -> int:
+    """
+    Version stamp of a tracked object (0 if it was never stamped).
+
+    Reads the stamp directly, so it also works for classes with a model
+    field that shadows Versioned.change_version.
+    """
+    return obj.__dict__.get("_version", 0)
+
+
+class Versioned:
+    """
+    Mixin for dataclasses whose modifications should be tracked.
+
+    The version lives outside the dataclass fields, so it does not show up
+    in asdict()/to_dict(), equality comparisons or serialized output. The
+    hook adds a few microseconds to constructing an object with ~10 fields.
+
+    The stamp is exposed as change_version (and version_of()) rather than
+    "version", which is a model field of some classes (SoftwareModule).
+    """
+
+    def __setattr__(self, name: str, value: Any, _next=_clock.__next__) -> None:
+        # Runs for every field of every dataclass __init__, so it writes the
+        # instance dict directly (subclasses use plain attributes only).
+        state = self.__dict__
+        state[name] = value
+        state["_version"] = _next()
+        log = state.get("_change_log")
+        if log is not None:
+            log.changed[id(self)] = self
+
+    @property
+    def change_version(self) -> int:
+        """Version stamp of the last recorded modification."""
+        return self.__dict__.get("_version", 0)
+
+    def touch(self) -> int:
+        """
+        Record an in-place modification (e.g. a mutated nested list/dict).
+
+        Returns:
+            int: The new version.
+        """
+        version = next(_clock)
+        object.__setattr__(self, "_version", version)
+        log = self.__dict__.get("_change_log")
+        if log is not None:
+            log.changed[id(self)] = self
+        return version
+
+    def signature(self, _containers=(list, dict)) -> Tuple[int, ...]:
+        """
+        Cheap change signature: the version plus the length of every
+        list/dict attribute, so unsignalled appends/removals are noticed too.
+        """
+        state = self.__dict__
+        signature = [state.get("_version", 0)]
+        for value in state.values():
+            if isinstance(value, _containers):
+                signature.append(len(value))
+        return tuple(signature)
+
+
+class ChangeLog:
+    """
+    Records which members of a sequence of Versioned objects get stamped.
+
+    Attaching is O(members); afterwards every assignment or touch() of a
+    member adds it to `changed`, so modified() costs O(changes). It covers
+    changes after `start`: members stamped after it but before attaching
+    must be in `changed` already (the owner seeds them). A member
+    reports to the last log it was attached to. Logs are not copied or
+    pickled with their members (copies start unattached).
+
+    Args:
+        members: The objects to watch, e.g. StructureLayer.parts.
+        signature: Signature of the owning container when attached, so the
+                   owner can tell when the log no longer covers its members.
+        start: Oldest version modified() answers for.
+    """
+
+    __slots__ = ("start", "signature", "changed", "positions")
+
+    def __init__(self, members: Iterable[Versioned], signature: Tuple[int, ...], start: int) -> None:
+        self.start = start
+        self.signature = signature
+        self.changed: Dict[int, Versioned] = {}
+        self.positions: Dict[int, int] = {}
+        for position, member in enumerate(members):
+            self.attach(member, position)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(None), ()
+
+    def attach(self, member: Versioned, position: int) -> None:
+        """Watch `member`, found at `position` in the owning sequence."""
+        member.__dict__["_change_log"] = self
+        self.positions[id(member)] = position
+
+    def modified(self, since: int) -> List[int]:
+        """Positions of the members stamped after version `since` (>= start), in order."""
+        positions = self.positions
+        return sorted({
+            positions[key] for key, member in self.changed.items()
+            if key in positions and member.__dict__.get("_version", 0) > since
+        })
@@ -0,0 +1,66 @@
+"""
+conftest.py
+
+Shared fixtures: a six-layer passport builder and a small sample passport.
+"""
+
+import pytest
+
+from nmis_dpp.model import (
+    DigitalProductPassport,
+    IdentityLayer,
+    LifecycleLayer,
+    ProvenanceLayer,
+    RiskLayer,
+    StructureLayer,
+    SustainabilityLayer,
+)
+from nmis_dpp.part_class import PartClass
+
+
+def build_dpp(parts=(), global_ids=None, make_model=None, ownership=None, manufacture=None, mass=1.0):
+    """Build a passport with empty optional layers.
+
+    Args:
+        parts: Parts of the structure layer.
+        global_ids: Identity global IDs (default ``{"gtin": "123"}``).
+        make_model: Brand and model (default Acme X).
+        ownership: Ownership record (default manufacturer Acme).
+        manufacture: Lifecycle manufacture record.
+        mass: Sustainability mass.
+
+    Returns:
+        DigitalProductPassport: A new passport.
+    """
+    return DigitalProductPassport(
+        identity=IdentityLayer(
+            global_ids={"gtin": "123"} if global_ids is None else global_ids,
+            make_model=make_model or {"brand": "Acme", "model": "X"},
+            ownership={"manufacturer": "Acme"} if ownership is None else ownership,
+            conformity=[],
+        ),
+        structure=StructureLayer(hierarchy={}, parts=list(parts), interfaces=[], materials=[], bom_refs=[]),
+        lifecycle=LifecycleLayer(
+            manufacture=manufacture or {}, use={}, serviceability={}, events=[], end_of_life={},
+        ),
+        risk=RiskLayer(criticality={}, fmea=[], security={}),
+        sustainability=SustainabilityLayer(mass=mass, energy={}, recycled_content={}, remanufacture={}),
+        provenance=ProvenanceLayer(signatures=[], trace_links=[]),
+    )
+
+
+@pytest.fixture
+def make_dpp():
+    """The passport builder; tests pass only the fields they check."""
+    return build_dpp
+
+
+@pytest.fixture
+def sample_dpp():
+    part = PartClass(part_id="P1", name="Part1", type="Actuator", properties={"torque": 10})
+    return build_dpp(
+        parts=[part],
+        make_model={"brand": "BrandX", "model": "Mod1"},
+        ownership={"manufacturer": "MfgCo"},
+        manufacture={"date": "2023-01-01", "lot": "L1"},
+    )
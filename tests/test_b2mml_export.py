@@ -0,0 +1,96 @@
+"""
+test_b2mml_export.py
+
+Tests for the streaming B2MML XML writer.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from nmis_dpp.b2mml_export import B2MML_NAMESPACE, B2MMLWriter, write_b2mml
+from nmis_dpp.b2mml_import import B2MMLImporter
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Sensor
+
+NS = {"b": B2MML_NAMESPACE}
+
+
+@pytest.fixture
+def unit_dpp(make_dpp):
+    def build(serial):
+        sensor = Sensor(
+            part_id=f"S-{serial}", name="Temp <NTC> & probe", type="Sensor",
+            properties={"range_max": 120, "unit": "degC"},
+        )
+        sensor.bind_ontology("ISA-95", class_ids=["TemperatureSensor"])
+        return make_dpp(
+            parts=[sensor], global_ids={"serial": serial}, make_model={"brand": "Acme", "model": "UnitX"},
+            ownership={}, manufacture={"lot": "Batch77", "date": "2025-03-18"},
+        )
+    return build
+
+
+def test_writes_many_passports_into_one_document(unit_dpp):
+    out = io.BytesIO()
+    count = write_b2mml(
+        (unit_dpp(f"SN{i}") for i in range(3)), out, mapper=ISA95Mapper(config={})
+    )
+    assert count == 3
+
+    root = ET.fromstring(out.getvalue())
+    assert root.tag == f"{{{B2MML_NAMESPACE}}}EquipmentInformation"
+    equipment = root.findall("b:Equipment", NS)
+    assert [e.findtext("b:ID", namespaces=NS) for e in equipment] == ["SN0", "SN1", "SN2"]
+
+    first = equipment[0]
+    assert first.findtext("b:Description", namespaces=NS) == "Acme UnitX"
+    assert first.findtext("b:EquipmentLevel", namespaces=NS) == "Unit"
+    props = {
+        p.findtext("b:ID", namespaces=NS): p.findtext("b:Value/b:ValueString", namespaces=NS)
+        for p in first.findall("b:EquipmentProperty", NS)
+    }
+    assert props == {"WorkOrder": "Batch77", "ProductionDate": "2025-03-18"}
+
+    child = first.find("b:EquipmentChild", NS)
+    assert child.findtext("b:Description", namespaces=NS) == "Temp <NTC> & probe"
+    assert child.findtext("b:EquipmentClassID", namespaces=NS) == "TemperatureSensor"
+
+
+def test_plain_text_writers_receive_str(unit_dpp):
+    class Collector:  # not an io.TextIOBase
+        def __init__(self):
+            self.parts = []
+
+        def write(self, data):
+            self.parts.append(data)
+
+    stream = Collector()
+    assert write_b2mml([unit_dpp("SN0")], stream, mapper=ISA95Mapper(config={})) == 1
+    assert all(isinstance(part, str) for part in stream.parts)
+    assert ET.fromstring("".join(stream.parts).encode("utf-8")).findtext("b:Equipment/b:ID", namespaces=NS) == "SN0"
+
+
+def test_flushes_incrementally_and_round_trips_through_importer(tmp_path, unit_dpp):
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, data):
+            writes.append(len(data))
+            return super().write(data)
+
+    stream = Recorder()
+    with B2MMLWriter(stream, mapper=ISA95Mapper(config={}), buffer_size=256) as writer:
+        for i in range(50):
+            writer.write_dpp(unit_dpp(f"SN{i}"))
+    assert len(writes) > 10
+    assert max(writes) < 1024
+
+    path = tmp_path / "export.xml"
+    path.write_text(stream.getvalue(), encoding="utf-8")
+    importer = B2MMLImporter()
+    records = list(importer.iter_records([path]))
+    assert importer.stats.by_tag == {"Equipment": 50, "EquipmentChild": 50}
+    assert records[0].part.part_id == "S-SN0"
+    assert records[0].part.properties["range_max"] == "120"
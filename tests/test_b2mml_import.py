@@ -0,0 +1,87 @@
+"""
+test_b2mml_import.py
+
+Tests for the streaming B2MML importer.
+"""
+
+import zipfile
+from pathlib import Path
+
+from nmis_dpp.b2mml_import import B2MMLImporter
+from nmis_dpp.part_class import Consumable, PartClass, Sensor
+
+EXAMPLES_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "nmis_dpp" / "ontology_data" / "isa95" / "Examples"
+)
+
+EQUIPMENT_DOC = """<?xml version="1.0" encoding="utf-8"?>
+<ShowEquipmentInformation xmlns="http://www.mesa.org/xml/B2MML">
+  <ApplicationArea><CreationDateTime>2025-01-01T00:00:00Z</CreationDateTime></ApplicationArea>
+  <DataArea>
+    <EquipmentInformation>
+      {equipment}
+    </EquipmentInformation>
+  </DataArea>
+</ShowEquipmentInformation>
+"""
+
+EQUIPMENT = """
+<Equipment>
+  <ID>LINE-{i}</ID>
+  <Description>Filling line {i}</Description>
+  <EquipmentLevel>ProductionLine</EquipmentLevel>
+  <Equipment>
+    <ID>TT-{i}</ID>
+    <Description>Temperature sensor transducer</Description>
+    <EquipmentClassID>TemperatureTransmitter</EquipmentClassID>
+    <EquipmentProperty>
+      <ID>RangeMax</ID>
+      <Value><ValueString>120</ValueString><DataType>decimal</DataType></Value>
+    </EquipmentProperty>
+  </Equipment>
+</Equipment>
+"""
+
+
+def test_imports_material_lots_from_example_archive():
+    importer = B2MMLImporter()
+    parts, lifecycle = importer.import_layers(
+        [EXAMPLES_DIR / "Courbon B2MML v0401 Example XML Files.zip"]
+    )
+
+    assert importer.stats.by_tag == {"MaterialLot": 2}
+    assert all(isinstance(p, Consumable) for p in parts)
+    assert {p.part_id for p in parts} == {"CRBN0001_LOT01"}
+    assert len(lifecycle.events) == 2
+    assert lifecycle.events[0]["timestamp"].startswith("2012-12-10")
+    assert not importer.stats.errors
+
+
+def test_streams_nested_equipment_from_zip(tmp_path):
+    archive = tmp_path / "mes_export.zip"
+    body = "".join(EQUIPMENT.format(i=i) for i in range(500))
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("equipment.xml", EQUIPMENT_DOC.format(equipment=body))
+        zf.writestr("broken.xml", "<Equipment><ID>X</ID>")
+
+    importer = B2MMLImporter()
+    records = list(importer.iter_records([archive]))
+
+    assert importer.stats.records == 1000
+    assert importer.stats.records_per_second > 0
+    assert [source for source, _ in importer.stats.errors] == ["mes_export.zip!broken.xml"]
+
+    # Children are emitted before their parent (document order of end tags).
+    sensor, line = records[0].part, records[1].part
+    assert isinstance(sensor, Sensor)
+    assert sensor.part_id == "TT-0"
+    assert sensor.properties["RangeMax"] == 120.0
+    assert sensor.get_binding("ISA-95").class_ids == ["TemperatureTransmitter"]
+    assert sensor.get_binding("ISA-95").metadata["parent_id"] == "LINE-0"
+
+    assert type(line) is PartClass
+    assert line.part_id == "LINE-0"
+    assert line.properties["equipmentLevel"] == "ProductionLine"
+    assert records[1].event["event_type"] == "b2mml_equipment"
+    assert records[1].event["timestamp"] == "2025-01-01T00:00:00Z"
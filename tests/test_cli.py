@@ -0,0 +1,116 @@
+"""
+test_cli.py
+
+Tests for the command-line interface (interactive mode and the profile
+and batch subcommands).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from nmis_dpp import cli
+from nmis_dpp.synthetic import generate_passport_dict
+
+COFFEE_MACHINE = Path(__file__).resolve().parents[1] / "coffee_machine.json"
+
+
+def test_profile_synthetic_json_report(tmp_path, capsys):
+    output = tmp_path / "report.json"
+    code = cli.main([
+        "profile", "--schema", "ECLASS", "--synthetic", "50", "-n", "2",
+        "--cprofile", "--tracemalloc", "--top", "5", "--json", "-o", str(output),
+    ])
+    assert code == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report == json.loads(output.read_text(encoding="utf-8"))
+    assert report["schema"] == "ECLASS" and report["parts"] == 50 and report["iterations"] == 2
+    assert report["workload"] == "synthetic (seed 0)"
+    assert report["map_dpp_s"]["min"] > 0
+    assert "structure" in report["layers_s"] and report["schema_check_s"] is not None
+    assert report["full_validation"] is False and report["validation_s"] > report["schema_check_s"]
+    assert "map_dpp" in report["cprofile"]
+    assert 0 < len(report["tracemalloc"]["top"]) <= 5
+
+
+def test_profile_input_file_text_report(capsys):
+    assert cli.main(["profile", "--schema", "ISA-95", "--input", str(COFFEE_MACHINE), "-n", "1"]) == 0
+    out = capsys.readouterr().out
+    assert "ISA-95" in out and "coffee_machine.json" in out and "structure" in out
+
+
+def test_profile_errors(tmp_path, capsys):
+    assert cli.main(["profile", "--schema", "NOPE", "--synthetic", "5"]) == 2
+    assert "not found" in capsys.readouterr().err
+
+    broken = tmp_path / "broken.json"
+    broken.write_text("{", encoding="utf-8")
+    assert cli.main(["profile", "--schema", "ECLASS", "--input", str(broken)]) == 2
+    assert cli.main(["profile", "--schema", "ECLASS", "--synthetic", "5", "-n", "0"]) == 2
+
+
+def test_no_command_runs_interactive_mode(monkeypatch, capsys):
+    monkeypatch.setattr("builtins.input", lambda prompt="": "q")
+    assert cli.main([]) == 0
+    assert "Available schemas" in capsys.readouterr().out
+
+
+def write_inputs(root):
+    (root / "sub").mkdir(parents=True)
+    (root / "one.json").write_text(json.dumps(generate_passport_dict(3, seed=1)), encoding="utf-8")
+    lines = [json.dumps(generate_passport_dict(3, seed=seed)) for seed in range(4)]
+    lines += ["{not json", json.dumps({"identity": {}})]
+    (root / "sub" / "many.jsonl").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_batch_maps_directory_to_each_schema(tmp_path, capsys, workers):
+    write_inputs(tmp_path / "in")
+    out, report = tmp_path / "out", tmp_path / "report.json"
+    code = cli.main([
+        "batch", str(tmp_path / "in"), "-s", "ECLASS", "-s", "isa95", "-o", str(out),
+        "--workers", workers, "--report", str(report),
+    ])
+    assert code == 1  # two malformed records
+
+    summary = json.loads(report.read_text(encoding="utf-8"))
+    assert summary["files"] == 2 and summary["records"] == 7 and summary["failed"] == 2
+    assert summary["mapped"] == {"ECLASS": 5, "ISA-95": 5}
+    assert sorted(f["record"] for f in summary["failures"]) == ["line 5", "line 6"]
+    assert "[2/2]" in capsys.readouterr().err
+
+    mapped = [json.loads(line) for line in (out / "isa95" / "sub" / "many.jsonl").read_text().splitlines()]
+    assert len(mapped) == 4 and all(doc["schema"] == "ISA-95" for doc in mapped)
+    assert json.loads((out / "eclass" / "one.json").read_text())["schema"] == "ECLASS"
+    assert not list(out.rglob(".*.tmp"))
+
+
+def test_unreadable_file_writes_nothing(tmp_path):
+    source = tmp_path / "broken.jsonl"
+    good = json.dumps(generate_passport_dict(3, seed=1)).encode("utf-8")
+    source.write_bytes((good + b"\n") * 50 + b"\xff\xfe\n")  # fails to decode part way through
+    result = cli.map_file(source, Path("broken.jsonl"), ["ECLASS"], tmp_path / "out")
+    assert result["records"] > 0 and result["failed"] == 1 and result["mapped"] == {"ECLASS": 0}
+    assert "UnicodeDecodeError" in result["failures"][0]["error"]
+    assert not [p for p in (tmp_path / "out").rglob("*") if p.is_file()]
+
+
+def test_batch_glob_and_errors(tmp_path, capsys):
+    write_inputs(tmp_path / "in")
+    args = ["batch", str(tmp_path / "in" / "*.json"), "-s", "ECLASS", "-o", str(tmp_path / "out"), "-q"]
+    assert cli.main(args) == 0
+    assert "Failures: 0" in capsys.readouterr().out
+    assert [p.name for p in (tmp_path / "out").rglob("*.json")] == ["one.json"]
+
+    assert cli.main(args[:3] + ["NOPE"] + args[4:]) == 2
+    assert cli.main(["batch", str(tmp_path / "missing*"), "-s", "ECLASS", "-o", str(tmp_path)]) == 2
+    assert cli.main(args + ["--workers", "0"]) == 2
+
+    # Duplicates are dropped; different files with the same output name are rejected
+    one = tmp_path / "in" / "one.json"
+    assert cli.collect_inputs([str(one), str(tmp_path / "in" / "*.json")]) == [(one, Path("one.json"))]
+    (tmp_path / "in" / "sub" / "one.json").write_text(one.read_text())
+    with pytest.raises(ValueError, match="would both be written"):
+        cli.collect_inputs([str(tmp_path / "in" / "**" / "one.json")])
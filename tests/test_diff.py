@@ -0,0 +1,165 @@
+"""
+test_diff.py
+
+Tests for the passport diff/patch engine.
+"""
+
+import copy
+import json
+import random
+
+import pytest
+
+from nmis_dpp.diff import PatchError, apply_patch, diff_passports, diff_values
+from nmis_dpp.part_class import Sensor, SoftwareModule
+from nmis_dpp.synthetic import generate_passport
+from nmis_dpp.utils import passport_from_dict, to_dict
+
+
+def edit(dpp):
+    """Apply a representative set of changes to dpp (in place, signalled)."""
+    dpp.sustainability.mass = 99.5
+    dpp.lifecycle.add_event({"type": "inspection", "date": "2026-01-02"})
+    dpp.identity.ownership = {k: v for k, v in dpp.identity.ownership.items() if k != "owner"}
+    dpp.identity.ownership["operator"] = "Plant 7/North"
+    parts = dpp.structure.parts
+    parts[1].properties = dict(parts[1].properties, supplier="SUP-9999")
+    parts[2].bind_ontology("ISA-95", class_ids=["EQ-1"])
+    removed = parts.pop(0)
+    dpp.structure.parts = parts[:2] + [Sensor(part_id="new~/1", name="Probe", type="Sensor")] + parts[2:]
+    return removed
+
+
+def test_diff_is_compact_and_round_trips():
+    old = generate_passport(50, seed=3, binding_ratio=1.0)
+    new = copy.deepcopy(old)
+    removed = edit(new)
+
+    patch = diff_passports(old, new)
+    json.dumps(patch)  # plain JSON
+    paths = {(op["op"], op["path"]) for op in patch}
+    assert ("replace", "/sustainability/mass") in paths
+    assert ("add", "/lifecycle/events/-") in paths
+    assert ("remove", "/identity/ownership/owner") in paths
+    assert ("add", "/identity/ownership/operator") in paths
+    assert ("remove", f"/structure/parts/{removed.part_id}") in paths
+    assert ("add", "/structure/parts/new~0~11") in paths
+    assert ("replace", f"/structure/parts/{new.structure.parts[0].part_id}/properties/supplier") in paths
+    assert ("reorder", "/structure/parts") in paths
+    assert len(patch) < 12  # nothing about the 47 untouched parts
+
+    patched = apply_patch(old, patch)
+    assert to_dict(patched) == to_dict(new)
+    assert isinstance(patched.structure.parts[2], Sensor)
+    assert apply_patch(to_dict(old), patch) == to_dict(new)
+    assert diff_passports(patched, new) == []
+
+
+def test_apply_patch_copies_on_write():
+    old = generate_passport(5, seed=1)
+    before = to_dict(old)
+    new = copy.deepcopy(old)
+    new.structure.parts[3].name = "renamed"
+    new.risk.criticality = {"level": "high"}
+
+    patched = apply_patch(old, diff_passports(old, new))
+    assert to_dict(old) == before
+    assert patched.identity is old.identity and patched.lifecycle is old.lifecycle
+    assert patched.structure.parts[0] is old.structure.parts[0]
+    assert patched.structure.parts[3] is not old.structure.parts[3]
+    assert patched.risk.change_version > old.risk.change_version
+
+    raw = to_dict(old)
+    patched_raw = apply_patch(raw, diff_passports(old, new))
+    assert raw == before and patched_raw["identity"] is raw["identity"]
+
+
+def test_content_is_compared_unless_versions_are_trusted():
+    old = generate_passport(20, seed=2)
+    new = copy.deepcopy(old)
+    assert diff_passports(old, new) == diff_passports(old, new, trust_versions=True) == []
+
+    # Unsignalled in-place edit: found by content, invisible to versions
+    new.structure.parts[4].properties["weight_g"] = 1.0
+    assert diff_passports(old, new) == [
+        {"op": "replace", "path": f"/structure/parts/{old.structure.parts[4].part_id}/properties/weight_g", "value": 1.0}
+    ]
+    assert diff_passports(old, new, trust_versions=True) == []
+    new.structure.parts[4].touch()
+    assert diff_passports(old, new, trust_versions=True) == diff_passports(old, new)
+
+    # Independently built equal passports produce no ops either
+    assert diff_passports(old, passport_from_dict(to_dict(old))) == []
+
+
+def test_part_type_change_replaces_part_and_reorder():
+    old = generate_passport(4, seed=4, part_types=["Actuator"])
+    new = copy.deepcopy(old)
+    first = new.structure.parts[0]
+    new.structure.parts[0] = Sensor(part_id=first.part_id, name=first.name, type="Sensor")
+    new.structure.parts.reverse()
+
+    patch = diff_passports(old, new)
+    assert [op["op"] for op in patch] == ["replace", "reorder"]
+    assert to_dict(apply_patch(old, patch)) == to_dict(new)
+
+
+def test_diff_values_and_patch_errors():
+    assert diff_values({"a": [1], "b": 2}, {"a": [1, 2, 3], "b": 2}, "/x") == [
+        {"op": "add", "path": "/x/a/-", "value": 2},
+        {"op": "add", "path": "/x/a/-", "value": 3},
+    ]
+    assert diff_values([1, 2], [2], "/y") == [{"op": "replace", "path": "/y", "value": [2]}]
+    assert diff_values({"a": 1}, {"a": 1, 2: "x"}, "/z") == [{"op": "replace", "path": "/z", "value": {"a": 1, 2: "x"}}]
+
+    # Non-string keys round-trip through a patch
+    dpp = generate_passport(2, seed=0)
+    keyed = copy.deepcopy(dpp)
+    keyed.lifecycle.use = {1: "x"}
+    assert apply_patch(dpp, diff_passports(dpp, keyed)) == keyed
+    changed = copy.deepcopy(keyed)
+    changed.lifecycle.use[1] = "y"
+    assert apply_patch(keyed, diff_passports(keyed, changed)) == changed
+
+    dpp = generate_passport(2, seed=0)
+    part_id = dpp.structure.parts[0].part_id
+    for bad in (
+        [{"op": "move", "path": "/risk/fmea"}],
+        [{"op": "replace", "path": "risk"}],
+        [{"op": "replace", "path": "/risk/fmea/7/x", "value": 1}],
+        [{"op": "remove", "path": "/identity/global_ids"}],
+        [{"op": "replace", "path": "/structure/parts/nope/name", "value": "x"}],
+        [{"op": "add", "path": f"/structure/parts/{part_id}", "value": to_dict(dpp.structure.parts[0])}],
+        [{"op": "reorder", "path": "/structure/parts", "value": [part_id]}],
+        [{"op": "replace", "path": "/warranty", "value": {}}],
+    ):
+        with pytest.raises(PatchError):
+            apply_patch(dpp, bad)
+    with pytest.raises(TypeError):
+        apply_patch([], [])
+
+    duplicated = copy.deepcopy(dpp)
+    duplicated.structure.parts[1].part_id = part_id
+    with pytest.raises(PatchError):
+        diff_passports(dpp, duplicated)
+
+
+def test_round_trip_with_software_modules():
+    rng = random.Random(7)
+    for _ in range(50):
+        old = generate_passport(6, seed=rng.randrange(1000))
+        for index in range(3):
+            old.structure.add_part(SoftwareModule(
+                part_id=f"SW{index}", name=f"Firmware {index}", type="SoftwareModule",
+                version=rng.choice([None, "1.0", "4.12.74"]),
+            ))
+        new = copy.deepcopy(old)
+        module = new.structure.parts[rng.randrange(6, 9)]
+        change = rng.randrange(3)
+        if change == 0:
+            module.name = "Bootloader"
+        elif change == 1:
+            module.version = "9.9.9"
+        else:
+            module.properties["x"] = rng.random()  # unsignalled size change
+        assert apply_patch(old, diff_passports(old, new)) == new
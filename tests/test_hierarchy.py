@@ -0,0 +1,97 @@
+"""
+test_hierarchy.py
+
+Tests for the compiled StructureLayer hierarchy index.
+"""
+
+import time
+
+import pytest
+
+from nmis_dpp.hierarchy import HierarchyIndex
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.synthetic import generate_passport, tree_hierarchy
+
+
+def make_layer():
+    layer = generate_passport(6, seed=1).structure
+    p = [part.part_id for part in layer.parts]
+    layer.hierarchy = {
+        "product": "UnitX",
+        "components": [
+            p[0],
+            {"id": "ASM-1", "components": [p[1], {"id": p[2], "components": [p[3]]}]},
+        ],
+        "children": {p[3]: ["SUB-9"], p[5]: []},
+    }
+    layer.touch()
+    return layer, p
+
+
+def test_queries_on_mixed_hierarchy():
+    layer, p = make_layer()
+    index = layer.hierarchy_index()
+    assert index.product == "UnitX" and len(index) == 8
+
+    # Unmentioned parts (p[4]) and parentless flat keys (p[5]) hang off the product
+    assert index.children() == [p[0], "ASM-1", p[5], p[4]]
+    assert index.children("ASM-1") == [p[1], p[2]]
+    assert index.parent(p[3]) == p[2] and index.parent("ASM-1") is None
+    assert index.path_to_root("SUB-9") == ["SUB-9", p[3], p[2], "ASM-1"]
+    assert index.depth("SUB-9") == 4 and index.depth(p[0]) == 1
+
+    assert list(index.subtree("ASM-1")) == ["ASM-1", p[1], p[2], p[3], "SUB-9"]
+    assert list(index.subtree("ASM-1", max_depth=1, include_self=False)) == [p[1], p[2]]
+    assert list(index.subtree(max_depth=1)) == [p[0], "ASM-1", p[5], p[4]]
+    assert index.level(2) == [p[1], p[2]]
+    assert index.subtree_size("ASM-1") == 5 and index.subtree_size() == 9
+    assert index.is_ancestor("ASM-1", "SUB-9") and not index.is_ancestor(p[0], "SUB-9")
+
+    assert index.part(p[3]) is layer.parts[3] and index.part("ASM-1") is None
+    assert [part.part_id for part in index.subtree_parts("ASM-1")] == [p[1], p[2], p[3]]
+    with pytest.raises(KeyError):
+        index.parent("missing")
+
+
+def test_index_is_cached_until_the_layer_changes():
+    layer, p = make_layer()
+    index = layer.hierarchy_index()
+    assert layer.hierarchy_index() is index
+
+    layer.add_part(Sensor(part_id="S-new", name="Probe", type="Sensor"))
+    rebuilt = layer.hierarchy_index()
+    assert rebuilt is not index and rebuilt.parent("S-new") is None
+    assert "S-new" not in index
+
+
+@pytest.mark.parametrize("hierarchy, message", [
+    ({"components": ["A", {"id": "B", "components": ["A"]}]}, "two parents"),
+    ({"children": {"A": ["B"], "C": ["D", "B"]}}, "two parents"),
+    ({"children": {"A": ["B"], "B": ["A"]}}, "cycle"),
+    ({"components": [{"name": "no id"}]}, "no id"),
+])
+def test_invalid_hierarchies(hierarchy, message):
+    with pytest.raises(ValueError, match=message):
+        HierarchyIndex(hierarchy, [])
+
+
+def test_large_deep_tree():
+    layer = generate_passport(100_000, seed=0).structure
+    ids = [part.part_id for part in layer.parts]
+    layer.hierarchy = tree_hierarchy(ids, fanout=2)  # depth 17
+    layer.touch()
+
+    index = layer.hierarchy_index()
+    assert len(index) == 100_000 and index.depth(ids[-1]) == 17
+    assert index.path_to_root(ids[-1])[-1] == ids[0]
+
+    start = time.perf_counter()
+    for node in ids[::1000]:
+        index.path_to_root(node)
+        index.subtree_size(node)
+    assert sum(1 for _ in index.subtree(ids[1], max_depth=3)) == 15
+    assert time.perf_counter() - start < 0.5
+
+    # A chain deeper than the recursion limit builds and walks iteratively
+    chain = HierarchyIndex(tree_hierarchy(ids[:5000], fanout=1), [])
+    assert chain.depth(ids[4999]) == 5000 and len(chain.path_to_root(ids[4999])) == 5000
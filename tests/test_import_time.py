@@ -0,0 +1,52 @@
+"""
+test_import_time.py
+
+Cold-start regression checks for `import nmis_dpp`.
+
+Each check runs in a fresh interpreter, so it sees everything the package
+pulls in. The checks are on which modules load rather than on wall time:
+the lazy import is only about a third faster than the eager one, less than
+the run-to-run spread on CI, so no time budget could tell them apart.
+"""
+
+import json
+import subprocess
+import sys
+
+#: Modules that must not be loaded by a bare `import nmis_dpp`.
+DEFERRED_MODULES = (
+    "yaml",
+    "xml.etree.ElementTree",
+    "nmis_dpp.schema_registry",
+    "nmis_dpp.eclass_build_mapping",
+    "nmis_dpp.isa95_build_mapping",
+)
+
+
+def run_python(code, *flags):
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+
+
+def test_import_does_not_load_deferred_modules():
+    result = run_python(
+        "import json, sys, nmis_dpp; print(json.dumps(sorted(sys.modules)))"
+    )
+    loaded = set(json.loads(result.stdout))
+    assert loaded.isdisjoint(DEFERRED_MODULES), loaded.intersection(DEFERRED_MODULES)
+
+
+def test_lazy_attributes_resolve_on_first_access():
+    result = run_python(
+        "import nmis_dpp\n"
+        "registry = nmis_dpp.get_global_registry()\n"
+        "assert {'ECLASS', 'ISA-95'} <= set(registry.list_schemas())\n"
+        "assert nmis_dpp.isa95_build_mapping.ISA95_SCHEMA_DIR.exists()\n"
+        "try:\n"
+        "    nmis_dpp.missing\n"
+        "except AttributeError:\n"
+        "    print('ok')\n"
+    )
+    assert result.stdout.strip() == "ok"
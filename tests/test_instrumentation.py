@@ -0,0 +1,128 @@
+"""
+test_instrumentation.py
+
+Tests for SchemaMapper instrumentation hooks and the MetricsRecorder exporter.
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from nmis_dpp.instrumentation import Instrumentation, MetricsRecorder
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.schema_registry import SchemaRegistry
+
+
+def probes(n_parts=3):
+    return [Sensor(part_id=f"S{i}", name="Probe", type="Sensor") for i in range(n_parts)]
+
+
+class EventLog(Instrumentation):
+    def __init__(self):
+        self.events = []
+
+    def layer_mapped(self, schema, layer, seconds):
+        self.events.append(("layer", layer))
+
+    def parts_mapped(self, schema, count):
+        self.events.append(("parts", count))
+
+    def validated(self, schema, seconds, valid):
+        self.events.append(("validated", valid))
+
+    def dpp_mapped(self, schema, seconds, error):
+        self.events.append(("dpp", error is None))
+
+
+def test_hooks_fire_for_map_dpp_and_remap(make_dpp):
+    log = EventLog()
+    mapper = ECLASSMapper(config={"full_validation": True})
+    mapper.instrumentation = log
+    dpp = make_dpp(parts=probes())
+
+    mapped = mapper.map_dpp(dpp)
+    assert log.events == [
+        ("layer", "identity"), ("layer", "structure"), ("parts", 3), ("layer", "lifecycle"),
+        ("layer", "risk"), ("layer", "sustainability"), ("layer", "provenance"),
+        ("validated", True), ("dpp", True),
+    ]
+
+    log.events.clear()
+    dpp.structure.parts[1].name = "Renamed"
+    mapper.remap(dpp, mapped)
+    assert log.events == [("layer", "structure"), ("parts", 1), ("validated", True), ("dpp", True)]
+
+    log.events.clear()
+    with pytest.raises(ValueError):
+        mapper.map_dpp(make_dpp(parts=probes(), global_ids={}))
+    assert log.events[-2:] == [("validated", False), ("dpp", False)]
+
+    # Uninstrumented mappers are unaffected
+    assert ECLASSMapper().instrumentation is None
+
+
+def test_recorder_aggregates_and_exports(tmp_path, make_dpp):
+    recorder = MetricsRecorder()
+    registry = SchemaRegistry(plugin_group=None, instrumentation=recorder)
+    registry.register(ECLASSMapper)
+    mapper = registry.get_mapper("ECLASS")
+    assert mapper.instrumentation is recorder
+    mapper.enable_part_cache()
+
+    for _ in range(2):
+        registry.map_dpp("ECLASS", make_dpp(parts=probes()))
+
+    snapshot = recorder.snapshot()
+    structure = [s for s in snapshot["layer_seconds"] if s["labels"]["layer"] == "structure"]
+    assert structure[0]["count"] == 2 and structure[0]["sum"] >= structure[0]["max"] > 0
+    assert snapshot["parts_mapped_total"] == [{"labels": {"schema": "ECLASS"}, "value": 6}]
+    lookups = {s["labels"]["result"]: s["value"] for s in snapshot["part_cache_lookups_total"]}
+    assert lookups == {"miss": 1, "hit": 5}
+    assert snapshot["map_dpp_seconds"][0]["count"] == 2
+
+    text = recorder.to_prometheus()
+    assert "# TYPE nmis_dpp_layer_seconds summary" in text
+    assert 'nmis_dpp_layer_seconds_count{schema="ECLASS",layer="structure"} 2' in text
+    assert 'nmis_dpp_part_cache_lookups_total{schema="ECLASS",result="hit"} 5' in text
+    assert "structure" in recorder.summary()
+
+    prom = recorder.write_prometheus(tmp_path / "metrics" / "dpp.prom")
+    assert prom.read_text(encoding="utf-8") == text
+    assert json.loads(recorder.write_json(tmp_path / "dpp.json").read_text()) == snapshot
+    assert sorted(p.name for p in tmp_path.rglob("*")) == ["dpp.json", "dpp.prom", "metrics"]
+
+    recorder.reset()
+    assert recorder.to_prometheus() == ""
+
+
+def test_concurrent_exports_to_one_file(tmp_path):
+    recorder = MetricsRecorder()
+    recorder.validated("ECLASS", 0.01, True)
+    target = tmp_path / "dpp.json"
+
+    def export(_):
+        for _ in range(20):
+            recorder.write_json(target)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(export, range(8)))  # re-raises a failed os.replace()
+    assert json.loads(target.read_text()) == recorder.snapshot()
+    assert [p.name for p in tmp_path.iterdir()] == ["dpp.json"]
+
+
+def test_set_instrumentation_updates_existing_instances(make_dpp):
+    registry = SchemaRegistry(plugin_group=None)
+    registry.register(ISA95Mapper)
+    mapper = registry.get_mapper("ISA-95")
+    assert mapper.instrumentation is None
+
+    recorder = MetricsRecorder(namespace="dpp")
+    registry.set_instrumentation(recorder)
+    registry.map_dpp("ISA-95", make_dpp(parts=probes()))
+    assert "dpp_map_dpp_seconds_count{schema=\"ISA-95\"} 1" in recorder.to_prometheus()
+
+    registry.set_instrumentation(None)
+    assert mapper.instrumentation is None
@@ -0,0 +1,135 @@
+"""
+test_integrity.py
+
+Tests for Merkle-tree passport digests and store verification.
+"""
+
+import copy
+
+import pytest
+
+from nmis_dpp import integrity
+from nmis_dpp.integrity import (
+    passport_digest,
+    passport_tree,
+    verify_part,
+    verify_passport,
+    verify_store,
+)
+from nmis_dpp.part_class import Sensor, SoftwareModule
+from nmis_dpp.store import PassportStore
+from nmis_dpp.synthetic import generate_passport
+from nmis_dpp.utils import passport_from_dict, to_dict
+
+
+def test_digest_is_canonical_and_covers_content():
+    dpp = generate_passport(9, seed=1, binding_ratio=1.0)
+    digest = passport_digest(dpp)
+    assert digest.startswith("sha256:") and len(digest) == 7 + 64
+    assert passport_digest(to_dict(dpp)) == digest
+    assert passport_digest(passport_from_dict(to_dict(dpp))) == digest
+    assert passport_digest(dpp, algorithm="blake2b") != digest
+
+    # Signatures are not covered (they sign the root)
+    dpp.provenance.signatures = [{"type": "manufacturer", "digest": digest}]
+    assert passport_digest(dpp) == digest
+
+    for change in (
+        lambda d: setattr(d.sustainability, "mass", 1.5),
+        lambda d: setattr(d.structure, "bom_refs", ["BOM-X"]),
+        lambda d: setattr(d.structure.parts[4], "name", "changed"),
+        lambda d: d.structure.parts.reverse(),
+        lambda d: d.structure.parts.pop(),
+        lambda d: setattr(d.provenance, "trace_links", []),
+    ):
+        changed = copy.deepcopy(dpp)
+        change(changed)
+        assert passport_digest(changed) != digest
+
+
+def test_incremental_update_rehashes_only_changes(monkeypatch):
+    dpp = generate_passport(64, seed=2)
+    tree = passport_tree(dpp)
+
+    leaves = []
+    real_leaf = integrity._leaf
+    monkeypatch.setattr(integrity, "_leaf", lambda hasher, name, content: leaves.append(name) or real_leaf(hasher, name, content))
+
+    assert passport_tree(dpp, previous=tree).root == tree.root and leaves == []
+
+    dpp.structure.parts[10].name = "Pump"
+    dpp.lifecycle.add_event({"type": "service"})
+    updated = passport_tree(dpp, previous=tree)
+    assert sorted(leaves) == ["lifecycle", "part"]
+    assert updated.root == passport_tree(to_dict(dpp)).root
+    assert updated.root != tree.root
+
+    leaves.clear()
+    dpp.structure.add_part(Sensor(part_id="S-new", name="Probe", type="Sensor"))
+    grown = passport_tree(dpp, previous=updated)
+    assert sorted(leaves) == ["part", "structure"]
+    assert grown.root == passport_tree(to_dict(dpp)).root
+
+
+def test_part_proofs():
+    dpp = generate_passport(13, seed=3)
+    tree = passport_tree(dpp)
+    for index in (0, 6, 12):
+        proof = tree.part_proof(index)
+        assert verify_part(dpp.structure.parts[index], proof, tree.hexdigest)
+        assert verify_part(to_dict(dpp.structure.parts[index]), proof, tree.hexdigest)
+        assert not verify_part(dpp.structure.parts[index - 1], proof, tree.hexdigest)
+    with pytest.raises(IndexError):
+        tree.part_proof(13)
+
+
+def test_verify_passport_with_recorded_digests():
+    dpp = generate_passport(5, seed=4)
+    assert not verify_passport(dpp)  # nothing recorded
+    dpp.provenance.signatures.append({"type": "manufacturer", "digest": passport_digest(dpp)})
+    dpp.provenance.signatures.append({"type": "service", "digest": passport_digest(dpp, algorithm="sha512")})
+    dpp.provenance.touch()
+    assert verify_passport(dpp) and verify_passport(to_dict(dpp))
+
+    dpp.risk.criticality = {"level": "low"}
+    assert not verify_passport(dpp)
+    assert verify_passport(dpp, expected=passport_digest(dpp))
+    with pytest.raises(ValueError):
+        verify_passport(dpp, expected="nonsense")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_verify_store(tmp_path, workers):
+    passports = []
+    for seed in range(12):
+        dpp = generate_passport(4, seed=seed)
+        if seed != 7:
+            dpp.provenance.signatures = [{"type": "manufacturer", "digest": passport_digest(dpp)}]
+        passports.append(dpp)
+    passports[3].sustainability.mass = 0.0  # modified after signing
+
+    with PassportStore(tmp_path / "passports.db", deduplicate=True) as store:
+        store.add_many(passports)
+        result = verify_store(store, workers=workers, chunk_size=5)
+    assert result.checked == 12 and result.mismatched == [4] and result.unsigned == [8]
+    assert not result.ok
+
+    with pytest.raises(ValueError):
+        verify_store(PassportStore(), workers=2)
+
+
+def test_incremental_tree_with_software_modules():
+    # SoftwareModule.version is a model field; reuse must not key on it
+    dpp = generate_passport(6, seed=5)
+    for index in range(3):
+        dpp.structure.add_part(SoftwareModule(part_id=f"SW{index}", name=f"Firmware {index}", type="SoftwareModule"))
+    tree = passport_tree(dpp)
+
+    dpp.structure.parts[-1].name = "Bootloader"
+    edited = passport_tree(dpp, previous=tree)
+    assert edited.hexdigest == passport_tree(dpp).hexdigest != tree.hexdigest
+
+    dpp.structure.parts.insert(0, SoftwareModule(part_id="SW-new", name="Patch", type="SoftwareModule"))
+    dpp.structure.parts[3].properties["x"] = 1  # unsignalled, but changes the signature
+    grown = passport_tree(dpp, previous=edited)
+    assert grown.hexdigest == passport_tree(to_dict(dpp)).hexdigest
@@ -0,0 +1,83 @@
+"""
+test_isa95_build_mapping.py
+
+Tests for the ISA-95 definition ingestion paths (XSD and B2MML-JSON).
+"""
+
+import contextlib
+import io
+import json
+
+import pytest
+
+from nmis_dpp import isa95_build_mapping as ibm
+
+
+@pytest.fixture(scope="module")
+def both_sources():
+    with contextlib.redirect_stdout(io.StringIO()):
+        xsd_defs = ibm.load_definitions("xsd")
+        json_defs = ibm.load_definitions("json")
+    return xsd_defs, json_defs
+
+
+def test_json_stream_walks_defs_across_chunk_boundaries(tmp_path):
+    schema = {
+        "$id": "urn:test",
+        "description": "header",
+        "$defs": {
+            "EquipmentType": {
+                "description": "\n  An equipment\n\t type ",
+                "properties": {"ID": {}, "@languageID": {}, "$": {}},
+            },
+            "Equipment": {"$ref": "#/$defs/EquipmentType"},
+            "xsd:string": {"type": "string"},
+        },
+        "properties": {"Equipment": {"$ref": "#/$defs/Equipment"}},
+    }
+    path = tmp_path / "AllSchemas.json"
+    path.write_text(json.dumps(schema, indent=4), encoding="utf-8")
+
+    with path.open(encoding="utf-8") as fp:
+        stream = ibm._JsonStream(fp, chunk_size=7)
+        keys = []
+        for key, member in stream.iter_object():
+            member.value()
+            keys.append(key)
+    assert keys == ["$id", "description", "$defs", "properties"]
+
+    # Members left unconsumed are skipped on resume
+    with path.open(encoding="utf-8") as fp:
+        stream = ibm._JsonStream(fp, chunk_size=7)
+        keys = [key for key, member in stream.iter_object()]
+        assert stream.peek() == ""
+    assert keys == ["$id", "description", "$defs", "properties"]
+
+    defs = ibm.load_all_json_definitions(path)
+    assert defs["EquipmentType"]["group"] == "ComplexType"
+    assert defs["EquipmentType"]["description"] == "An equipment type"
+    assert defs["Equipment"]["group"] == "Element"
+    assert defs["ID"]["group"] == "Element"
+    assert "xsd:string" not in defs
+    assert "@languageID" not in defs
+
+
+def test_json_path_is_consistent_with_xsd_path(both_sources):
+    xsd_defs, json_defs = both_sources
+    report = ibm.compare_definitions(xsd_defs, json_defs)
+
+    # Every annotated XSD definition carries the same text in the JSON schema,
+    # so the JSON path can only ever add classification evidence.
+    annotated = [n for n, meta in xsd_defs.items() if meta["description"]]
+    assert annotated
+    for name in annotated:
+        assert json_defs[name]["description"] == xsd_defs[name]["description"]
+
+    # The bulk of definitions are shared between the two paths.
+    assert len(report["only_in_xsd"]) < 0.01 * len(xsd_defs)
+    assert len(report["only_in_json"]) < 0.01 * len(json_defs)
+
+
+def test_load_definitions_rejects_unknown_source():
+    with pytest.raises(ValueError):
+        ibm.load_definitions("owl")
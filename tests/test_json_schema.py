@@ -0,0 +1,107 @@
+"""
+test_json_schema.py
+
+Tests for JSON Schema generation from the DPP dataclasses and the compiled
+raw-dict validator.
+"""
+
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from nmis_dpp.json_schema import (
+    JSON_SCHEMA_DIALECT,
+    SchemaValidator,
+    all_schemas,
+    dataclass_schema,
+    part_validator,
+    passport_schema,
+    passport_validator,
+)
+from nmis_dpp.model import IdentityLayer
+from nmis_dpp.part_class import PART_CLASS_TYPES, Sensor
+from nmis_dpp.utils import to_dict
+
+SAMPLE = Path(__file__).resolve().parents[1] / "coffee_machine.json"
+
+
+@pytest.fixture(scope="module")
+def passport():
+    return json.loads(SAMPLE.read_text(encoding="utf-8"))
+
+
+def test_schemas_follow_dataclass_fields():
+    schema = dataclass_schema(IdentityLayer)
+    assert schema["$schema"] == JSON_SCHEMA_DIALECT
+    assert schema["required"] == ["global_ids", "make_model", "ownership", "conformity"]
+    assert schema["properties"]["conformity"] == {"type": "array", "items": {"type": "string"}}
+    assert schema["additionalProperties"] is False
+
+    sensor = dataclass_schema(Sensor)
+    assert sensor["required"] == ["part_id", "name", "type"]
+    assert sensor["properties"]["range_min"] == {"type": ["number", "null"]}
+    assert sensor["properties"]["ontology_bindings"]["additionalProperties"] == {
+        "$ref": "#/$defs/OntologyBinding"
+    }
+
+    defs = passport_schema()["$defs"]
+    assert {"Part", "StructureLayer", *PART_CLASS_TYPES} <= set(defs)
+    assert defs["StructureLayer"]["properties"]["parts"]["items"] == {"$ref": "#/$defs/Part"}
+
+    schemas = all_schemas()
+    assert len(schemas) == 1 + 6 + 1 + len(PART_CLASS_TYPES) + 1
+    json.dumps(schemas)  # plain JSON
+
+    with pytest.raises(TypeError):
+        dataclass_schema(dict)
+
+
+def test_sample_passport_and_serialized_parts_are_valid(passport):
+    assert passport_validator().validate(passport) == []
+    part = Sensor(part_id="S1", name="Probe", type="Sensor", range_min=-40, accuracy=0.5)
+    part.bind_ontology("ECLASS", class_ids=["0173-1#01-AGZ376#020"])
+    assert part_validator().validate(to_dict(part)) == []
+
+
+def test_bad_records_report_every_issue(passport):
+    bad = copy.deepcopy(passport)
+    del bad["risk"]
+    bad["identity"]["conformity"] = ["CE", 7]
+    bad["structure"]["parts"][0]["torque"] = "strong"
+    bad["structure"]["parts"][0]["colour"] = "red"
+    bad["sustainability"]["mass"] = True
+
+    issues = {(i.path, i.rule) for i in passport_validator().validate(bad)}
+
+    assert issues == {
+        ("$.risk", "required"),
+        ("$.identity.conformity[1]", "type"),
+        ("$.structure.parts[0].torque", "type"),
+        ("$.structure.parts[0].colour", "additionalProperties"),
+        ("$.sustainability.mass", "type"),
+    }
+
+
+def test_part_type_selects_the_subclass_schema():
+    validator = part_validator()
+    record = {"part_id": "A1", "name": "Pump", "type": "Actuator", "torque": 1.5}
+    assert validator.is_valid(record)
+
+    # Typed fields of another class are unknown; unknown types fall back to PartClass
+    assert not validator.is_valid({**record, "type": "Sensor"})
+    assert validator.is_valid({"part_id": "X", "name": "Thing", "type": "Gizmo"})
+    assert [i.path for i in validator.validate({"part_id": "X", "type": ["Sensor"]})] == ["$.name", "$.type"]
+
+
+def test_batch_validation(passport):
+    broken = copy.deepcopy(passport)
+    broken["structure"]["parts"][2].pop("part_id")
+    validator = SchemaValidator(passport_schema())
+
+    report = validator.validate_batch([passport, broken, passport])
+
+    assert (report.documents, report.valid, report.invalid) == (3, 2, 1)
+    assert report.by_path == {"$.structure.parts[*].part_id": 1}
+    assert report.documents_per_second > 0
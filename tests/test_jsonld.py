@@ -0,0 +1,113 @@
+"""
+test_jsonld.py
+
+Tests for the compact, canonical JSON-LD export.
+"""
+
+import io
+import json
+
+import pytest
+
+from nmis_dpp.jsonld import GEN_DELIMS, JsonLdExporter, compact_iri, exporter_for, prefix_context
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.synthetic import generate_passport
+
+
+def expand(key, context):
+    """Expand a compact IRI as JSON-LD 1.1 does for simple term definitions."""
+    prefix, suffix = key.split(":", 1)
+    iri = context.get(prefix)
+    if not isinstance(iri, str) or iri[-1] not in GEN_DELIMS:
+        return None  # not usable as a prefix
+    return iri + suffix
+
+
+def all_keys(value):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from all_keys(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from all_keys(item)
+
+
+@pytest.mark.parametrize("mapper_class", [ECLASSMapper, ISA95Mapper])
+def test_compacted_document_is_canonical_jsonld(mapper_class):
+    mapper = mapper_class()
+    mapped = mapper.map_dpp(generate_passport(30, seed=1))
+    exporter = JsonLdExporter(mapper, chunk_items=7)
+
+    text = exporter.dumps(mapped)
+    document = json.loads(text)
+    assert document == exporter.compact(mapped)
+    assert document["@context"] == exporter.context == prefix_context(mapper.get_context(), mapper.JSONLD_PREFIX)
+    assert text.startswith('{"@context":')
+    assert text == '{"@context":' + json.dumps(
+        exporter.context, sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    ) + "," + json.dumps(
+        {k: v for k, v in document.items() if k != "@context"},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+    )[1:]
+
+    # Every key expands through a prefix defined in the context
+    body = {k: v for k, v in document.items() if k != "@context"}
+    prefixes = {key.split(":", 1)[0] for key in all_keys(body)}
+    assert prefixes == {mapper.JSONLD_PREFIX}
+    assert all(expand(key, exporter.context) for key in all_keys(body))
+
+    # Equal documents give identical bytes, independent of key insertion order
+    reordered = {key: mapped[key] for key in reversed(list(mapped))}
+    assert exporter.dumps(reordered) == text
+
+
+def test_context_reference_and_streaming(tmp_path):
+    mapper = ECLASSMapper()
+    exporter = exporter_for(mapper, context_url="https://dpp.example/eclass.jsonld")
+    assert exporter_for(ECLASSMapper, context_url="https://dpp.example/eclass.jsonld") is exporter
+    assert exporter_for(mapper) is not exporter
+
+    exporter.write_context(tmp_path / "eclass.jsonld")
+    assert json.loads((tmp_path / "eclass.jsonld").read_text()) == {"@context": mapper.get_context()}
+
+    passports = [generate_passport(5, seed=seed) for seed in range(3)]
+    out = io.StringIO()
+    assert exporter.write((mapper.map_dpp(dpp) for dpp in passports), out) == 3
+    documents = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [doc["@context"] for doc in documents] == ["https://dpp.example/eclass.jsonld"] * 3
+    assert documents[1]["eclass:identity"]["eclass:serialNumber"] == passports[1].identity.global_ids["serial"]
+
+    out = io.StringIO()
+    exporter.write([mapper.map_dpp(dpp) for dpp in passports], out, lines=False)
+    assert len(json.loads(out.getvalue())) == 3
+
+
+def test_prefix_iris_end_in_a_gen_delim():
+    exporter = JsonLdExporter(ISA95Mapper())
+    assert exporter.context == {"isa95": "http://www.mesa.org/xml/B2MML-V0600#"}
+    assert expand("isa95:ID", exporter.context) == "http://www.mesa.org/xml/B2MML-V0600#ID"
+    assert expand("isa95:ID", ISA95Mapper().get_context()) is None  # the raw namespace is not a prefix
+
+    eclass = JsonLdExporter(ECLASSMapper())
+    assert eclass.context == ECLASSMapper().get_context()
+    assert expand("eclass:serialNumber", eclass.context) == "https://eclass.eu/eclass-standard/v16-0/serialNumber"
+
+    expanded = prefix_context({"x": {"@id": "urn:x", "@prefix": True}}, "x")
+    assert expanded == {"x": {"@id": "urn:x#", "@prefix": True}}
+    with pytest.raises(ValueError):
+        prefix_context({"x": {"@type": "@id"}}, "x")
+
+
+def test_compact_iri():
+    assert compact_iri("eclass", "serialNumber") == "eclass:serialNumber"
+    assert compact_iri("eclass", "%mass") == "eclass:%25mass"
+    assert compact_iri("eclass", "@id") == "@id"
+    assert compact_iri("eclass", "schema:name") == "schema:name"
+
+    class Broken(ECLASSMapper):
+        JSONLD_PREFIX = "nope"
+
+    with pytest.raises(ValueError):
+        JsonLdExporter(Broken())
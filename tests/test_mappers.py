@@ -7,45 +7,7 @@ Tests for ECLASS and ISA-95 mappers.
 import pytest
 from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
 from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
-from nmis_dpp.model import (
-    DigitalProductPassport, IdentityLayer, StructureLayer, LifecycleLayer, 
-    RiskLayer, SustainabilityLayer, ProvenanceLayer
-)
-from nmis_dpp.part_class import PartClass
-
-@pytest.fixture
-def sample_dpp():
-    part = PartClass(part_id="P1", name="Part1", type="Actuator", properties={"torque": 10})
-    return DigitalProductPassport(
-        identity=IdentityLayer(
-            global_ids={"gtin": "123"}, 
-            make_model={"brand": "BrandX", "model": "Mod1"}, 
-            ownership={"manufacturer": "MfgCo"}, 
-            conformity=[]
-        ),
-        structure=StructureLayer(
-            hierarchy={}, 
-            parts=[part], 
-            interfaces=[], 
-            materials=[], 
-            bom_refs=[]
-        ),
-        lifecycle=LifecycleLayer(
-            manufacture={"date": "2023-01-01", "lot": "L1"}, 
-            use={}, 
-            serviceability={}, 
-            events=[], 
-            end_of_life={}
-        ),
-        risk=RiskLayer(criticality={}, fmea=[], security={}),
-        sustainability=SustainabilityLayer(
-            mass=1.0, 
-            energy={}, 
-            recycled_content={}, 
-            remanufacture={}
-        ),
-        provenance=ProvenanceLayer(signatures=[], trace_links=[])
-    )
+from nmis_dpp.model import StructureLayer
 
 def test_eclass_mapper(sample_dpp):
     # Empty config for test
@@ -77,3 +39,46 @@ def test_isa95_mapper(sample_dpp):
     assert len(nested) == 1
     assert nested[0]["ID"] == "P1"
     
+
+
+GROUPED_CONFIG = {
+    "domain_mappings": {
+        "Sensor": {"eclass_classes": {"0173-1#01-AAA001#001": {}}, "isa95_type_ids": ["TT"]},
+        "Actuator": {"eclass_classes": {"0173-1#01-AAA002#001": {}}, "isa95_type_ids": ["AC"]},
+    }
+}
+
+
+@pytest.mark.parametrize("mapper_class", [ECLASSMapper, ISA95Mapper])
+def test_grouped_part_mapping_matches_per_part(mapper_class):
+    from nmis_dpp.synthetic import generate_passport
+
+    parts = generate_passport(300, seed=5, binding_ratio=0.3).structure.parts
+    mapper = mapper_class(config=GROUPED_CONFIG)
+    calls = []
+    resolve = mapper.resolve_part_type
+    mapper.resolve_part_type = lambda part_type: calls.append(part_type) or resolve(part_type)
+
+    grouped = mapper.map_parts(parts)
+    assert grouped == [mapper.map_part_class(part) for part in parts]
+    assert len(calls) == len({part.type for part in parts}) + len(parts)  # once per type, then per part
+    assert mapper.map_structure_layer(StructureLayer({}, parts, [], [], []))[mapper.STRUCTURE_PARTS_KEY] == grouped
+
+    # Bindings still take precedence over the type's config classification
+    bound = next(part for part in parts if part.type == "Sensor")
+    bound.bind_ontology(mapper.get_schema_name(), class_ids=["BOUND"])
+    assert "BOUND" in mapper.map_parts([bound])[0].values()
+
+
+def test_subclass_overriding_map_part_class_is_mapped_per_part(sample_dpp):
+    class Custom(ECLASSMapper):
+        def map_part_class(self, part):
+            return {"id": part.part_id, "custom": True}
+
+    parts = sample_dpp.structure.parts
+    assert Custom().map_parts(parts) == [{"id": "P1", "custom": True}]
+
+    cached = ECLASSMapper(config=GROUPED_CONFIG)
+    cached.enable_part_cache()
+    assert cached.map_parts(parts + parts)[1]["eclassIrdi"] == "0173-1#01-AAA002#001"
+    assert cached.part_cache.hits == 1
@@ -0,0 +1,111 @@
+"""
+test_part_cache.py
+
+Tests for content-keyed memoization of SchemaMapper.map_part_class.
+"""
+
+from nmis_dpp.cache import PartMappingCache, part_fingerprint
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Fastener, Sensor
+
+
+def fastener(part_id, length=12.0):
+    return Fastener(
+        part_id=part_id, name="M4 screw", type="Fastener",
+        properties={"thread": "M4"}, fastener_type="screw", length=length,
+    )
+
+
+def test_fingerprint_ignores_part_id_but_not_content():
+    assert part_fingerprint(fastener("F1")) == part_fingerprint(fastener("F2"))
+    assert part_fingerprint(fastener("F1")) != part_fingerprint(fastener("F1", length=16.0))
+
+    bound = fastener("F1")
+    bound.bind_ontology("ECLASS", class_ids=["0173-1#01-AAA123#001"])
+    assert part_fingerprint(bound) != part_fingerprint(fastener("F1"))
+
+    # Same fields, different subclass
+    sensor = Sensor(part_id="F1", name="M4 screw", type="Fastener", properties={"thread": "M4"})
+    assert part_fingerprint(sensor) != part_fingerprint(Fastener(
+        part_id="F1", name="M4 screw", type="Fastener", properties={"thread": "M4"}
+    ))
+
+
+def test_fingerprint_keeps_value_types_apart():
+    class Token:
+        def __init__(self, value):
+            self.value = value
+
+        def __str__(self):
+            return "token"
+
+        def __repr__(self):
+            return f"Token({self.value!r})"
+
+    def with_properties(properties):
+        return part_fingerprint(Sensor(part_id="S1", name="Probe", type="Sensor", properties=properties))
+
+    distinct = [
+        {1: "x"}, {"1": "x"}, {"k": (1, 2)}, {"k": [1, 2]}, {"k": {1}}, {"k": {"1"}},
+        {"k": Token(1)}, {"k": Token(2)}, {"k": "token"}, {"k": 1}, {"k": 1.0}, {"k": True},
+        {"\x00dict": [[1, "x"]]},
+    ]
+    fingerprints = [with_properties(properties) for properties in distinct]
+    assert len(set(fingerprints)) == len(distinct)
+
+    # Mixed key types no longer break sorting; equal content still matches
+    assert with_properties({1: "a", "b": 2}) == with_properties({"b": 2, 1: "a"})
+    assert with_properties({"k": {3, 1, 2}}) == with_properties({"k": {2, 3, 1}})
+
+
+def test_cached_mapping_matches_uncached_and_counts_hits():
+    plain = ECLASSMapper(config={})
+    cached = ECLASSMapper(config={})
+    cache = cached.enable_part_cache(maxsize=8)
+
+    parts = [fastener(f"F{i}") for i in range(5)]
+    results = [cached.map_part_class(p) for p in parts]
+
+    assert results == [plain.map_part_class(p) for p in parts]
+    assert [r["id"] for r in results] == ["F0", "F1", "F2", "F3", "F4"]
+    assert cache.stats()["hits"] == 4
+    assert cache.stats()["misses"] == 1
+
+    # Mutating a returned top-level key does not leak into the cache
+    results[1]["name"] = "changed"
+    assert cached.map_part_class(fastener("F9"))["name"] == "M4 screw"
+
+    cached.disable_part_cache()
+    cached.map_part_class(fastener("F10"))
+    assert cache.stats()["hits"] == 5
+
+
+def test_lru_eviction_and_config_enable():
+    cache = PartMappingCache(maxsize=2)
+    mapper = ISA95Mapper(config={}, part_cache=cache)
+
+    for length in (1.0, 2.0, 3.0, 1.0):
+        mapper.map_part_class(fastener("F", length=length))
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["size"] == 2
+    assert stats["hits"] == 0
+
+    from_config = ISA95Mapper(config={"part_cache_size": 16})
+    assert from_config.part_cache.maxsize == 16
+
+
+def test_shared_cache_keys_on_schema_and_config():
+    cache = PartMappingCache()
+    eclass = ECLASSMapper(config={}, part_cache=cache)
+    isa95 = ISA95Mapper(config={}, part_cache=cache)
+    other_config = ISA95Mapper(
+        config={"domain_mappings": {"Fastener": {"isa95_type_ids": ["BoltType"]}}},
+        part_cache=cache,
+    )
+
+    eclass.map_part_class(fastener("F1"))
+    assert isa95.map_part_class(fastener("F1"))["ID"] == "F1"
+    assert other_config.map_part_class(fastener("F1"))["EquipmentClassID"] == "BoltType"
+    assert cache.stats()["misses"] == 3
@@ -0,0 +1,82 @@
+"""
+test_part_index.py
+
+Tests for part_id / type lookups on StructureLayer.
+"""
+
+import copy
+import time
+
+import pytest
+
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.part_index import PartIndex
+from nmis_dpp.synthetic import generate_passport
+
+
+def test_lookup_by_id_and_type():
+    layer = generate_passport(40, seed=1).structure
+    index = layer.part_index()
+    assert len(index) == 40 and layer.part_index() is index
+
+    part = layer.parts[17]
+    assert layer.get_part(part.part_id) is part and index[part.part_id] is part
+    assert layer.get_part("missing") is None
+    with pytest.raises(KeyError):
+        index["missing"]
+    assert index.get_many([part.part_id, "missing"]) == [part, None]
+
+    for part_type in {p.type for p in layer.parts}:
+        assert layer.parts_of_type(part_type) == [p for p in layer.parts if p.type == part_type]
+    assert layer.parts_of_type("Nonexistent") == []
+
+
+def test_index_follows_layer_changes():
+    layer = generate_passport(10, seed=2).structure
+    index = layer.part_index()
+
+    layer.add_part(Sensor(part_id="S-new", name="Probe", type="Sensor"))
+    assert layer.part_index() is not index and layer.get_part("S-new") is layer.parts[-1]
+
+    removed = layer.parts.pop(0)  # unsignalled removal: noticed through the list length
+    assert layer.get_part(removed.part_id) is None
+
+    # A part renamed in place without touch() is not returned under its old id
+    renamed = layer.parts[0]
+    old_id, renamed.part_id = renamed.part_id, "RENAMED"
+    assert layer.get_part(old_id) is None and layer.get_part("RENAMED") is renamed
+
+    # Replacing an item in place keeps the length: the old part is no longer
+    # returned, the new one is found after touch()
+    old = layer.parts[1]
+    layer.parts[1] = Sensor(part_id="S-swapped", name="Probe", type="Sensor")
+    assert layer.get_part(old.part_id) is None
+    layer.parts[2] = Sensor(part_id="S-later", name="Probe", type="Probe")
+    layer.touch()
+    assert layer.get_part("S-later") is layer.parts[2]
+    assert layer.parts_of_type("Probe") == [layer.parts[2]]
+
+    # Copies get their own index over their own parts
+    clone = copy.deepcopy(layer)
+    assert clone.get_part("RENAMED") is clone.parts[0]
+
+
+def test_duplicate_ids_are_rejected():
+    layer = generate_passport(5, seed=3).structure
+    layer.add_part(Sensor(part_id=layer.parts[2].part_id, name="Twin", type="Sensor"))
+    with pytest.raises(ValueError, match=repr(layer.parts[2].part_id)):
+        layer.part_index()
+    with pytest.raises(ValueError, match="Duplicate"):
+        layer.hierarchy_index()
+    assert len(PartIndex(layer.parts[:5])) == 5
+
+
+def test_large_join_is_linear():
+    layer = generate_passport(100_000, seed=0).structure
+    references = [part.part_id for part in layer.parts[::-1]]
+
+    start = time.perf_counter()
+    joined = layer.part_index().get_many(references)
+    found = sum(layer.get_part(part_id) is not None for part_id in references[:20_000])
+    assert time.perf_counter() - start < 2.0
+    assert joined[0] is layer.parts[-1] and found == 20_000
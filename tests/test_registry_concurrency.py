@@ -0,0 +1,109 @@
+"""
+test_registry_concurrency.py
+
+Stress tests for concurrent SchemaRegistry use: single-flight loading of
+configs and mapper instances, the global registry, and pooled mappers.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+from nmis_dpp import schema_registry
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.schema_registry import SchemaRegistry
+
+THREADS = 64
+
+
+def hammer(fn, threads=THREADS):
+    """Call fn from many threads released at the same moment."""
+    barrier = threading.Barrier(threads)
+
+    def run(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(run, range(threads)))
+
+
+class SlowECLASSMapper(ECLASSMapper):
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+        time.sleep(0.01)
+        super().__init__(*args, **kwargs)
+
+
+class StatefulMapper(ECLASSMapper):
+    """Keeps per-call state, so one instance must never be shared concurrently."""
+
+    THREAD_SAFE = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_use = False
+
+    def map_part_class(self, part):
+        assert not self.in_use, "instance used by two threads at once"
+        self.in_use = True
+        time.sleep(0.001)
+        try:
+            return super().map_part_class(part)
+        finally:
+            self.in_use = False
+
+
+def test_config_and_instance_load_once_under_contention(tmp_path, monkeypatch):
+    (tmp_path / "eclass_mapping.yml").write_text(
+        yaml.safe_dump({"domain_mappings": {}}), encoding="utf-8"
+    )
+    loads = []
+    real_safe_load = yaml.safe_load
+
+    def slow_safe_load(stream):
+        loads.append(threading.get_ident())
+        time.sleep(0.02)
+        return real_safe_load(stream)
+
+    monkeypatch.setattr(yaml, "safe_load", slow_safe_load)
+    SlowECLASSMapper.created = 0
+
+    registry = SchemaRegistry(config_dir=tmp_path, plugin_group=None)
+    registry.register(SlowECLASSMapper, aliases=["ec"])
+
+    mappers = hammer(lambda: registry.get_mapper("ec"))
+
+    assert len(loads) == 1
+    assert SlowECLASSMapper.created == 1
+    assert all(m is mappers[0] for m in mappers)
+
+
+def test_global_registry_is_created_once(monkeypatch):
+    monkeypatch.setattr(schema_registry, "_global_registry", None)
+    registries = hammer(schema_registry.get_global_registry)
+    assert all(r is registries[0] for r in registries)
+    assert {"ECLASS", "ISA-95"} <= set(registries[0].list_schemas())
+
+
+def test_non_thread_safe_mappers_are_leased_from_pool():
+    registry = SchemaRegistry(plugin_group=None, pool_size=4)
+    registry.register(StatefulMapper)
+    part = Sensor(part_id="S1", name="Probe", type="Sensor")
+
+    results = hammer(lambda: registry.map_part("ECLASS", part))
+
+    assert all(r["id"] == "S1" for r in results)
+    assert 1 <= len(registry._pools["ECLASS"]) <= 4
+
+    with registry.lease("ECLASS") as first, registry.lease("ECLASS") as second:
+        assert first is not second
+
+    # A forced reload discards pooled instances created from the old state
+    registry.get_mapper("ECLASS", force_reload=True)
+    assert "ECLASS" not in registry._pools
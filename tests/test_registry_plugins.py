@@ -0,0 +1,106 @@
+"""
+test_registry_plugins.py
+
+Tests for instantiation-free registration and entry point plugin discovery.
+"""
+
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from nmis_dpp import schema_registry
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.schema_registry import PLUGIN_ENTRY_POINT_GROUP, SchemaRegistry
+
+PLUGIN_MODULE = '''
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+
+class AASMapper(ISA95Mapper):
+    SCHEMA_NAME = "AAS"
+    SCHEMA_VERSION = "3.0"
+
+    def validate_mapping(self, mapped_data):
+        return True, []
+'''
+
+
+class CountingECLASSMapper(ECLASSMapper):
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).instances += 1
+        super().__init__(*args, **kwargs)
+
+
+def entry_point(name, value):
+    return EntryPoint(name=name, value=value, group=PLUGIN_ENTRY_POINT_GROUP)
+
+
+def test_register_reads_class_metadata_without_instantiating():
+    registry = SchemaRegistry(plugin_group=None)
+    registry.register(CountingECLASSMapper, aliases=["ec"])
+
+    assert CountingECLASSMapper.instances == 0
+    assert registry.list_schemas() == ["ECLASS"]
+
+    mapper = registry.get_mapper("ec")
+    assert CountingECLASSMapper.instances == 1
+    assert mapper.get_schema_version() == CountingECLASSMapper.SCHEMA_VERSION
+
+
+def test_register_instantiates_when_get_schema_name_overrides_inherited_name():
+    class RenamedMapper(CountingECLASSMapper):
+        instances = 0
+
+        def get_schema_name(self):
+            return "ECLASS-Custom"
+
+    class RenamedAgainMapper(RenamedMapper):
+        SCHEMA_NAME = "ECLASS-Declared"
+        instances = 0
+
+    registry = SchemaRegistry(plugin_group=None)
+    registry.register(RenamedMapper)
+    assert registry.list_schemas() == ["ECLASS-Custom"] and RenamedMapper.instances == 1
+
+    registry.register(RenamedAgainMapper)
+    assert "ECLASS-Declared" in registry.list_schemas() and RenamedAgainMapper.instances == 0
+
+
+def test_plugins_are_discovered_but_imported_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "acme_aas_plugin.py").write_text(PLUGIN_MODULE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(
+        schema_registry, "_iter_entry_points",
+        lambda group: [
+            entry_point("AAS", "acme_aas_plugin:AASMapper"),
+            entry_point("ECLASS", "acme_aas_plugin:AASMapper"),
+            entry_point("BROKEN", "acme_aas_plugin"),
+        ],
+    )
+
+    registry = SchemaRegistry(tmp_path)
+    registry.register(ECLASSMapper)
+
+    assert registry.list_schemas() == ["ECLASS", "AAS"]
+    assert "acme_aas_plugin" not in sys.modules
+
+    mapper = registry.get_mapper("AAS")
+    assert "acme_aas_plugin" in sys.modules
+    assert mapper.get_schema_name() == "AAS"
+    # Already registered schemas are not overridden by plugins
+    assert type(registry.get_mapper("ECLASS")) is ECLASSMapper
+
+
+def test_unknown_schema_triggers_discovery_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        schema_registry, "_iter_entry_points", lambda group: calls.append(group) or []
+    )
+    registry = SchemaRegistry()
+
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            registry.get_mapper("NOPE")
+    assert calls == [PLUGIN_ENTRY_POINT_GROUP]
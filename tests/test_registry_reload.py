@@ -0,0 +1,131 @@
+"""
+test_registry_reload.py
+
+Tests for config hot-reload (SchemaRegistry.check_for_updates / watch).
+"""
+
+import os
+import time
+
+import pytest
+import yaml
+
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.schema_registry import SchemaRegistry
+
+
+def write_config(path, equipment_class, bump_ns=0):
+    path.write_text(
+        yaml.safe_dump({"domain_mappings": {"Sensor": {"isa95_type_ids": [equipment_class]}}}),
+        encoding="utf-8",
+    )
+    if bump_ns:
+        # Guarantee a new mtime even on coarse-grained file systems
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+@pytest.fixture
+def setup(tmp_path, monkeypatch):
+    cfg = tmp_path / "isa95_mapping.yml"
+    write_config(cfg, "TT")
+
+    parses = []
+    real_safe_load = yaml.safe_load
+    monkeypatch.setattr(yaml, "safe_load", lambda data: parses.append(1) or real_safe_load(data))
+
+    registry = SchemaRegistry(config_dir=tmp_path, plugin_group=None)
+    registry.register(ISA95Mapper)
+    yield registry, cfg, parses
+    registry.stop_watching()
+
+
+def equipment_class(mapper):
+    return mapper.map_part_class(Sensor(part_id="S1", name="Probe", type="Sensor"))["EquipmentClassID"]
+
+
+def test_unchanged_or_touched_files_are_not_reparsed(setup):
+    registry, cfg, parses = setup
+    mapper = registry.get_mapper("ISA-95")
+    assert parses == [1]
+
+    assert registry.check_for_updates() == []
+
+    # Same content, new mtime: hashed but not parsed, instance kept
+    st = cfg.stat()
+    os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert registry.check_for_updates() == []
+    assert parses == [1]
+    assert registry.get_mapper("ISA-95") is mapper
+
+
+def test_changed_config_swaps_instance_and_invalidates(setup):
+    registry, cfg, parses = setup
+    old = registry.get_mapper("ISA-95")
+    cache = old.enable_part_cache()
+    assert equipment_class(old) == "TT"
+
+    notified = []
+    registry.add_reload_listener(lambda name, mapper: notified.append((name, mapper)))
+
+    write_config(cfg, "Thermocouple", bump_ns=10**9)
+    assert registry.check_for_updates() == ["ISA-95"]
+
+    new = registry.get_mapper("ISA-95")
+    assert new is not old
+    assert notified == [("ISA-95", new)]
+    # Cache carried over, but old entries are keyed by the old config version
+    assert new.part_cache is cache
+    assert equipment_class(new) == "Thermocouple"
+    assert equipment_class(old) == "TT"
+
+
+def test_slow_reload_does_not_overwrite_a_newer_one(setup, monkeypatch):
+    registry, cfg, _ = setup
+    registry.get_mapper("ISA-95")
+    write_config(cfg, "Thermocouple", bump_ns=10**9)
+
+    # While the first check parses its read of the file, the file changes
+    # again and a second check installs the newer config
+    real_parse = registry._parse_config
+    nested = []
+
+    def parse(canonical, path, data):
+        config = real_parse(canonical, path, data)
+        if not nested:
+            nested.append(1)
+            write_config(cfg, "RTD", bump_ns=2 * 10**9)
+            assert registry.check_for_updates() == ["ISA-95"]
+        return config
+
+    monkeypatch.setattr(registry, "_parse_config", parse)
+    assert registry.check_for_updates() == []
+    assert equipment_class(registry.get_mapper("ISA-95")) == "RTD"
+
+
+def test_invalid_config_keeps_previous_one(setup):
+    registry, cfg, _ = setup
+    mapper = registry.get_mapper("ISA-95")
+
+    cfg.write_text(":\n  - invalid: [", encoding="utf-8")
+    assert registry.check_for_updates() == []
+    assert registry.get_mapper("ISA-95") is mapper
+    assert equipment_class(registry.get_mapper("ISA-95")) == "TT"
+
+
+def test_watch_thread_picks_up_changes(setup):
+    registry, cfg, _ = setup
+    registry.get_mapper("ISA-95")
+
+    thread = registry.watch(interval=0.01)
+    assert registry.watch() is thread
+
+    write_config(cfg, "RTD", bump_ns=10**9)
+    deadline = time.monotonic() + 5
+    while equipment_class(registry.get_mapper("ISA-95")) != "RTD":
+        assert time.monotonic() < deadline, "watcher did not reload the config"
+        time.sleep(0.01)
+
+    registry.stop_watching(timeout=1)
+    assert not thread.is_alive()
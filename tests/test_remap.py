@@ -0,0 +1,183 @@
+"""
+test_remap.py
+
+Tests for change tracking and incremental re-mapping (SchemaMapper.remap).
+"""
+
+import copy
+import json
+
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Fastener, OntologyBinding, Sensor, SoftwareModule
+from nmis_dpp.utils import canonical_json
+from nmis_dpp.versioning import version_of
+
+
+def sensors(n_parts=3):
+    return [
+        Sensor(part_id=f"S{i}", name=f"Sensor {i}", type="Sensor", properties={"range": i})
+        for i in range(n_parts)
+    ]
+
+
+class CountingMapper(ECLASSMapper):
+    """ECLASS mapper that records which layers and parts get mapped."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+        super().__init__(*args, **kwargs)
+
+    def map_identity_layer(self, layer):
+        self.calls.append("identity")
+        return super().map_identity_layer(layer)
+
+    def map_structure_layer(self, layer):
+        self.calls.append("structure")
+        return super().map_structure_layer(layer)
+
+    def map_lifecycle_layer(self, layer):
+        self.calls.append("lifecycle")
+        return super().map_lifecycle_layer(layer)
+
+    def map_part_class(self, part):
+        self.calls.append(part.part_id)
+        return super().map_part_class(part)
+
+
+def test_versions_track_assignment_touch_and_helpers(make_dpp):
+    dpp = make_dpp(parts=sensors())
+    lifecycle = dpp.lifecycle
+    v0 = lifecycle.change_version
+    sig0 = lifecycle.signature()
+
+    lifecycle.add_event({"event_type": "inspection"})
+    assert lifecycle.change_version > v0
+
+    # Unsignalled append is still caught by the signature's length component
+    sig1 = lifecycle.signature()
+    lifecycle.events.append({"event_type": "repair"})
+    assert lifecycle.signature() != sig1 != sig0
+
+    part = dpp.structure.parts[0]
+    before = part.change_version
+    part.bind_ontology("ECLASS", class_ids=["0173-1#01-AAA123#001"])
+    assert part.change_version > before
+
+    # Versions are not part of the data model
+    assert "_version" not in canonical_json(dpp)
+    assert copy.deepcopy(dpp) == dpp
+
+
+def test_remap_unchanged_returns_equal_result_without_mapping(make_dpp):
+    mapper = CountingMapper(config={})
+    dpp = make_dpp(parts=sensors())
+    first = mapper.map_dpp(dpp)
+    mapper.calls.clear()
+
+    again = mapper.remap(dpp, first)
+    assert again == first
+    assert mapper.calls == []
+
+
+def test_remap_only_changed_layers(make_dpp):
+    mapper = CountingMapper(config={})
+    dpp = make_dpp(parts=sensors(), manufacture={"lot": "L1", "date": "2025-01-01"})
+    first = mapper.map_dpp(dpp)
+    mapper.calls.clear()
+
+    dpp.lifecycle.manufacture["lot"] = "L2"
+    dpp.lifecycle.touch()
+    second = mapper.remap(dpp, first)
+
+    assert mapper.calls == ["lifecycle"]
+    assert second["lifecycle"]["batchId"] == "L2"
+    assert first["lifecycle"]["batchId"] == "L1"
+    assert second["structure"] is first["structure"]
+    assert second == mapper.map_dpp(dpp)
+
+
+def test_remap_only_changed_parts(make_dpp):
+    mapper = CountingMapper(config={})
+    dpp = make_dpp(parts=sensors(5))
+    first = mapper.map_dpp(dpp)
+    mapper.calls.clear()
+
+    dpp.structure.parts[3].name = "Renamed"
+    dpp.structure.parts[1] = Fastener(part_id="F1", name="Bolt", type="Fastener")
+    second = mapper.remap(dpp, first)
+
+    assert mapper.calls == ["F1", "S3"]
+    assert [c["id"] for c in second["structure"]["components"]] == ["S0", "F1", "S2", "S3", "S4"]
+    assert second["structure"]["components"][3]["name"] == "Renamed"
+    assert first["structure"]["components"][3]["name"] == "Sensor 3"
+
+    # Adding a part changes the layer itself -> full structure re-map
+    mapper.calls.clear()
+    dpp.structure.add_part(Sensor(part_id="S9", name="New", type="Sensor"))
+    third = mapper.remap(dpp, second)
+    assert mapper.calls[0] == "structure"
+    assert len(third["structure"]["components"]) == 6
+
+
+def test_remap_falls_back_to_full_mapping(make_dpp):
+    dpp = make_dpp(parts=sensors())
+    mapper = ISA95Mapper(config={})
+    result = mapper.map_dpp(dpp)
+
+    # Plain dicts (e.g. loaded from storage) carry no mapping state
+    plain = json.loads(json.dumps(result))
+    assert mapper.remap(dpp, plain) == result
+
+    # A result from another mapper instance may reflect another configuration
+    other = ISA95Mapper(config={"domain_mappings": {"Sensor": {"isa95_type_ids": ["TT"]}}})
+    remapped = other.remap(dpp, result)
+    assert remapped["structure"]["NestedEquipment"][0]["EquipmentClassID"] == "TT"
+
+
+def test_remap_tracks_software_modules_and_nested_part_edits(make_dpp):
+    dpp = make_dpp(parts=sensors())
+    module = SoftwareModule(part_id="SW1", name="Firmware", type="SoftwareModule", version="4.12.74")
+    dpp.structure.add_part(module)
+    mapper = ECLASSMapper(config={})
+    mapped = mapper.map_dpp(dpp)
+
+    # The SoftwareModule "version" field does not hide the change stamp
+    assert module.version == "4.12.74" and version_of(module) == module.change_version > 0
+    module.name = "Bootloader"
+    mapped = mapper.remap(dpp, mapped)
+    assert mapped == mapper.map_dpp(dpp)
+    assert mapped["structure"]["components"][-1]["name"] == "Bootloader"
+
+    # Nested edits of a part are signalled with touch()
+    dpp.structure.parts[0].ontology_bindings["ECLASS"] = OntologyBinding("ECLASS", class_ids=["0173-1#01-AAA123#001"])
+    dpp.structure.parts[0].touch()
+    mapped = mapper.remap(dpp, mapped)
+    assert mapped["structure"]["components"][0]["eclassIrdi"] == "0173-1#01-AAA123#001"
+
+
+def test_remap_reads_only_changed_parts_once_tracking(make_dpp):
+    mapper = CountingMapper(config={})
+    dpp = make_dpp(parts=sensors(6))
+    mapped = mapper.remap(dpp, mapper.map_dpp(dpp))  # first remap: one version scan, starts tracking
+    layer = dpp.structure
+    assert layer.changed_parts(0) == list(range(6))
+
+    mapper.calls.clear()
+    layer.parts[4].name = "Renamed"
+    layer.replace_part(2, Fastener(part_id="F2", name="Bolt", type="Fastener"))
+    mapped = mapper.remap(dpp, mapped)
+    assert mapper.calls == ["F2", "S4"]
+    assert layer.get_part("F2") is layer.parts[2] and layer.get_part("S2") is None
+    assert mapped == mapper.map_dpp(dpp)
+
+    # Parts report to the log, so a version scan is not needed
+    state = mapped.mapping_state
+    assert layer.changed_parts(state.since) == []
+    layer.parts[5].touch()
+    assert layer.changed_parts(state.since) == [5]
+
+    # Copies are not attached to the original's log
+    clone = copy.deepcopy(layer)
+    clone.parts[0].name = "Copy"
+    assert layer.changed_parts(state.since) == [5]
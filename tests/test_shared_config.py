@@ -0,0 +1,106 @@
+"""
+test_shared_config.py
+
+Tests for memory-mapped shared mapping configs.
+"""
+
+import pickle
+
+import pytest
+import yaml
+
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.schema_registry import SchemaRegistry
+from nmis_dpp.shared_config import SharedConfig, export_config, to_plain
+
+CONFIG = {
+    "eclass_version": "16.0",
+    "total_classes": 3,
+    "domain_mappings": {
+        "Sensor": {
+            "eclass_class_ids": [],
+            # Deliberately not in sorted order: iteration must keep it
+            "eclass_classes": {
+                "0173-1#01-ZZZ999#001": {"name": "Temperatur­fühler °C", "level": 4},
+                "0173-1#01-AAA111#001": {"name": "Pressure sensor", "level": 4},
+            },
+        },
+        "Fastener": {"eclass_classes": {}},
+    },
+    "values": [1, -2, 2 ** 70, 1.5, True, False, None, [], {"nested": ["x"]}],
+}
+
+
+@pytest.fixture
+def shared(tmp_path):
+    config = SharedConfig.open(export_config(CONFIG, tmp_path / "eclass.mmcfg"))
+    yield config
+    config.close()
+
+
+def test_round_trip_preserves_values_and_order(shared):
+    assert to_plain(shared) == CONFIG
+    assert shared == CONFIG
+    assert list(shared["domain_mappings"]["Sensor"]["eclass_classes"]) == [
+        "0173-1#01-ZZZ999#001", "0173-1#01-AAA111#001",
+    ]
+    assert shared["values"][2] == 2 ** 70
+    assert shared["values"][-1]["nested"] == ["x"]
+    assert shared.get("missing", "default") == "default"
+    assert "domain_mappings" in shared and 42 not in shared
+    with pytest.raises(KeyError):
+        shared["missing"]
+    # Memoized views: the same child object on every lookup
+    assert shared["domain_mappings"] is shared["domain_mappings"]
+
+
+def test_export_rejects_unsupported_content(tmp_path):
+    with pytest.raises(TypeError):
+        export_config({1: "int key"}, tmp_path / "bad.mmcfg")
+    with pytest.raises(TypeError):
+        export_config({"when": object()}, tmp_path / "bad.mmcfg")
+    assert list(tmp_path.iterdir()) == []
+
+    not_shared = tmp_path / "plain.yml"
+    not_shared.write_text("a: 1", encoding="utf-8")
+    with pytest.raises(ValueError):
+        SharedConfig.open(not_shared)
+
+
+def test_mapper_on_shared_config_matches_dict_config(shared):
+    part = Sensor(part_id="S1", name="Probe", type="Sensor")
+    plain_mapper = ECLASSMapper(config=CONFIG)
+    shared_mapper = ECLASSMapper(config=shared)
+
+    assert shared_mapper.map_part_class(part) == plain_mapper.map_part_class(part)
+    assert shared_mapper.map_part_class(part)["eclassIrdi"] == "0173-1#01-ZZZ999#001"
+    # Same fingerprint without walking the mapped content
+    assert shared_mapper.config_version == plain_mapper.config_version
+
+    clone = pickle.loads(pickle.dumps(shared))
+    assert clone.path == shared.path and clone == shared
+
+
+def test_registry_exports_and_workers_attach(tmp_path):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    (config_dir / "eclass_mapping.yml").write_text(yaml.safe_dump(CONFIG), encoding="utf-8")
+    shm = tmp_path / "shm"
+
+    parent = SchemaRegistry(config_dir=config_dir, plugin_group=None)
+    parent.register(ECLASSMapper)
+    written = parent.export_shared_configs(shm)
+    assert list(written) == ["ECLASS"]
+
+    worker = SchemaRegistry(config_dir=config_dir, plugin_group=None)
+    worker.register(ECLASSMapper)
+    worker.get_mapper("ECLASS")
+    assert worker.attach_shared_configs(shm) == ["ECLASS"]
+
+    mapper = worker.get_mapper("ECLASS")
+    assert isinstance(mapper.config, SharedConfig)
+    part = Sensor(part_id="S1", name="Probe", type="Sensor")
+    assert mapper.map_part_class(part) == parent.get_mapper("ECLASS").map_part_class(part)
+    # Attached configs are not hot-reloaded from YAML
+    assert worker.check_for_updates() == []
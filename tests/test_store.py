@@ -0,0 +1,182 @@
+"""
+test_store.py
+
+Tests for the SQLite-backed PassportStore.
+"""
+
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from nmis_dpp.store import PassportStore
+from nmis_dpp.synthetic import generate_passport
+from nmis_dpp.utils import to_dict, to_json_compact
+
+
+def make_passports(n, **kwargs):
+    passports = []
+    for i in range(n):
+        dpp = generate_passport(3, seed=i, part_types=["Sensor"] if i % 2 else ["Actuator", "Thermal"], **kwargs)
+        dpp.identity.global_ids["serial"] = f"SN-{i:04d}"
+        dpp.identity.global_ids["gtin"] = f"{i % 3:014d}"
+        passports.append(dpp)
+    return passports
+
+
+def test_to_json_compact_matches_to_dict():
+    dpp = generate_passport(20, seed=5, binding_ratio=1.0)
+    assert json.loads(to_json_compact(dpp)) == to_dict(dpp)
+    assert to_json_compact(dpp) == json.dumps(to_dict(dpp), separators=(",", ":"), ensure_ascii=False)
+
+
+def test_add_get_replace_delete(tmp_path):
+    path = tmp_path / "passports.db"
+    dpp, other = make_passports(2)
+    with PassportStore(path) as store:
+        passport_id = store.add(dpp)
+        assert to_dict(store.get(passport_id)) == to_dict(dpp)
+        assert store.get(passport_id, raw=True) == to_dict(dpp)
+        assert passport_id in store and len(store) == 1
+
+        store.replace(passport_id, other)
+        assert store.find_ids(serial="SN-0000") == []
+        assert store.find_ids(serial="SN-0001") == [passport_id]
+        assert store.find_ids(part_type="Thermal") == []
+
+        store.delete(passport_id)
+        assert len(store) == 0 and store.stats()["part_types"] == {}
+        for call in (lambda: store.get(passport_id), lambda: store.delete(passport_id),
+                     lambda: store.replace(passport_id, dpp)):
+            with pytest.raises(KeyError):
+                call()
+
+    # WAL mode and the schema persist across connections
+    with PassportStore(path) as store:
+        assert store._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.add(dpp)
+    assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM passports").fetchone()[0] == 1
+
+
+def test_bulk_insert_lookups_and_scans():
+    passports = make_passports(25)
+    store = PassportStore()
+    assert store.add_many(iter(passports), batch_size=4) == 25
+    assert len(store) == 25
+
+    assert store.find_ids(serial="SN-0007") == [8]
+    assert store.find_ids(gtin=f"{1:014d}") == list(range(2, 26, 3))
+    assert store.find_ids(gtin=f"{1:014d}", part_type="Sensor") == [2, 8, 14, 20]
+    assert len(store.find_ids(brand="Synthetic Devices")) == 25
+    assert store.find_ids(serial="nope") == []
+    with pytest.raises(ValueError):
+        store.find_ids(colour="red")
+
+    # Pagination (batch_size smaller than the result) keeps order and completeness
+    found = list(store.find(part_type="Sensor", batch_size=3))
+    assert [i for i, _ in found] == list(range(2, 26, 2))
+    assert all(type(p).__name__ == "Sensor" for _, dpp in found for p in dpp.structure.parts)
+    assert [i for i, _ in store.find(raw=True, batch_size=2)] == list(range(1, 26))
+
+    scanned = list(store.scan("serial", "SN-0005", "SN-0015", raw=True, batch_size=4))
+    assert [d["identity"]["global_ids"]["serial"] for _, d in scanned] == [f"SN-{i:04d}" for i in range(5, 15)]
+    by_gtin = [i for i, _ in store.scan("gtin", raw=True, batch_size=5)]
+    assert by_gtin == sorted(range(1, 26), key=lambda i: ((i - 1) % 3, i))
+    assert [i for i, _ in store.scan(start=20, raw=True)] == list(range(20, 26))
+    with pytest.raises(ValueError):
+        list(store.scan("document"))
+
+    stats = store.stats()
+    assert stats["passports"] == 25 and stats["parts"] == 75
+    assert stats["part_types"] == {"Actuator": 13, "Thermal": 13, "Sensor": 12}
+
+
+def test_failed_batch_stores_nothing_and_threads_share_store():
+    store = PassportStore()
+    broken = make_passports(3)
+    broken[2].structure.parts = None  # fails while building the row
+    with pytest.raises(TypeError):
+        store.add_many(broken)
+    assert len(store) == 0
+
+    threads = [threading.Thread(target=store.add_many, args=(make_passports(10),)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(store) == 40 and len(store.find_ids(part_type="Sensor")) == 20
+
+
+def make_fleet(n, lines=3):
+    """Passports of a few product lines: shared parts and layers, unique identities."""
+    fleet = []
+    for i in range(n):
+        dpp = generate_passport(4, seed=i % lines, binding_ratio=0.5)
+        dpp.identity.global_ids["serial"] = f"SN-{i:04d}"
+        dpp.structure.parts[0].part_id = f"unit-{i}"  # part ids differ, specs do not
+        fleet.append(dpp)
+    return fleet
+
+
+def test_deduplicating_store_round_trips_and_shares_blobs(tmp_path):
+    fleet = make_fleet(30)
+    plain, dedup = PassportStore(), PassportStore(tmp_path / "dedup.db", deduplicate=True, blob_cache_size=4)
+    plain.add_many(fleet)
+    dedup.add_many(fleet[:10], batch_size=3)
+    for dpp in fleet[10:]:
+        dedup.add(dpp)
+
+    for passport_id, dpp in enumerate(fleet, 1):
+        assert dedup.get(passport_id, raw=True) == to_dict(dpp)
+    assert [to_dict(p) for _, p in dedup.scan("serial", batch_size=7)] == [to_dict(p) for p in fleet]
+    assert dedup.find_ids(serial="SN-0004") == [5]
+
+    stats = dedup.stats()
+    # 3 product lines x (5 layers + 4 parts), each stored once
+    assert stats["blobs"] == 27 and stats["blob_refs"] == 30 * 9
+    assert stats["document_bytes"] + stats["blob_bytes"] < plain.stats()["document_bytes"] / 2
+
+
+def test_deduplicated_blobs_are_reference_counted(tmp_path):
+    fleet = make_fleet(4, lines=2)
+    store = PassportStore(deduplicate=True)
+    ids = [store.add(dpp) for dpp in fleet]
+    assert store.stats()["blobs"] == 18
+
+    store.delete(ids[0])
+    assert store.stats()["blobs"] == 18  # still used by fleet[2]
+    store.delete(ids[2])
+    assert store.stats()["blobs"] == 9
+
+    changed = make_fleet(2, lines=2)[1]
+    changed.sustainability.mass = 123.0
+    store.replace(ids[1], changed)
+    assert store.get(ids[1], raw=True) == to_dict(changed)
+    assert store.get(ids[3], raw=True) == to_dict(fleet[3])
+    assert store.stats()["blobs"] == 10 and store.stats()["blob_refs"] == 18
+
+    # Plain and deduplicated rows coexist and convert on replace
+    store.deduplicate = False
+    store.replace(ids[3], fleet[3])
+    assert store.stats()["blob_refs"] == 9 and store.get(ids[3], raw=True) == to_dict(fleet[3])
+
+
+def test_schema_v1_database_is_migrated(tmp_path):
+    path = tmp_path / "v1.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE passports (id INTEGER PRIMARY KEY, gtin TEXT, serial TEXT, manufacturer_pn TEXT,
+                                brand TEXT, model TEXT, n_parts INTEGER NOT NULL, document TEXT NOT NULL);
+        PRAGMA user_version = 1;
+    """)
+    dpp = make_fleet(1)[0]
+    conn.execute("INSERT INTO passports VALUES (1, NULL, 'SN-0000', NULL, NULL, NULL, 4, ?)", (to_json_compact(dpp),))
+    conn.commit()
+    conn.close()
+
+    with PassportStore(path, deduplicate=True) as store:
+        assert store.get(1, raw=True) == to_dict(dpp)
+        store.add(dpp)
+        assert store.get(2, raw=True) == to_dict(dpp)
+        assert store._conn.execute("PRAGMA user_version").fetchone()[0] == 2
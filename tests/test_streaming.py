@@ -0,0 +1,105 @@
+"""
+test_streaming.py
+
+Tests for streaming JSON output of mapped passports.
+"""
+
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from nmis_dpp.instrumentation import MetricsRecorder
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.synthetic import generate_passport
+from nmis_dpp.validation import MappingValidationError
+
+
+@pytest.mark.parametrize("mapper_class", [ECLASSMapper, ISA95Mapper])
+@pytest.mark.parametrize("n_parts", [0, 7, 25])
+def test_fragments_join_to_map_dpp_output(mapper_class, n_parts):
+    mapper = mapper_class()
+    dpp = generate_passport(n_parts, seed=2)
+    fragments = list(mapper.iter_map_json(dpp, batch_size=5))
+    assert "".join(fragments) == json.dumps(mapper.map_dpp(dpp))
+    assert len(fragments) > 5 + n_parts // 5
+
+    out = io.StringIO()
+    assert mapper.write_dpp_json(dpp, out, batch_size=5) == len(out.getvalue())
+    assert json.loads(out.getvalue()) == json.loads("".join(fragments))
+
+
+def test_peak_memory_is_bounded_by_the_batch():
+    mapper = ECLASSMapper()
+    small, large = generate_passport(2_000, seed=0), generate_passport(20_000, seed=0)
+
+    class Discard:
+        def write(self, text):
+            pass
+
+    # A fresh trace per run (tracemalloc.reset_peak() is 3.9+)
+    peaks = []
+    for dpp in (small, large):
+        tracemalloc.start()
+        try:
+            mapper.write_dpp_json(dpp, Discard(), batch_size=500)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    assert peaks[1] < 2 * peaks[0]
+
+
+def test_validation_and_instrumentation():
+    recorder = MetricsRecorder()
+    mapper = ECLASSMapper(config={"full_validation": True})
+    mapper.instrumentation = recorder
+    dpp = generate_passport(12, seed=3)
+    "".join(mapper.iter_map_json(dpp, batch_size=4))
+    snapshot = recorder.snapshot()
+    assert snapshot["parts_mapped_total"] == [{"labels": {"schema": "ECLASS"}, "value": 12}]
+    assert snapshot["map_dpp_seconds"][0]["count"] == 1
+
+    dpp.structure.parts[9].part_id = None  # fails structure.components[*].id in the third batch
+    fragments = []
+    with pytest.raises(MappingValidationError) as excinfo:
+        for fragment in mapper.iter_map_json(dpp, batch_size=4):
+            fragments.append(fragment)
+    assert excinfo.value.errors == ["$.structure.components[9].id: is required"]  # index in the whole list
+    text = "".join(fragments)  # the first two batches, an incomplete document
+    assert dpp.structure.parts[7].part_id in text and dpp.structure.parts[8].part_id not in text
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+
+    with pytest.raises(ValueError):
+        next(mapper.iter_map_json(dpp, batch_size=0))
+
+
+def test_streamed_validation_matches_map_dpp(caplog):
+    mapper = ECLASSMapper(config={"full_validation": True, "validation_rules": [
+        {"path": "identity.manufacturerId", "equals": "nobody", "severity": "warning"},
+    ]})
+    dpp = generate_passport(12, seed=6)
+    dpp.structure.parts[10].part_id = dpp.structure.parts[1].part_id  # duplicate across batches
+
+    with pytest.raises(MappingValidationError) as expected:
+        mapper.map_dpp(dpp)
+    caplog.clear()
+    with pytest.raises(MappingValidationError) as streamed:
+        "".join(mapper.iter_map_json(dpp, batch_size=4))
+    assert streamed.value.errors == expected.value.errors
+    assert streamed.value.errors[0].startswith("$.structure.components[10].id: duplicate id")
+
+    # Header rules (and their warnings) are evaluated once, not per batch
+    warnings = [r for r in caplog.records if "validation warning" in r.getMessage()]
+    assert len(warnings) == 1
+
+
+def test_mapper_without_parts_key_yields_one_fragment():
+    class Plain(ISA95Mapper):
+        STRUCTURE_PARTS_KEY = None
+
+    mapper = Plain()
+    dpp = generate_passport(3, seed=4)
+    assert list(mapper.iter_map_json(dpp)) == [json.dumps(mapper.map_dpp(dpp))]
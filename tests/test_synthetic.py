@@ -0,0 +1,59 @@
+"""
+test_synthetic.py
+
+Tests for the synthetic passport generator, dict deserialization and a
+smoke run of the benchmark suite.
+"""
+
+import json
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+from nmis_dpp.json_schema import passport_validator
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.synthetic import DEFAULT_PART_TYPES, generate_passport, generate_passport_dict, iter_parts
+from nmis_dpp.utils import passport_from_dict, to_dict
+
+BENCHMARKS = Path(__file__).resolve().parents[1] / "benchmarks" / "run_benchmarks.py"
+
+
+def test_generator_is_seeded_and_covers_all_part_types():
+    assert generate_passport_dict(40, seed=7) == generate_passport_dict(40, seed=7)
+    assert generate_passport_dict(40, seed=7) != generate_passport_dict(40, seed=8)
+
+    counts = Counter(part.type for part in iter_parts(len(DEFAULT_PART_TYPES) * 3))
+    assert set(counts) == set(DEFAULT_PART_TYPES) and set(counts.values()) == {3}
+
+    parts = list(iter_parts(200, binding_ratio=1.0, part_types=["Sensor"]))
+    assert all(type(p).__name__ == "Sensor" and p.get_binding("ECLASS") for p in parts)
+
+
+def test_synthetic_passports_are_valid_and_round_trip():
+    dpp = generate_passport(300, seed=1)
+    data = json.loads(json.dumps(to_dict(dpp)))
+
+    assert passport_validator().validate(data) == []
+    assert to_dict(passport_from_dict(data)) == data
+    assert len(ECLASSMapper().map_dpp(dpp)["structure"]["components"]) == 300
+    assert len(ISA95Mapper().map_dpp(dpp)["structure"]["NestedEquipment"]) == 300
+
+
+def test_benchmark_suite_smoke_run(tmp_path):
+    output = tmp_path / "results.json"
+    args = [sys.executable, str(BENCHMARKS), "--sizes", "5", "--min-time", "0", "--no-configs", "-o", str(output)]
+    subprocess.run(args, check=True, capture_output=True, cwd=tmp_path)
+
+    document = json.loads(output.read_text(encoding="utf-8"))
+    names = {r["name"] for r in document["results"]}
+    assert {"map_dpp[ECLASS]", "map_dpp[ISA-95]", "serialize", "deserialize", "validate_raw"} <= names
+    assert all(r["parts"] == 5 and r["min_s"] > 0 for r in document["results"])
+
+    # Comparing a run with itself reports no regressions
+    compare = subprocess.run(
+        args[:-2] + ["--compare", str(output), "--threshold", "1000"],
+        capture_output=True, text=True, cwd=tmp_path,
+    )
+    assert compare.returncode == 0, compare.stderr
@@ -0,0 +1,132 @@
+"""
+test_validation.py
+
+Tests for the compiled declarative validation rules (nmis_dpp.validation)
+and their use by the built-in mappers.
+"""
+
+import math
+
+import pytest
+
+from nmis_dpp.mappers.eclass_mapper import ECLASSMapper
+from nmis_dpp.mappers.isa95_mapper import ISA95Mapper
+from nmis_dpp.part_class import Sensor
+from nmis_dpp.validation import MappingValidationError, Validator
+
+
+def test_collects_every_issue_with_json_paths():
+    validator = Validator([
+        {"path": "identity.ID", "required": True, "type": "string"},
+        {"path": "parts", "unique_by": "id"},
+        {"path": "parts[*].id", "required": True},
+        {"path": "parts[*].attributes.*", "finite": True},
+        {"path": "mass", "min": 0, "severity": "warning"},
+    ])
+    document = {
+        "parts": [
+            {"id": "a", "attributes": {"t": 1.0}},
+            {"id": "a", "attributes": {"t": math.nan}},
+            {"attributes": {}},
+        ],
+        "mass": -1,
+    }
+
+    issues = {(i.path, i.rule, i.severity) for i in validator.validate(document)}
+
+    assert issues == {
+        ("$.identity.ID", "required", "error"),
+        ("$.parts[1].id", "unique_by", "error"),
+        ("$.parts[1].attributes.t", "finite", "error"),
+        ("$.parts[2].id", "required", "error"),
+        ("$.mass", "min", "warning"),
+    }
+    assert not validator.is_valid(document)
+    assert validator.is_valid({"identity": {"ID": "x"}, "mass": -1})
+
+
+def test_rule_keywords():
+    validator = Validator([
+        {"path": "level", "one_of": ["Unit", "Site"]},
+        {"path": "irdi", "pattern": r"\d{4}-\d+"},
+        {"path": "name", "type": "string", "max_length": 3, "message": "bad name"},
+        {"path": "ids", "required_any": ["gtin", "serial"]},
+        {"path": "schema", "equals": "ECLASS"},
+    ])
+    ok = {"level": "Unit", "irdi": "0173-1", "name": "abc", "ids": {"serial": "S"}, "schema": "ECLASS"}
+    assert validator.validate(ok) == []
+
+    bad = {"level": "Moon", "irdi": "x0173-1", "name": "abcd", "ids": {"gtin": ""}, "schema": "ISA-95"}
+    issues = validator.validate(bad)
+    assert [i.rule for i in issues] == ["one_of", "pattern", "max_length", "required_any", "equals"]
+    assert str(issues[2]) == "$.name: bad name"
+
+    # Absent values only fail "required"/"required_any"
+    assert [i.path for i in validator.validate({})] == ["$.ids"]
+
+
+def test_invalid_rule_sets_are_rejected():
+    with pytest.raises(ValueError):
+        Validator([{"path": "a", "colour": "red"}])
+    with pytest.raises(ValueError):
+        Validator([{"path": "a", "type": "date"}])
+    with pytest.raises(ValueError):
+        Validator([{"path": "a", "required": True, "severity": "fatal"}])
+    with pytest.raises(ValueError):
+        Validator([{"path": "a..b", "required": True}])
+
+
+def test_batch_report_aggregates_statistics():
+    validator = Validator([{"path": "items[*].id", "required": True}])
+    documents = [{"items": [{"id": 1}]}, {"items": [{}, {}]}, {"items": []}]
+
+    report = validator.validate_batch(documents, max_failures=1)
+
+    assert (report.documents, report.valid, report.invalid, report.errors) == (3, 2, 1, 2)
+    assert report.by_path == {"$.items[*].id": 2}
+    assert list(report.failures) == [1]
+    assert "3 documents: 2 valid, 1 invalid" in report.summary()
+
+
+FULL = {"full_validation": True}
+
+
+def test_mappers_report_all_errors_on_map_dpp(make_dpp):
+    parts = [
+        Sensor(part_id="S1", name="A", type="Sensor", properties={"range": math.inf}),
+        Sensor(part_id="S1", name="B", type="Sensor"),
+    ]
+    with pytest.raises(MappingValidationError) as excinfo:
+        ECLASSMapper(config=FULL).map_dpp(make_dpp(global_ids={}, parts=parts, mass=-2.0))
+
+    errors = excinfo.value.errors
+    assert isinstance(excinfo.value, ValueError)
+    assert "$.identity: requires one of serialNumber, gtin, manufacturerPartId" in errors
+    assert any(e.startswith("$.structure.components[1].id: duplicate id") for e in errors)
+    assert any(e.startswith("$.structure.components[0].attributes.range") for e in errors)
+    assert any(e.startswith("$.sustainability.mass") for e in errors)
+
+    with pytest.raises(MappingValidationError, match=r"\$\.identity\.ID"):
+        ISA95Mapper(config=FULL).map_dpp(make_dpp(global_ids={}))
+
+
+def test_config_rules_extend_class_rules(make_dpp):
+    mapper = ISA95Mapper(config={"full_validation": True, "validation_rules": [
+        {"path": "lifecycle.WorkOrder", "required": True},
+    ]})
+    valid, errors = mapper.validate_mapping(ISA95Mapper().map_dpp(make_dpp()))
+    assert not valid and errors == ["$.lifecycle.WorkOrder: is required"]
+
+    report = ECLASSMapper().validate_batch(ECLASSMapper().map_dpp(make_dpp()) for _ in range(5))
+    assert report.valid == 5 and report.documents_per_second > 0
+
+
+def test_map_dpp_runs_only_the_schema_check_by_default(make_dpp):
+    mapper = ECLASSMapper()
+    mapped = mapper.map_dpp(make_dpp(global_ids={}, mass=-2.0))  # rule violations, not raised
+    assert not mapper.full_validation and mapper.validate_mapping(mapped) == (True, [])
+    assert mapper.validate_mapping({**mapped, "schema": "ISA-95"}) == (False, ["Schema mismatch"])
+
+    valid, errors = mapper.check_rules(mapped)  # the full rules, e.g. at export time
+    assert not valid and any(e.startswith("$.sustainability.mass") for e in errors)
+    assert mapper.validate_batch([mapped]).invalid == 1
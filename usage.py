@@ -14,124 +14,30 @@ Example:
 
 import argparse
 import json
-import ast
 import sys
-from typing import Dict, Any, Type
+from typing import Dict, Any
 from pathlib import Path
 
 from nmis_dpp import get_global_registry, register_default_mappers
-from nmis_dpp.model import (
-    IdentityLayer, StructureLayer, LifecycleLayer, RiskLayer,
-    SustainabilityLayer, ProvenanceLayer, DigitalProductPassport
-)
-from nmis_dpp.part_class import (
-    PartClass, OntologyBinding,
-    Actuator, Sensor, PowerConversion, Thermal, Fluidics,
-    Structural, ControlUnit, UserInterface, Fastener, Connectivity,
-    EnergyStorage, SoftwareModule, Consumable, Protection, Transmission
-)
-from nmis_dpp.utils import to_json
+from nmis_dpp.model import DigitalProductPassport
+from nmis_dpp.part_class import PartClass
+from nmis_dpp.utils import part_from_dict, passport_from_dict
 
 # Registry is initialized on module import via nmis_dpp.__init__ but explicit call is safe
 register_default_mappers()
 
-# Map type strings to classes for deserialization
-PART_CLASS_MAP: Dict[str, Type[PartClass]] = {
-    "Actuator": Actuator,
-    "Sensor": Sensor,
-    "PowerConversion": PowerConversion,
-    "Thermal": Thermal,
-    "Fluidics": Fluidics,
-    "Structural": Structural,
-    "ControlUnit": ControlUnit,
-    "UserInterface": UserInterface,
-    "Fastener": Fastener,
-    "Connectivity": Connectivity,
-    "EnergyStorage": EnergyStorage,
-    "SoftwareModule": SoftwareModule,
-    "Consumable": Consumable,
-    "Protection": Protection,
-    "Transmission": Transmission,
-    "PartClass": PartClass
-}
-
 def reconstruct_part(data: Dict[str, Any]) -> PartClass:
     """
     Reconstruct a specific PartClass subclass from a dictionary.
-    Handles nested OntologyBinding objects.
+    Handles nested OntologyBinding objects (see nmis_dpp.utils.part_from_dict).
     """
-    # 1. Extract core PartClass fields that might need special handling
-    p_type = data.get("type", "PartClass")
-    bindings_data = data.pop("ontology_bindings", {})
-    
-    # 2. Reconstruct OntologyBinding objects
-    bindings = {}
-    for key, b_data in bindings_data.items():
-        if isinstance(b_data, dict):
-            bindings[key] = OntologyBinding(**b_data)
-        else:
-            # Fallback if somehow already object (unlikely from JSON)
-            bindings[key] = b_data
-            
-    # 3. Resolve class
-    cls = PART_CLASS_MAP.get(p_type, PartClass)
-    
-    # 4. Instantiate (passing remaining data as kwargs)
-    # Check if 'properties' is in data, preserve it
-    # Note: dataclasses constructor expects fields. Extra fields in JSON might cause error if not careful.
-    # However, PartClass has 'properties' field for extras.
-    # But usually JSON matches fields. if strict dataclass, we must filter.
-    # For now assuming JSON strictly matches schema generated by to_dict.
-    
-    try:
-        part = cls(**data)
-    except TypeError as e:
-        # Fallback: if data contains extra keys, we might need to filter them
-        # or put them into 'properties'
-        valid_fields = cls.__dataclass_fields__.keys()
-        filtered_data = {k: v for k, v in data.items() if k in valid_fields}
-        part = cls(**filtered_data)
-        
-        # If there were extra fields, maybe log them or add to properties?
-        # part.properties.update({k: v for k, v in data.items() if k not in valid_fields})
-
-    part.ontology_bindings = bindings
-    return part
+    return part_from_dict(data)
 
 def reconstruct_dpp(data: Dict[str, Any]) -> DigitalProductPassport:
     """
     Reconstruct a DigitalProductPassport object from a dictionary.
     """
-    # Reconstruct layers
-    identity = IdentityLayer(**data.get("identity", {}))
-    
-    # Structure needs part reconstruction
-    struct_data = data.get("structure", {})
-    parts_data = struct_data.get("parts", [])
-    parts = [reconstruct_part(p) for p in parts_data]
-    
-    # Update structure dict to have object list
-    struct_args = struct_data.copy()
-    struct_args["parts"] = parts
-    
-    # Handle optional fields or list of objects in other layers?
-    # Usually they are dicts or lists of dicts which match standard types (e.g. interfaces, materials are list[dict])
-    # So simple unpacking works for other layers.
-    
-    structure = StructureLayer(**struct_args)
-    lifecycle = LifecycleLayer(**data.get("lifecycle", {}))
-    risk = RiskLayer(**data.get("risk", {}))
-    sustainability = SustainabilityLayer(**data.get("sustainability", {}))
-    provenance = ProvenanceLayer(**data.get("provenance", {}))
-    
-    return DigitalProductPassport(
-        identity=identity,
-        structure=structure,
-        lifecycle=lifecycle,
-        risk=risk,
-        sustainability=sustainability,
-        provenance=provenance
-    )
+    return passport_from_dict(data)
 
 def main():
     parser = argparse.ArgumentParser(description="Map a DPP JSON file to a specific schema.")